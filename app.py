@@ -1,9 +1,9 @@
+from contextlib import nullcontext
 import os
 import sys
 import warnings
 from pathlib import Path
 
-import pandas as pd
 import streamlit as st
 from streamlit_option_menu import option_menu
 
@@ -17,7 +17,9 @@ for path in [root_path, scripts_path]:
         sys.path.insert(0, path)
 
 # Import modular styles and renderer
-from styles import MenuStyles, DashboardStyles, MenuRenderer
+from styles import MenuRenderer, inject_style_bundle
+
+from scripts.utilities.render_tracing import instrument_components, trace_rerun
 
 # Initialize modern themes system (optional)
 try:
@@ -27,6 +29,14 @@ try:
 except Exception:
     pass
 
+# Send Plotly figures as compact typed arrays (optional)
+try:
+    from scripts.plotting.payload_encoding import install_payload_compaction
+
+    install_payload_compaction()
+except Exception:
+    pass
+
 def render():
     # Robust local module loader to avoid import cache/key conflicts in some environments (e.g., Streamlit reload)
     def _load_dashboard_module(module_name: str):
@@ -44,7 +54,10 @@ def render():
             sys.modules.pop('dashboard', None)
 
         try:
-            return importlib.import_module(f"dashboard.{module_name}")
+            module = importlib.import_module(f"dashboard.{module_name}")
+            # Trace render_*/plot_*/create_* components of the loaded page
+            instrument_components()
+            return module
         except Exception:
             # Fallback: load directly from file path
             mod_path = current_dir / 'dashboard' / f'{module_name}.py'
@@ -56,52 +69,24 @@ def render():
                 spec.loader.exec_module(mod)  # type: ignore[attr-defined]
                 return mod
             raise
-    # Import the JSON interpreter inside render to avoid Streamlit UI at import time
+    # Import the shared data plane inside render to avoid Streamlit UI at import time
     try:
-        from scripts.utilities.json_interpreter import interpret_initiatives_metadata
+        from scripts.utilities.data_plane import attach_session
     except Exception as e:
-        st.error(f"❌ Error importing JSON interpreter: {e}")
+        st.error(f"❌ Error importing data plane: {e}")
         st.stop()
 
     os.environ["STREAMLIT_BROWSER_GATHER_USAGE_STATS"] = "false"
     warnings.filterwarnings("ignore")
 
-    # Cache main data for better performance
-    @st.cache_data(ttl=300)
-    def load_cached_data():
-        try:
-            metadata_file_path = current_dir / "data" / "json" / "initiatives_metadata.jsonc"
-            df = interpret_initiatives_metadata(metadata_file_path)
-            if df is None or df.empty:
-                return pd.DataFrame()
-            return df
-        except Exception:
-            return pd.DataFrame()
-
     # Page config and styles
     st.set_page_config(page_title="LANDAGRI-B Dashboard", layout="wide", page_icon="🌍", initial_sidebar_state="expanded")
 
-    # Apply modular styles
-    st.markdown(DashboardStyles.get_main_container_styles(), unsafe_allow_html=True)
-    st.markdown(DashboardStyles.get_header_styles(), unsafe_allow_html=True)
-    st.markdown(DashboardStyles.get_card_styles(), unsafe_allow_html=True)
-    st.markdown(DashboardStyles.get_responsive_styles(), unsafe_allow_html=True)
-    st.markdown(DashboardStyles.get_sidebar_styles(), unsafe_allow_html=True)
-    st.markdown(MenuStyles.get_option_menu_styles(), unsafe_allow_html=True)
-    st.markdown(MenuStyles.get_breadcrumb_styles(), unsafe_allow_html=True)
-
-    # --- Load and cache data early ---
-    if "df_interpreted" not in st.session_state or st.session_state.df_interpreted is None:
-        df_loaded = load_cached_data()
-        st.session_state.df_interpreted = df_loaded
-        # Load raw metadata if available
-        try:
-            from scripts.utilities.json_interpreter import _load_jsonc_file
+    # Apply modular styles (single cached bundle, injected once per session)
+    inject_style_bundle()
 
-            metadata_file_path = current_dir / "data" / "json" / "initiatives_metadata.jsonc"
-            st.session_state.metadata = _load_jsonc_file(metadata_file_path)
-        except Exception:
-            st.session_state.metadata = {}
+    # --- Pin this session to the shared, read-only data (loaded once per version) ---
+    attach_session()
 
 
     # --- Sidebar ---
@@ -125,6 +110,17 @@ def render():
             st.session_state.current_category = list(MENU_STRUCTURE.keys())[0]
             st.session_state.current_page = str(MENU_STRUCTURE[st.session_state.current_category]['pages'][0])
 
+    # --- Pre-render default page states in the background (once per process) ---
+    try:
+        from scripts.utilities.cache_warmup import ensure_warmup_started
+
+        ensure_warmup_started(
+            [(category, str(page)) for category, data in MENU_STRUCTURE.items() for page in data["pages"]],
+            lambda category, page: _render_current_page(category, page, _load_dashboard_module),
+        )
+    except Exception:
+        pass
+
     # --- Read-only query params handling: allow URLs to set initial page when app loads ---
     # We only use query params here to set the initial navigation state; the menu renderer
     # itself will write back query params when users interact with the UI.
@@ -162,6 +158,35 @@ def render():
     current_category = st.session_state.get('current_category')
     current_page = st.session_state.get('current_page')
 
+    # Hidden performance page: ?view=performance
+    if st.query_params.get("view") == "performance":
+        with trace_rerun("Performance"):
+            _load_dashboard_module('performance').run()
+        return
+
+    # Record the charts rendered on this page for batch export/report generation
+    try:
+        from scripts.utilities.batch_chart_export import (
+            capture_page_figures,
+            render_chart_export_controls,
+        )
+    except ImportError:
+        capture_page_figures = render_chart_export_controls = None
+
+    if capture_page_figures is None:
+        page_capture = nullcontext()
+    else:
+        page_capture = capture_page_figures(str(current_page))
+
+    with trace_rerun(str(current_page)), page_capture:
+        _render_current_page(current_category, current_page, _load_dashboard_module)
+
+    if render_chart_export_controls is not None:
+        with st.sidebar:
+            render_chart_export_controls(str(current_page))
+
+
+def _render_current_page(current_category, current_page, _load_dashboard_module):
     if current_category == "Overview":
         if current_page == "Dashboard Overview":
             overview = _load_dashboard_module('overview')
@@ -170,12 +195,12 @@ def render():
     elif current_category == "Initiative Analysis":
         if current_page in ["Temporal Analysis", "Comparative Analysis", "Detailed Analysis"]:
             initiative_analysis = _load_dashboard_module('initiative_analysis')
-            initiative_analysis.run()
+            initiative_analysis.run(page=current_page)
 
     elif current_category == "Agricultural Analysis":
         if current_page in ["Agriculture Overview", "Crop Calendar", "Agriculture Availability"]:
             agricultural_analysis = _load_dashboard_module('agricultural_analysis')
-            agricultural_analysis.run()
+            agricultural_analysis.run(page=current_page)
 
     elif current_category == "About":
         if current_page == "About the Dashboard":
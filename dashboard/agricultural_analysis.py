@@ -11,15 +11,23 @@ Date: 2025-08-08
 
 import streamlit as st
 
+from dashboard.components.shared.fragments import (
+    fragment_memo,
+    isolated_fragment,
+    render_in_fragment,
+)
+from dashboard.components.shared.lod_controls import lod_row_window, lod_window
+from scripts.plotting.heatmap_lod import DEFAULT_MAX_ROWS
 
-def run():
+
+def run(page=None):
     """
     Main function that responds to pages selected in the app.py sidebar menu.
-    Checks st.session_state.current_page to determine which page to render.
+    Renders ``page`` when given, otherwise st.session_state.current_page.
     """
     
-    # Get current page from session state (defined by app.py)
-    current_page = getattr(st.session_state, 'current_page', 'Agriculture Overview')
+    # Get current page from the caller or session state (defined by app.py)
+    current_page = page or getattr(st.session_state, 'current_page', 'Agriculture Overview')
     
     # Render page based on sidebar menu selection
     if current_page == "Agriculture Overview":
@@ -198,14 +206,35 @@ def render_crop_calendar_page():
         unsafe_allow_html=True,
     )
     
-    # Load data
-    data = load_calendar_data()
+    # Load data: every safra is kept as arrays; the selected one is rebuilt from them
+    safra_calendar = load_safra_calendar_data()
+    safra = None
+    if safra_calendar is not None and safra_calendar.safras:
+        safra = st.selectbox(
+            "📆 Safra:",
+            options=safra_calendar.safras,
+            index=len(safra_calendar.safras) - 1,
+            key="crop_calendar_safra",
+            help="CONAB crop calendar of each safra (add files to data/json/crop_calendar_safras/)",
+        )
+        data = safra_calendar.calendar(safra)
+        rollup = load_calendar_rollup(safra_calendar, safra)
+        if rollup is not None:
+            data = select_calendar_level(rollup, data)
+    else:
+        data = load_calendar_data()
     
     if not data:
         st.warning("⚠️ Agricultural calendar data not available")
         return
     
-    # Global filters
+    # Filters and charts rerun on their own (fragment); headers above do not
+    render_crop_calendar_explorer(data, safra_calendar, safra)
+
+
+@isolated_fragment
+def render_crop_calendar_explorer(data: dict, safra_calendar=None, safra=None) -> None:
+    """Crop/region filters and the calendar chart tabs that depend on them."""
     st.markdown("### 🎛️ Filters")
     st.info("💡 **Tip:** Use the multiselect filters below to focus on specific crops and regions. All options are selected by default.")
     col1, col2 = st.columns(2)
@@ -226,42 +255,53 @@ def render_crop_calendar_page():
             default=regions  # All regions selected by default
         )
     
-    # Filter data
-    filtered_data = filter_data(data, selected_cultures, selected_regions)
+    # Filter data (reused while only chart-level widgets change)
+    filtered_data = fragment_memo(
+        "crop_calendar",
+        "filtered_data",
+        (tuple(selected_cultures), tuple(selected_regions)),
+        lambda: filter_data(data, selected_cultures, selected_regions),
+        source=data,
+    )
     
     st.divider()
     
     # Organizar gráficos em abas baseado nos arquivos em #file:calendar
-    cal_tab1, cal_tab2, cal_tab3, cal_tab4, cal_tab5, cal_tab6, cal_tab7 = st.tabs([
+    # (cada aba é um fragmento: seus widgets só reexecutam a própria aba)
+    cal_tab1, cal_tab2, cal_tab3, cal_tab4, cal_tab5, cal_tab6, cal_tab7, cal_tab8 = st.tabs([
         "🗓️ Calendar Heatmaps",
         "⏳ Activities Timeline", 
         "𖦹 Spatio-temporal Distribution",
         "🌞 Seasonal Overview",
         "📊 Crop Distribution", 
         "📈 Monthly Intensity",
-        "⚡ Activity Intensity"
+        "⚡ Activity Intensity",
+        "🔀 Safra Changes",
     ])
     
     with cal_tab1:
-        render_calendar_heatmaps_tab(filtered_data)
+        render_in_fragment(render_calendar_heatmaps_tab, filtered_data)
 
     with cal_tab2:
-        render_timeline_regional_tab(filtered_data)
+        render_in_fragment(render_timeline_regional_tab, filtered_data)
     
     with cal_tab3:
-        render_spatial_temporal_tab(filtered_data)
+        render_in_fragment(render_spatial_temporal_tab, filtered_data)
     
     with cal_tab4:
-        render_seasonal_overview_tab(filtered_data)
+        render_in_fragment(render_seasonal_overview_tab, filtered_data)
     
     with cal_tab5:
-        render_crop_distribution_tab(filtered_data)
+        render_in_fragment(render_crop_distribution_tab, filtered_data)
     
     with cal_tab6:
-        render_monthly_intensity_tab(filtered_data)
+        render_in_fragment(render_monthly_intensity_tab, filtered_data)
     
     with cal_tab7:
-        render_activity_intensity_tab(filtered_data)
+        render_in_fragment(render_activity_intensity_tab, filtered_data)
+
+    with cal_tab8:
+        render_in_fragment(render_safra_changes_tab, safra_calendar, safra, selected_cultures, selected_regions)
 
 
 
@@ -365,6 +405,47 @@ def load_calendar_data():
         return None
 
 
+def load_safra_calendar_data():
+    """Loads the multi-safra crop calendar (None when unavailable)"""
+    try:
+        from scripts.data_processors.agricultural_data.safra_calendar import get_safra_calendar
+        return get_safra_calendar()
+    except Exception as e:
+        st.error(f"❌ Error loading safra calendars: {e}")
+        return None
+
+
+def load_calendar_rollup(safra_calendar, safra):
+    """Loads the admin-level rollups of the selected safra (None when unavailable)"""
+    try:
+        from scripts.data_processors.agricultural_data.admin_hierarchy import get_calendar_rollup
+        return get_calendar_rollup(safra_calendar, safra)
+    except Exception as e:
+        st.error(f"❌ Error aggregating the crop calendar: {e}")
+        return None
+
+
+def select_calendar_level(rollup, data):
+    """Aggregation level selector; levels whose calendars exceed the chart cell budget are not offered"""
+    from scripts.data_processors.agricultural_data.admin_hierarchy import LEVEL_LABELS
+
+    finest = rollup.levels.index(rollup.choose_level())
+    options = list(rollup.levels[finest:])
+    level = st.selectbox(
+        "🧭 Aggregation level:",
+        options=options,
+        format_func=LEVEL_LABELS.get,
+        key="crop_calendar_level",
+        help="Calendars of finer units are rolled up (municipality → microregion → mesoregion → state → region)",
+    )
+    if finest:
+        skipped = ", ".join(LEVEL_LABELS[l].lower() for l in rollup.levels[:finest])
+        st.caption(f"ℹ️ Calendars at {skipped} level exceed the chart cell budget and are shown rolled up.")
+    if level == rollup.levels[0] and rollup.native:
+        return data
+    return rollup.crop_calendar(level)
+
+
 def get_available_cultures(data):
     """Extracts available crops from data"""
     if not data or 'crop_calendar' not in data:
@@ -1186,9 +1267,19 @@ def render_spatial_coverage_tab(data):
     st.markdown("*Analysis of agricultural data spatial coverage across Brazilian states.*")
     
     try:
-        from dashboard.components.agricultural_analysis.charts.availability import plot_conab_spatial_coverage_by_state
+        from dashboard.components.agricultural_analysis.charts.availability import (
+            plot_conab_spatial_coverage_by_state,
+            plot_conab_spatial_coverage_map,
+        )
+        # Choropleth from the offline geometry store, with the ranking below
+        map_fig = plot_conab_spatial_coverage_map(data)
+        if map_fig:
+            st.plotly_chart(map_fig, use_container_width=True)
         fig = plot_conab_spatial_coverage_by_state(data)
-        if fig:
+        if fig and map_fig:
+            with st.expander("📊 State ranking"):
+                st.plotly_chart(fig, use_container_width=True)
+        elif fig:
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.warning("⚠️ Unable to generate spatial coverage chart")
@@ -1270,8 +1361,10 @@ def render_regional_activity_tab(data):
             st.markdown("##### 🗺️ Activity Heatmap")
             st.markdown("*Agricultural calendar activities intensity between Brazilian states.*")
             try:
-                from dashboard.components.agricultural_analysis.charts.availability import plot_state_activity_heatmap
-                fig = plot_state_activity_heatmap(data)
+                from dashboard.components.agricultural_analysis.charts.availability import plot_state_activity_heatmap, state_activity_pyramid
+                pyramid = state_activity_pyramid(data)
+                window = lod_row_window("state_activity_heatmap_window", pyramid, DEFAULT_MAX_ROWS) if pyramid else None
+                fig = plot_state_activity_heatmap(data, row_range=window, pyramid=pyramid)
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
                 else:
@@ -1551,11 +1644,14 @@ def render_conab_availability_analysis_page():
                 # Prepare filtered data
                 filtered_data = data.copy()
                 
-                # Generate chart based on selection
+                # Generate chart based on selection (drill-down window when crops exceed the budget)
+                crops = list(filtered_data.get('crop_calendar', {}).keys())
                 if chart_type == 'Heatmap':
-                    fig = create_calendar_heatmap_chart(filtered_data)
+                    window = lod_window("national_calendar_matrix_window", crops, DEFAULT_MAX_ROWS // 2, "crops")
+                    fig = create_calendar_heatmap_chart(filtered_data, row_range=window)
                 else:
-                    fig = create_consolidated_calendar_matrix_chart(filtered_data)
+                    window = lod_window("national_calendar_matrix_window", crops, DEFAULT_MAX_ROWS, "crops")
+                    fig = create_consolidated_calendar_matrix_chart(filtered_data, row_range=window)
                 
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
@@ -2029,6 +2125,15 @@ def render_monthly_intensity_tab(data):
         st.error(f"❌ Error loading monthly intensity chart: {e}")
 
 
+def render_safra_changes_tab(safra_calendar, safra, selected_cultures, selected_regions):
+    """Renders the comparison of the selected safra with another safra"""
+    try:
+        from dashboard.components.agricultural_analysis.charts.calendar.safra_diff_charts import render_safra_diff_tab
+        render_safra_diff_tab(safra_calendar, safra, selected_cultures, selected_regions)
+    except Exception as e:
+        st.warning(f"⚠️ Safra Changes: {e}")
+
+
 def render_activity_intensity_tab(data):
     """Renders activity intensity analysis tab for crop calendar"""
     st.markdown("### ⚡ Activity Intensity Analysis")
@@ -2046,8 +2151,10 @@ def render_activity_intensity_tab(data):
         st.markdown("#### 🗓️ Intensity Matrix")
         st.markdown("*Comprehensive matrix  of agricultural activity intensity patterns across all Brazilian states and months.*")
         try:
-            from dashboard.components.agricultural_analysis.charts.availability import plot_state_activity_heatmap
-            fig = plot_state_activity_heatmap(data)
+            from dashboard.components.agricultural_analysis.charts.availability import plot_state_activity_heatmap, state_activity_pyramid
+            pyramid = state_activity_pyramid(data)
+            window = lod_row_window("intensity_matrix_window", pyramid, DEFAULT_MAX_ROWS) if pyramid else None
+            fig = plot_state_activity_heatmap(data, row_range=window, pyramid=pyramid)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             else:
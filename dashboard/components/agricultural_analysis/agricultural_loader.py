@@ -15,7 +15,10 @@ import streamlit as st
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from scripts.utilities.single_flight import single_flight
 
+
+@single_flight()
 def load_agricultural_data() -> dict[str, Any]:
     """
     Load detailed agricultural data from JSON file.
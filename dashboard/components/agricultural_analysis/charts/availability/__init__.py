@@ -10,7 +10,13 @@ from .calendar_availability_analysis import render_calendar_availability_analysi
 from .conab_availability_analysis import render_conab_availability_analysis
 from .conab_availability_matrix import create_conab_availability_matrix
 from .conab_specific_charts import render_conab_charts_tab
-from .spatial_coverage import plot_conab_spatial_coverage, plot_conab_spatial_coverage_by_state, plot_conab_spatial_coverage_by_region
+from .spatial_coverage import (
+    compute_state_coverage,
+    plot_conab_spatial_coverage,
+    plot_conab_spatial_coverage_by_state,
+    plot_conab_spatial_coverage_by_region,
+    plot_conab_spatial_coverage_map
+)
 from .crop_diversity import plot_conab_crop_diversity, plot_conab_crop_diversity_by_state, plot_conab_crop_diversity_by_region
 from .seasonal_patterns import (
     plot_seasonal_patterns,
@@ -26,7 +32,9 @@ from .regional_activity import (
     plot_state_crop_distribution,
     plot_state_activity_timeline,
     plot_regional_activity_heatmap,
-    plot_regional_activity_timeline
+    plot_regional_activity_timeline,
+    state_activity_pyramid,
+    state_crop_pyramid
 )
 from .activity_intensity import (
     plot_activity_intensity_matrix,
@@ -43,6 +51,8 @@ __all__ = [
     "plot_conab_spatial_coverage",
     "plot_conab_spatial_coverage_by_state",
     "plot_conab_spatial_coverage_by_region",
+    "plot_conab_spatial_coverage_map",
+    "compute_state_coverage",
     "plot_conab_crop_diversity",
     "plot_conab_crop_diversity_by_state",
     "plot_conab_crop_diversity_by_region",
@@ -58,6 +68,8 @@ __all__ = [
     "plot_state_activity_timeline",
     "plot_regional_activity_heatmap",
     "plot_regional_activity_timeline",
+    "state_activity_pyramid",
+    "state_crop_pyramid",
     "plot_activity_intensity_matrix",
     "plot_peak_activity_analysis",
     "plot_activity_density_map",
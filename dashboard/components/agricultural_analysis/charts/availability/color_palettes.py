@@ -8,6 +8,8 @@ Author: LANDAGRI-B Project Team
 Date: 2025-08-11
 """
 
+from scripts.data_processors.agricultural_data.admin_hierarchy import unit_region
+
 # Regional color palette for Brazilian regions
 REGIONAL_COLORS = {
     'North': '#E8F8F5',         # Light mint green for Amazon region
@@ -99,14 +101,18 @@ def get_state_color(state_code: str, use_dark: bool = False) -> str:
     """
     Get color for a state based on its region.
     
+    Also accepts IBGE codes of municipalities, microregions and mesoregions
+    (their first digit is the region) and region names; other units get the
+    neutral color.
+    
     Args:
-        state_code: Two-letter state code (e.g., 'SP', 'MG')
+        state_code: Two-letter state code (e.g., 'SP', 'MG') or IBGE unit code
         use_dark: Whether to use dark colors for better contrast
     
     Returns:
         Hex color code for the state's region
     """
-    region = STATE_TO_REGION.get(state_code, 'Southeast')  # Default to Southeast
+    region = STATE_TO_REGION.get(state_code) or unit_region(state_code)
     
     if use_dark:
         return REGIONAL_COLORS_DARK.get(region, MODERN_COLORS['primary'])
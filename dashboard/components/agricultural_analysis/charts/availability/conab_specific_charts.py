@@ -70,6 +70,54 @@ def create_conab_spatial_coverage_chart(conab_data: dict) -> Optional[go.Figure]
         return None
 
 
+def create_conab_spatial_coverage_map(conab_data: dict) -> Optional[go.Figure]:
+    """
+    Creates the choropleth version of the spatial coverage chart (by region).
+
+    Args:
+        conab_data: Detailed CONAB data
+
+    Returns:
+        go.Figure: Plotly figure, or None without data or geometry store
+    """
+    from scripts.utilities.geometry_store import get_geometry_store
+    from scripts.utilities.json_interpreter import get_mesoregion_index
+    from .color_palettes import get_state_acronym
+
+    store = get_geometry_store()
+    if store is None or not validate_data_structure(conab_data):
+        return None
+
+    index = get_mesoregion_index()
+    region_coverage = {}
+    for initiative in conab_data.values():
+        state = safe_get_data(initiative, 'state', '')
+        region = index.mesoregion_for(get_state_acronym(state)) if state else None
+        if region:
+            region_coverage[region] = region_coverage.get(region, 0) + 1
+
+    available = set(store.feature_ids("mesoregion"))
+    regions = sorted(r for r in region_coverage if r in available)
+    if not regions:
+        return None
+
+    fig = go.Figure(go.Choropleth(
+        geojson=store.geojson("mesoregion", "overview"),
+        featureidkey="id",
+        locations=regions,
+        z=[region_coverage[r] for r in regions],
+        text=[index.name_pt(r) or r for r in regions],
+        colorscale="Greens",
+        marker_line_color="white",
+        colorbar=dict(title="Initiatives"),
+        hovertemplate="<b>%{text}</b><br>Initiatives: %{z}<extra></extra>"
+    ))
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(title="🌍 CONAB Spatial Coverage by Region", height=450,
+                      margin=dict(l=10, r=10, t=60, b=10))
+    return fig
+
+
 def create_conab_quality_metrics_chart(conab_data: dict) -> Optional[go.Figure]:
     """
     Creates quality metrics chart for CONAB data.
@@ -230,7 +278,8 @@ def render_conab_charts_tab(conab_data: dict) -> None:
     
     with tab1:
         st.markdown("#### 🌍 CONAB Spatial Coverage")
-        spatial_fig = create_conab_spatial_coverage_chart(conab_data)
+        # Choropleth when the offline geometry store is available
+        spatial_fig = create_conab_spatial_coverage_map(conab_data) or create_conab_spatial_coverage_chart(conab_data)
         if spatial_fig:
             st.plotly_chart(spatial_fig, use_container_width=True)
         else:
@@ -8,9 +8,21 @@ using CONAB crop calendar data.
 
 import plotly.graph_objects as go
 import plotly.express as px
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 
+from scripts.plotting.heatmap_lod import DEFAULT_MAX_COLS, DEFAULT_MAX_ROWS, HeatmapPyramid, cached_pyramid
+
+STATE_ACTIVITY_TYPES = ['Planting Only', 'Harvesting Only', 'Planting & Harvesting', 'Total Activities']
+# Units beyond these are averaged into one "Others" bar/line (calendars rolled up
+# from microregions or municipalities have hundreds of units)
+MAX_STATE_BARS = 60
+MAX_STATE_TRACES = 30
+
+
+def _others_label(count: int) -> str:
+    return f"Others ({count}, avg)"
+
 
 def plot_regional_activity_comparison(conab_data: Dict[str, Any]) -> go.Figure:
     """
@@ -134,24 +146,26 @@ def plot_regional_activity_comparison(conab_data: Dict[str, Any]) -> go.Figure:
     return fig
 
 
-def plot_state_activity_heatmap(conab_data: Dict[str, Any]) -> go.Figure:
+@cached_pyramid
+def state_activity_pyramid(conab_data: Dict[str, Any]) -> Optional[HeatmapPyramid]:
     """
-    Create a heatmap showing agricultural activity intensity across states and activity types.
+    Build the state × activity-type matrix as a level-of-detail pyramid.
+    
+    Cached per ``conab_data`` object (see ``cached_pyramid``).
     
     Args:
         conab_data: Dictionary containing CONAB crop calendar data
         
     Returns:
-        Plotly figure showing state activity heatmap by activity type
+        Pyramid of activity counts (states sorted alphabetically), or None without data
     """
     if not conab_data or 'crop_calendar' not in conab_data:
-        return go.Figure().update_layout(title="Activity Heatmap (No data available)")
+        return None
     
     crop_calendar = conab_data['crop_calendar']
     
     # Prepare state activity data by activity type
     state_activity_data = {}
-    activity_types = ['Planting Only', 'Harvesting Only', 'Planting & Harvesting', 'Total Activities']
     
     for crop_name, crop_data in crop_calendar.items():
         for state_info in crop_data:
@@ -187,7 +201,7 @@ def plot_state_activity_heatmap(conab_data: Dict[str, Any]) -> go.Figure:
                         state_activity_data[state_abbrev]['Planting & Harvesting'] += 1
     
     if not state_activity_data:
-        return go.Figure().update_layout(title="Activity Heatmap (No data)")
+        return None
     
     # Get all states sorted alphabetically for better organization
     sorted_states = sorted(state_activity_data.keys())
@@ -195,18 +209,49 @@ def plot_state_activity_heatmap(conab_data: Dict[str, Any]) -> go.Figure:
     # Create matrix for heatmap
     matrix = []
     for state in sorted_states:
-        row = [state_activity_data[state][activity_type] for activity_type in activity_types]
+        row = [state_activity_data[state][activity_type] for activity_type in STATE_ACTIVITY_TYPES]
         matrix.append(row)
     
+    return HeatmapPyramid(matrix, sorted_states, STATE_ACTIVITY_TYPES, agg="mean")
+
+
+def plot_state_activity_heatmap(
+    conab_data: Dict[str, Any],
+    row_range: Optional[Tuple[int, int]] = None,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    pyramid: Optional[HeatmapPyramid] = None
+) -> go.Figure:
+    """
+    Create a heatmap showing agricultural activity intensity across states and activity types.
+    
+    States beyond ``max_rows`` are aggregated into blocks (mean count per
+    state); ``row_range`` drills into a window of states.
+    
+    Args:
+        conab_data: Dictionary containing CONAB crop calendar data
+        row_range: Window of states (start, stop) to show in detail
+        max_rows: Row budget of the heatmap
+        pyramid: Prebuilt ``state_activity_pyramid`` (avoids rebuilding it)
+        
+    Returns:
+        Plotly figure showing state activity heatmap by activity type
+    """
+    if not conab_data or 'crop_calendar' not in conab_data:
+        return go.Figure().update_layout(title="Activity Heatmap (No data available)")
+    
+    pyramid = pyramid or state_activity_pyramid(conab_data)
+    if pyramid is None:
+        return go.Figure().update_layout(title="Activity Heatmap (No data)")
+    
+    view = pyramid.view(max_rows=max_rows, row_range=row_range)
+    value_label = "Count" if view.full_resolution else "Mean count per state"
+    
     # Create heatmap
-    fig = go.Figure(data=go.Heatmap(
-        z=matrix,
-        x=activity_types,
-        y=sorted_states,
+    fig = go.Figure(data=view.heatmap(
         colorscale='Viridis',
         showscale=True,
         colorbar=dict(title="Activity Count"),
-        hovertemplate="State: %{y}<br>Activity Type: %{x}<br>Count: %{z}<extra></extra>"
+        hovertemplate=f"State: %{{y}}<br>Activity Type: %{{x}}<br>{value_label}: %{{z:.4~g}}<extra></extra>"
     ))
     
     fig.update_layout(
@@ -379,12 +424,13 @@ def plot_activity_timeline_by_region(conab_data: Dict[str, Any]) -> go.Figure:
     return fig
 
 
-def plot_state_activity_comparison(conab_data: Dict[str, Any]) -> go.Figure:
+def plot_state_activity_comparison(conab_data: Dict[str, Any], max_bars: int = MAX_STATE_BARS) -> go.Figure:
     """
     Create a comparison chart showing agricultural activity levels by individual states.
     
     Args:
         conab_data: Dictionary containing CONAB crop calendar data
+        max_bars: Bar budget; the least active units beyond it share one averaged bar
         
     Returns:
         Plotly figure comparing state activities
@@ -440,12 +486,21 @@ def plot_state_activity_comparison(conab_data: Dict[str, Any]) -> go.Figure:
                           key=lambda s: state_data[s]['total_activities'], 
                           reverse=True)
     
-    # Prepare data for visualization - show all states
+    # Prepare data for visualization - show all states within the bar budget
     states = sorted_states
+    others = []
+    if len(sorted_states) > max_bars:
+        states, others = sorted_states[:max_bars - 1], sorted_states[max_bars - 1:]
     total_activities = [state_data[state]['total_activities'] for state in states]
     planting_activities = [state_data[state]['planting_activities'] for state in states]
     harvest_activities = [state_data[state]['harvest_activities'] for state in states]
     crops_count = [len(state_data[state]['crops']) for state in states]
+    if others:
+        states = states + [_others_label(len(others))]
+        for values, key in ((total_activities, 'total_activities'),
+                            (planting_activities, 'planting_activities'),
+                            (harvest_activities, 'harvest_activities')):
+            values.append(round(sum(state_data[state][key] for state in others) / len(others), 1))
     
     # Create figure
     fig = go.Figure()
@@ -489,18 +544,21 @@ def plot_state_activity_comparison(conab_data: Dict[str, Any]) -> go.Figure:
     return fig
 
 
-def plot_state_crop_distribution(conab_data: Dict[str, Any]) -> go.Figure:
+@cached_pyramid
+def state_crop_pyramid(conab_data: Dict[str, Any]) -> Optional[HeatmapPyramid]:
     """
-    Create a chart showing crop distribution by individual states.
+    Build the crop × state presence matrix as a level-of-detail pyramid.
+    
+    Cached per ``conab_data`` object (see ``cached_pyramid``).
     
     Args:
         conab_data: Dictionary containing CONAB crop calendar data
         
     Returns:
-        Plotly figure showing crop distribution by state
+        Pyramid of presence flags (1 if the state grows the crop), or None without data
     """
     if not conab_data or 'crop_calendar' not in conab_data:
-        return go.Figure().update_layout(title="State Crop Distribution (No data available)")
+        return None
     
     crop_calendar = conab_data['crop_calendar']
     
@@ -522,7 +580,7 @@ def plot_state_crop_distribution(conab_data: Dict[str, Any]) -> go.Figure:
             state_crops[state_abbrev].add(crop_name)
     
     if not state_crops:
-        return go.Figure().update_layout(title="State Crop Distribution (No data)")
+        return None
     
     # Create matrix for heatmap
     states = sorted(state_crops.keys())
@@ -539,14 +597,49 @@ def plot_state_crop_distribution(conab_data: Dict[str, Any]) -> go.Figure:
                 row.append(0)
         matrix.append(row)
     
+    return HeatmapPyramid(matrix, crops, states, agg="mean")
+
+
+def plot_state_crop_distribution(
+    conab_data: Dict[str, Any],
+    row_range: Optional[Tuple[int, int]] = None,
+    col_range: Optional[Tuple[int, int]] = None,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_cols: int = DEFAULT_MAX_COLS,
+    pyramid: Optional[HeatmapPyramid] = None
+) -> go.Figure:
+    """
+    Create a chart showing crop distribution by individual states.
+    
+    Crops/states beyond the budget are aggregated into blocks (share of
+    crop-state pairs present); the ranges drill into a window.
+    
+    Args:
+        conab_data: Dictionary containing CONAB crop calendar data
+        row_range: Window of crops (start, stop) to show in detail
+        col_range: Window of states (start, stop) to show in detail
+        max_rows: Row budget of the heatmap
+        max_cols: Column budget of the heatmap
+        pyramid: Prebuilt ``state_crop_pyramid`` (avoids rebuilding it)
+        
+    Returns:
+        Plotly figure showing crop distribution by state
+    """
+    if not conab_data or 'crop_calendar' not in conab_data:
+        return go.Figure().update_layout(title="State Crop Distribution (No data available)")
+    
+    pyramid = pyramid or state_crop_pyramid(conab_data)
+    if pyramid is None:
+        return go.Figure().update_layout(title="State Crop Distribution (No data)")
+    
+    view = pyramid.view(max_rows=max_rows, max_cols=max_cols, row_range=row_range, col_range=col_range)
+    value_label = "Present" if view.full_resolution else "Share present"
+    
     # Create heatmap
-    fig = go.Figure(data=go.Heatmap(
-        z=matrix,
-        x=states,
-        y=crops,
+    fig = go.Figure(data=view.heatmap(
         colorscale='Viridis',
         showscale=True,
-        hovertemplate="State: %{x}<br>Crop: %{y}<br>Present: %{z}<extra></extra>"
+        hovertemplate=f"State: %{{x}}<br>Crop: %{{y}}<br>{value_label}: %{{z:.2~f}}<extra></extra>"
     ))
     
     fig.update_layout(
@@ -560,12 +653,13 @@ def plot_state_crop_distribution(conab_data: Dict[str, Any]) -> go.Figure:
     return fig
 
 
-def plot_state_activity_timeline(conab_data: Dict[str, Any]) -> go.Figure:
+def plot_state_activity_timeline(conab_data: Dict[str, Any], max_traces: int = MAX_STATE_TRACES) -> go.Figure:
     """
     Create a timeline showing agricultural activities by individual states.
     
     Args:
         conab_data: Dictionary containing CONAB crop calendar data
+        max_traces: Line budget; the least active units beyond it share one averaged line
         
     Returns:
         Plotly figure showing activity timeline by state
@@ -618,6 +712,10 @@ def plot_state_activity_timeline(conab_data: Dict[str, Any]) -> go.Figure:
     
     colors = px.colors.qualitative.Set3
     
+    others = []
+    if len(sorted_states) > max_traces:
+        sorted_states, others = sorted_states[:max_traces - 1], sorted_states[max_traces - 1:]
+    
     for i, state in enumerate(sorted_states):
         activities = [state_monthly_data[state][month] for month in month_abbrev]
         
@@ -630,7 +728,21 @@ def plot_state_activity_timeline(conab_data: Dict[str, Any]) -> go.Figure:
             marker=dict(size=6),
             hovertemplate=f"State: {state}<br>Month: %{{x}}<br>Activities: %{{y}}<extra></extra>"
         ))
-    
+
+    if others:
+        label = _others_label(len(others))
+        activities = [round(sum(state_monthly_data[state][month] for state in others) / len(others), 1)
+                      for month in month_abbrev]
+        fig.add_trace(go.Scatter(
+            x=month_abbrev,
+            y=activities,
+            mode='lines+markers',
+            name=label,
+            line=dict(color='#7F8C8D', width=2, dash='dash'),
+            marker=dict(size=6),
+            hovertemplate=f"{label}<br>Month: %{{x}}<br>Activities: %{{y}}<extra></extra>"
+        ))
+
     fig.update_layout(
         title="Planting and Harvesting Activity Timeline by Brazilian States",
         xaxis_title="Month",
@@ -52,33 +52,31 @@ from .color_palettes import (
     get_state_acronym
 )
 
-def plot_conab_spatial_coverage_by_state(
+DEFAULT_REGION_MAPPING = {
+    'AC': 'North', 'AP': 'North', 'AM': 'North', 'PA': 'North', 'RO': 'North', 'RR': 'North', 'TO': 'North',
+    'AL': 'Northeast', 'BA': 'Northeast', 'CE': 'Northeast', 'MA': 'Northeast', 'PB': 'Northeast',
+    'PE': 'Northeast', 'PI': 'Northeast', 'RN': 'Northeast', 'SE': 'Northeast',
+    'DF': 'Central-West', 'GO': 'Central-West', 'MT': 'Central-West', 'MS': 'Central-West',
+    'ES': 'Southeast', 'MG': 'Southeast', 'RJ': 'Southeast', 'SP': 'Southeast',
+    'PR': 'South', 'RS': 'South', 'SC': 'South'
+}
+DEFAULT_MAP_LEVEL = "medium"
+
+
+def compute_state_coverage(
     conab_data: Dict[str, Any],
-    region_mapping: Dict[str, str] | None = None,
     total_years: int = 24,
     weights: Dict[str, int] | None = None
-) -> go.Figure:
-    """
-    Simplified state-level spatial coverage chart.
-    - Keeps legend (one entry per region).
-    - Colors states by region.
-    - Avoids hardcoded layout details by exposing mapping, weights and total_years.
-    - Legend and Y axis are sorted alphabetically.
+) -> Dict[str, float] | None:
     """
-    if not conab_data:
-        return go.Figure().update_layout(title="Spatial Coverage by State (No data available)")
+    Coverage score (0-100) per state acronym.
 
-    # Default region mapping (can be overridden by caller)
-    if region_mapping is None:
-        region_mapping = {
-            'AC': 'North', 'AP': 'North', 'AM': 'North', 'PA': 'North', 'RO': 'North', 'RR': 'North', 'TO': 'North',
-            'AL': 'Northeast', 'BA': 'Northeast', 'CE': 'Northeast', 'MA': 'Northeast', 'PB': 'Northeast',
-            'PE': 'Northeast', 'PI': 'Northeast', 'RN': 'Northeast', 'SE': 'Northeast',
-            'DF': 'Central-West', 'GO': 'Central-West', 'MT': 'Central-West', 'MS': 'Central-West',
-            'ES': 'Southeast', 'MG': 'Southeast', 'RJ': 'Southeast', 'SP': 'Southeast',
-            'PR': 'South', 'RS': 'South', 'SC': 'South'
-        }
+    - Initiative format: share of ``total_years`` with data.
+    - Crop calendar format: weighted activity, crop count and active months.
 
+    Returns:
+        State acronym -> coverage, or None for an unsupported format
+    """
     # Default weights (activity, crop count, active months)
     if weights is None:
         weights = {'activity': 60, 'crop': 30, 'density': 10}
@@ -120,21 +118,13 @@ def plot_conab_spatial_coverage_by_state(
                     entry['crops'].add(crop_name)
                     entry['total_activities'] += total_acts_this
     else:
-        return go.Figure().update_layout(title="Spatial Coverage by State (No compatible data format)")
-
-    if not state_coverage:
-        return go.Figure().update_layout(title="Spatial Coverage by State (No coverage data)")
-
-    # Compute coverage percentages
-    states: list[str] = []
-    coverages: list[float] = []
+        return None
 
+    coverage: Dict[str, float] = {}
     if "CONAB Crop Monitoring Initiative" in conab_data:
         for st, years in state_coverage.items():
-            pct = (len(years) / total_years) * 100 if total_years > 0 else 0
-            states.append(st)
-            coverages.append(pct)
-    else:
+            coverage[st] = (len(years) / total_years) * 100 if total_years > 0 else 0
+    elif state_coverage:
         max_acts = max((v['total_activities'] for v in state_coverage.values()), default=1)
         max_crops = max((len(v['crops']) for v in state_coverage.values()), default=1)
         max_months = max((v['active_months'] for v in state_coverage.values()), default=1)
@@ -143,8 +133,39 @@ def plot_conab_spatial_coverage_by_state(
             a = (v['total_activities'] / max_acts) * weights['activity'] if max_acts else 0
             c = (len(v['crops']) / max_crops) * weights['crop'] if max_crops else 0
             d = (v['active_months'] / max_months) * weights['density'] if max_months else 0
-            states.append(st)
-            coverages.append(a + c + d)
+            coverage[st] = a + c + d
+    return coverage
+
+
+def plot_conab_spatial_coverage_by_state(
+    conab_data: Dict[str, Any],
+    region_mapping: Dict[str, str] | None = None,
+    total_years: int = 24,
+    weights: Dict[str, int] | None = None
+) -> go.Figure:
+    """
+    Simplified state-level spatial coverage chart.
+    - Keeps legend (one entry per region).
+    - Colors states by region.
+    - Avoids hardcoded layout details by exposing mapping, weights and total_years.
+    - Legend and Y axis are sorted alphabetically.
+    """
+    if not conab_data:
+        return go.Figure().update_layout(title="Spatial Coverage by State (No data available)")
+
+    # Default region mapping (can be overridden by caller)
+    if region_mapping is None:
+        region_mapping = DEFAULT_REGION_MAPPING
+
+    coverage = compute_state_coverage(conab_data, total_years, weights)
+    if coverage is None:
+        return go.Figure().update_layout(title="Spatial Coverage by State (No compatible data format)")
+
+    if not coverage:
+        return go.Figure().update_layout(title="Spatial Coverage by State (No coverage data)")
+
+    states: list[str] = list(coverage)
+    coverages: list[float] = list(coverage.values())
 
     # Sort descending
     sorted_pairs = sorted(zip(states, coverages), key=lambda x: x[1], reverse=True)
@@ -215,6 +236,69 @@ def plot_conab_spatial_coverage_by_state(
     return fig
 
 
+def plot_conab_spatial_coverage_map(
+    conab_data: Dict[str, Any],
+    layer: str = "state",
+    level: str = DEFAULT_MAP_LEVEL,
+    region_mapping: Dict[str, str] | None = None,
+    total_years: int = 24,
+    weights: Dict[str, int] | None = None
+) -> go.Figure | None:
+    """
+    Choropleth version of the state coverage chart.
+
+    Uses the offline geometry store (``scripts.utilities.geometry_store``);
+    ``level`` picks a pre-simplified resolution, so the map payload stays
+    small. With ``layer="mesoregion"`` states are averaged per region.
+
+    Returns:
+        Figure, or None when the geometry store has not been built or there
+        is no coverage data (callers fall back to the bar chart)
+    """
+    from scripts.utilities.geometry_store import get_geometry_store
+
+    store = get_geometry_store()
+    if store is None or not conab_data:
+        return None
+    coverage = compute_state_coverage(conab_data, total_years, weights)
+    if not coverage:
+        return None
+
+    if layer == "mesoregion":
+        region_mapping = region_mapping or DEFAULT_REGION_MAPPING
+        grouped: Dict[str, list] = {}
+        for st, value in coverage.items():
+            grouped.setdefault(region_mapping.get(st, 'Unknown'), []).append(value)
+        coverage = {region: sum(v) / len(v) for region, v in grouped.items()}
+
+    available = set(store.feature_ids(layer))
+    locations = sorted(k for k in coverage if k in available)
+    if not locations:
+        return None
+
+    fig = go.Figure(go.Choropleth(
+        geojson=store.geojson(layer, level),
+        featureidkey="id",
+        locations=locations,
+        z=[round(coverage[k], 1) for k in locations],
+        zmin=0,
+        zmax=100,
+        colorscale="YlGn",
+        marker_line_color="white",
+        marker_line_width=0.5,
+        colorbar=dict(title="Coverage (%)"),
+        hovertemplate="<b>%{location}</b><br>Coverage: %{z:.1f}%<extra></extra>"
+    ))
+    fig.update_geos(fitbounds="locations", visible=False)
+    title = "states" if layer == "state" else "regions"
+    fig.update_layout(
+        title=f"Agricultural data availability by Brazilian {title}",
+        height=560,
+        margin=dict(l=10, r=10, t=60, b=10)
+    )
+    return fig
+
+
 def plot_conab_spatial_coverage_by_region(conab_data: Dict[str, Any]) -> go.Figure:
     """
     Create a spatial coverage chart showing percentage coverage by region.
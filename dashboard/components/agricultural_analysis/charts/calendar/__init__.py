@@ -44,6 +44,8 @@ from .monthly_activity_charts import (
 )
 
 from .national_calendar_matrix import (
+    calendar_heatmap_pyramids,
+    consolidated_calendar_pyramid,
     create_consolidated_calendar_matrix_chart,
     create_calendar_heatmap_chart,
     create_regional_activity_comparison_chart,
@@ -164,6 +166,8 @@ __all__ = [
     'create_planting_harvesting_periods_chart',
     
     # Funções individuais de matriz nacional
+    'consolidated_calendar_pyramid',
+    'calendar_heatmap_pyramids',
     'create_consolidated_calendar_matrix_chart',
     'create_calendar_heatmap_chart',
     'create_regional_activity_comparison_chart',
@@ -328,8 +328,9 @@ def create_crop_diversity_by_region_chart(filtered_data: dict) -> Optional[go.Fi
                     if isinstance(state_entry, dict):
                         state_name = state_entry.get('state_name', '')
                         # Convert state name to acronym and then to region
-                        state_acronym = get_state_acronym(state_name)
-                        region = get_brazilian_region(state_acronym)
+                        # (rolled-up calendars carry unit codes and their region)
+                        state_acronym = state_entry.get('state_code') or get_state_acronym(state_name)
+                        region = state_entry.get('region') or get_brazilian_region(state_acronym)
                         calendar = state_entry.get('calendar', {})
                         
                         # Verificar se há atividade neste estado
@@ -557,8 +558,8 @@ def create_number_of_crops_per_region_chart(filtered_data: dict) -> Optional[go.
                     if isinstance(state_entry, dict):
                         state_name = state_entry.get('state_name', '')
                         if state_name:
-                            state_acronym = get_state_acronym(state_name)
-                            region = get_brazilian_region(state_acronym)
+                            state_acronym = state_entry.get('state_code') or get_state_acronym(state_name)
+                            region = state_entry.get('region') or get_brazilian_region(state_acronym)
                             
                             if region not in region_activities:
                                 region_activities[region] = 0
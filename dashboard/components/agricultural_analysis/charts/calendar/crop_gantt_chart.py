@@ -11,109 +11,121 @@ Data: 2025-08-11
 
 import streamlit as st
 import plotly.graph_objects as go
-from typing import Dict, Any
+from typing import Any, Dict, List
 
+from scripts.data_processors.agricultural_data.month_masks import (
+    calendar_masks,
+    linear_segments,
+    union,
+    window_label,
+)
 
-def render_crop_gantt_chart(filtered_data: Dict[str, Any], region: str = "Brasil") -> None:
+
+MONTH_NAMES = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+               'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+GANTT_COLORS = ['#2E8B57', '#FF6B35', '#4682B4', '#9370DB', '#20B2AA', '#FF69B4', '#FFA500']
+
+
+def build_gantt_rows(filtered_data: Dict[str, Any], max_crops: int | None = 10) -> List[Dict[str, Any]]:
     """
-    Renderiza gráfico de Gantt para mostrar períodos de culturas.
+    Monta as barras (plantio/colheita) do Gantt por cultura.
+    
+    As janelas são a união das máscaras de meses dos estados; uma janela que
+    atravessa o ano (ex.: Out–Mar) vira duas barras (Out–Dez e Jan–Mar) com
+    o mesmo período no hover, em vez de uma barra de janeiro a dezembro.
     
     Args:
         filtered_data: Dados filtrados de culturas com calendários
-        region: Nome da região para exibição no título
+        max_crops: Número máximo de culturas (None = todas)
+        
+    Returns:
+        Lista de barras com tarefa, início, fim, atividade, período, cor e opacidade
     """
-
-    if not filtered_data:
-        st.info("📊 Dados insuficientes para gráfico de Gantt.")
-        return
-
-    # Mapeamento de meses para índices
-    month_mapping = {
-        'January': 0, 'February': 1, 'March': 2, 'April': 3,
-        'May': 4, 'June': 5, 'July': 6, 'August': 7,
-        'September': 8, 'October': 9, 'November': 10, 'December': 11
-    }
-
-    month_names = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
-                  'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-
-    # Preparar dados para Gantt
     gantt_data = []
-    colors = ['#2E8B57', '#FF6B35', '#4682B4', '#9370DB', '#20B2AA', '#FF69B4', '#FFA500']
 
-    for crop_index, (crop_name, crop_data) in enumerate(list(filtered_data.items())[:10]):
-        # Find planting and harvest periods
-        planting_months = set()
-        harvest_months = set()
-
-        for state_entry in crop_data:
-            calendar_data = state_entry.get('calendar', {})
+    for crop_index, (crop_name, crop_data) in enumerate(list(filtered_data.items())[:max_crops]):
+        planting, harvest = calendar_masks(crop_data)
+        color = GANTT_COLORS[crop_index % len(GANTT_COLORS)]
 
-            for month, activity in calendar_data.items():
-                if month in month_mapping:
-                    if activity in ['P', 'PH']:
-                        planting_months.add(month)
-                    if activity in ['H', 'PH']:
-                        harvest_months.add(month)
+        for icon, resource, masks, opacity in (
+            ("🌱", 'Planting', planting, 0.8),
+            ("🌾", 'Harvest', harvest, 0.5),
+        ):
+            window = int(union(masks))
+            period = window_label(window, MONTH_NAMES)
+            for start, finish in linear_segments(window):
+                gantt_data.append({
+                    'Task': f"{crop_name[:30]} - {icon}",
+                    'Start': start,
+                    'Finish': finish,
+                    'Resource': resource,
+                    'Period': period,
+                    'Color': color,
+                    'Opacity': opacity
+                })
 
-        # Create bars for planting
-        if planting_months:
-            month_indices = [month_mapping[m] for m in planting_months]
-            start_month = min(month_indices)
-            end_month = max(month_indices)
+    return gantt_data
 
-            gantt_data.append({
-                'Task': f"{crop_name[:30]} - 🌱",
-                'Start': start_month,
-                'Finish': end_month + 1,
-                'Resource': 'Planting',
-                'Color': colors[crop_index % len(colors)],
-                'Opacity': 0.8
-            })
 
-        # Create bars for harvest
-        if harvest_months:
-            month_indices = [month_mapping[m] for m in harvest_months]
-            start_month = min(month_indices)
-            end_month = max(month_indices)
+def _period_label(row: Dict[str, Any]) -> str:
+    if 'Period' in row:
+        return row['Period']
+    start_idx = max(0, min(11, row['Start']))
+    end_idx = max(0, min(11, row['Finish'] - 1))
+    return f"{MONTH_NAMES[start_idx]} - {MONTH_NAMES[end_idx]}"
 
-            gantt_data.append({
-                'Task': f"{crop_name[:30]} - 🌾",
-                'Start': start_month,
-                'Finish': end_month + 1,
-                'Resource': 'Harvest',
-                'Color': colors[crop_index % len(colors)],
-                'Opacity': 0.5
-            })
 
-    if not gantt_data:
-        st.info("📊 Nenhum período de cultivo encontrado.")
-        return
-
-    # Criar gráfico de Gantt usando Plotly
+def build_crop_gantt_figure(gantt_data: List[Dict[str, Any]], consolidate_traces: bool = True) -> go.Figure:
+    """
+    Cria a figura de Gantt a partir das barras.
+    
+    Args:
+        gantt_data: Barras de ``build_gantt_rows``
+        consolidate_traces: Um único trace de barras com cor/opacidade por
+            barra em vez de um trace por barra (mesmo resultado visual)
+        
+    Returns:
+        Figura Plotly
+    """
     fig_gantt = go.Figure()
 
-    for row in gantt_data:
-        # Verificar se os índices estão válidos
-        start_idx = max(0, min(11, row['Start']))
-        end_idx = max(0, min(11, row['Finish'] - 1))
-
+    if consolidate_traces:
         fig_gantt.add_trace(go.Bar(
-            name=row['Task'],
-            x=[row['Finish'] - row['Start']],
-            y=[row['Task']],
-            base=[row['Start']],
+            name="Activities",
+            x=[row['Finish'] - row['Start'] for row in gantt_data],
+            y=[row['Task'] for row in gantt_data],
+            base=[row['Start'] for row in gantt_data],
             orientation='h',
             marker={
-                'color': row['Color'],
-                'opacity': row['Opacity'],
+                'color': [row['Color'] for row in gantt_data],
+                'opacity': [row['Opacity'] for row in gantt_data],
                 'line': {'width': 1, 'color': 'white'}
             },
+            customdata=[[_period_label(row), row['Resource']] for row in gantt_data],
             showlegend=False,
-            hovertemplate=f"<b>{row['Task']}</b><br>" +
-                         f"Period: {month_names[start_idx]} - {month_names[end_idx]}<br>" +
-                         f"Activity: {row['Resource']}<extra></extra>"
+            hovertemplate="<b>%{y}</b><br>" +
+                         "Period: %{customdata[0]}<br>" +
+                         "Activity: %{customdata[1]}<extra></extra>"
         ))
+    else:
+        for row in gantt_data:
+            fig_gantt.add_trace(go.Bar(
+                name=row['Task'],
+                x=[row['Finish'] - row['Start']],
+                y=[row['Task']],
+                base=[row['Start']],
+                orientation='h',
+                marker={
+                    'color': row['Color'],
+                    'opacity': row['Opacity'],
+                    'line': {'width': 1, 'color': 'white'}
+                },
+                showlegend=False,
+                hovertemplate=f"<b>{row['Task']}</b><br>" +
+                             f"Period: {_period_label(row)}<br>" +
+                             f"Activity: {row['Resource']}<extra></extra>"
+            ))
 
     # Optimize layout for clarity and performance
     fig_gantt.update_layout(
@@ -123,7 +135,7 @@ def render_crop_gantt_chart(filtered_data: Dict[str, Any], region: str = "Brasil
         xaxis={
             'tickmode': 'array',
             'tickvals': list(range(12)),
-            'ticktext': month_names,
+            'ticktext': MONTH_NAMES,
             'range': [-0.5, 11.5]
         },
         height=max(420, len(gantt_data) * 36),
@@ -145,6 +157,31 @@ def render_crop_gantt_chart(filtered_data: Dict[str, Any], region: str = "Brasil
     )
     fig_gantt.update_yaxes(automargin=True)
     fig_gantt.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#e5e5e5')
+    return fig_gantt
+
+
+def render_crop_gantt_chart(filtered_data: Dict[str, Any], region: str = "Brasil") -> None:
+    """
+    Renderiza gráfico de Gantt para mostrar períodos de culturas.
+    
+    Args:
+        filtered_data: Dados filtrados de culturas com calendários
+        region: Nome da região para exibição no título
+    """
+
+    if not filtered_data:
+        st.info("📊 Dados insuficientes para gráfico de Gantt.")
+        return
+
+    # Preparar dados para Gantt
+    gantt_data = build_gantt_rows(filtered_data)
+
+    if not gantt_data:
+        st.info("📊 Nenhum período de cultivo encontrado.")
+        return
+
+    # Criar gráfico de Gantt usando Plotly (um único trace de barras)
+    fig_gantt = build_crop_gantt_figure(gantt_data)
 
     st.plotly_chart(fig_gantt, use_container_width=True, key="crop_gantt_chart")
 
@@ -152,10 +189,10 @@ def render_crop_gantt_chart(filtered_data: Dict[str, Any], region: str = "Brasil
     st.markdown("**Data Summary**")
     col1, col2 = st.columns(2)
     with col1:
-        plantio_count = len([g for g in gantt_data if '🌱' in g['Task']])
+        plantio_count = len({g['Task'] for g in gantt_data if '🌱' in g['Task']})
         st.metric("🌱 Planting Periods", plantio_count)
     with col2:
-        harvest_count = len([g for g in gantt_data if '🌾' in g['Task']])
+        harvest_count = len({g['Task'] for g in gantt_data if '🌾' in g['Task']})
         st.metric("🌾 Harvest Periods", harvest_count)
 
 
@@ -9,36 +9,24 @@ Author: LANDAGRI-B Project Team
 Date: 2025-08-07
 """
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 from typing import Optional
 
+from scripts.data_processors.agricultural_data.month_masks import (
+    calendar_masks,
+    month_counts,
+    union,
+    window_label,
+)
+
 # Import das funções seguras
 from ...agricultural_loader import safe_get_data, validate_data_structure
 
 
-def _get_month_abbreviation(month_name: str) -> str:
-    """Convert month name to abbreviation."""
-    month_mapping = {
-        'January': 'Jan', 'February': 'Feb', 'March': 'Mar', 'April': 'Apr',
-        'May': 'May', 'June': 'Jun', 'July': 'Jul', 'August': 'Aug',
-        'September': 'Sep', 'October': 'Oct', 'November': 'Nov', 'December': 'Dec'
-    }
-    return month_mapping.get(month_name, month_name[:3])
-
-
-def _get_full_month_name(month_abbr: str) -> str:
-    """Convert month abbreviation to full name."""
-    abbr_mapping = {
-        'Jan': 'January', 'Feb': 'February', 'Mar': 'March', 'Apr': 'April',
-        'May': 'May', 'Jun': 'June', 'Jul': 'July', 'Aug': 'August',
-        'Sep': 'September', 'Oct': 'October', 'Nov': 'November', 'Dec': 'December'
-    }
-    return abbr_mapping.get(month_abbr, month_abbr)
-
-
 def create_total_activities_per_month_chart(filtered_data: dict) -> Optional[go.Figure]:
     """
     Creates total activities per month chart.
@@ -260,36 +248,15 @@ def create_simultaneous_planting_harvesting_chart(filtered_data: dict) -> Option
             st.info("📊 No calendar data available for simultaneous activities")
             return None
 
-        # Inicializa contadores mensais
+        # Months with planting and harvest in the same state: mask intersection
         months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        simultaneous_activities = {month: 0 for month in months}
-
-        # Identifica atividades simultâneas por mês
-        for crop, states_data in crop_calendar.items():
-            # Handle case where states_data is a list, not a dict
-            if isinstance(states_data, list):
-                for state_info in states_data:
-                    if not isinstance(state_info, dict):
-                        continue
-                    calendar = state_info.get('calendar', {})
-                    for month, activity in calendar.items():
-                        if activity and ('P' in str(activity) and 'H' in str(activity)):
-                            month_abbr = _get_month_abbreviation(month)
-                            if month_abbr in simultaneous_activities:
-                                simultaneous_activities[month_abbr] += 1
-            else:
-                # Original logic for dict format
-                for state, activities in states_data.items():
-                    planting_months = set(activities.get('planting_months', []))
-                    harvesting_months = set(activities.get('harvesting_months', []))
-                    
-                    # Encontra meses com atividades simultâneas
-                    simultaneous_months = planting_months.intersection(harvesting_months)
-                    
-                    for month in simultaneous_months:
-                        if month in simultaneous_activities:
-                            simultaneous_activities[month] += 1
+        counts = np.zeros(12, dtype=np.int64)
+        for states_data in crop_calendar.values():
+            records = states_data if isinstance(states_data, list) else list(states_data.values())
+            planting, harvest = calendar_masks(records)
+            counts += month_counts(planting & harvest)
+        simultaneous_activities = dict(zip(months, counts.tolist()))
 
         if not any(simultaneous_activities.values()):
             st.info("📊 No simultaneous activity found in the data")
@@ -478,50 +445,17 @@ def create_planting_harvesting_periods_chart(filtered_data: dict) -> Optional[go
         heatmap_data = []
         
         for crop, states_data in crop_calendar.items():
-            crop_row_planting = []
-            crop_row_harvesting = []
-            
-            for month in months:
-                # Count states with planting this month
-                planting_count = 0
-                harvesting_count = 0
-                
-                # Handle case where states_data is a list, not a dict
-                if isinstance(states_data, list):
-                    for state_info in states_data:
-                        if not isinstance(state_info, dict):
-                            continue
-                        calendar = state_info.get('calendar', {})
-                        month_full_name = _get_full_month_name(month)
-                        activity = calendar.get(month_full_name, '')
-                        if activity:
-                            if 'P' in str(activity):
-                                planting_count += 1
-                            if 'H' in str(activity):
-                                harvesting_count += 1
-                else:
-                    # Original logic for dict format
-                    for state, activities in states_data.items():
-                        if month in activities.get('planting_months', []):
-                            planting_count += 1
-                        if month in activities.get('harvesting_months', []):
-                            harvesting_count += 1
-                
-                crop_row_planting.append(planting_count)
-                crop_row_harvesting.append(harvesting_count)
-            
-            # Adds data to heatmap
-            heatmap_data.append({
-                'Crop': f"{crop} (Planting)",
-                'Type': 'Planting',
-                **{months[i]: crop_row_planting[i] for i in range(len(months))}
-            })
+            # States planting/harvesting in each month, from the month masks
+            records = states_data if isinstance(states_data, list) else list(states_data.values())
+            planting, harvest = calendar_masks(records)
             
-            heatmap_data.append({
-                'Crop': f"{crop} (Harvesting)",
-                'Type': 'Harvesting',
-                **{months[i]: crop_row_harvesting[i] for i in range(len(months))}
-            })
+            for activity, masks in (('Planting', planting), ('Harvesting', harvest)):
+                heatmap_data.append({
+                    'Crop': f"{crop} ({activity})",
+                    'Type': activity,
+                    'Window': window_label(int(union(masks))) or '—',
+                    **dict(zip(months, month_counts(masks).tolist()))
+                })
 
         if not heatmap_data:
             st.info("📊 No periods found in the data")
@@ -543,6 +477,8 @@ def create_planting_harvesting_periods_chart(filtered_data: dict) -> Optional[go
             text=z_data,
             texttemplate="%{text}",
             textfont={"size": 10},
+            customdata=np.repeat(df[['Window']].values, len(months), axis=1),
+            hovertemplate="%{y}<br>%{x}: %{z} states<br>Window: %{customdata}<extra></extra>",
             hoverongaps=False
         ))
 
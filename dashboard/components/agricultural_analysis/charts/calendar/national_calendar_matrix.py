@@ -9,25 +9,115 @@ Author: LANDAGRI-B Project Team
 Date: 2025-08-07
 """
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit as st
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from dashboard.components.shared.lod_controls import lod_window
+from scripts.plotting.heatmap_lod import DEFAULT_MAX_ROWS, HeatmapPyramid, cached_pyramid
 
 # Import das funções seguras
 from ...agricultural_loader import safe_get_data, validate_data_structure
 
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
 
-def create_consolidated_calendar_matrix_chart(filtered_data: dict) -> Optional[go.Figure]:
+@cached_pyramid
+def consolidated_calendar_pyramid(filtered_data: dict) -> Optional[HeatmapPyramid]:
+    """
+    Builds the crop × month activity matrix as a level-of-detail pyramid.
+    
+    Cached per ``filtered_data`` object (see ``cached_pyramid``).
+    
+    Args:
+        filtered_data: Filtered agricultural calendar data
+        
+    Returns:
+        HeatmapPyramid or None if no data
+    """
+    crop_calendar = safe_get_data(filtered_data, 'crop_calendar') or {}
+    if not crop_calendar:
+        return None
+
+    # Months for matrix
+    months = MONTHS
+
+    # Prepare matrix data
+    matrix_data = []
+    crops = list(crop_calendar.keys())
+    
+    for crop in crops:
+        crop_row = []
+        states_data = crop_calendar[crop]
+        
+        for month in months:
+            # Conta atividades (plantio + colheita) por mês usando acesso seguro
+            activity_count = 0
+            
+            # Verificar se é estrutura CONAB (lista de estados) ou IBGE (dict)
+            if isinstance(states_data, list):
+                # Estrutura CONAB: lista de estados com calendários
+                month_mapping = {
+                    'Jan': 'January', 'Feb': 'February', 'Mar': 'March', 'Apr': 'April',
+                    'May': 'May', 'Jun': 'June', 'Jul': 'July', 'Aug': 'August',
+                    'Sep': 'September', 'Oct': 'October', 'Nov': 'November', 'Dec': 'December'
+                }
+                
+                month_en = month_mapping.get(month, month)
+                
+                for state_entry in states_data:
+                    if isinstance(state_entry, dict) and 'calendar' in state_entry:
+                        calendar = state_entry['calendar']
+                        activity = calendar.get(month_en, '')
+                        
+                        if activity and activity.strip():  # Qualquer atividade
+                            activity_count += 1
+                            
+            elif isinstance(states_data, dict):
+                # Estrutura IBGE: dict de estados
+                for state, activities in states_data.items():
+                    if isinstance(activities, dict):
+                        # Acesso seguro aos meses de plantio
+                        planting_months = safe_get_data(activities, 'planting_months') or []
+                        if month in planting_months:
+                            activity_count += 1
+                        
+                        # Acesso seguro aos meses de colheita
+                        harvesting_months = safe_get_data(activities, 'harvesting_months') or []
+                        if month in harvesting_months:
+                            activity_count += 1
+            
+            crop_row.append(activity_count)
+        
+        matrix_data.append(crop_row)
+
+    if not matrix_data:
+        return None
+    return HeatmapPyramid(matrix_data, crops, months, agg="mean")
+
+
+def create_consolidated_calendar_matrix_chart(
+    filtered_data: dict,
+    row_range: Optional[Tuple[int, int]] = None,
+    max_rows: int = DEFAULT_MAX_ROWS,
+) -> Optional[go.Figure]:
     """
     Creates consolidated agricultural calendar matrix.
     
     Equivalent to: consolidated_calendar_matrix.png from old_calendar/national/
     
+    Crops beyond ``max_rows`` are aggregated into blocks (mean per crop);
+    ``row_range`` drills into a window of crops.
+    
     Args:
         filtered_data: Filtered agricultural calendar data
+        row_range: Window of crops (start, stop) to show in detail
+        max_rows: Row budget of the heatmap
         
     Returns:
         go.Figure: Plotly figure or None if no data
@@ -40,73 +130,20 @@ def create_consolidated_calendar_matrix_chart(filtered_data: dict) -> Optional[g
             st.info("📊 No calendar data available for consolidated matrix")
             return None
 
-        # Months for matrix
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        # Prepare matrix data
-        matrix_data = []
-        crops = list(crop_calendar.keys())
-        
-        for crop in crops:
-            crop_row = []
-            states_data = crop_calendar[crop]
-            
-            for month in months:
-                # Conta atividades (plantio + colheita) por mês usando acesso seguro
-                activity_count = 0
-                
-                # Verificar se é estrutura CONAB (lista de estados) ou IBGE (dict)
-                if isinstance(states_data, list):
-                    # Estrutura CONAB: lista de estados com calendários
-                    month_mapping = {
-                        'Jan': 'January', 'Feb': 'February', 'Mar': 'March', 'Apr': 'April',
-                        'May': 'May', 'Jun': 'June', 'Jul': 'July', 'Aug': 'August',
-                        'Sep': 'September', 'Oct': 'October', 'Nov': 'November', 'Dec': 'December'
-                    }
-                    
-                    month_en = month_mapping.get(month, month)
-                    
-                    for state_entry in states_data:
-                        if isinstance(state_entry, dict) and 'calendar' in state_entry:
-                            calendar = state_entry['calendar']
-                            activity = calendar.get(month_en, '')
-                            
-                            if activity and activity.strip():  # Qualquer atividade
-                                activity_count += 1
-                                
-                elif isinstance(states_data, dict):
-                    # Estrutura IBGE: dict de estados
-                    for state, activities in states_data.items():
-                        if isinstance(activities, dict):
-                            # Acesso seguro aos meses de plantio
-                            planting_months = safe_get_data(activities, 'planting_months') or []
-                            if month in planting_months:
-                                activity_count += 1
-                            
-                            # Acesso seguro aos meses de colheita
-                            harvesting_months = safe_get_data(activities, 'harvesting_months') or []
-                            if month in harvesting_months:
-                                activity_count += 1
-                
-                crop_row.append(activity_count)
-            
-            matrix_data.append(crop_row)
-
-        if not matrix_data:
+        pyramid = consolidated_calendar_pyramid(filtered_data)
+        if pyramid is None:
             st.info("📊 Nenhum dado de matriz encontrado")
             return None
 
+        view = pyramid.view(max_rows=max_rows, row_range=row_range)
+
         # Cria heatmap
-        fig = go.Figure(data=go.Heatmap(
-            z=matrix_data,
-            x=months,
-            y=crops,
+        fig = go.Figure(data=view.heatmap(
             colorscale='Viridis',
-            text=matrix_data,
-            texttemplate="%{text}",
+            texttemplate="%{z:.1~f}",
             textfont={"size": 10},
             hoverongaps=False,
+            hovertemplate="<b>%{y}</b><br>%{x}: %{z:.1~f} activities<extra></extra>",
             colorbar=dict(title="Number of<br>Activities")
         ))
 
@@ -115,7 +152,7 @@ def create_consolidated_calendar_matrix_chart(filtered_data: dict) -> Optional[g
             title="🗓️ National Agricultural Calendar Consolidated Matrix",
             xaxis_title="Month of Year",
             yaxis_title="Crop Type",
-            height=400 + (len(crops) * 20),
+            height=400 + (len(view.row_labels) * 20),
             font=dict(size=12)
         )
 
@@ -126,14 +163,108 @@ def create_consolidated_calendar_matrix_chart(filtered_data: dict) -> Optional[g
         return None
 
 
-def create_calendar_heatmap_chart(filtered_data: dict) -> Optional[go.Figure]:
+@cached_pyramid
+def calendar_heatmap_pyramids(filtered_data: dict) -> Optional[Tuple[HeatmapPyramid, HeatmapPyramid]]:
+    """
+    Builds crop × month planting and harvesting matrices as pyramids.
+    
+    Cached per ``filtered_data`` object (see ``cached_pyramid``).
+    
+    Args:
+        filtered_data: Dados filtrados do calendário agrícola
+        
+    Returns:
+        (planting, harvesting) pyramids with the same crop rows, or None if no data
+    """
+    crop_calendar = safe_get_data(filtered_data, 'crop_calendar') or {}
+    if not crop_calendar:
+        return None
+
+    # Meses para heatmap
+    months = MONTHS
+    
+    # Prepara dados com diferenciação de atividades usando acesso seguro
+    planting_matrix = []
+    harvesting_matrix = []
+    
+    for crop, states_data in crop_calendar.items():
+        # Cria linha para plantio
+        planting_row = []
+        harvesting_row = []
+        
+        for month in months:
+            planting_count = 0
+            harvesting_count = 0
+            
+            # Verificar se é estrutura CONAB (lista de estados) ou IBGE (dict)
+            if isinstance(states_data, list):
+                # Estrutura CONAB: lista de estados com calendários
+                month_mapping = {
+                    'Jan': 'January', 'Feb': 'February', 'Mar': 'March', 'Apr': 'April',
+                    'May': 'May', 'Jun': 'June', 'Jul': 'July', 'Aug': 'August',
+                    'Sep': 'September', 'Oct': 'October', 'Nov': 'November', 'Dec': 'December'
+                }
+                
+                month_en = month_mapping.get(month, month)
+                
+                for state_entry in states_data:
+                    if isinstance(state_entry, dict) and 'calendar' in state_entry:
+                        calendar = state_entry['calendar']
+                        activity = calendar.get(month_en, '')
+                        
+                        if 'P' in activity:  # Planting
+                            planting_count += 1
+                        if 'H' in activity:  # Harvesting
+                            harvesting_count += 1
+                            
+            elif isinstance(states_data, dict):
+                # Estrutura IBGE: dict de estados
+                for state, activities in states_data.items():
+                    if isinstance(activities, dict):
+                        # Acesso seguro aos meses de plantio
+                        planting_months = safe_get_data(activities, 'planting_months') or []
+                        if month in planting_months:
+                            planting_count += 1
+                        
+                        # Acesso seguro aos meses de colheita
+                        harvesting_months = safe_get_data(activities, 'harvesting_months') or []
+                        if month in harvesting_months:
+                            harvesting_count += 1
+            
+            planting_row.append(planting_count)
+            harvesting_row.append(harvesting_count)
+        
+        planting_matrix.append(planting_row)
+        harvesting_matrix.append(harvesting_row)
+
+    if not planting_matrix:
+        return None
+
+    crops = list(crop_calendar.keys())
+    return (
+        HeatmapPyramid(planting_matrix, crops, months, agg="mean"),
+        HeatmapPyramid(harvesting_matrix, crops, months, agg="mean"),
+    )
+
+
+def create_calendar_heatmap_chart(
+    filtered_data: dict,
+    row_range: Optional[Tuple[int, int]] = None,
+    max_rows: int = DEFAULT_MAX_ROWS,
+) -> Optional[go.Figure]:
     """
     Creates agricultural calendar heatmap.
     
     Equivalente ao: calendario_agricola_heatmap.png do old_calendar/national/
     
+    Crops beyond ``max_rows / 2`` are aggregated into blocks (mean per
+    crop), keeping planting and harvesting rows apart; ``row_range`` drills
+    into a window of crops.
+    
     Args:
         filtered_data: Dados filtrados do calendário agrícola
+        row_range: Window of crops (start, stop) to show in detail
+        max_rows: Row budget of the heatmap (two rows per crop)
         
     Returns:
         go.Figure: Plotly figure ou None if no data
@@ -146,82 +277,33 @@ def create_calendar_heatmap_chart(filtered_data: dict) -> Optional[go.Figure]:
             st.info("📊 No data de calendário available para heatmap")
             return None
 
-        # Meses para heatmap
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        # Prepara dados com diferenciação de atividades usando acesso seguro
-        heatmap_data = []
-        
-        for crop, states_data in crop_calendar.items():
-            # Cria linha para plantio
-            planting_row = []
-            harvesting_row = []
-            
-            for month in months:
-                planting_count = 0
-                harvesting_count = 0
-                
-                # Verificar se é estrutura CONAB (lista de estados) ou IBGE (dict)
-                if isinstance(states_data, list):
-                    # Estrutura CONAB: lista de estados com calendários
-                    month_mapping = {
-                        'Jan': 'January', 'Feb': 'February', 'Mar': 'March', 'Apr': 'April',
-                        'May': 'May', 'Jun': 'June', 'Jul': 'July', 'Aug': 'August',
-                        'Sep': 'September', 'Oct': 'October', 'Nov': 'November', 'Dec': 'December'
-                    }
-                    
-                    month_en = month_mapping.get(month, month)
-                    
-                    for state_entry in states_data:
-                        if isinstance(state_entry, dict) and 'calendar' in state_entry:
-                            calendar = state_entry['calendar']
-                            activity = calendar.get(month_en, '')
-                            
-                            if 'P' in activity:  # Planting
-                                planting_count += 1
-                            if 'H' in activity:  # Harvesting
-                                harvesting_count += 1
-                                
-                elif isinstance(states_data, dict):
-                    # Estrutura IBGE: dict de estados
-                    for state, activities in states_data.items():
-                        if isinstance(activities, dict):
-                            # Acesso seguro aos meses de plantio
-                            planting_months = safe_get_data(activities, 'planting_months') or []
-                            if month in planting_months:
-                                planting_count += 1
-                            
-                            # Acesso seguro aos meses de colheita
-                            harvesting_months = safe_get_data(activities, 'harvesting_months') or []
-                            if month in harvesting_months:
-                                harvesting_count += 1
-                
-                planting_row.append(planting_count)
-                harvesting_row.append(harvesting_count)
-            
-            heatmap_data.extend([planting_row, harvesting_row])
-
-        if not heatmap_data:
+        pyramids = calendar_heatmap_pyramids(filtered_data)
+        if pyramids is None:
             st.info("📊 Nenhum dado de heatmap encontrado")
             return None
 
-        # Cria labels para y-axis
-        crops = list(crop_calendar.keys())
+        planting, harvesting = (
+            pyramid.view(max_rows=max(1, max_rows // 2), row_range=row_range) for pyramid in pyramids
+        )
+
+        # Intercala linhas de plantio e colheita por cultura
+        heatmap_data = np.empty((2 * len(planting.row_labels), len(planting.col_labels)))
+        heatmap_data[0::2] = planting.z
+        heatmap_data[1::2] = harvesting.z
         y_labels = []
-        for crop in crops:
+        for crop in planting.row_labels:
             y_labels.extend([f"{crop} (🌱)", f"{crop} (🌾)"])
 
         # Cria heatmap
         fig = go.Figure(data=go.Heatmap(
             z=heatmap_data,
-            x=months,
+            x=planting.col_labels,
             y=y_labels,
             colorscale='RdYlGn',
-            text=heatmap_data,
-            texttemplate="%{text}",
+            texttemplate="%{z:.1~f}",
             textfont={"size": 9},
             hoverongaps=False,
+            hovertemplate="<b>%{y}</b><br>%{x}: %{z:.1~f} states<extra></extra>",
             colorbar=dict(title="Number of<br>States")
         ))
 
@@ -355,13 +437,16 @@ def render_national_calendar_matrix_charts(filtered_data: dict) -> None:
     
     # Primeira linha: matriz consolidada
     st.markdown("#### 📋 Consolidated Matrix")
-    fig1 = create_consolidated_calendar_matrix_chart(filtered_data)
+    crops = list((safe_get_data(filtered_data, 'crop_calendar') or {}).keys())
+    window = lod_window("consolidated_calendar_matrix_window", crops, DEFAULT_MAX_ROWS, "crops")
+    fig1 = create_consolidated_calendar_matrix_chart(filtered_data, row_range=window)
     if fig1:
         st.plotly_chart(fig1, use_container_width=True, key="consolidated_calendar_matrix")
     
     # Segunda linha: heatmap detalhado
     st.markdown("#### 🔥 Detailed Heatmap")
-    fig2 = create_calendar_heatmap_chart(filtered_data)
+    window = lod_window("calendar_heatmap_detailed_window", crops, DEFAULT_MAX_ROWS // 2, "crops")
+    fig2 = create_calendar_heatmap_chart(filtered_data, row_range=window)
     if fig2:
         st.plotly_chart(fig2, use_container_width=True, key="calendar_heatmap_detailed")
     
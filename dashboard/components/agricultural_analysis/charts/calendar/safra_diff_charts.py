@@ -0,0 +1,107 @@
+"""
+Safra Diff Charts Module
+========================
+
+Módulo para comparar calendários de safras diferentes: células
+cultura/estado/mês alteradas e deslocamento das janelas de plantio e
+colheita, calculados pelo motor de diferenças de
+``scripts/data_processors/agricultural_data/safra_calendar.py``.
+
+Autor: LANDAGRI-B Project Team
+Data: 2025
+"""
+
+from collections.abc import Iterable
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from scripts.data_processors.agricultural_data.safra_calendar import MONTHS, SafraCalendar, SafraDiff
+
+MONTH_LABELS = [month[:3] for month in MONTHS]
+
+
+def create_safra_changes_heatmap(diff: SafraDiff) -> go.Figure:
+    """
+    Cria heatmap com o número de estados alterados por cultura e mês.
+
+    Args:
+        diff: Diferenças entre duas safras
+
+    Returns:
+        Figura Plotly
+    """
+    counts = (
+        diff.cells.groupby(["crop", "month"]).size().unstack(fill_value=0)
+        .reindex(columns=list(MONTHS), fill_value=0)
+    )
+    fig = go.Figure(go.Heatmap(
+        z=counts.values,
+        x=MONTH_LABELS,
+        y=counts.index.tolist(),
+        colorscale="Oranges",
+        colorbar=dict(title="States"),
+        hovertemplate="%{y} · %{x}: %{z} states changed<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"Changed Calendar Cells: {diff.before} → {diff.after}",
+        xaxis_title="Month",
+        yaxis_title="Crop",
+        height=max(350, 40 * len(counts) + 120),
+    )
+    return fig
+
+
+def render_safra_diff_tab(
+    calendar: SafraCalendar | None,
+    safra: str | None,
+    crops: Iterable[str] | None = None,
+    regions: Iterable[str] | None = None,
+) -> None:
+    """
+    Renderiza a comparação da safra selecionada com outra safra.
+
+    Args:
+        calendar: Calendário com todas as safras
+        safra: Safra selecionada na página
+        crops: Culturas selecionadas nos filtros
+        regions: Regiões selecionadas nos filtros
+    """
+    st.markdown("#### 🔀 Safra Changes")
+    if calendar is None or safra is None or len(calendar.safras) < 2:
+        st.info(
+            "ℹ️ Only one safra calendar is loaded. Add CONAB calendars of other safras (same format, "
+            "with `metadata.safra`) to `data/json/crop_calendar_safras/` to compare them."
+        )
+        return
+
+    others = [s for s in calendar.safras if s != safra]
+    baseline = st.selectbox("Compare with safra:", options=others, index=len(others) - 1, key="crop_calendar_safra_baseline")
+    diff = calendar.diff(baseline, safra, crops=crops or None, regions=regions or None)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Changed cells", len(diff.cells))
+    col2.metric("Changed crop/state pairs", diff.changed_entries)
+    shifted = diff.shifts["shift_months"].abs() > 0
+    col3.metric("Shifted windows", int(shifted.sum()))
+
+    if diff.cells.empty:
+        st.success(f"✅ No calendar changes between {baseline} and {safra}.")
+        return
+
+    st.plotly_chart(create_safra_changes_heatmap(diff), use_container_width=True)
+
+    st.markdown("##### Planting and harvest window shifts")
+    st.caption("Positive shifts mean the window moved later in the year (months, circular).")
+    st.dataframe(
+        diff.shifts.rename(columns={
+            "crop": "Crop", "state_code": "State", "region": "Region", "window": "Window",
+            "months_before": f"Months ({baseline})", "months_after": f"Months ({safra})",
+            "shift_months": "Shift (months)", "added": "Added", "removed": "Removed",
+        }),
+        hide_index=True,
+        use_container_width=True,
+    )
+    with st.expander("Changed cells"):
+        st.dataframe(pd.DataFrame(diff.cells), hide_index=True, use_container_width=True)
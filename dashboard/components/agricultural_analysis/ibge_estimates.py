@@ -6,6 +6,8 @@ Version: 1.0 - Updated
 
 import streamlit as st
 
+from scripts.utilities.single_flight import single_flight
+
 
 def render():
     """Renders IBGE-specific data (UI entry point)"""
@@ -74,6 +76,7 @@ def render():
     render_ibge_visualizations(data)
 
 
+@single_flight()
 def load_ibge_data():
     """Loads IBGE agricultural data from disk (tries primary then fallback)"""
     try:
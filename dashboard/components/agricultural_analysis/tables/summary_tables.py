@@ -9,6 +9,8 @@ import pandas as pd
 import streamlit as st
 from typing import Dict, Any, Optional
 
+from scripts.utilities.table_downloads import render_table_downloads
+
 
 def create_crop_summary_table(calendar_data: dict, crop: str) -> pd.DataFrame | None:
     """
@@ -244,12 +246,6 @@ def format_dataframe_display(df: pd.DataFrame, title: str = "", use_container_wi
         }
     )
     
-    # Add download button
-    csv_data = df.to_csv(index=False)
-    st.download_button(
-        label="📥 Download CSV",
-        data=csv_data,
-        file_name=f"{title.lower().replace(' ', '_')}_summary.csv" if title else "summary.csv",
-        mime="text/csv",
-        use_container_width=True
-    )
+    # Add download buttons (serialized only on click)
+    base_name = f"{title.lower().replace(' ', '_')}_summary" if title else "summary"
+    render_table_downloads(df, base_name, key_prefix=f"download_{base_name}")
@@ -16,7 +16,10 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from scripts.utilities.single_flight import single_flight
 
+
+@single_flight()
 def load_agricultural_data() -> dict:
     """
     Load Brazilian agricultural data from JSON file.
@@ -13,6 +13,7 @@ from .performance_heatmap_component import render_performance_heatmap_tab
 from .detailed_table_component import render_detailed_table_tab
 from .class_details_component import render_class_details_tab
 from .methodology_deepdive_component import render_methodology_deepdive_tab
+from .spatial_overlap_component import render_spatial_overlap_tab
 
 __all__ = [
     "render_accuracy_resolution_tab",
@@ -21,4 +22,5 @@ __all__ = [
     "render_detailed_table_tab",
     "render_class_details_tab",
     "render_methodology_deepdive_tab",
+    "render_spatial_overlap_tab",
 ]
@@ -16,6 +16,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from scripts.utilities.data_plane import session_metadata
+
 
 def render_class_details_tab(filtered_df: pd.DataFrame) -> None:
     """
@@ -31,8 +33,8 @@ def render_class_details_tab(filtered_df: pd.DataFrame) -> None:
         st.warning("⚠️ No initiative data available for class analysis.")
         return
     
-    # Access metadata from session state
-    metadata = st.session_state.get("metadata", {})
+    # Shared read-only metadata of this session's data version
+    metadata = session_metadata()
     if not metadata:
         st.warning("⚠️ Metadata not available for class details analysis.")
         return
@@ -0,0 +1,103 @@
+"""
+Spatial Overlap Component - Comparison Analysis
+==============================================
+
+Compares the coverage footprints of initiatives: pairwise overlap heatmap,
+footprint areas and the initiatives covering a chosen state or mesoregion.
+Queries are answered by the footprint index of the session's data version
+(``scripts/utilities/footprint_index.py``).
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard.components.shared.chart_core import apply_standard_layout
+from scripts.utilities.data_plane import session_snapshot
+from scripts.utilities.footprint_index import UF_EXTENTS, FootprintIndex, get_footprint_index
+
+EXTENT_LABELS = {"global": "Global", "south_america": "South America", "brazil": "Brazil", "states": "States"}
+
+
+def _label(df: pd.DataFrame, name: str) -> str:
+    """Acronym of an initiative when available (keeps heatmap axes short)."""
+    if "Acronym" in df.columns:
+        match = df.loc[df["Name"] == name, "Acronym"]
+        if not match.empty and pd.notna(match.iloc[0]) and str(match.iloc[0]).strip():
+            return str(match.iloc[0])
+    return name
+
+
+def create_overlap_heatmap(index: FootprintIndex, df: pd.DataFrame, names: list[str]) -> go.Figure:
+    """
+    Heatmap of the share of each row initiative's footprint covered by each column initiative.
+
+    Args:
+        index: Footprint index
+        df: Initiatives frame (for acronyms)
+        names: Initiatives to compare
+
+    Returns:
+        Plotly figure
+    """
+    matrix = index.overlap_matrix(names)
+    labels = [_label(df, name) for name in matrix.index]
+    fig = go.Figure(go.Heatmap(
+        z=(matrix.values * 100).round(1),
+        x=labels,
+        y=labels,
+        colorscale="YlGn",
+        zmin=0,
+        zmax=100,
+        colorbar=dict(title="% of row"),
+        hovertemplate="%{y} ∩ %{x}: %{z}% of %{y}<extra></extra>",
+    ))
+    apply_standard_layout(fig, title="Footprint Overlap", xaxis_title="Initiative", yaxis_title="Initiative")
+    fig.update_layout(height=max(450, 32 * len(labels)))
+    return fig
+
+
+def render_spatial_overlap_tab(filtered_df: pd.DataFrame) -> None:
+    """
+    Render the footprint overlap analysis.
+
+    Args:
+        filtered_df: Filtered DataFrame with initiative data
+    """
+    st.markdown("#### 🗺️ Spatial Coverage Overlap")
+    st.markdown("*Overlap of initiative coverage footprints (global, continental, national or state-level extents).*")
+
+    if filtered_df.empty or "Name" not in filtered_df.columns:
+        st.warning("⚠️ No initiative data available for spatial overlap analysis.")
+        return
+
+    index = get_footprint_index(session_snapshot())
+    names = [name for name in filtered_df["Name"].astype(str) if name in index.specs]
+    if len(names) < 2:
+        st.info("ℹ️ At least two initiatives with coverage footprints are needed.")
+        return
+
+    st.plotly_chart(create_overlap_heatmap(index, filtered_df, names), use_container_width=True)
+
+    areas = pd.DataFrame({
+        "Initiative": names,
+        "Extent": [EXTENT_LABELS[index.specs[name]["extent"]] for name in names],
+        "Footprint area (km²)": [round(index.area(name)) for name in names],
+    })
+    st.dataframe(areas, hide_index=True, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        state = st.selectbox("State", options=sorted(UF_EXTENTS), key="comparison_overlap_state")
+        covering = [name for name in index.covering_state(state) if name in names]
+        st.markdown(f"**{len(covering)}** initiatives cover **{state}**")
+        st.write(covering)
+    with col2:
+        regions = sorted(index.mesoregions)
+        region = st.selectbox("Mesoregion", options=regions, key="comparison_overlap_region")
+        covering = [name for name in index.covering_mesoregion(region) if name in names]
+        st.markdown(f"**{len(covering)}** initiatives cover **{region}**")
+        st.write(covering)
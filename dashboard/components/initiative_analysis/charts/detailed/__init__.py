@@ -11,6 +11,7 @@ from .radar_chart_component import render_radar_chart_tab
 from .heatmap_component import render_heatmap_tab
 from .data_table_component import render_data_table_tab
 from .annual_coverage_component import render_annual_coverage_tab
+from .zonal_stats_component import render_zonal_stats_tab
 
 __all__ = [
     "render_bars_tab",
@@ -18,4 +19,5 @@ __all__ = [
     "render_heatmap_tab",
     "render_data_table_tab",
     "render_annual_coverage_tab",
+    "render_zonal_stats_tab",
 ]
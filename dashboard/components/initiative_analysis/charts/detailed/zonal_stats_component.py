@@ -0,0 +1,98 @@
+"""
+Zonal Statistics Component - Detailed Analysis
+==============================================
+
+Class areas per state or mesoregion of local raster exports of the selected
+initiatives, read from the tables cached by ``scripts/utilities/zonal_stats.py``.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard.components.shared.chart_core import apply_standard_layout
+from scripts.utilities.zonal_stats import LAYERS, ZONAL_CACHE_DIR, list_zonal_tables, load_zonal_table, rollup
+
+TOP_CLASSES = 8
+
+
+def create_zonal_area_chart(table: pd.DataFrame, title: str, top_classes: int = TOP_CLASSES) -> go.Figure:
+    """
+    Stacked bars of class area per zone; classes beyond the largest
+    ``top_classes`` are grouped as "Other".
+
+    Args:
+        table: Rolled-up table (zone, class_value, area_km2, share)
+        title: Chart title
+        top_classes: Number of classes shown individually
+
+    Returns:
+        Plotly figure
+    """
+    largest = table.groupby("class_value")["area_km2"].sum().nlargest(top_classes).index
+    labels = table["class_value"].where(table["class_value"].isin(largest)).map(
+        lambda value: f"Class {int(value)}" if pd.notna(value) else "Other"
+    )
+    grouped = table.assign(label=labels).groupby(["zone", "label"], as_index=False)["area_km2"].sum()
+    zones = grouped.groupby("zone")["area_km2"].sum().sort_values(ascending=False).index.tolist()
+
+    fig = go.Figure()
+    order = [f"Class {int(value)}" for value in largest] + (["Other"] if (labels == "Other").any() else [])
+    for label in order:
+        subset = grouped[grouped["label"] == label].set_index("zone").reindex(zones, fill_value=0)
+        fig.add_trace(go.Bar(
+            x=zones,
+            y=subset["area_km2"],
+            name=label,
+            hovertemplate="%{x}<br>" + label + ": %{y:,.0f} km²<extra></extra>",
+        ))
+    apply_standard_layout(fig, title=title, xaxis_title="Zone", yaxis_title="Area (km²)")
+    fig.update_layout(barmode="stack", height=500)
+    return fig
+
+
+def render_zonal_stats_tab(filtered_df: pd.DataFrame) -> None:
+    """
+    Render class areas per zone for the selected initiatives.
+
+    Args:
+        filtered_df: Filtered DataFrame with initiatives data
+    """
+    tables = list_zonal_tables(ZONAL_CACHE_DIR)
+    if not tables.empty and "Name" in filtered_df.columns:
+        tables = tables[tables["initiative"].isin(filtered_df["Name"])]
+    if tables.empty:
+        st.info(
+            "ℹ️ No zonal statistics for the selected initiatives. Compute them from a local raster export with "
+            "`python -m scripts.utilities.zonal_stats <raster.tif> --initiative <Name> --year <YYYY>`."
+        )
+        return
+
+    options = tables.index.tolist()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected = st.selectbox(
+            "Raster",
+            options=options,
+            format_func=lambda i: f"{tables.at[i, 'initiative']} · {tables.at[i, 'year'] or '—'} · {tables.at[i, 'raster']}",
+            key="detailed_zonal_raster",
+        )
+    with col2:
+        layer = st.radio("Zones", options=LAYERS, horizontal=True, key="detailed_zonal_layer")
+
+    table, meta = load_zonal_table(tables.at[selected, "path"])
+    table = rollup(table, layer)
+    if meta.get("zone_set", "").endswith("-approx"):
+        st.caption("⚠️ Zones were rasterized from approximate state extents (geometry store not built).")
+
+    st.plotly_chart(
+        create_zonal_area_chart(table, f"Class Area by {layer.title()} — {meta.get('initiative')}"),
+        use_container_width=True,
+    )
+    st.dataframe(
+        table.pivot_table(index="zone", columns="class_value", values="area_km2", fill_value=0).round(1),
+        use_container_width=True,
+    )
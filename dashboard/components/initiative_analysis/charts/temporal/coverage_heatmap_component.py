@@ -142,26 +142,15 @@ def plot_coverage_heatmap_chart(
     z_data = [item['coverage'] for item in initiatives_data]
     y_labels = [item['initiative'] for item in initiatives_data]
 
-    # Criar texto customizado para hover
-    hover_text = []
-    for _, item in enumerate(initiatives_data):
-        row_text = []
-        for j, year in enumerate(years_range):
-            if item['coverage'][j] == 1:
-                status = "Available"
-                color = "🟢"
-            else:
-                status = "Not Available"
-                color = "⚪"
-
-            hover_info = (
-                f"<b>{item['initiative']}</b><br>"
-                f"Year: {year}<br>"
-                f"Status: {color} {status}<br>"
-                f"Coverage: {item['coverage_percentage']:.1f}%"
-            )
-            row_text.append(hover_info)
-        hover_text.append(row_text)
+    # Hover: status curto por célula (text) e cobertura por linha (customdata);
+    # nome e ano vêm de %{y}/%{x} em vez de uma string completa por célula
+    status_text = [
+        ["🟢 Available" if covered else "⚪ Not Available" for covered in item['coverage']]
+        for item in initiatives_data
+    ]
+    coverage_data = [
+        [item['coverage_percentage']] * len(years_range) for item in initiatives_data
+    ]
 
     # Criar o heatmap
     fig = go.Figure(data=go.Heatmap(
@@ -180,8 +169,14 @@ def plot_coverage_heatmap_chart(
             "thickness": 15,
             "len": 0.7
         },
-        hovertemplate='%{customdata}<extra></extra>',
-        customdata=hover_text
+        text=status_text,
+        customdata=coverage_data,
+        hovertemplate=(
+            "<b>%{y}</b><br>"
+            "Year: %{x}<br>"
+            "Status: %{text}<br>"
+            "Coverage: %{customdata:.1f}%<extra></extra>"
+        )
     ))
 
     # Layout do heatmap
@@ -11,6 +11,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from dashboard.components.shared.lod_controls import lod_window
+from scripts.plotting.heatmap_lod import DEFAULT_MAX_ROWS, HeatmapPyramid, cached_pyramid
 
 
 def render_coverage_matrix_heatmap(temporal_data: pd.DataFrame, metadata: dict) -> None:
@@ -187,10 +189,29 @@ def render_evolution_trends(metadata: dict) -> None:
 
 def render_coverage_heatmap(metadata: dict) -> None:
     """Simplified temporal coverage view: horizontal timeline per initiative with gaps preserved.
-    Keeps a consistent (larger) height and a clean visual — not a matrix."""
+    Keeps a consistent (larger) height and a clean visual — not a matrix.
+    Beyond ``DEFAULT_MAX_ROWS`` initiatives the view becomes an aggregated
+    heatmap with a drill-down window."""
     st.markdown("#### 🗓️ Temporal Coverage Availability")
 
+    coverage_rows = _collect_coverage_rows(metadata)
+    window = lod_window(
+        "coverage_availability_window",
+        [i["short_name"] for i in coverage_rows[0]],
+        DEFAULT_MAX_ROWS,
+        "initiatives",
+    )
+
+    fig = build_coverage_availability_figure(metadata, row_range=window, coverage_rows=coverage_rows)
+    if fig is None:
+        st.info("No temporal data available for coverage view.")
+        return
+
+    st.plotly_chart(fig, use_container_width=True)
 
+
+def _collect_coverage_rows(metadata: dict) -> tuple[list[dict], list[int]]:
+    """Initiatives with their covered years (display order) and the sorted year axis."""
     # Collect years and initiatives
     all_years = set()
     initiatives_raw = []
@@ -217,32 +238,62 @@ def render_coverage_heatmap(metadata: dict) -> None:
         })
 
     if not all_years or not initiatives_raw:
-        st.info("No temporal data available for coverage view.")
-        return
+        return [], []
 
     years_sorted = sorted(all_years)
 
     # Sort initiatives: newest start first, then by coverage desc
     initiatives_sorted = sorted(initiatives_raw, key=lambda i: (i["start"], -i["coverage"]), reverse=True)
-    initiative_names = [i["short_name"] for i in initiatives_sorted]
+    return initiatives_sorted, years_sorted
+
+
+@cached_pyramid
+def coverage_pyramid(metadata: dict) -> HeatmapPyramid | None:
+    """Initiative × year coverage pyramid, cached per metadata object (None without years)."""
+    initiatives_sorted, years_sorted = _collect_coverage_rows(metadata)
+    if not initiatives_sorted:
+        return None
+    matrix = [[1 if year in inst["years"] else 0 for year in years_sorted] for inst in initiatives_sorted]
+    return HeatmapPyramid(matrix, [i["short_name"] for i in initiatives_sorted], years_sorted, agg="mean")
+
+
+def build_coverage_availability_figure(
+    metadata: dict,
+    row_range: tuple[int, int] | None = None,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    coverage_rows: tuple[list[dict], list[int]] | None = None,
+) -> go.Figure | None:
+    """Build the year-by-year availability line view (None when no initiative has years).
+
+    When the initiatives in ``row_range`` exceed ``max_rows`` they are drawn as
+    a heatmap aggregated into blocks (share of initiatives covering each year).
+    ``coverage_rows`` passes ``_collect_coverage_rows(metadata)`` when the
+    caller already has it."""
+    initiatives_sorted, years_sorted = coverage_rows or _collect_coverage_rows(metadata)
+    if not initiatives_sorted:
+        return None
+
+    start, stop = row_range or (0, len(initiatives_sorted))
+    if stop - start > max_rows:
+        return _build_coverage_lod_figure(coverage_pyramid(metadata), row_range, max_rows)
+
+    initiatives_window = initiatives_sorted[start:stop]
+    initiative_names = [i["short_name"] for i in initiatives_window]
 
     # Build traces: one horizontal trace per initiative using full year axis with None for gaps
     fig = go.Figure()
     color = "#2563eb"
-    for idx, inst in enumerate(initiatives_sorted):
+    for idx, inst in enumerate(initiatives_window):
         x_vals = []
         y_vals = []
-        hover_texts = []
         for y in years_sorted:
             if y in inst["years"]:
                 x_vals.append(y)
                 y_vals.append(idx)
-                hover_texts.append(f"<b>{inst['short_name']}</b><br>Year: {y}")
             else:
                 # None breaks the line (preserves gaps/continuity)
                 x_vals.append(None)
                 y_vals.append(None)
-                hover_texts.append(None)
 
         fig.add_trace(go.Scattergl(
             x=x_vals,
@@ -251,8 +302,8 @@ def render_coverage_heatmap(metadata: dict) -> None:
             name=inst['short_name'],
             line=dict(color=color, width=3),
             marker=dict(size=8, color=color),
-            hoverinfo='text',
-            hovertext=hover_texts,
+            # One template per trace instead of a hover string per point
+            hovertemplate=f"<b>{inst['short_name']}</b><br>Year: %{{x}}<extra></extra>",
             connectgaps=False,
             showlegend=False
         ))
@@ -297,7 +348,38 @@ def render_coverage_heatmap(metadata: dict) -> None:
         font=dict(family="Inter", size=11, color="#111827")
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+
+def _build_coverage_lod_figure(
+    pyramid: HeatmapPyramid,
+    row_range: tuple[int, int] | None,
+    max_rows: int,
+) -> go.Figure:
+    """Coverage as a level-of-detail heatmap (initiative blocks × years)."""
+    view = pyramid.view(max_rows=max_rows, row_range=row_range)
+
+    fig = go.Figure(view.heatmap(
+        colorscale=[[0, "#f8fafc"], [1, "#2563eb"]],
+        zmin=0,
+        zmax=1,
+        colorbar=dict(title="Share<br>available", tickformat=".0%"),
+        hovertemplate="<b>%{y}</b><br>Year: %{x}<br>Available: %{z:.0%}<extra></extra>",
+    ))
+    fig.update_yaxes(title_text="<b>Initiative</b>", autorange="reversed", automargin=True)
+    fig.update_xaxes(title_text="<b>Year</b>", tickangle=45)
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Year-by-Year Availability</b><br><span style='font-size:12px;color:#6b7280'>{view.describe()}</span>",
+            x=0.5,
+            font=dict(family="Inter", size=14, color="#111827")
+        ),
+        template="plotly_white",
+        margin=dict(l=260, r=80, t=100, b=120),
+        height=900,
+        font=dict(family="Inter", size=11, color="#111827")
+    )
+    return fig
 
 
 def render_coverage_statistics(metadata: dict) -> None:
@@ -10,6 +10,8 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from scripts.utilities.data_plane import session_metadata
+
 
 def render_evolution_analysis(temporal_df: pd.DataFrame) -> None:
     """
@@ -54,10 +56,11 @@ def render_evolution_analysis(temporal_df: pd.DataFrame) -> None:
     
     with tab2:
         st.markdown("#### 🔥 Spatial Resolution Evolution")
-        if 'metadata' not in st.session_state:
+        metadata = session_metadata()
+        if not metadata:
             st.warning("❌ Metadata not available for resolution evolution analysis.")
             return
-        fig = plot_evolution_heatmap_chart(st.session_state.metadata, temporal_df)
+        fig = plot_evolution_heatmap_chart(metadata, temporal_df)
         st.plotly_chart(fig, use_container_width=True, key="evolution_heatmap_chart")
 
 
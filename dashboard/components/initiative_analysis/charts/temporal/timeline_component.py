@@ -18,6 +18,8 @@ from dashboard.components.shared.chart_core import (
     apply_standard_layout,
     get_chart_colors,
 )
+from dashboard.components.shared.fragments import fragment_memo, isolated_fragment
+from scripts.plotting.trace_consolidation import group_segments
 
 
 def render_timeline_tab(temporal_data: pd.DataFrame, metadata: dict) -> None:
@@ -35,7 +37,26 @@ def render_timeline_tab(temporal_data: pd.DataFrame, metadata: dict) -> None:
         st.warning("⚠️ No temporal data available for analysis.")
         return
     
-    # Timeline controls
+    # Controls + chart rerun on their own (fragment), not the whole page
+    render_timeline_explorer(temporal_data, metadata)
+
+
+def _timeline_year_stats(metadata: dict) -> tuple[int, set]:
+    """Initiatives with data and covered years (1985-2024)."""
+    total_initiatives = len([name for name, details in metadata.items() 
+                           if details.get("available_years", [])])
+    
+    all_years = set()
+    for details in metadata.values():
+        available_years = details.get("available_years", [])
+        if available_years:
+            all_years.update([y for y in available_years if 1985 <= y <= 2024])
+    return total_initiatives, all_years
+
+
+@isolated_fragment
+def render_timeline_explorer(temporal_data: pd.DataFrame, metadata: dict) -> None:
+    """Timeline controls, chart and statistics."""
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -59,24 +80,23 @@ def render_timeline_tab(temporal_data: pd.DataFrame, metadata: dict) -> None:
             help="Show lines connecting years for each initiative"
         )
     
-    # Generate modern timeline chart
-    fig_timeline = plot_timeline_chart(metadata, temporal_data, show_gaps, group_by_type, show_connections)
+    # Generate modern timeline chart (one figure per control combination)
+    fig_timeline = fragment_memo(
+        "timeline",
+        "figure",
+        (show_gaps, group_by_type, show_connections),
+        lambda: plot_timeline_chart(metadata, temporal_data, show_gaps, group_by_type, show_connections),
+        source=metadata,
+    )
     
     if fig_timeline:
         st.plotly_chart(fig_timeline, use_container_width=True, key="temporal_timeline_chart")
         
-        # Timeline statistics
+        # Timeline statistics (independent of the controls)
         stats_col1, stats_col2, stats_col3 = st.columns(3)
-        
-        # Calculate statistics
-        total_initiatives = len([name for name, details in metadata.items() 
-                               if details.get("available_years", [])])
-        
-        all_years = set()
-        for details in metadata.values():
-            available_years = details.get("available_years", [])
-            if available_years:
-                all_years.update([y for y in available_years if 1985 <= y <= 2024])
+        total_initiatives, all_years = fragment_memo(
+            "timeline", "stats", None, lambda: _timeline_year_stats(metadata), source=metadata
+        )
         
         with stats_col1:
             st.metric("Initiatives with data", total_initiatives)
@@ -97,7 +117,8 @@ def plot_timeline_chart(
     temporal_data: pd.DataFrame, 
     show_gaps: bool = True,
     group_by_type: bool = False,
-    show_connections: bool = True
+    show_connections: bool = True,
+    consolidate_traces: bool = True,
 ) -> go.Figure:
     """
     Create modern timeline chart of LULC initiatives using points.
@@ -108,6 +129,8 @@ def plot_timeline_chart(
         show_gaps: Whether to show temporal gaps
         group_by_type: Whether to group by type/methodology
         show_connections: Whether to connect points with lines
+        consolidate_traces: One trace per visual category instead of
+            several traces per initiative (same rendering, smaller figure)
         
     Returns:
         Plotly Figure with modern timeline using points
@@ -209,69 +232,10 @@ def plot_timeline_chart(
     # Create figure with modern layout
     fig = go.Figure()
     
-    # Add points for each available year
-    for i, item in enumerate(timeline_data):
-        # Add points for available years
-        fig.add_trace(go.Scatter(
-            x=item["All_Years"],
-            y=[item["Initiative"]] * len(item["All_Years"]),
-            mode='markers',
-            marker=dict(
-                color=item["Color"],
-                size=12,
-                symbol='circle',
-                line=dict(width=2, color='white'),
-                opacity=0.85
-            ),
-            name=item["Initiative"],
-            hovertemplate=f"<b>{item['Initiative']}</b><br>" +
-                         f"<b>Year:</b> %{{x}}<br>" +
-                         f"<b>Period:</b> {item['Start']} - {item['End']}<br>" +
-                         f"<b>Coverage:</b> {item['Coverage_Text']}<br>" +
-                         f"<b>Methodology:</b> {item['Type']}<br>" +
-                         f"<b>Scope:</b> {item['Coverage']}<extra></extra>",
-            showlegend=False
-        ))
-        
-        # Add connecting lines if requested
-        if show_connections and len(item["All_Years"]) > 1:
-            fig.add_trace(go.Scatter(
-                x=[item["Start"], item["End"]],
-                y=[item["Initiative"], item["Initiative"]],
-                mode='lines',
-                line=dict(
-                    color=item["Color"],
-                    width=3,
-                    dash='solid'
-                ),
-                opacity=0.5,
-                hoverinfo='skip',
-                showlegend=False
-            ))
-        
-        # Add gaps if requested
-        if show_gaps and item["Years_Available"] < item["Duration"]:
-            # Create list of missing years
-            full_range = set(range(item["Start"], item["End"] + 1))
-            missing_years = list(full_range - set(item["All_Years"]))
-            
-            if missing_years:
-                fig.add_trace(go.Scatter(
-                    x=missing_years,
-                    y=[item["Initiative"]] * len(missing_years),
-                    mode='markers',
-                    marker=dict(
-                        color='rgba(239,68,68,0.8)',
-                        size=8,
-                        symbol='x',
-                        line=dict(width=2, color='#dc2626')
-                    ),
-                    name=f"Gaps - {item['Initiative']}",
-                    hovertemplate=f"<b>Temporal Gap</b><br>" +
-                                 f"<b>Missing year:</b> %{{x}}<br>" +
-                                 f"<b>Initiative:</b> {item['Initiative']}<extra></extra>",
-                    showlegend=False
-                ))
+    if consolidate_traces:
+        _add_consolidated_traces(fig, timeline_data, show_gaps, show_connections)
+    else:
+        _add_traces_per_initiative(fig, timeline_data, show_gaps, show_connections)
     
     # Modern and responsive layout with improved typography
     fig.update_layout(
@@ -367,3 +331,167 @@ def plot_timeline_chart(
     )
     
     return fig
+
+
+def _add_consolidated_traces(
+    fig: go.Figure, timeline_data: list[dict], show_gaps: bool, show_connections: bool
+) -> None:
+    """
+    Add points, connection lines and gaps with one trace per visual category.
+
+    Points carry per-point colours and hover data; connection lines are
+    None-separated segments, one trace per colour. Trace order (points,
+    lines, gaps) keeps the per-initiative stacking of the original traces.
+    """
+    years, rows, point_colors, point_data = [], [], [], []
+    for item in timeline_data:
+        count = len(item["All_Years"])
+        years.extend(item["All_Years"])
+        rows.extend([item["Initiative"]] * count)
+        point_colors.extend([item["Color"]] * count)
+        point_data.extend(
+            [[f"{item['Start']} - {item['End']}", item["Coverage_Text"], item["Type"], item["Coverage"]]]
+            * count
+        )
+
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=rows,
+        mode='markers',
+        marker=dict(
+            color=point_colors,
+            size=12,
+            symbol='circle',
+            line=dict(width=2, color='white'),
+            opacity=0.85
+        ),
+        name="Available years",
+        customdata=point_data,
+        hovertemplate="<b>%{y}</b><br>" +
+                     "<b>Year:</b> %{x}<br>" +
+                     "<b>Period:</b> %{customdata[0]}<br>" +
+                     "<b>Coverage:</b> %{customdata[1]}<br>" +
+                     "<b>Methodology:</b> %{customdata[2]}<br>" +
+                     "<b>Scope:</b> %{customdata[3]}<extra></extra>",
+        showlegend=False
+    ))
+
+    if show_connections:
+        lines = group_segments(
+            timeline_data,
+            style=lambda item: item["Color"],
+            segment=lambda item: (
+                ([item["Start"], item["End"]], [item["Initiative"], item["Initiative"]])
+                if len(item["All_Years"]) > 1
+                else None
+            ),
+        )
+        for color, (line_x, line_y) in lines.items():
+            fig.add_trace(go.Scatter(
+                x=line_x,
+                y=line_y,
+                mode='lines',
+                line=dict(
+                    color=color,
+                    width=3,
+                    dash='solid'
+                ),
+                opacity=0.5,
+                hoverinfo='skip',
+                showlegend=False
+            ))
+
+    if show_gaps:
+        gap_years, gap_rows = [], []
+        for item in timeline_data:
+            if item["Years_Available"] < item["Duration"]:
+                missing_years = sorted(set(range(item["Start"], item["End"] + 1)) - set(item["All_Years"]))
+                gap_years.extend(missing_years)
+                gap_rows.extend([item["Initiative"]] * len(missing_years))
+
+        if gap_years:
+            fig.add_trace(go.Scatter(
+                x=gap_years,
+                y=gap_rows,
+                mode='markers',
+                marker=dict(
+                    color='rgba(239,68,68,0.8)',
+                    size=8,
+                    symbol='x',
+                    line=dict(width=2, color='#dc2626')
+                ),
+                name="Gaps",
+                hovertemplate="<b>Temporal Gap</b><br>" +
+                             "<b>Missing year:</b> %{x}<br>" +
+                             "<b>Initiative:</b> %{y}<extra></extra>",
+                showlegend=False
+            ))
+
+
+def _add_traces_per_initiative(
+    fig: go.Figure, timeline_data: list[dict], show_gaps: bool, show_connections: bool
+) -> None:
+    """Add points, connection line and gaps as separate traces per initiative."""
+    # Add points for each available year
+    for i, item in enumerate(timeline_data):
+        # Add points for available years
+        fig.add_trace(go.Scatter(
+            x=item["All_Years"],
+            y=[item["Initiative"]] * len(item["All_Years"]),
+            mode='markers',
+            marker=dict(
+                color=item["Color"],
+                size=12,
+                symbol='circle',
+                line=dict(width=2, color='white'),
+                opacity=0.85
+            ),
+            name=item["Initiative"],
+            hovertemplate=f"<b>{item['Initiative']}</b><br>" +
+                         f"<b>Year:</b> %{{x}}<br>" +
+                         f"<b>Period:</b> {item['Start']} - {item['End']}<br>" +
+                         f"<b>Coverage:</b> {item['Coverage_Text']}<br>" +
+                         f"<b>Methodology:</b> {item['Type']}<br>" +
+                         f"<b>Scope:</b> {item['Coverage']}<extra></extra>",
+            showlegend=False
+        ))
+        
+        # Add connecting lines if requested
+        if show_connections and len(item["All_Years"]) > 1:
+            fig.add_trace(go.Scatter(
+                x=[item["Start"], item["End"]],
+                y=[item["Initiative"], item["Initiative"]],
+                mode='lines',
+                line=dict(
+                    color=item["Color"],
+                    width=3,
+                    dash='solid'
+                ),
+                opacity=0.5,
+                hoverinfo='skip',
+                showlegend=False
+            ))
+        
+        # Add gaps if requested
+        if show_gaps and item["Years_Available"] < item["Duration"]:
+            # Create list of missing years
+            full_range = set(range(item["Start"], item["End"] + 1))
+            missing_years = list(full_range - set(item["All_Years"]))
+            
+            if missing_years:
+                fig.add_trace(go.Scatter(
+                    x=missing_years,
+                    y=[item["Initiative"]] * len(missing_years),
+                    mode='markers',
+                    marker=dict(
+                        color='rgba(239,68,68,0.8)',
+                        size=8,
+                        symbol='x',
+                        line=dict(width=2, color='#dc2626')
+                    ),
+                    name=f"Gaps - {item['Initiative']}",
+                    hovertemplate=f"<b>Temporal Gap</b><br>" +
+                                 f"<b>Missing year:</b> %{{x}}<br>" +
+                                 f"<b>Initiative:</b> {item['Initiative']}<extra></extra>",
+                    showlegend=False
+                ))
@@ -6,9 +6,120 @@ Este módulo contém funções para renderizar os filtros modernos
 e interativos do dashboard de visão geral.
 """
 
+import math
+
 import pandas as pd
 import streamlit as st
 
+from scripts.utilities.facet_counts import FacetCounts, FacetEngine
+from scripts.utilities.filter_index import FilterIndex, get_filter_index
+
+NUMERIC_FILTER_COLUMNS = ("Resolution", "Accuracy (%)", "Num_Agri_Classes")
+FILTER_KEYS = {
+    "Type": "overview_filter_type",
+    "Resolution": "overview_filter_resolution",
+    "Accuracy (%)": "overview_filter_accuracy",
+    "Num_Agri_Classes": "overview_filter_agri_classes",
+}
+FACET_ENGINE_KEY = "_overview_facet_engine"
+
+
+def _get_filter_index(df: pd.DataFrame) -> FilterIndex:
+    """Índice dos filtros para as colunas presentes no DataFrame."""
+    numeric_columns = [col for col in NUMERIC_FILTER_COLUMNS if col in df.columns]
+    categorical_columns = ["Type"] if "Type" in df.columns else []
+    return get_filter_index(df, numeric_columns, categorical_columns)
+
+
+def _get_facet_engine(index: FilterIndex) -> FacetEngine:
+    """Motor de facetas da sessão (estado incremental próprio de cada sessão)."""
+    engine = st.session_state.get(FACET_ENGINE_KEY)
+    if engine is None or engine.index is not index:
+        engine = FacetEngine(index)
+        st.session_state[FACET_ENGINE_KEY] = engine
+    return engine
+
+
+def compute_filter_facets(df: pd.DataFrame) -> FacetCounts | None:
+    """
+    Calcula quantas iniciativas cada opção dos filtros deixaria.
+
+    Usa o estado atual dos widgets (já atualizado no rerun) e conta cada
+    filtro considerando apenas os demais filtros ativos.
+
+    Args:
+        df: DataFrame com os dados das iniciativas
+
+    Returns:
+        Contagens por faceta, ou None se o estado dos filtros for inválido
+    """
+    index = _get_filter_index(df)
+    ranges = {
+        col: _ordered(st.session_state[FILTER_KEYS[col]])
+        for col in index.numeric
+        if FILTER_KEYS[col] in st.session_state
+    }
+    selected_types = st.session_state.get(FILTER_KEYS["Type"])
+    categories = {"Type": selected_types} if selected_types and index.categorical else {}
+    try:
+        return _get_facet_engine(index).counts(ranges, categories)
+    except (KeyError, ValueError):
+        return None
+
+
+def _range_caption(facets: FacetCounts | None, column: str) -> None:
+    if facets is not None and column in facets.ranges:
+        st.caption(f"{facets.total} de {facets.ranges[column]} iniciativas no intervalo")
+
+
+def _range_slider(
+    index: FilterIndex,
+    facets: FacetCounts | None,
+    column: str,
+    label: str,
+    fallback: tuple[int, int],
+    help_text: str,
+    data_name: str,
+) -> tuple[int, int]:
+    """
+    Slider de faixa com limites tirados do índice (sem reconverter a coluna).
+
+    Sem valores numéricos, mostra um slider desabilitado com ``fallback``.
+    """
+    numeric = index.numeric.get(column)
+    if numeric is None or numeric.min is None:
+        st.slider(
+            label,
+            min_value=fallback[0],
+            max_value=fallback[1],
+            value=fallback,
+            disabled=True,
+            help=f"Dados de {data_name} não disponíveis",
+        )
+        reason = "para a seleção atual" if numeric is None else "ou não numéricos"
+        st.caption(f"⚠️ Dados de {data_name} não disponíveis {reason}.")
+        return fallback
+
+    low, high = math.floor(numeric.min), math.ceil(numeric.max)
+    if low == high:
+        high = low + 1
+    selected = st.slider(
+        label,
+        min_value=low,
+        max_value=high,
+        value=(low, high),
+        key=FILTER_KEYS[column],
+        help=help_text,
+    )
+    _range_caption(facets, column)
+    return selected
+
+
+def _ordered(bounds) -> tuple:
+    """Faixa ``(lo, hi)`` com os limites em ordem (invertidos são trocados)."""
+    lo, hi = bounds
+    return (lo, hi) if lo <= hi else (hi, lo)
+
 
 def render_initiative_filters(
     df: pd.DataFrame,
@@ -73,162 +184,50 @@ def render_initiative_filters(
         unsafe_allow_html=True,
     )
 
+    index = _get_filter_index(df)
+    facets = compute_filter_facets(df) if not df.empty else None
+    type_counts = facets.categories.get("Type", {}) if facets is not None else {}
+
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
         # Filtro de Tipo
-        tipos = (
-            df["Type"].unique().tolist()
-            if not df.empty and "Type" in df.columns and df["Type"].notna().any()
-            else []
-        )
+        tipos = list(index.categorical["Type"].categories) if "Type" in index.categorical else []
         selected_types = st.multiselect(
             "🏷️ Tipo",
             options=tipos,
             default=tipos,
-            help="Selecione os tipos de iniciativas para análise",
+            format_func=lambda tipo: f"{tipo} ({type_counts[tipo]})" if tipo in type_counts else str(tipo),
+            key=FILTER_KEYS["Type"],
+            help="Selecione os tipos de iniciativas para análise (entre parênteses: "
+                 "iniciativas restantes com os demais filtros)",
         )
 
     with col2:
-        # Filtro de Resolução
-        if (
-            not df.empty
-            and "Resolution" in df.columns
-            and df["Resolution"].notna().any()
-        ):
-            resolutions_numeric = pd.to_numeric(
-                df["Resolution"], errors="coerce"
-            ).dropna()
-            if not resolutions_numeric.empty:
-                min_res, max_res = (
-                    int(resolutions_numeric.min()),
-                    int(resolutions_numeric.max()),
-                )
-                selected_res = st.slider(
-                    "📐 Resolução (m)",
-                    min_value=min_res,
-                    max_value=max_res,
-                    value=(min_res, max_res),
-                    help="Filtre por resolução espacial em metros",
-                )
-            else:
-                selected_res = st.slider(
-                    "📐 Resolução (m)",
-                    min_value=0,
-                    max_value=1000,
-                    value=(0, 1000),
-                    disabled=True,
-                    help="Dados de resolução não disponíveis",
-                )
-                st.caption("⚠️ Dados de resolução não disponíveis ou não numéricos.")
-        else:
-            selected_res = st.slider(
-                "📐 Resolução (m)",
-                min_value=0,
-                max_value=1000,
-                value=(0, 1000),
-                disabled=True,
-                help="Dados de resolução não disponíveis",
-            )
-            st.caption("⚠️ Dados de resolução não disponíveis para a seleção atual.")
+        selected_res = _range_slider(
+            index, facets, "Resolution", "📐 Resolução (m)", (0, 1000),
+            "Filtre por resolução espacial em metros", "resolução",
+        )
 
     with col3:
-        # Filtro de Acurácia
-        if (
-            not df.empty
-            and "Accuracy (%)" in df.columns
-            and df["Accuracy (%)"].notna().any()
-        ):
-            accuracies_numeric = pd.to_numeric(
-                df["Accuracy (%)"], errors="coerce"
-            ).dropna()
-            if not accuracies_numeric.empty:
-                min_acc, max_acc = (
-                    int(accuracies_numeric.min()),
-                    int(accuracies_numeric.max()),
-                )
-                selected_acc = st.slider(
-                    "🎯 Acurácia (%)",
-                    min_value=min_acc,
-                    max_value=max_acc,
-                    value=(min_acc, max_acc),
-                    help="Filtre por acurácia da classificação",
-                )
-            else:
-                selected_acc = st.slider(
-                    "🎯 Acurácia (%)",
-                    min_value=0,
-                    max_value=100,
-                    value=(0, 100),
-                    disabled=True,
-                    help="Dados de acurácia não disponíveis",
-                )
-                st.caption("⚠️ Dados de acurácia não disponíveis ou não numéricos.")
-        else:
-            selected_acc = st.slider(
-                "🎯 Acurácia (%)",
-                min_value=0,
-                max_value=100,
-                value=(0, 100),
-                disabled=True,
-                help="Dados de acurácia não disponíveis",
-            )
-            st.caption("⚠️ Dados de acurácia não disponíveis para a seleção atual.")
+        selected_acc = _range_slider(
+            index, facets, "Accuracy (%)", "🎯 Acurácia (%)", (0, 100),
+            "Filtre por acurácia da classificação", "acurácia",
+        )
 
     with col4:
-        # Filtro de Classes Agrícolas
-        if (
-            not df.empty
-            and "Num_Agri_Classes" in df.columns
-            and df["Num_Agri_Classes"].notna().any()
-        ):
-            agri_classes_numeric = pd.to_numeric(
-                df["Num_Agri_Classes"], errors="coerce"
-            ).dropna()
-            if not agri_classes_numeric.empty:
-                min_agri_classes, max_agri_classes = (
-                    int(agri_classes_numeric.min()),
-                    int(agri_classes_numeric.max()),
-                )
-                if min_agri_classes == max_agri_classes:
-                    max_agri_classes = min_agri_classes + 1
-                selected_agri_classes = st.slider(
-                    "🌾 Classes Agrícolas",
-                    min_value=min_agri_classes,
-                    max_value=max_agri_classes,
-                    value=(min_agri_classes, max_agri_classes),
-                    help="Filtre por número de classes agrícolas",
-                )
-            else:
-                selected_agri_classes = st.slider(
-                    "🌾 Classes Agrícolas",
-                    min_value=0,
-                    max_value=20,
-                    value=(0, 20),
-                    disabled=True,
-                    help="Dados de classes agrícolas não disponíveis",
-                )
-                st.caption(
-                    "⚠️ Dados de classes agrícolas não disponíveis ou não numéricos."
-                )
-        else:
-            selected_agri_classes = st.slider(
-                "🌾 Classes Agrícolas",
-                min_value=0,
-                max_value=20,
-                value=(0, 20),
-                disabled=True,
-                help="Dados de classes agrícolas não disponíveis",
-            )
-            st.caption(
-                "⚠️ Dados de classes agrícolas não disponíveis para a seleção atual."
-            )
+        selected_agri_classes = _range_slider(
+            index, facets, "Num_Agri_Classes", "🌾 Classes Agrícolas", (0, 20),
+            "Filtre por número de classes agrícolas", "classes agrícolas",
+        )
 
     with col5:
         # Botão de reset dos filtros
         if st.button(
             "🔄 Resetar Filtros", help="Restaurar todos os filtros para valores padrão"
         ):
+            for key in FILTER_KEYS.values():
+                st.session_state.pop(key, None)
             st.rerun()
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -254,66 +253,39 @@ def apply_filters(
         selected_agri_classes: Range de classes agrícolas selecionado
 
     Returns:
-        DataFrame filtrado
+        DataFrame filtrado (linhas com valores não numéricos ficam de fora
+        dos filtros de faixa; faixas invertidas têm os limites trocados).
+        Sem nenhuma linha removida, devolve o próprio ``df``.
     """
-    # Copiar DataFrame para não modificar o original
-    filtered_df = df.copy()
+    # Índice construído uma vez por frame (ver scripts.utilities.filter_index)
+    index = _get_filter_index(df)
+
+    selected_ranges = dict(
+        zip(NUMERIC_FILTER_COLUMNS, (selected_res, selected_acc, selected_agri_classes))
+    )
+    ranges = {col: _ordered(selected_ranges[col]) for col in index.numeric}
+    categories = {"Type": selected_types} if selected_types and index.categorical else {}
 
-    # Aplicar filtros sequencialmente
-    conditions = []
+    rows = index.select(ranges, categories)
+    if rows.size == len(df):
+        return df
+    return df.iloc[rows]
 
-    # Filtro por tipo
-    if selected_types:
-        conditions.append(filtered_df["Type"].isin(selected_types))
 
-    # Filtro por resolução
-    if "Resolution" in filtered_df.columns:
-        filtered_df["Resolution_numeric"] = pd.to_numeric(
-            filtered_df["Resolution"], errors="coerce"
-        )
-        res_condition = (filtered_df["Resolution_numeric"] >= selected_res[0]) & (
-            filtered_df["Resolution_numeric"] <= selected_res[1]
-        )
-        conditions.append(res_condition)
+def render(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Renderiza o painel de filtros e devolve as iniciativas filtradas.
 
-    # Filtro por acurácia
-    if "Accuracy (%)" in filtered_df.columns:
-        filtered_df["Accuracy_numeric"] = pd.to_numeric(
-            filtered_df["Accuracy (%)"], errors="coerce"
-        )
-        acc_condition = (filtered_df["Accuracy_numeric"] >= selected_acc[0]) & (
-            filtered_df["Accuracy_numeric"] <= selected_acc[1]
-        )
-        conditions.append(acc_condition)
+    Args:
+        df: DataFrame com os dados das iniciativas
 
-    # Filtro por classes agrícolas
-    if "Num_Agri_Classes" in filtered_df.columns:
-        filtered_df["Num_Agri_Classes_numeric"] = pd.to_numeric(
-            filtered_df["Num_Agri_Classes"], errors="coerce"
-        )
-        agri_condition = (
-            filtered_df["Num_Agri_Classes_numeric"] >= selected_agri_classes[0]
-        ) & (filtered_df["Num_Agri_Classes_numeric"] <= selected_agri_classes[1])
-        conditions.append(agri_condition)
-
-    # Combinar todas as condições
-    if conditions:
-        final_condition = conditions[0]
-        for condition in conditions[1:]:
-            final_condition = final_condition & condition
-        filtered_df = filtered_df[final_condition]
-
-    # Limpar colunas auxiliares
-    columns_to_drop = [
-        "Resolution_numeric",
-        "Accuracy_numeric",
-        "Num_Agri_Classes_numeric",
-    ]
-    for col in columns_to_drop:
-        if col in filtered_df.columns:
-            filtered_df = filtered_df.drop(columns=[col])
-
-    return filtered_df
+    Returns:
+        DataFrame filtrado (o próprio ``df`` quando nada é removido)
+    """
+    selection = render_initiative_filters(df)
+    filtered = apply_filters(df, *selection)
+    display_filter_results(len(df), len(filtered))
+    return filtered
 
 
 def display_filter_results(original_count: int, filtered_count: int) -> None:
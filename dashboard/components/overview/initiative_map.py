@@ -4,7 +4,12 @@ Initiative Map Component
 
 Componente para visualização de mapa das iniciativas.
 
-Author: LANDAGRI-B Project Team 
+A cobertura de cada estado vem do índice espacial de footprints
+(``scripts/utilities/footprint_index.py``): com o arquivo de geometrias
+construído o mapa é um coroplético dos estados; sem ele, círculos no centro
+aproximado de cada estado.
+
+Author: LANDAGRI-B Project Team
 Date: 2025-07-23
 """
 
@@ -12,6 +17,70 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from scripts.utilities import geometry_store
+from scripts.utilities.data_plane import session_snapshot
+from scripts.utilities.footprint_index import UF_EXTENTS, FootprintIndex, get_footprint_index
+
+
+def create_coverage_map(index: FootprintIndex, names: list[str]) -> go.Figure:
+    """
+    Cria mapa com o número de iniciativas que cobrem cada estado.
+
+    Args:
+        index: Índice de footprints das iniciativas
+        names: Iniciativas consideradas
+
+    Returns:
+        Figura Plotly (coroplético ou círculos por estado)
+    """
+    coverage = index.state_coverage(names)
+    codes = list(coverage)
+    counts = [len(coverage[code]) for code in codes]
+    hover = ["<br>".join(coverage[code]) or "—" for code in codes]
+
+    store = geometry_store.get_geometry_store()
+    if store is not None and set(codes) <= set(store.feature_ids("state")):
+        fig = go.Figure(go.Choropleth(
+            geojson=store.geojson("state", "medium"),
+            featureidkey="id",
+            locations=codes,
+            z=counts,
+            customdata=hover,
+            colorscale="YlGn",
+            colorbar=dict(title="Iniciativas"),
+            hovertemplate="<b>%{location}</b>: %{z}<br>%{customdata}<extra></extra>",
+        ))
+        fig.update_geos(fitbounds="locations", visible=False)
+    else:
+        centers = [UF_EXTENTS[code] for code in codes]
+        fig = go.Figure(go.Scattergeo(
+            lon=[(x0 + x1) / 2 for x0, _, x1, _ in centers],
+            lat=[(y0 + y1) / 2 for _, y0, _, y1 in centers],
+            text=codes,
+            customdata=hover,
+            mode="markers+text",
+            textposition="top center",
+            marker=dict(
+                size=[8 + 2 * count for count in counts],
+                color=counts,
+                colorscale="YlGn",
+                showscale=True,
+                colorbar=dict(title="Iniciativas"),
+                line=dict(width=0.5, color="#3d4a1f"),
+            ),
+            hovertemplate="<b>%{text}</b>: %{marker.color}<br>%{customdata}<extra></extra>",
+        ))
+        fig.update_geos(
+            fitbounds="locations",
+            showcountries=True,
+            showland=True,
+            landcolor="lightgray",
+            showframe=False,
+        )
+
+    fig.update_layout(title="Iniciativas que cobrem cada estado", height=500, margin=dict(l=0, r=0, t=40, b=0))
+    return fig
+
 
 def render(df: pd.DataFrame) -> None:
     """
@@ -20,33 +89,28 @@ def render(df: pd.DataFrame) -> None:
     Args:
         df: DataFrame com dados das iniciativas
     """
-    st.subheader("🗺️ Mapa Global das Iniciativas")
-
-    # Placeholder para o mapa - implementar com dados geográficos
-    if "Country" in df.columns:
-        countries = df["Country"].value_counts()
-
-        fig = go.Figure(
-            data=go.Scattergeo(
-                lon=[0] * len(countries),  # Placeholder coordinates
-                lat=[0] * len(countries),
-                text=countries.index,
-                mode="markers+text",
-                marker=dict(size=countries.values * 5, color="blue", opacity=0.7),
-            )
-        )
+    st.subheader("🗺️ Mapa de Cobertura das Iniciativas")
 
-        fig.update_layout(
-            title="Distribuição Global das Iniciativas",
-            geo=dict(
-                showframe=False,
-                showcoastlines=True,
-                showland=True,
-                landcolor="lightgray",
-            ),
-            height=400,
-        )
+    if df.empty or "Name" not in df.columns:
+        st.info("Dados geográficos não disponíveis para exibir o mapa.")
+        return
 
-        st.plotly_chart(fig, use_container_width=True)
-    else:
+    index = get_footprint_index(session_snapshot())
+    names = [name for name in df["Name"].astype(str) if name in index.specs]
+    if not names:
         st.info("Dados geográficos não disponíveis para exibir o mapa.")
+        return
+
+    st.plotly_chart(create_coverage_map(index, names), use_container_width=True)
+
+    extents = pd.Series([index.specs[name]["extent"] for name in names]).value_counts()
+    labels = {"global": "globais", "south_america": "continentais", "brazil": "nacionais", "states": "regionais"}
+    st.caption(" · ".join(f"{count} {labels[extent]}" for extent, count in extents.items()))
+
+    state = st.selectbox(
+        "Iniciativas que cobrem o estado",
+        options=sorted(UF_EXTENTS),
+        key="overview_map_state",
+    )
+    covering = [name for name in index.covering_state(state) if name in names]
+    st.markdown(f"**{len(covering)}** iniciativas cobrem **{state}**: " + ", ".join(covering))
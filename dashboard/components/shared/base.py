@@ -16,24 +16,24 @@ from typing import Any, Dict, Optional
 from pathlib import Path
 import sys
 
+from scripts.utilities.data_plane import (
+    session_initiatives,
+    session_metadata,
+    session_snapshot,
+)
+
 
 class DashboardBase:
     @staticmethod
     def validate_data() -> bool:
         """
-        Static method to validate that required data is available in session state.
+        Static method to validate the shared data of the session's data version.
         Returns:
             bool: True if data is valid, False otherwise
         """
-        required_keys = ["df_interpreted", "metadata"]
-        import streamlit as st
-        import pandas as pd
-        for key in required_keys:
-            if key not in st.session_state:
-                st.error(f"❌ Required data '{key}' not found in session state.")
-                return False
-            data = st.session_state.get(key)
-            if data is None or (isinstance(data, pd.DataFrame) and data.empty):
+        snapshot = session_snapshot()
+        for key, data in (("initiatives", snapshot.initiatives), ("metadata", snapshot.metadata)):
+            if data is None or len(data) == 0:
                 st.error(f"❌ Data '{key}' is empty or invalid.")
                 return False
         return True
@@ -41,15 +41,13 @@ class DashboardBase:
     @staticmethod
     def get_data() -> pd.DataFrame:
         """
-        Static method to get validated data from session state.
+        Static method to get the validated (read-only) initiatives DataFrame.
         Returns:
             pd.DataFrame: The main dataframe if valid, else empty DataFrame
         """
-        import streamlit as st
-        import pandas as pd
         if not DashboardBase.validate_data():
             return pd.DataFrame()
-        return st.session_state.get("df_interpreted", pd.DataFrame())
+        return session_initiatives()
 
     @staticmethod
     def show_data_info(df: Optional[pd.DataFrame] = None):
@@ -58,11 +56,9 @@ class DashboardBase:
         Args:
             df (pd.DataFrame, optional): DataFrame to show info for. If None, will fetch from session.
         """
-        import streamlit as st
-        import pandas as pd
         if df is None:
             df = DashboardBase.get_data()
-        metadata = st.session_state.get("metadata", {})
+        metadata = session_metadata()
         if not df.empty:
             with st.sidebar:
                 st.markdown("### 📊 Data Information")
@@ -102,28 +98,16 @@ class DashboardBase:
     
     def validate_session_data(self) -> bool:
         """
-        Validate that required data is available in session state.
+        Validate the shared data of the session's data version.
         
         Returns:
             bool: True if data is valid, False otherwise
         """
-        required_keys = ["df_interpreted", "metadata"]
-        
-        for key in required_keys:
-            if key not in st.session_state:
-                st.error(f"❌ Required data '{key}' not found in session state.")
-                return False
-                
-            data = st.session_state.get(key)
-            if data is None or (isinstance(data, pd.DataFrame) and data.empty):
-                st.error(f"❌ Data '{key}' is empty or invalid.")
-                return False
-                
-        return True
+        return DashboardBase.validate_data()
     
     def get_session_data(self) -> tuple[pd.DataFrame, Dict[str, Any]]:
         """
-        Get validated data from session state.
+        Get the session's read-only data and metadata.
         
         Returns:
             tuple: (dataframe, metadata)
@@ -131,10 +115,8 @@ class DashboardBase:
         if not self.validate_session_data():
             return pd.DataFrame(), {}
             
-        return (
-            st.session_state.get("df_interpreted", pd.DataFrame()),
-            st.session_state.get("metadata", {})
-        )
+        snapshot = session_snapshot()
+        return snapshot.initiatives, snapshot.metadata
     
     def display_data_info(self):
         """Display information about loaded data in sidebar."""
@@ -0,0 +1,117 @@
+"""
+Fragment Utilities
+==================
+
+Partial reruns for filter + chart groups.
+
+A widget change normally reruns the whole page script (headers, CSS and
+every unrelated chart). Groups wrapped with ``isolated_fragment`` run as a
+Streamlit fragment instead, so interacting with their widgets reruns only
+that group. Each group keeps its derived data in a small per-fragment store
+(``fragment_state``/``fragment_memo``) so a rerun triggered by one chart's
+widget does not recompute data that depends only on the group's filters.
+
+Outside a script run (bare execution, cache warm-up) ``st.fragment`` renders
+nothing, so fragments are called as plain functions there.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Callable, Hashable
+import functools
+from typing import Any
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+FRAGMENT_STATE_KEY = "_fragment_state"
+
+
+def isolated_fragment(func: Callable) -> Callable:
+    """
+    Run ``func`` as a Streamlit fragment (partial rerun scope).
+
+    Args:
+        func: Function rendering a filter + chart group
+
+    Returns:
+        Wrapped function; a plain call when there is no script run context
+    """
+    streamlit_fragment = st.fragment(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return func(*args, **kwargs)
+        return streamlit_fragment(*args, **kwargs)
+
+    return wrapper
+
+
+@isolated_fragment
+def render_in_fragment(render: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Render one chart group (e.g. a tab body) in its own fragment.
+
+    Widgets inside ``render`` then rerun only that group.
+    """
+    return render(*args, **kwargs)
+
+
+def fragment_state(name: str) -> dict[str, Any]:
+    """
+    Per-fragment store kept in the session.
+
+    Args:
+        name: Fragment name
+
+    Returns:
+        Mutable dict owned by this fragment in the current session
+    """
+    stores = st.session_state.setdefault(FRAGMENT_STATE_KEY, {})
+    return stores.setdefault(name, {})
+
+
+def fragment_memo(
+    name: str,
+    slot: str,
+    key: Hashable,
+    compute: Callable[[], Any],
+    source: Any = None,
+) -> Any:
+    """
+    Value of ``compute()`` memoized in a fragment store.
+
+    The value is reused while ``key`` is equal and ``source`` is the same
+    object, i.e. across reruns of the fragment itself; a full page rerun
+    that reloads the source data recomputes it.
+
+    Args:
+        name: Fragment name
+        slot: Value name inside the store
+        key: Inputs the value depends on (e.g. the selected filters)
+        compute: Builds the value
+        source: Object the value was derived from
+
+    Returns:
+        Memoized or freshly computed value
+    """
+    store = fragment_state(name)
+    cached = store.get(slot)
+    if cached is not None and cached[0] is source and cached[1] == key:
+        return cached[2]
+    value = compute()
+    store[slot] = (source, key, value)
+    return value
+
+
+def clear_fragment_state(name: str | None = None) -> None:
+    """Drop one fragment store (or all of them) from the session."""
+    stores = st.session_state.get(FRAGMENT_STATE_KEY)
+    if not stores:
+        return
+    if name is None:
+        stores.clear()
+    else:
+        stores.pop(name, None)
@@ -0,0 +1,62 @@
+"""
+Level-of-Detail Controls
+========================
+
+Drill-down widgets for heatmaps built from a ``HeatmapPyramid``.
+
+Plotly zoom and pan happen in the browser and never reach the script, so a
+heatmap that was aggregated to fit its cell budget is drilled into with a
+range slider: narrowing the window re-renders it at a finer level, down to
+full resolution. The slider only appears when the axis exceeds its budget.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+import streamlit as st
+
+from scripts.plotting.heatmap_lod import HeatmapPyramid, LodView
+
+
+def lod_window(key: str, labels: list[str], budget: int, axis: str = "rows") -> tuple[int, int] | None:
+    """
+    Range slider selecting the part of an axis to show in detail.
+
+    Args:
+        key: Widget key
+        labels: Axis labels of the full matrix
+        budget: Items the chart shows at full resolution
+        axis: Axis name used in the slider label
+
+    Returns:
+        ``(start, stop)`` window, or None when the axis fits the budget
+    """
+    size = len(labels)
+    if size <= budget:
+        return None
+
+    start, stop = st.slider(
+        f"🔍 Detail window ({axis})",
+        min_value=0,
+        max_value=size,
+        value=(0, size),
+        key=key,
+        help=f"{size} {axis} exceed the {budget} drawn at full resolution; "
+             "narrow the window to drill in.",
+    )
+    if stop <= start:
+        stop = min(size, start + 1)
+        start = stop - 1
+    st.caption(f"{labels[start]} → {labels[stop - 1]}")
+    return start, stop
+
+
+def lod_row_window(key: str, pyramid: HeatmapPyramid, max_rows: int) -> tuple[int, int] | None:
+    """Row drill-down window for ``pyramid`` (see ``lod_window``)."""
+    return lod_window(key, pyramid.row_labels, max_rows)
+
+
+def render_lod_caption(view: LodView) -> None:
+    """Tell the user when a heatmap is aggregated."""
+    if not view.full_resolution:
+        st.caption(f"ℹ️ {view.describe()}.")
@@ -33,6 +33,7 @@ from dashboard.components.initiative_analysis.charts.comparison import (
     render_distributions_tab,
     render_methodology_deepdive_tab,
     render_performance_heatmap_tab,
+    render_spatial_overlap_tab,
 )
 from dashboard.components.initiative_analysis.charts.comparison.distributions_component import render_methodology_distribution
 from dashboard.components.initiative_analysis.charts.comparison.bar_chart_component import render_bar_chart_tab
@@ -42,6 +43,7 @@ from dashboard.components.initiative_analysis.charts.detailed import (
     render_bars_tab,
     render_heatmap_tab,
     render_radar_chart_tab,
+    render_zonal_stats_tab,
 )
 from dashboard.components.initiative_analysis.charts.temporal import (
     render_coverage_matrix_heatmap,
@@ -49,6 +51,8 @@ from dashboard.components.initiative_analysis.charts.temporal import (
     render_gaps_analysis,
     render_timeline_tab,
 )
+from dashboard.components.shared.fragments import render_in_fragment
+from scripts.utilities.data_plane import session_initiatives, session_metadata
 
 # Adicionar project root ao path
 _project_root = Path(__file__).resolve().parent.parent
@@ -56,13 +60,14 @@ if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
 
-def run(metadata=None, df_original=None):
+def run(metadata=None, df_original=None, page=None):
     """
     Execute comprehensive analysis of LULC initiatives with sidebar menu.
 
     Args:
         metadata: Dictionary of initiative metadata (optional)
         df_original: Original DataFrame with initiative data (optional)
+        page: Page to render (defaults to st.session_state.current_page)
     """
     # Standard visual header
     st.markdown(
@@ -95,32 +100,18 @@ def run(metadata=None, df_original=None):
     if metadata is not None and df_original is not None:
         df_for_analysis = df_original
         meta_geral = metadata
-    elif (
-        "df_interpreted" in st.session_state
-        and not st.session_state.df_interpreted.empty
-    ):
-        df_for_analysis = st.session_state.df_interpreted
-        meta_geral = st.session_state.get("metadata", {})
-        if not meta_geral:
-            try:
-                from scripts.utilities.json_interpreter import _load_jsonc_file
-                metadata_file_path = (
-                    _project_root / "data" / "initiatives_metadata.jsonc"
-                )
-                meta_geral = _load_jsonc_file(metadata_file_path)
-            except Exception as e:
-                st.error(f"Error loading metadata: {e}")
-                return
     else:
-        st.error("❌ No data available for initiative analysis.")
-        return
+        # Shared read-only data of this session's version (no per-session copy)
+        df_for_analysis = session_initiatives()
+        meta_geral = session_metadata()
 
     # Check if we have enough data
     if df_for_analysis is None or df_for_analysis.empty:
         st.warning("⚠️ No initiative data available for analysis.")
         return
 
-    # Add Display_Name if not present
+    # Display_Name is precomputed by the data plane; only add it to
+    # frames passed in explicitly
     if "Display_Name" not in df_for_analysis.columns:
         df_for_analysis = df_for_analysis.copy()
         if "Acronym" in df_for_analysis.columns:
@@ -129,7 +120,7 @@ def run(metadata=None, df_original=None):
             df_for_analysis["Display_Name"] = df_for_analysis["Name"].str[:10]
 
     # Use navigation system from app.py
-    current_page = st.session_state.get("current_page", "Temporal Analysis")
+    current_page = page or st.session_state.get("current_page", "Temporal Analysis")
 
     # Render page based on main menu selection
     if current_page == "Temporal Analysis":
@@ -167,14 +158,15 @@ def render_comparative_analysis(df: pd.DataFrame, metadata: dict) -> None:
         unsafe_allow_html=True,
     )
 
-    # Filtros removidos conforme solicitado. Usar df diretamente.
-    filtered_df = df.copy()
+    # Filtros removidos conforme solicitado. Usar df diretamente (somente leitura).
+    filtered_df = df
 
     st.markdown("---")
     st.markdown("### 📊 Comparison Charts")
     st.markdown("*Comparison of LULC mapping initiatives characteristics using different approaches.*")
 
-    # Abas de análise comparativa usando todos os componentes
+    # Abas de análise comparativa usando todos os componentes; cada aba é um
+    # fragmento, então seus filtros/widgets só reexecutam a própria aba
     tab_labels = [
         "𝒂/𝓫 Pairwise Performance",
         "📉 Distributions Analysis",
@@ -183,6 +175,7 @@ def render_comparative_analysis(df: pd.DataFrame, metadata: dict) -> None:
         "🏷️ Class Details",
         "🔬 Methodology Deep Dive",
         "🔥 Normalized Performance",
+        "🗺️ Spatial Overlap",
         "📋 Detailed Table",
     ]
     (
@@ -193,22 +186,23 @@ def render_comparative_analysis(df: pd.DataFrame, metadata: dict) -> None:
         tab_class_details,
         tab_method_deep,
         tab_perf_norm,
+        tab_spatial,
         tab_table,
     ) = st.tabs(tab_labels)
 
     with tab_acc_res:
-        render_accuracy_resolution_tab(filtered_df)
+        render_in_fragment(render_accuracy_resolution_tab, filtered_df)
     with tab_res:
         # Distribution Analysis (distribution)
-        render_distributions_tab(filtered_df)  # includes sub-tabs, can be adjusted
+        render_in_fragment(render_distributions_tab, filtered_df)  # includes sub-tabs, can be adjusted
     with tab_acc:
         # Global accuracy (bar chart)
-        render_bar_chart_tab(filtered_df)
+        render_in_fragment(render_bar_chart_tab, filtered_df)
     with tab_method_dist:
         # Methodology distribution
-        render_methodology_distribution(filtered_df)
+        render_in_fragment(render_methodology_distribution, filtered_df)
     with tab_class_details:
-        render_class_details_tab(filtered_df)
+        render_in_fragment(render_class_details_tab, filtered_df)
     # Check for required columns
     methodology_cols = [col for col in filtered_df.columns if 'methodology' in col.lower() or 'method' in col.lower()]
     performance_cols = [col for col in filtered_df.columns if filtered_df[col].dtype in ['float64', 'int64'] and col.lower() != 'initiative']
@@ -218,17 +212,19 @@ def render_comparative_analysis(df: pd.DataFrame, metadata: dict) -> None:
         if not methodology_cols:
             st.warning("⚠️ No methodology column found in the data. Please check your input file.")
         else:
-            render_methodology_deepdive_tab(filtered_df)
+            render_in_fragment(render_methodology_deepdive_tab, filtered_df)
     with tab_perf_norm:
         if not performance_cols:
             st.warning("⚠️ No numerical performance columns found in the data. Please check your input file.")
         else:
-            render_performance_heatmap_tab(filtered_df)
+            render_in_fragment(render_performance_heatmap_tab, filtered_df)
+    with tab_spatial:
+        render_in_fragment(render_spatial_overlap_tab, filtered_df)
     with tab_table:
         if filtered_df.empty:
             st.warning("⚠️ No data available for detailed table.")
         else:
-            render_detailed_table_tab(filtered_df)
+            render_in_fragment(render_detailed_table_tab, filtered_df)
 
 
 def render_temporal_analysis(df: pd.DataFrame, metadata: dict) -> None:
@@ -328,13 +324,14 @@ def render_detailed_analysis(df: pd.DataFrame, metadata: dict) -> None:
     st.markdown("### 📊 Detailed Analysis")
     st.markdown("*Detailed statistical analysis.*")
     # Detailed analysis tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
         [
             "📊 Bar Chart",
             "🎯 Radar Chart",
             "🔥 Heatmap",
             "📋 Data Details",
             "📅 Annual Coverage",
+            "🗺️ Zonal Statistics",
         ]
     )
     with tab1:
@@ -402,6 +399,13 @@ def render_detailed_analysis(df: pd.DataFrame, metadata: dict) -> None:
         )
         render_annual_coverage_tab(df_filtered)
 
+    with tab6:
+        st.markdown("#### 🗺️ Zonal Statistics")
+        st.markdown(
+            "Class areas per state or mesoregion computed from local raster exports of the selected initiatives."
+        )
+        render_zonal_stats_tab(df_filtered)
+
 
 def prepare_temporal_data(metadata: dict, df: pd.DataFrame) -> pd.DataFrame:
     """
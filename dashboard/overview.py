@@ -16,8 +16,11 @@ from pathlib import Path
 import pandas as pd
 import streamlit as st
 
-from dashboard.components.overview import lulc_classes, summary_cards
+from dashboard.components.overview import filters, initiative_map, lulc_classes, summary_cards
 from dashboard.components import agricultural_data
+from scripts.utilities.data_plane import session_snapshot
+from scripts.utilities.search_index import get_search_index
+from scripts.utilities.sensor_resolver import SensorResolver, get_sensor_resolver
 
 # Add scripts to path if necessary
 current_dir = Path(__file__).parent.parent  # dashboard-iniciativas/
@@ -107,18 +110,26 @@ def render_initiative_details(df: pd.DataFrame, meta: dict, sensors_meta: dict)
         return
 
     # Add acronyms if available
-    options = []
+    acronyms = df["Acronym"].tolist() if "Acronym" in df.columns else ["N/A"] * len(initiative_names)
     name_mapping = {}
-
-    for name in initiative_names:
-        acronym = (
-            df[df["Name"] == name]["Acronym"].iloc[0]
-            if "Acronym" in df.columns
-            else "N/A"
-        )
+    for name, acronym in zip(initiative_names, acronyms):
         display_name = f"{name} ({acronym})" if acronym != "N/A" else name
-        options.append(display_name)
         name_mapping[display_name] = name
+    options = list(name_mapping)
+
+    # Ranked search (name, acronym, provider, methodology, classes and sensors)
+    query = st.text_input(
+        "🔍 Search initiatives:",
+        key="modern_overview_search",
+        placeholder="e.g. sentinel, mapbiomas, soybean…",
+    )
+    if query.strip():
+        ranked = _search_initiatives(query)
+        matching = [display for display, name in name_mapping.items() if name in ranked]
+        if matching:
+            options = sorted(matching, key=lambda display: ranked[name_mapping[display]])
+        else:
+            st.caption(f"No initiatives match '{query}'; showing all.")
 
     selected_display = st.selectbox(
         "Select an initiative for detailed analysis:",
@@ -135,6 +146,29 @@ def render_initiative_details(df: pd.DataFrame, meta: dict, sensors_meta: dict)
         _render_selected_initiative(selected_data, selected_metadata, sensors_meta)
 
 
+def _search_initiatives(query: str) -> dict[str, int]:
+    """
+    Rank initiatives matching ``query``.
+
+    Initiatives referencing a matching sensor are ranked after the direct
+    matches.
+
+    Returns:
+        Initiative name → rank (0 = best)
+    """
+    snapshot = session_snapshot()
+    index = get_search_index(snapshot)
+    hits = index.search(query, limit=None)
+
+    ranked = [hit.key for hit in hits if hit.kind == "initiative"]
+    sensor_keys = {hit.key for hit in hits if hit.kind == "sensor"}
+    if sensor_keys and "Primary_Sensor" in snapshot.initiatives.columns:
+        for name, sensor in zip(snapshot.initiatives["Name"], snapshot.initiatives["Primary_Sensor"]):
+            if sensor in sensor_keys and name not in ranked:
+                ranked.append(name)
+    return {name: rank for rank, name in enumerate(ranked)}
+
+
 def _render_selected_initiative(
     data: pd.Series, metadata: dict, sensors_meta: dict
 ) -> None:
@@ -199,13 +233,7 @@ def _render_key_metrics_cards(data: pd.Series) -> None:
         data.get("Classes", data.get("Number_of_Classes", "")), errors="coerce"
     )
     # Calculate temporal coverage (years)
-    available_years_str = data.get("Available_Years_List", "[]")
-    try:
-        available_years = (
-            json.loads(available_years_str) if available_years_str else []
-        )
-    except Exception:
-        available_years = []
+    available_years = _available_years(data)
     years_coverage = len(available_years)
 
     # Custom CSS for colored cards
@@ -320,16 +348,17 @@ def _render_key_metrics_cards(data: pd.Series) -> None:
 def _render_sensor_details(data: pd.Series, sensors_meta: dict) -> None:
     """Render sensor details using metadata."""
 
-    # Look for sensor information in the initiative data
-    sensor_fields = ["Sensor", "Primary_Sensor", "Sensors_Used", "Data_Source"]
-    sensor_info = None
-
-    for field in sensor_fields:
-        if field in data and pd.notna(data[field]) and str(data[field]).strip():
-            sensor_info = str(data[field]).strip()
-            break
+    # Sensor resolutions are precomputed once per data version
+    snapshot = session_snapshot()
+    resolver = (
+        get_sensor_resolver(snapshot)
+        if sensors_meta is snapshot.sensors
+        else SensorResolver(sensors_meta)
+    )
+    resolution = resolver.for_initiative(data)
+    sensor_info = resolution.sensor_info
 
-    if not sensor_info or sensor_info.lower() in ["n/a", "none", "-", ""]:
+    if not sensor_info:
         st.info("💡 No specific sensor information available for this initiative.")
 
         # Try to show alternative sensor-related information
@@ -342,20 +371,8 @@ def _render_sensor_details(data: pd.Series, sensors_meta: dict) -> None:
                     break
         return
 
-    # Try to match with sensor metadata
-    sensor_key = None
-    sensor_data = None
-
-    # Look for exact matches or partial matches in sensor metadata
-    for key, meta in sensors_meta.items():
-        if (
-            key.lower() in sensor_info.lower()
-            or sensor_info.lower() in key.lower()
-            or meta.get("display_name", "").lower() in sensor_info.lower()
-        ):
-            sensor_key = key
-            sensor_data = meta
-            break
+    sensor_key = resolution.sensor_key
+    sensor_data = sensors_meta.get(sensor_key) if sensor_key else None
 
     if sensor_data:
         # Display rich sensor information
@@ -450,13 +467,7 @@ def _render_technical_details(data: pd.Series, metadata: dict) -> None:
     # Temporal information
     with st.expander("⏳ Temporal Information"):
         # Parse available years
-        available_years_str = data.get("Available_Years_List", "[]")
-        try:
-            available_years = (
-                json.loads(available_years_str) if available_years_str else []
-            )
-        except json.JSONDecodeError:
-            available_years = []
+        available_years = _available_years(data)
 
         if available_years:
             st.write(f"**First Year:** {min(available_years)}")
@@ -466,57 +477,37 @@ def _render_technical_details(data: pd.Series, metadata: dict) -> None:
             st.write("**Temporal Coverage:** Not available")
 
 
-def load_sensor_metadata() -> dict:
-    """Load sensor metadata with proper error handling."""
-    sensors_meta = {}
-
+def _available_years(data: pd.Series) -> list:
+    """Available years of an initiative (precomputed by the data plane)."""
+    years = data.get("Available_Years")
+    if years is not None:
+        return list(years)
+    available_years_str = data.get("Available_Years_List", "[]")
     try:
-        from scripts.utilities.json_interpreter import _load_jsonc_file
-
-        current_dir = Path(__file__).parent.parent
-        sensors_metadata_path = current_dir / "data" / "json" / "sensors_metadata.jsonc"
-        fallback_metadata_path = (
-            current_dir / "data" / "json" / "sensors_metadata_original.jsonc"
-        )
-
-        if sensors_metadata_path.exists():
-            sensors_meta = _load_jsonc_file(sensors_metadata_path)
-        elif fallback_metadata_path.exists():
-            sensors_meta = _load_jsonc_file(fallback_metadata_path)
-
-        if isinstance(sensors_meta, dict):
-            return sensors_meta
+        return json.loads(available_years_str) if available_years_str else []
+    except json.JSONDecodeError:
+        return []
 
-    except Exception as e:
-        st.error(f"❌ Error loading sensor metadata: {e}")
 
-    return {}
+def load_sensor_metadata() -> dict:
+    """Sensor metadata (shared, read-only copy kept by the data plane)."""
+    return session_snapshot().sensors
 
 
 def run() -> None:
     """Main function to run the modern overview dashboard."""
 
-    # Check session state for required data
-    if "metadata" not in st.session_state or "df_interpreted" not in st.session_state:
-        st.error(
-            "❌ Data not found in session state. Please ensure the app loads data correctly."
-        )
-        return
-
-    df = st.session_state.get("df_interpreted", pd.DataFrame())
-    meta = st.session_state.get("metadata", {})
+    # Shared read-only data of this session's version
+    snapshot = session_snapshot()
+    df = snapshot.initiatives
+    meta = snapshot.metadata
 
     if df is None or df.empty:
         st.error("❌ No initiative data available for the overview dashboard.")
         return
 
-    # Load sensor metadata
-    sensors_meta = load_sensor_metadata()
-    if sensors_meta:
-        st.session_state.sensors_meta = sensors_meta
-
-    # Apply any filters (using components)
-    # filters.render(df)  # Uncomment if filter component is needed
+    # Sensor metadata is loaded once per data version by the data plane
+    sensors_meta = snapshot.sensors
 
     # Render visually styled header (like Initiative Analysis)
     st.markdown(
@@ -539,10 +530,19 @@ def run() -> None:
         unsafe_allow_html=True,
     )
 
+    # Filter panel: the sections below show the filtered initiatives
+    df = filters.render(df)
+
     # Render main overview sections using components
-    render_overview_metrics(df, meta)
-    render_initiative_details(df, meta, sensors_meta)
-    
+    if df.empty:
+        st.info("ℹ️ No initiatives match the selected filters.")
+    else:
+        render_overview_metrics(df, meta)
+        render_initiative_details(df, meta, sensors_meta)
+
+        st.markdown("---")
+        initiative_map.render(df)
+
     # Add Brazilian agricultural data section
     st.markdown("---")
     agricultural_data.render()
@@ -0,0 +1,138 @@
+"""
+Performance Module
+==================
+
+Página oculta (``?view=performance``) com os tempos de renderização por
+componente registrados por ``scripts.utilities.render_tracing``.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from scripts.utilities.cache_warmup import get_warmup_status, get_warmup_worker
+from scripts.utilities.render_tracing import (
+    TRACING_MODES,
+    get_tracer,
+    get_tracing_mode,
+    set_tracing_mode,
+)
+from scripts.utilities.single_flight import get_single_flight_stats
+from scripts.utilities.table_downloads import lazy_download_button
+
+
+def run() -> None:
+    """Renderiza a página de performance."""
+    tracer = get_tracer()
+
+    st.title("⚡ Performance")
+    st.caption(
+        "Tempos por componente (janela deslizante em memória do processo). "
+        "O modo 'full' também mede alocações (tracemalloc) e o tamanho dos gráficos; "
+        "alocações e picos de memória são do processo inteiro (incluem outras sessões)."
+    )
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        mode = st.radio(
+            "Tracing mode",
+            TRACING_MODES,
+            index=TRACING_MODES.index(get_tracing_mode()),
+            horizontal=True,
+            key="performance_tracing_mode",
+        )
+        if mode != get_tracing_mode():
+            set_tracing_mode(mode)
+    with col2:
+        if st.button("🗑️ Clear window", key="performance_clear"):
+            tracer.clear()
+    with col3:
+        lazy_download_button(
+            lambda: tracer.to_json().encode("utf-8"),
+            "⬇️ JSON dump",
+            "render_timings.json",
+            "application/json",
+            key="performance_json",
+        )
+
+    _render_warmup_status()
+    _render_single_flight_stats()
+
+    summary = pd.DataFrame(tracer.summary())
+    if summary.empty:
+        st.info("Nenhuma medição ainda. Navegue pelas páginas do dashboard.")
+        return
+
+    pages = summary[summary["component"].str.startswith("page:")]
+    components = summary[~summary["component"].str.startswith("page:")]
+
+    st.subheader("Pages")
+    st.dataframe(pages, hide_index=True, use_container_width=True)
+
+    st.subheader("Components")
+    st.dataframe(components, hide_index=True, use_container_width=True)
+
+    last_rerun = tracer.last_rerun()
+    if last_rerun:
+        st.subheader("Last rerun")
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "component": r.component,
+                        "wall_ms": round(r.wall_ms, 2),
+                        "cpu_ms": round(r.cpu_ms, 2),
+                        "process_peak_kb": r.process_peak_kb,
+                        "payload_kb": round(r.payload_bytes / 1024, 1),
+                    }
+                    for r in last_rerun
+                ]
+            ).sort_values("wall_ms", ascending=False),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def _render_warmup_status() -> None:
+    """Mostra o progresso do pré-aquecimento de caches em segundo plano."""
+    status = get_warmup_status()
+    st.subheader("Cache warm-up")
+    if status is None:
+        st.caption("Worker inativo (LANDAGRI_WARMUP=0 ou fora de `streamlit run`).")
+        return
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        label = f"{status['state']} · data {status['version'] or '-'} · {status['completed']}/{status['total']}"
+        if status["current"]:
+            label += f" · {status['current']}"
+        st.progress(min(1.0, status["progress"]), text=label)
+    with col2:
+        if st.button("🔥 Re-warm", key="performance_rewarm"):
+            worker = get_warmup_worker()
+            if worker is not None:
+                worker.request_warmup()
+
+    if status["durations"]:
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {"page": page, "seconds": seconds, "error": status["errors"].get(page)}
+                    for page, seconds in status["durations"].items()
+                ]
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def _render_single_flight_stats() -> None:
+    """Mostra quantas chamadas concorrentes de carregadores foram agrupadas."""
+    stats = get_single_flight_stats()
+    if not stats:
+        return
+    st.subheader("Single-flight loaders")
+    st.dataframe(
+        pd.DataFrame([{"function": name, **counters} for name, counters in stats.items()]),
+        hide_index=True,
+        use_container_width=True,
+    )
@@ -20,7 +20,6 @@ Date: 2025
 
 import contextlib
 import json
-import re
 import sys
 import warnings
 from datetime import datetime
@@ -36,6 +35,14 @@ warnings.filterwarnings("ignore")
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
+from scripts.utilities.metadata_normalization import (
+    accuracy_value as accuracy_value_normalizer,
+    method_category,
+    methodology_group,
+    reference_system_epsg,
+    resolution_value as resolution_value_normalizer,
+)
+
 try:
     from scripts.utilities.config import standardize_dataframe_columns
 except ImportError:
@@ -54,173 +61,27 @@ class UnifiedDataProcessor:
 
     def _parse_enhanced_accuracy(self, accuracy_value):
         """Enhanced accuracy parsing to support both traditional and new structured formats."""
-        # Handle new structured accuracy format
-        if isinstance(accuracy_value, dict):
-            # Check if it's the new structured format with status
-            if "status" in accuracy_value:
-                # Handle "not_available" status
-                if accuracy_value.get("status") == "not_available":
-                    return 0.0
-                # Handle other statuses with overall value
-                return self._parse_enhanced_accuracy(accuracy_value.get("overall", 0))
-
-            # Handle new accuracy object format
-            if "overall" in accuracy_value:
-                return self._parse_enhanced_accuracy(accuracy_value.get("overall", 0))
-
-            # Fallback for unknown dict format
-            return 0.0
-
-        # Handle traditional formats using existing parse_accuracy function
-        return self.parse_accuracy(accuracy_value)
+        return accuracy_value_normalizer(accuracy_value)
 
     def parse_accuracy(self, accuracy_value: str | int | float | dict) -> float:
         """Parse accuracy value from various formats into a float percentage."""
-        if isinstance(accuracy_value, dict):
-            # Check if it's the new structured format
-            if "status" in accuracy_value:
-                # Handle "not_available" status
-                if accuracy_value.get("status") == "not_available":
-                    return 0.0
-                # Handle other statuses with overall value
-                return self.parse_accuracy(accuracy_value.get("overall", 0))
-            # Handle new accuracy object format
-            if "overall" in accuracy_value:
-                return self.parse_accuracy(accuracy_value.get("overall", 0))
-            # Fallback for unknown dict format
-            return 0.0
-
-        # Handle traditional formats
-        if isinstance(accuracy_value, int | float):
-            return float(accuracy_value)
-
-        if not accuracy_value or accuracy_value in [
-            "Not informed",
-            "Incomplete",
-            "N/A",
-            "Not available",
-        ]:
-            return 0.0
-
-        try:
-            accuracy_str = re.sub(r"[^\d.]", "", str(accuracy_value))
-            return float(accuracy_str) if accuracy_str else 0.0
-        except (ValueError, TypeError):
-            return 0.0
+        return accuracy_value_normalizer(accuracy_value)
 
     def _parse_enhanced_resolution(self, resolution_value):
         """Enhanced resolution parsing to support both traditional and new structured formats."""
-        # Handle new structured resolution format (array of objects)
-        if isinstance(resolution_value, list):
-            # Find current resolution or use the first one
-            for res_obj in resolution_value:
-                if isinstance(res_obj, dict) and res_obj.get("current", False):
-                    return self._parse_enhanced_resolution(
-                        res_obj.get("resolution", 30)
-                    )
-
-            # If no current resolution, use the first one
-            if resolution_value and isinstance(resolution_value[0], dict):
-                return self._parse_enhanced_resolution(
-                    resolution_value[0].get("resolution", 30)
-                )
-
-            # Fallback for mixed array formats
-            for res in resolution_value:
-                if isinstance(res, int | float):
-                    return float(res)
-
-            return 30.0
-
-        # Handle traditional formats using existing parse_resolution function
-        return self.parse_resolution(resolution_value)
+        return resolution_value_normalizer(resolution_value)
 
     def _parse_enhanced_reference_system(self, reference_system_value):
         """Enhanced reference system parsing to support both traditional and new structured formats."""
-        # Handle new structured reference system format (array of objects)
-        if isinstance(reference_system_value, list):
-            # Extract EPSG codes and create a readable string
-            epsg_codes = []
-            for ref_obj in reference_system_value:
-                if isinstance(ref_obj, dict):
-                    epsg_code = ref_obj.get("epsg_code", "")
-                    hemisphere = ref_obj.get("hemisphere", "")
-                    if epsg_code:
-                        if hemisphere:
-                            epsg_codes.append(f"{epsg_code} ({hemisphere})")
-                        else:
-                            epsg_codes.append(epsg_code)
-
-            if epsg_codes:
-                return ", ".join(epsg_codes)
-            else:
-                return "EPSG:4326"
-
-        # Handle traditional string format
-        if isinstance(reference_system_value, str):
-            return reference_system_value
-
-        return "EPSG:4326"
+        return reference_system_epsg(reference_system_value)
 
     def parse_resolution(self, resolution_value: str | int | float | list) -> float:
         """Enhanced resolution parsing function to handle new structured formats."""
-        # Handle new structured resolution format (array of objects)
-        if isinstance(resolution_value, list):
-            # Find current resolution or use the first one
-            for res_obj in resolution_value:
-                if isinstance(res_obj, dict) and res_obj.get("current", False):
-                    return self.parse_resolution(res_obj.get("resolution", 30))
-
-            # If no current resolution, use the first one
-            if resolution_value and isinstance(resolution_value[0], dict):
-                return self.parse_resolution(resolution_value[0].get("resolution", 30))
-
-            # Fallback for mixed array formats
-            for res in resolution_value:
-                if isinstance(res, int | float):
-                    return float(res)
-
-            return 30.0
-
-        # Handle traditional formats
-        if isinstance(resolution_value, int | float):
-            return float(resolution_value)
-
-        if not resolution_value:
-            return 30.0
-
-        try:
-            resolution_str = re.sub(r"[^\d.]", "", str(resolution_value))
-            return float(resolution_str) if resolution_str else 30.0
-        except (ValueError, TypeError):
-            return 30.0
+        return resolution_value_normalizer(resolution_value)
 
     def parse_reference_system(self, reference_system_value: str | list) -> str:
         """Enhanced reference system parsing function to handle new structured formats."""
-        # Handle new structured reference system format (array of objects)
-        if isinstance(reference_system_value, list):
-            # Extract EPSG codes and create a readable string
-            epsg_codes = []
-            for ref_obj in reference_system_value:
-                if isinstance(ref_obj, dict):
-                    epsg_code = ref_obj.get("epsg_code", "")
-                    hemisphere = ref_obj.get("hemisphere", "")
-                    if epsg_code:
-                        if hemisphere:
-                            epsg_codes.append(f"{epsg_code} ({hemisphere})")
-                        else:
-                            epsg_codes.append(epsg_code)
-
-            if epsg_codes:
-                return ", ".join(epsg_codes)
-            else:
-                return "EPSG:4326"
-
-        # Handle traditional string format
-        if isinstance(reference_system_value, str):
-            return reference_system_value
-
-        return "EPSG:4326"
+        return reference_system_epsg(reference_system_value)
 
     def get_accuracy_details(
         self, accuracy_value: str | int | float | dict
@@ -347,90 +208,11 @@ class UnifiedDataProcessor:
 
     def categorize_methodology(self, method: str) -> str:
         """Unified methodology categorization function."""
-        method_lower = method.lower()
-
-        if any(
-            term in method_lower
-            for term in ["deep learning", "neural network", "cnn", "u-net"]
-        ):
-            return "Deep Learning"
-        elif any(
-            term in method_lower
-            for term in [
-                "machine learning",
-                "random forest",
-                "gradient boost",
-                "catboost",
-            ]
-        ):
-            return "Machine Learning"
-        elif any(term in method_lower for term in ["visual interpretation", "visual"]):
-            return "Visual Interpretation"
-        elif any(
-            term in method_lower
-            for term in ["statistical", "regression", "decision tree"]
-        ):
-            return "Statistical Methods"
-        else:
-            return "Combined"
+        return method_category(method)
 
     def standardize_methodology(self, classification_method: str) -> str:
         """Standardize methodology into broader categories for better chart visualization."""
-        if not classification_method:
-            return "Unknown"
-
-        method = classification_method.lower()
-
-        # Deep Learning and Neural Networks
-        if any(
-            word in method
-            for word in [
-                "deep learning",
-                "neural network",
-                "u-net",
-                "cnn",
-                "convolutional",
-            ]
-        ):
-            return "Deep Learning"
-
-        # Machine Learning (traditional)
-        elif any(
-            word in method
-            for word in [
-                "random forest",
-                "gradient boost",
-                "decision tree",
-                "machine learning",
-                "catboost",
-            ]
-        ):
-            return "Machine Learning"
-
-        # Visual Interpretation with other methods = Hybrid
-        elif "visual interpretation" in method:
-            if any(
-                word in method
-                for word in [
-                    "machine learning",
-                    "spectral",
-                    "classification",
-                    "random forest",
-                    "deep learning",
-                    "bhattacharya",
-                ]
-            ):
-                return "Hybrid"
-            else:
-                return "Visual Interpretation"
-
-        # Combined methods
-        elif "combined" in method or "," in method:
-            return "Hybrid"
-
-        # Default fallback
-        else:
-            return "Machine Learning"
+        return methodology_group(classification_method)
 
     def categorize_coverage(self, coverage: str) -> str:
         """Unified coverage categorization function."""
@@ -499,7 +281,31 @@ class UnifiedDataProcessor:
         # Convert metadata to standardized DataFrame
         df_data = []
 
-        for initiative_name, initiative_data in metadata.items():
+        # Normalize each metadata column in one batch (memoized per distinct value)
+        records = list(metadata.values())
+        resolutions = resolution_value_normalizer.batch(
+            record.get("spatial_resolution", 30) for record in records
+        )
+        accuracies = accuracy_value_normalizer.batch(
+            record.get("overall_accuracy", record.get("accuracy", 0))
+            for record in records
+        )
+        method_groups = methodology_group.batch(
+            record.get("classification_method", "") for record in records
+        )
+        method_categories = method_category.batch(
+            record.get("classification_method", "") for record in records
+        )
+
+        for (
+            (initiative_name, initiative_data),
+            resolution,
+            accuracy,
+            method_group,
+            category,
+        ) in zip(
+            metadata.items(), resolutions, accuracies, method_groups, method_categories
+        ):
             # Get temporal data from mapping or parse from metadata
             # temporal_years_input = self.temporal_data.get( # Removed as mappings are now handled by json_interpreter
             #     initiative_name,
@@ -524,16 +330,7 @@ class UnifiedDataProcessor:
 
             final_classes = classes_main
 
-            # Parse core metrics - now using English field names
-            resolution = self.parse_resolution(
-                initiative_data.get("spatial_resolution", 30)
-            )  # Enhanced accuracy parsing - support both old and new formats
-            accuracy_raw = initiative_data.get(
-                "overall_accuracy", initiative_data.get("accuracy", 0)
-            )
-            accuracy = self._parse_enhanced_accuracy(
-                accuracy_raw
-            )  # Create standardized row with English columns
+            # Create standardized row with English columns
             row = {
                 "Name": initiative_name,
                 "Acronym": initiative_data.get("acronym", initiative_name[:8]),
@@ -557,15 +354,11 @@ class UnifiedDataProcessor:
                 "Algorithm": initiative_data.get(
                     "methodology", ""
                 ),  # Detailed technical description
-                "Methodology": self.standardize_methodology(
-                    initiative_data.get("classification_method", "")
-                ),  # Standardized category
+                "Methodology": method_group,  # Standardized category
                 "Classification Method": initiative_data.get(
                     "classification_method", ""
                 ),
-                "Method Category": self.categorize_methodology(
-                    initiative_data.get("classification_method", "")
-                ),
+                "Method Category": category,
                 "Temporal Frequency": initiative_data.get("temporal_frequency", ""),
                 "Update Frequency": initiative_data.get("update_frequency", ""),
                 "Classes Legend": initiative_data.get("class_legend", ""),
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Admin Hierarchy
+===============
+
+Hierarquia administrativa do IBGE (município → microrregião → mesorregião →
+UF → região) e agregações pré-calculadas do calendário agrícola e da
+produção em cada nível.
+
+Características:
+- ``AdminHierarchy``: tabela dos 5.570 municípios lida do dump da API de
+  localidades do IBGE (``data/json/ibge_municipalities.json``); sem o
+  arquivo, a hierarquia começa nas UFs (UF → região)
+- ``CalendarRollup``: contagens de unidades com plantio/colheita por
+  (unidade, cultura, mês) em todos os níveis, somadas uma única vez por
+  grupos (``np.add.reduceat``) a partir das unidades do calendário
+- ``CalendarRollup.choose_level``: nível mais fino cujo número de células
+  (pares unidade/cultura × colunas) cabe no orçamento dos gráficos
+- ``CalendarRollup.crop_calendar``: o nível escolhido no formato
+  ``crop_calendar`` usado por todos os gráficos de calendário
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterable, Mapping
+import json
+from pathlib import Path
+import threading
+from typing import Any
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_processors.agricultural_data.safra_calendar import (
+    ACTIVITY_LABELS,
+    HARVEST,
+    MONTH_INDEX,
+    MONTHS,
+    PLANTING,
+    SafraCalendar,
+)
+from scripts.utilities.data_plane import freeze_value
+from scripts.utilities.geometry_store import IBGE_UF_CODES
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+HIERARCHY_PATH = PROJECT_ROOT / "data" / "json" / "ibge_municipalities.json"
+
+LEVELS = ("municipality", "microregion", "mesoregion", "state", "region")
+LEVEL_LABELS = {
+    "municipality": "Municipality",
+    "microregion": "Microregion",
+    "mesoregion": "Mesoregion",
+    "state": "State",
+    "region": "Region",
+}
+# Primeiro dígito dos códigos IBGE (UF, mesorregião, microrregião, município)
+IBGE_REGIONS = {"1": "North", "2": "Northeast", "3": "Southeast", "4": "South", "5": "Central-West"}
+STATE_REGIONS = {sigla: IBGE_REGIONS[code[0]] for code, sigla in IBGE_UF_CODES.items()}
+# Mesmo orçamento dos heatmaps com níveis de detalhe (120 × 120 células)
+CELL_BUDGET = 14_400
+
+
+def unit_region(code: Any) -> str | None:
+    """
+    Região de uma unidade a partir do código: sigla de UF, código IBGE
+    numérico (o primeiro dígito é a região) ou nome de região.
+    """
+    code = str(code or "").strip()
+    if code in STATE_REGIONS:
+        return STATE_REGIONS[code]
+    if code in IBGE_REGIONS.values():
+        return code
+    if code[:1].isdigit():
+        return IBGE_REGIONS.get(code[0])
+    return None
+
+
+def _group_sum(values: np.ndarray, groups: np.ndarray, size: int) -> np.ndarray:
+    """Soma as linhas de ``values`` por grupo (``groups`` em ``[0, size)``)."""
+    out = np.zeros((size,) + values.shape[1:], dtype=values.dtype)
+    if not len(groups):
+        return out
+    order = np.argsort(groups, kind="stable")
+    ordered = groups[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    out[ordered[starts]] = np.add.reduceat(values[order], starts, axis=0)
+    return out
+
+
+class AdminHierarchy:
+    """
+    Tabela de unidades administrativas, uma linha por unidade do nível mais
+    fino, com colunas ``<nível>_code`` e ``<nível>_name``.
+
+    Os índices de cada nível (linha → unidade) são somente leitura.
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        """
+        Args:
+            table: Uma linha por unidade do nível mais fino; os níveis
+                presentes devem ser contíguos e terminar em UF e região
+
+        Raises:
+            ValueError: Para tabela sem UF/região ou com níveis intercalados
+        """
+        levels = tuple(level for level in LEVELS if f"{level}_code" in table.columns)
+        if levels != LEVELS[len(LEVELS) - len(levels):] or len(levels) < 2:
+            raise ValueError(f"Níveis inválidos na hierarquia: {levels}")
+        self.levels = levels
+        self.leaf_level = levels[0]
+        self.units: dict[str, tuple[str, ...]] = {}
+        self.names: dict[str, tuple[str, ...]] = {}
+        self.regions: dict[str, tuple[str, ...]] = {}
+        self.index: dict[str, np.ndarray] = {}
+        self._rows: dict[str, dict[str, int]] = {}
+
+        regions = table["region_code"].astype(str).to_numpy()
+        for level in levels:
+            codes = table[f"{level}_code"].astype(str).to_numpy()
+            names_column = f"{level}_name"
+            names = table[names_column].astype(str).to_numpy() if names_column in table.columns else codes
+            units, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+            inverse = inverse.astype(np.int32)
+            inverse.flags.writeable = False
+            self.units[level] = tuple(units.tolist())
+            self.names[level] = tuple(names[first].tolist())
+            self.regions[level] = tuple(regions[first].tolist())
+            self.index[level] = inverse
+            self._rows[level] = dict(zip(units.tolist(), first.tolist()))
+
+    def __len__(self) -> int:
+        return len(self.index[self.leaf_level])
+
+    def size(self, level: str) -> int:
+        """Número de unidades do nível."""
+        return len(self.units[self._level(level)])
+
+    def _level(self, level: str) -> str:
+        if level not in self.index:
+            raise KeyError(f"Nível fora da hierarquia: {level!r} (disponíveis: {', '.join(self.levels)})")
+        return level
+
+    def locate(self, code: Any) -> tuple[str, int] | None:
+        """
+        Nível da unidade e uma linha da tabela que a contém (None se o
+        código não pertence à hierarquia).
+        """
+        code = str(code)
+        for level in self.levels:
+            row = self._rows[level].get(code)
+            if row is not None:
+                return level, row
+        return None
+
+    def unit_index(self, level: str, rows: np.ndarray) -> np.ndarray:
+        """Índice, no nível ``level``, da unidade de cada linha."""
+        return self.index[self._level(level)][rows]
+
+    @classmethod
+    def from_ibge(cls, records: Iterable[Mapping[str, Any]]) -> "AdminHierarchy":
+        """
+        Hierarquia a partir da resposta de ``/api/v1/localidades/municipios``.
+
+        Municípios sem microrregião (criados depois da divisão de 1989)
+        ficam numa micro/mesorregião "sem divisão" da própria UF.
+        """
+        rows = []
+        for record in records:
+            micro = record.get("microrregiao") or {}
+            meso = micro.get("mesorregiao") or {}
+            uf = meso.get("UF") or (
+                ((record.get("regiao-imediata") or {}).get("regiao-intermediaria") or {}).get("UF") or {}
+            )
+            if not uf:
+                raise ValueError(f"Município sem UF: {record.get('id')}")
+            uf_id = str(uf["id"])
+            rows.append({
+                "municipality_code": str(record["id"]),
+                "municipality_name": record.get("nome", str(record["id"])),
+                "microregion_code": str(micro.get("id") or f"{uf_id}000"),
+                "microregion_name": micro.get("nome") or f"{uf['sigla']} (sem microrregião)",
+                "mesoregion_code": str(meso.get("id") or f"{uf_id}00"),
+                "mesoregion_name": meso.get("nome") or f"{uf['sigla']} (sem mesorregião)",
+                "state_code": uf["sigla"],
+                "state_name": uf.get("nome", uf["sigla"]),
+                "region_code": IBGE_REGIONS[uf_id[0]],
+                "region_name": IBGE_REGIONS[uf_id[0]],
+            })
+        return cls(pd.DataFrame(rows))
+
+    @classmethod
+    def from_states(cls, state_names: Mapping[str, str] | None = None) -> "AdminHierarchy":
+        """Hierarquia UF → região das 27 UFs (nomes opcionais por sigla)."""
+        state_names = state_names or {}
+        siglas = sorted(STATE_REGIONS)
+        return cls(pd.DataFrame({
+            "state_code": siglas,
+            "state_name": [state_names.get(sigla, sigla) for sigla in siglas],
+            "region_code": [STATE_REGIONS[sigla] for sigla in siglas],
+            "region_name": [STATE_REGIONS[sigla] for sigla in siglas],
+        }))
+
+
+_hierarchy_lock = threading.Lock()
+_hierarchies: dict[tuple, AdminHierarchy] = {}
+
+
+def _hierarchy_signature(path: Path) -> tuple | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def get_admin_hierarchy(
+    path: str | Path = HIERARCHY_PATH,
+    state_names: Mapping[str, str] | None = None,
+) -> AdminHierarchy:
+    """
+    Hierarquia municipal do IBGE (compartilhada, recarregada quando o arquivo
+    muda) ou, sem o arquivo, a hierarquia das UFs.
+
+    Args:
+        path: Dump da API de localidades do IBGE
+        state_names: Nomes das UFs para a hierarquia sem municípios
+    """
+    signature = _hierarchy_signature(Path(path))
+    if signature is None:
+        return AdminHierarchy.from_states(state_names)
+    with _hierarchy_lock:
+        hierarchy = _hierarchies.get(signature)
+        if hierarchy is None:
+            with open(path, encoding="utf-8") as file:
+                hierarchy = AdminHierarchy.from_ibge(json.load(file))
+            _hierarchies.clear()
+            _hierarchies[signature] = hierarchy
+        return hierarchy
+
+
+class CalendarRollup:
+    """
+    Calendário agrícola (e produção, opcional) agregado em todos os níveis
+    da hierarquia a partir das unidades de origem.
+
+    Uma unidade de origem entra em todos os níveis iguais ou mais grossos que
+    o seu; os níveis disponíveis começam no nível mais grosso entre as
+    unidades de origem (UFs não se dividem em municípios).
+    """
+
+    def __init__(
+        self,
+        hierarchy: AdminHierarchy,
+        crops: Iterable[str],
+        units: Iterable[str],
+        codes: np.ndarray,
+        present: np.ndarray,
+        production: pd.DataFrame | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ):
+        """
+        Args:
+            hierarchy: Hierarquia administrativa
+            crops: Culturas (eixo 0)
+            units: Códigos das unidades de origem (eixo 1)
+            codes: Bits de atividade, ``uint8`` (cultura, unidade, 12)
+            present: Presença do par cultura/unidade
+            production: Tabela com ``code``, ``crop`` e colunas numéricas
+            metadata: ``metadata`` do calendário de origem
+        """
+        self.hierarchy = hierarchy
+        self.crops = tuple(crops)
+        units = [str(unit) for unit in units]
+        located = [hierarchy.locate(unit) for unit in units]
+        self.unplaced = tuple(unit for unit, place in zip(units, located) if place is None)
+        keep = np.array([place is not None for place in located], dtype=bool)
+        placed = [place for place in located if place is not None]
+        rows = np.array([row for _, row in placed], dtype=np.int64)
+        source_level = max((LEVELS.index(level) for level, _ in placed), default=LEVELS.index("state"))
+        self.levels = tuple(level for level in hierarchy.levels if LEVELS.index(level) >= source_level)
+        # Todas as unidades de origem já estão no nível mais fino disponível
+        self.native = all(level == self.levels[0] for level, _ in placed)
+        self.metadata = freeze_value(dict(metadata or {}))
+
+        # (unidade, cultura, 25): 12 meses de plantio, 12 de colheita e presença
+        codes = np.asarray(codes)[:, keep].transpose(1, 0, 2)
+        present = np.asarray(present)[:, keep].T
+        values = np.concatenate(
+            [(codes & PLANTING) > 0, (codes & HARVEST) > 0, present[..., None]], axis=-1
+        ).astype(np.int32)
+
+        self._counts: dict[str, np.ndarray] = {}
+        for level in self.levels:
+            counts = _group_sum(values, hierarchy.unit_index(level, rows), hierarchy.size(level))
+            counts.flags.writeable = False
+            self._counts[level] = counts
+
+        self._production: dict[str, pd.DataFrame] = {}
+        if production is not None and not production.empty:
+            self._rollup_production(production)
+        self._calendars: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _rollup_production(self, production: pd.DataFrame) -> None:
+        places = production["code"].astype(str).map(
+            lambda code: self.hierarchy.locate(code) or (None, -1)
+        )
+        unit_levels = np.array([LEVELS.index(level) if level else len(LEVELS) for level, _ in places])
+        rows = np.array([row for _, row in places], dtype=np.int64)
+        measures = production.drop(columns=["code", "crop"]).select_dtypes("number")
+        for level in self.levels:
+            included = unit_levels <= LEVELS.index(level)
+            index = self.hierarchy.unit_index(level, rows[included])
+            frame = measures[included].assign(
+                code=np.asarray(self.hierarchy.units[level], dtype=object)[index],
+                crop=production["crop"].to_numpy()[included],
+            )
+            summed = frame.groupby(["code", "crop"], as_index=False, sort=True).sum()
+            lookup = dict(zip(self.hierarchy.units[level], range(self.hierarchy.size(level))))
+            position = summed["code"].map(lookup).to_numpy()
+            summed.insert(1, "name", np.asarray(self.hierarchy.names[level], dtype=object)[position])
+            summed.insert(2, "region", np.asarray(self.hierarchy.regions[level], dtype=object)[position])
+            self._production[level] = summed
+
+    @classmethod
+    def from_safra(
+        cls,
+        calendar: SafraCalendar,
+        safra: str,
+        hierarchy: AdminHierarchy,
+        production: pd.DataFrame | None = None,
+    ) -> "CalendarRollup":
+        """
+        Agregações da safra ``safra`` de um ``SafraCalendar``.
+
+        Raises:
+            KeyError: Para safra desconhecida
+        """
+        if safra not in calendar.safras:
+            raise KeyError(f"Safra desconhecida: {safra!r}")
+        index = calendar.safras.index(safra)
+        return cls(
+            hierarchy,
+            calendar.crops,
+            calendar.states,
+            calendar.codes[index],
+            calendar.present[index],
+            production,
+            calendar.metadata.get("metadata", {}),
+        )
+
+    def _level(self, level: str) -> str:
+        if level not in self._counts:
+            raise KeyError(f"Nível sem dados: {level!r} (disponíveis: {', '.join(self.levels)})")
+        return level
+
+    def _crop_mask(self, crops: Iterable[str] | None) -> np.ndarray:
+        if crops is None:
+            return np.ones(len(self.crops), dtype=bool)
+        return np.isin(np.asarray(self.crops, dtype=object), list(crops))
+
+    def rows(self, level: str, crops: Iterable[str] | None = None) -> int:
+        """Número de pares unidade/cultura com calendário no nível."""
+        counts = self._counts[self._level(level)]
+        return int(np.count_nonzero(counts[:, self._crop_mask(crops), 24]))
+
+    def choose_level(
+        self,
+        columns: int = 12,
+        budget: int = CELL_BUDGET,
+        crops: Iterable[str] | None = None,
+    ) -> str:
+        """
+        Nível mais fino cujas linhas (pares unidade/cultura) × ``columns``
+        cabem em ``budget`` células; o mais grosso quando nenhum cabe.
+
+        Raises:
+            ValueError: Para orçamento ou número de colunas não positivo
+        """
+        if columns <= 0 or budget <= 0:
+            raise ValueError("columns e budget devem ser positivos")
+        for level in self.levels:
+            if self.rows(level, crops) * columns <= budget:
+                return level
+        return self.levels[-1]
+
+    def activity_counts(self, level: str) -> np.ndarray:
+        """
+        Contagens somente leitura (unidade, cultura, 25): unidades de origem
+        com plantio (meses 0–11), com colheita (12–23) e com calendário (24).
+        """
+        return self._counts[self._level(level)]
+
+    def crop_calendar(self, level: str, min_share: float = 0.0) -> Mapping[str, Any]:
+        """
+        Calendário do nível no formato ``crop_calendar``.
+
+        Cada unidade recebe plantio/colheita no mês em que a fração das suas
+        unidades de origem com a atividade passa de ``min_share`` (por padrão,
+        basta uma). ``state_code``/``state_name`` trazem o código e o nome da
+        unidade do nível; ``units`` é o número de unidades de origem.
+
+        Returns:
+            Dicionário congelado, compartilhado entre chamadas
+
+        Raises:
+            KeyError: Para nível sem dados
+            ValueError: Para ``min_share`` fora de [0, 1)
+        """
+        if not 0.0 <= min_share < 1.0:
+            raise ValueError(f"min_share fora de [0, 1): {min_share}")
+        key = (self._level(level), float(min_share))
+        cached = self._calendars.get(key)
+        if cached is not None:
+            return cached
+
+        counts = self._counts[level]
+        total = counts[..., 24:25]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            planting = counts[..., :12] / total > min_share
+            harvest = counts[..., 12:24] / total > min_share
+        labels = np.asarray(ACTIVITY_LABELS, dtype=object)[planting * PLANTING + harvest * HARVEST]
+
+        season_months = {
+            season: list(info.get("months", []))
+            for season, info in (self.metadata.get("seasons") or {}).items()
+        }
+        month_order = [m for months in season_months.values() for m in months if m in MONTH_INDEX]
+        month_order += [m for m in MONTHS if m not in month_order]
+        positions = [MONTH_INDEX[month] for month in month_order]
+
+        units, names, regions = (self.hierarchy.units[level], self.hierarchy.names[level], self.hierarchy.regions[level])
+        crop_calendar: dict[str, list[dict[str, Any]]] = {}
+        u_idx, c_idx = np.nonzero(total[..., 0])
+        for u, c in sorted(zip(u_idx.tolist(), c_idx.tolist()), key=lambda pair: (pair[1], pair[0])):
+            months = dict(zip(month_order, labels[u, c, positions].tolist()))
+            crop_calendar.setdefault(self.crops[c], []).append({
+                "state_code": units[u],
+                "state_name": names[u],
+                "region": regions[u],
+                "level": level,
+                "units": int(total[u, c, 0]),
+                "calendar": months,
+                "seasons": {
+                    season: {month: months[month] for month in season_list}
+                    for season, season_list in season_months.items()
+                },
+            })
+
+        calendar = freeze_value({
+            "metadata": {**self.metadata, "level": level},
+            "states": {},
+            "crop_calendar": crop_calendar,
+        })
+        with self._lock:
+            return self._calendars.setdefault(key, calendar)
+
+    def production(self, level: str) -> pd.DataFrame:
+        """
+        Produção somada por unidade do nível e cultura (cópia; vazia sem
+        tabela de produção).
+
+        Raises:
+            KeyError: Para nível sem dados
+        """
+        table = self._production.get(self._level(level))
+        if table is None:
+            return pd.DataFrame(columns=["code", "name", "region", "crop"])
+        return table.copy()
+
+
+_rollup_lock = threading.Lock()
+_rollups: "weakref.WeakKeyDictionary[SafraCalendar, dict[tuple, CalendarRollup]]" = weakref.WeakKeyDictionary()
+
+
+def get_calendar_rollup(
+    calendar: SafraCalendar,
+    safra: str,
+    hierarchy_path: str | Path = HIERARCHY_PATH,
+) -> CalendarRollup:
+    """
+    Agregações compartilhadas de uma safra, refeitas quando o calendário ou o
+    arquivo da hierarquia mudam.
+
+    Raises:
+        KeyError: Para safra desconhecida
+    """
+    key = (safra, _hierarchy_signature(Path(hierarchy_path)))
+    with _rollup_lock:
+        cached = _rollups.get(calendar, {}).get(key)
+    if cached is not None:
+        return cached
+    names = {code: info.get("name", code) for code, info in calendar.state_info.items()}
+    rollup = CalendarRollup.from_safra(calendar, safra, get_admin_hierarchy(hierarchy_path, names))
+    with _rollup_lock:
+        return _rollups.setdefault(calendar, {}).setdefault(key, rollup)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Calendar Views
+==============
+
+Visões leves (sem cópia) sobre o calendário agrícola mantido em cache pelos
+processadores. Uma visão guarda apenas as posições das linhas selecionadas e
+materializa, sob demanda, somente as colunas que um gráfico solicita.
+
+Características:
+- Índice cultura → faixa de linhas pré-computado (filtro por cultura em O(k))
+- Colunas materializadas de forma preguiçosa e memorizadas na própria visão
+- Faixas contíguas resolvidas como fatias NumPy (sem cópia dos dados)
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+class CropRowIndex:
+    """
+    Índice cultura → faixa de linhas sobre um DataFrame de calendário.
+
+    As linhas são agrupadas por cultura uma única vez (ordenação estável).
+    Quando o DataFrame já está agrupado por cultura — caso do CONABProcessor,
+    que gera os registros cultura a cultura — cada faixa vira uma fatia
+    direta, sem qualquer cópia.
+    """
+
+    def __init__(self, df: pd.DataFrame, crop_column: str = "crop"):
+        """
+        Constrói o índice.
+
+        Args:
+            df: DataFrame do calendário agrícola
+            crop_column: Nome da coluna com as culturas
+        """
+        self.n_rows = len(df)
+        self.ranges: dict[str, tuple[int, int]] = {}
+
+        if crop_column not in df.columns or df.empty:
+            self.order: np.ndarray | None = None
+            return
+
+        codes, uniques = pd.factorize(df[crop_column], sort=False)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [len(sorted_codes)]))
+
+        for start, stop in zip(starts, stops):
+            code = sorted_codes[start]
+            if code < 0:
+                continue  # culturas ausentes (NaN)
+            self.ranges[uniques[code]] = (int(start), int(stop))
+
+        # Permutação identidade → faixas são fatias diretas do DataFrame
+        is_identity = bool(np.array_equal(order, np.arange(self.n_rows)))
+        self.order = None if is_identity else order
+
+    def rows_for(self, crops: Iterable[str]) -> np.ndarray | slice:
+        """
+        Retorna as posições das linhas das culturas informadas.
+
+        Args:
+            crops: Culturas desejadas
+
+        Returns:
+            Fatia (faixa única contígua) ou array de posições
+        """
+        spans = sorted(self.ranges[crop] for crop in set(crops) if crop in self.ranges)
+
+        if not spans:
+            return np.empty(0, dtype=np.intp)
+
+        if len(spans) == 1 and self.order is None:
+            start, stop = spans[0]
+            return slice(start, stop)
+
+        positions = np.concatenate(
+            [np.arange(start, stop, dtype=np.intp) for start, stop in spans]
+        )
+        if self.order is not None:
+            positions = np.sort(self.order[positions])
+        return positions
+
+
+class CalendarView:
+    """
+    Visão filtrada e somente leitura sobre um DataFrame de calendário.
+
+    Expõe a mesma interface de leitura usada pelos gráficos
+    (``get_crop_calendar``, ``get_available_crops``) sem duplicar o
+    processador nem o DataFrame de origem.
+    """
+
+    __slots__ = ("_source", "_rows", "_columns", "_frames", "filters")
+
+    def __init__(
+        self,
+        source: pd.DataFrame,
+        rows: np.ndarray | slice,
+        filters: dict[str, tuple[str, ...]] | None = None,
+    ):
+        """
+        Inicializa a visão.
+
+        Args:
+            source: DataFrame de origem (não é copiado)
+            rows: Fatia ou array de posições das linhas selecionadas
+            filters: Filtros que originaram a visão (apenas informativo)
+        """
+        self._source = source
+        self._rows = rows
+        self._columns: dict[str, np.ndarray] = {}
+        self._frames: dict[tuple[str, ...], pd.DataFrame] = {}
+        self.filters = filters or {}
+
+    def __len__(self) -> int:
+        if isinstance(self._rows, slice):
+            return self._rows.stop - self._rows.start
+        return len(self._rows)
+
+    @property
+    def empty(self) -> bool:
+        """Indica se a visão não possui linhas."""
+        return len(self) == 0
+
+    @property
+    def columns(self) -> pd.Index:
+        """Colunas disponíveis no DataFrame de origem."""
+        return self._source.columns
+
+    @property
+    def rows(self) -> np.ndarray | slice:
+        """Posições das linhas selecionadas no DataFrame de origem."""
+        return self._rows
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Retorna os valores de uma coluna restritos à visão.
+
+        Args:
+            name: Nome da coluna
+
+        Returns:
+            Array com os valores (fatia sem cópia quando possível)
+        """
+        if name not in self._columns:
+            values = self._source[name].to_numpy()[self._rows]
+            if values.base is not None:
+                # Fatia sem cópia: protege o DataFrame de origem contra escrita
+                values = values.view()
+            values.flags.writeable = False
+            self._columns[name] = values
+        return self._columns[name]
+
+    def select(self, columns: Sequence[str] | None = None) -> pd.DataFrame:
+        """
+        Materializa apenas as colunas solicitadas.
+
+        O resultado é memorizado por conjunto de colunas, portanto chamadas
+        repetidas retornam o mesmo objeto e não alocam memória. O frame é
+        compartilhado entre todos os consumidores da visão: use ``.copy()``
+        antes de modificá-lo.
+
+        Args:
+            columns: Colunas desejadas (todas se None)
+
+        Returns:
+            DataFrame com as linhas da visão e as colunas pedidas
+        """
+        key = tuple(self._source.columns) if columns is None else tuple(columns)
+
+        if key not in self._frames:
+            if isinstance(self._rows, slice):
+                frame = self._source.iloc[self._rows, :].loc[:, list(key)]
+            else:
+                frame = self._source.take(self._rows).loc[:, list(key)]
+            frame.attrs = dict(self._source.attrs)
+            self._frames[key] = frame
+
+        return self._frames[key]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materializa a visão com todas as colunas."""
+        return self.select(None)
+
+    def get_crop_calendar(self) -> pd.DataFrame:
+        """Compatível com ``AgriculturalDataProcessor.get_crop_calendar``."""
+        return self.to_frame()
+
+    def get_available_crops(self) -> list[str]:
+        """Retorna as culturas presentes na visão, na ordem de aparição."""
+        if "crop" not in self._source.columns or self.empty:
+            return []
+        return list(dict.fromkeys(self.column("crop").tolist()))
+
+
+def build_calendar_view(
+    df: pd.DataFrame,
+    index: CropRowIndex,
+    crops: Iterable[str] | None = None,
+    regions: Iterable[str] | None = None,
+    states: Iterable[str] | None = None,
+) -> CalendarView:
+    """
+    Cria uma visão filtrada usando o índice de culturas.
+
+    O filtro de cultura usa as faixas pré-computadas; região e estado são
+    aplicados apenas sobre as linhas já selecionadas.
+
+    Args:
+        df: DataFrame do calendário agrícola
+        index: Índice de culturas construído sobre ``df``
+        crops: Culturas para manter (todas se None/vazio)
+        regions: Regiões para manter
+        states: Estados (código ou nome) para manter
+
+    Returns:
+        Visão filtrada sobre ``df``
+    """
+    filters: dict[str, Any] = {}
+    rows: np.ndarray | slice = slice(0, len(df))
+
+    if crops:
+        filters["crops"] = tuple(sorted(set(crops)))
+        rows = index.rows_for(filters["crops"])
+
+    secondary = []
+    if regions:
+        if "region" not in df.columns:
+            raise KeyError("Coluna 'region' ausente no calendário")
+        filters["regions"] = tuple(sorted(set(regions)))
+        secondary.append(("region", filters["regions"]))
+    if states:
+        state_column = "state_code" if "state_code" in df.columns else "state_name"
+        # Sem colunas de estado o filtro é ignorado (mesmo comportamento de
+        # ``AgriculturalDataWrapper.get_filtered_calendar``)
+        if state_column in df.columns:
+            filters["states"] = tuple(sorted(set(states)))
+            secondary.append((state_column, filters["states"]))
+
+    if secondary:
+        positions = (
+            np.arange(rows.start, rows.stop, dtype=np.intp)
+            if isinstance(rows, slice)
+            else rows
+        )
+        mask = np.ones(len(positions), dtype=bool)
+        for column, values in secondary:
+            mask &= np.isin(df[column].to_numpy()[positions], values)
+        rows = positions[mask]
+
+    return CalendarView(df, rows, filters)
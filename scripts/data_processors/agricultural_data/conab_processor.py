@@ -22,9 +22,24 @@ import json
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from scripts.utilities.single_flight import single_flight
+
 from . import AgriculturalDataProcessor, SeasonalDataMixin
+from .calendar_view import CalendarView, CropRowIndex, build_calendar_view
+from .month_masks import (
+    MONTHS,
+    mask_from_months,
+    masks_from_bools,
+    months_from_mask,
+    season_labels,
+    window_label,
+)
+
+# Número máximo de visões filtradas mantidas em memória por processador
+MAX_CACHED_VIEWS = 64
 
 
 class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
@@ -52,6 +67,14 @@ class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
         # Culturas detectadas dinamicamente dos dados
         self.detected_crops = []
 
+        # Último arquivo lido: (dados brutos, (caminho, mtime_ns, tamanho))
+        self._raw_source: tuple[dict[str, Any], tuple[str, int, int]] | None = None
+
+        # Índice cultura → faixa de linhas e visões filtradas memorizadas
+        self._crop_index: CropRowIndex | None = None
+        self._crop_index_source: pd.DataFrame | None = None
+        self._view_cache: dict[tuple, CalendarView] = {}
+
     def load_raw_data(self, data_path: Path) -> dict[str, Any]:
         """
         Carrega dados CONAB de arquivo JSONC.
@@ -78,6 +101,8 @@ class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
                 cleaned_content = "\n".join(cleaned_lines)
                 data = json.loads(cleaned_content)
 
+                stat = Path(data_path).stat()
+                self._raw_source = (data, (str(Path(data_path).resolve()), stat.st_mtime_ns, stat.st_size))
                 self.last_update = datetime.now()
                 return data
 
@@ -119,35 +144,60 @@ class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
         """
         Processa dados brutos CONAB.
 
+        Sessões concorrentes processando os mesmos dados compartilham uma
+        única execução (ver ``_build_processed_data``).
+
         Args:
             raw_data: Dados CONAB brutos
 
         Returns:
             Dicionário com DataFrames processados
         """
-        processed_data = {}
+        processed_data = self._build_processed_data(raw_data)
+        self._raw_source = None
 
         # Detectar culturas disponíveis nos dados
         if "crop_calendar" in raw_data:
             self.detected_crops = list(raw_data["crop_calendar"].keys())
 
+        # Cache para acesso rápido
+        self._data_cache.update(processed_data)
+
+        return processed_data
+
+    def _source_key(self, raw_data: dict[str, Any]) -> tuple:
+        """
+        Chave single-flight dos dados brutos.
+
+        Dados lidos por ``load_raw_data`` são identificados pela versão do
+        arquivo (caminho, mtime e tamanho), sem serializar o JSON. Dados
+        montados em memória não têm versão barata e não são agrupados.
+        """
+        source = self._raw_source
+        if source is not None and source[0] is raw_data:
+            return (type(self), source[1])
+        return (type(self), object())
+
+    @single_flight(
+        name="CONABProcessor.process_data",
+        key=lambda self, raw_data: self._source_key(raw_data),
+    )
+    def _build_processed_data(self, raw_data: dict[str, Any]) -> dict[str, pd.DataFrame]:
+        """Monta os DataFrames processados (sem alterar o estado do processador)."""
+        processed_data = {}
+
         # Processar calendário agrícola
         if "crop_calendar" in raw_data:
-            calendar_df = self._process_crop_calendar(raw_data)
-            processed_data["crop_calendar"] = calendar_df
-            # Cache para acesso rápido
-            self._data_cache["crop_calendar"] = calendar_df
+            processed_data["crop_calendar"] = self._process_crop_calendar(raw_data)
 
         # Processar outros tipos de dados se disponíveis
         if "production_data" in raw_data:
-            production_df = self._process_production_data(raw_data["production_data"])
-            processed_data["production"] = production_df
-            self._data_cache["production"] = production_df
+            processed_data["production"] = self._process_production_data(
+                raw_data["production_data"]
+            )
 
         if "area_data" in raw_data:
-            area_df = self._process_area_data(raw_data["area_data"])
-            processed_data["area"] = area_df
-            self._data_cache["area"] = area_df
+            processed_data["area"] = self._process_area_data(raw_data["area_data"])
 
         return processed_data
 
@@ -306,40 +356,30 @@ class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
         """
         Retorna resumo do calendário agrícola por região.
 
+        Lê as colunas de cada cultura pela visão do índice de culturas
+        (``CalendarView.column``), sem materializar frames filtrados.
+
         Returns:
             DataFrame com resumo por região e cultura
         """
         calendar_df = self.get_crop_calendar()
+        month_columns = [month.lower() for month in MONTHS]
 
         summary_data = []
         for crop in calendar_df["crop"].unique():
-            crop_data = calendar_df[calendar_df["crop"] == crop]
+            view = self.calendar_view(crops=[crop])
+            regions = view.column("region")
 
-            for region in crop_data["region"].unique():
-                region_data = crop_data[crop_data["region"] == region]
+            for region in pd.unique(regions):
+                in_region = regions == region
 
                 # Contar atividades por mês
                 planting_months = []
                 harvest_months = []
 
-                month_columns = [
-                    "january",
-                    "february",
-                    "march",
-                    "april",
-                    "may",
-                    "june",
-                    "july",
-                    "august",
-                    "september",
-                    "october",
-                    "november",
-                    "december",
-                ]
-
                 for month in month_columns:
-                    if month in region_data.columns:
-                        activities = region_data[month].unique()
+                    if month in view.columns:
+                        activities = set(view.column(month)[in_region].tolist())
                         if any("Planting" in str(act) for act in activities):
                             planting_months.append(month.capitalize())
                         if any("Harvest" in str(act) for act in activities):
@@ -351,7 +391,7 @@ class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
                         "region": region,
                         "planting_months": ", ".join(planting_months),
                         "harvest_months": ", ".join(harvest_months),
-                        "states_count": len(region_data),
+                        "states_count": int(in_region.sum()),
                     }
                 )
 
@@ -367,10 +407,61 @@ class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
         calendar_df = self.get_crop_calendar()
         calendar_df.to_csv(output_path, index=False, encoding="utf-8")
 
+    def _get_crop_index(self) -> CropRowIndex:
+        """Retorna o índice de culturas, reconstruindo-o se o calendário mudou."""
+        calendar_df = self.get_crop_calendar()
+
+        if self._crop_index is None or self._crop_index_source is not calendar_df:
+            self._crop_index = CropRowIndex(calendar_df)
+            self._crop_index_source = calendar_df
+            self._view_cache.clear()
+
+        return self._crop_index
+
+    def calendar_view(
+        self,
+        crops: list[str] | None = None,
+        regions: list[str] | None = None,
+        states: list[str] | None = None,
+    ) -> CalendarView:
+        """
+        Retorna uma visão filtrada (sem cópia) do calendário agrícola.
+
+        Visões são memorizadas por combinação de filtros; consultas repetidas
+        retornam o mesmo objeto.
+
+        Args:
+            crops: Culturas para manter
+            regions: Regiões para manter
+            states: Estados (código ou nome) para manter
+
+        Returns:
+            Visão sobre o calendário em cache
+        """
+        index = self._get_crop_index()
+        key = (
+            frozenset(crops or ()),
+            frozenset(regions or ()),
+            frozenset(states or ()),
+        )
+
+        view = self._view_cache.get(key)
+        if view is None:
+            view = build_calendar_view(
+                self.get_crop_calendar(), index, crops, regions, states
+            )
+            if len(self._view_cache) >= MAX_CACHED_VIEWS:
+                self._view_cache.pop(next(iter(self._view_cache)))
+            self._view_cache[key] = view
+
+        return view
+
     def filter_by_crop(self, crops: list[str]) -> "CONABProcessor":
         """
         Filtra processador por culturas específicas.
 
+        Para leituras sem cópia do calendário filtrado use ``calendar_view``.
+
         Args:
             crops: Lista de culturas para manter
 
@@ -390,73 +481,46 @@ class CONABProcessor(AgriculturalDataProcessor, SeasonalDataMixin):
         """
         Retorna informações sobre épocas de plantio e colheita.
 
+        Um mês entra na época de uma cultura/região quando mais da metade dos
+        estados tem a atividade nele; as épocas são máscaras de 12 bits, o que
+        mantém janelas que atravessam o ano (Out–Mar) contíguas.
+
         Returns:
             Dicionário com épocas por cultura e região
         """
         calendar_df = self.get_crop_calendar()
-        seasons_info = {}
-
-        for crop in calendar_df["crop"].unique():
-            crop_data = calendar_df[calendar_df["crop"] == crop]
-            seasons_info[crop] = {}
-
-            for region in crop_data["region"].unique():
-                region_data = crop_data[crop_data["region"] == region]
-
-                # Identificar épocas predominantes
-                month_columns = [
-                    "january",
-                    "february",
-                    "march",
-                    "april",
-                    "may",
-                    "june",
-                    "july",
-                    "august",
-                    "september",
-                    "october",
-                    "november",
-                    "december",
-                ]
-
-                planting_pattern = []
-                harvest_pattern = []
-
-                for month in month_columns:
-                    if month in region_data.columns:
-                        activities = region_data[month].tolist()
-                        planting_count = sum(
-                            1 for act in activities if "Planting" in str(act)
-                        )
-                        harvest_count = sum(
-                            1 for act in activities if "Harvest" in str(act)
-                        )
-
-                        if planting_count > len(activities) * 0.5:
-                            planting_pattern.append(month)
-                        if harvest_count > len(activities) * 0.5:
-                            harvest_pattern.append(month)
-
-                seasons_info[crop][region] = {
-                    "main_planting_season": self._get_season_range(planting_pattern),
-                    "main_harvest_season": self._get_season_range(harvest_pattern),
-                    "planting_months": planting_pattern,
-                    "harvest_months": harvest_pattern,
-                }
+        month_columns = [month.lower() for month in MONTHS]
+        # Meses ausentes do DataFrame viram "nan" (sem atividade)
+        activities = calendar_df.reindex(columns=month_columns).astype(str).to_numpy().astype("U")
+        planting = np.char.find(activities, "Planting") >= 0
+        harvest = np.char.find(activities, "Harvest") >= 0
+
+        groups = calendar_df.groupby(["crop", "region"], sort=False).ngroup().to_numpy()
+        keys = calendar_df[["crop", "region"]].drop_duplicates().to_numpy()
+        sizes = np.bincount(groups, minlength=len(keys))
+        majority = {}
+        for window, flags in (("planting", planting), ("harvest", harvest)):
+            counts = np.zeros((len(keys), 12), dtype=np.int64)
+            np.add.at(counts, groups, flags)
+            majority[window] = masks_from_bools(counts > sizes[:, None] * 0.5)
+
+        labels = {window: season_labels(masks) for window, masks in majority.items()}
+        seasons_info: dict[str, dict] = {}
+        for i, (crop, region) in enumerate(keys):
+            seasons_info.setdefault(crop, {})[region] = {
+                "main_planting_season": labels["planting"][i],
+                "main_harvest_season": labels["harvest"][i],
+                "planting_months": months_from_mask(majority["planting"][i], tuple(month_columns)),
+                "harvest_months": months_from_mask(majority["harvest"][i], tuple(month_columns)),
+                "planting_window": window_label(majority["planting"][i]),
+                "harvest_window": window_label(majority["harvest"][i]),
+            }
 
         return seasons_info
 
     def _get_season_range(self, months: list[str]) -> str:
         """Determina a estação predominante para uma lista de meses."""
-        if not months:
-            return "No defined season"
-
-        seasons = [self.get_season_from_month(month) for month in months]
-        most_common_season = (
-            max(set(seasons), key=seasons.count) if seasons else "Unknown"
-        )
-
-        return most_common_season
+        return season_labels(mask_from_months(months)).item()
 
 
 def create_conab_processor(data_path: str | Path = None) -> CONABProcessor:
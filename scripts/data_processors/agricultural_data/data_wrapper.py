@@ -23,6 +23,8 @@ from typing import Any
 
 import pandas as pd
 
+from scripts.utilities.table_downloads import write_frame
+
 from .conab_processor import create_conab_processor
 
 warnings.filterwarnings("ignore")
@@ -168,9 +170,20 @@ class AgriculturalDataWrapper:
             source: Fonte de dados
 
         Returns:
-            DataFrame filtrado
+            DataFrame filtrado (compartilhado entre chamadas com os mesmos
+            filtros; use ``.copy()`` antes de modificá-lo)
         """
-        calendar_df = self.get_crop_calendar(source)
+        if source not in self.processors:
+            raise ValueError(
+                f"Fonte {source} não disponível. Fontes: {self.get_available_sources()}"
+            )
+
+        processor = self.processors[source]
+        if hasattr(processor, "calendar_view"):
+            # Visão memorizada: consultas repetidas não alocam novos frames
+            return processor.calendar_view(crops, regions, states).to_frame()
+
+        calendar_df = processor.get_crop_calendar()
 
         # Aplicar filtros
         if crops:
@@ -216,21 +229,18 @@ class AgriculturalDataWrapper:
 
         Args:
             output_path: Caminho de saída
-            format_type: Formato (csv, excel, json)
+            format_type: Formato (csv, excel, parquet, json)
             source: Fonte de dados
         """
         calendar_df = self.get_crop_calendar(source)
         output_path = Path(output_path)
 
-        if format_type.lower() == "csv":
-            calendar_df.to_csv(output_path, index=False, encoding="utf-8")
-        elif format_type.lower() == "excel":
-            calendar_df.to_excel(output_path, index=False)
-        elif format_type.lower() == "json":
-            calendar_df.to_json(output_path, orient="records", indent=2)
-        else:
+        if format_type.lower() not in ("csv", "excel", "parquet", "json"):
             raise ValueError(f"Formato não suportado: {format_type}")
 
+        # CSV é escrito em blocos de linhas, sem montar o arquivo em memória
+        write_frame(calendar_df, output_path, format_type)
+
     def get_metadata(self, source: str = "CONAB") -> dict[str, Any]:
         """
         Retorna metadados da fonte de dados.
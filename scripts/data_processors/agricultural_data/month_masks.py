@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Month Masks
+===========
+
+Janelas de meses como máscaras de 12 bits (bit 0 = janeiro), para tratar
+janelas circulares do ano agrícola (outubro → março) sem conjuntos de meses.
+
+Características:
+- Conversão meses ↔ máscara e janelas circulares (``circular_window``)
+- União/interseção por grupos (``np.bitwise_or.reduceat``) e contagens de
+  sobreposição por popcount, tudo vetorizado sobre arrays ``uint16``
+- Maior sequência circular, rótulos de janela ("Oct–Mar") e de estação,
+  e centro circular, via tabelas pré-calculadas para as 4.096 máscaras
+- ``calendar_masks``: máscaras de plantio/colheita dos registros do
+  ``crop_calendar``
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+
+MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+MONTH_ABBREVIATIONS = tuple(month[:3] for month in MONTHS)
+FULL_YEAR = 0xFFF
+MONTH_BITS = (1 << np.arange(12)).astype(np.uint16)
+
+# Estações austrais (mesma divisão de ``SeasonalDataMixin.get_season_from_month``)
+SEASONS = {
+    "Spring": ("October", "November", "December"),
+    "Summer": ("January", "February", "March"),
+    "Autumn": ("April", "May", "June"),
+    "Winter": ("July", "August", "September"),
+}
+NO_SEASON = "No defined season"
+YEAR_ROUND = "Year-round"
+
+_MONTH_LOOKUP = {
+    **{month.lower(): i for i, month in enumerate(MONTHS)},
+    **{abbreviation.lower(): i for i, abbreviation in enumerate(MONTH_ABBREVIATIONS)},
+}
+
+
+def _tables() -> tuple[np.ndarray, ...]:
+    """Bits, popcount e maior sequência circular (início, tamanho) das 4.096 máscaras."""
+    masks = np.arange(FULL_YEAR + 1)
+    bits = ((masks[:, None] >> np.arange(12)) & 1).astype(np.uint8)
+    # Tamanho da sequência de 1s a partir de cada mês, dando a volta no ano
+    doubled = np.concatenate([bits, bits], axis=1).astype(np.int16)
+    ahead = np.zeros((len(masks), 25), dtype=np.int16)
+    for i in range(23, -1, -1):
+        ahead[:, i] = (ahead[:, i + 1] + 1) * doubled[:, i]
+    length_from = np.minimum(ahead[:, :12], 12)
+    starts = (bits == 1) & ((np.roll(bits, 1, axis=1) == 0) | (masks[:, None] == FULL_YEAR))
+    candidates = np.where(starts, length_from, 0)
+    length = candidates.max(axis=1).astype(np.int8)
+    start = np.where(length > 0, candidates.argmax(axis=1), -1).astype(np.int8)
+    popcount = bits.sum(axis=1).astype(np.uint8)
+    for table in (bits, popcount, start, length):
+        table.flags.writeable = False
+    return bits, popcount, start, length
+
+
+_BITS, _POPCOUNT, _RUN_START, _RUN_LENGTH = _tables()
+SEASON_MASKS = np.array(
+    [sum(1 << MONTHS.index(month) for month in months) for months in SEASONS.values()], dtype=np.uint16
+)
+
+
+def _masks(masks: Any) -> np.ndarray:
+    array = np.asarray(masks)
+    if array.dtype.kind not in "iu" or (array.size and (array.min() < 0 or array.max() > FULL_YEAR)):
+        raise ValueError("Máscaras de mês devem ser inteiros em [0, 0xFFF]")
+    return array.astype(np.uint16, copy=False)
+
+
+def month_index(month: str | int) -> int:
+    """
+    Posição (0–11) de um mês: nome ou abreviação em inglês (sem distinguir
+    maiúsculas) ou número de 1 a 12.
+
+    Raises:
+        ValueError: Para mês desconhecido
+    """
+    if isinstance(month, (int, np.integer)) and not isinstance(month, bool):
+        if 1 <= month <= 12:
+            return int(month) - 1
+    elif isinstance(month, str) and month.strip().lower() in _MONTH_LOOKUP:
+        return _MONTH_LOOKUP[month.strip().lower()]
+    raise ValueError(f"Mês desconhecido: {month!r}")
+
+
+def mask_from_months(months: Iterable[str | int]) -> int:
+    """Máscara de uma coleção de meses."""
+    mask = 0
+    for month in months:
+        mask |= 1 << month_index(month)
+    return mask
+
+
+def months_from_mask(mask: int, names: tuple[str, ...] = MONTHS) -> list[str]:
+    """Meses da máscara, em ordem de calendário."""
+    return [names[i] for i in range(12) if int(mask) >> i & 1]
+
+
+def circular_window(start: str | int, end: str | int) -> int:
+    """Máscara da janela de ``start`` a ``end`` (inclusive), dando a volta no ano se preciso."""
+    first, last = month_index(start), month_index(end)
+    length = (last - first) % 12 + 1
+    return sum(1 << ((first + i) % 12) for i in range(length))
+
+
+def masks_from_bools(flags: Any) -> np.ndarray:
+    """Máscaras de um array booleano (..., 12)."""
+    flags = np.asarray(flags, dtype=bool)
+    if flags.shape[-1:] != (12,):
+        raise ValueError(f"Esperado eixo final de 12 meses, recebido {flags.shape}")
+    return (flags.astype(np.uint16) * MONTH_BITS).sum(axis=-1, dtype=np.uint16)
+
+
+def masks_from_codes(codes: Any, bit: int) -> np.ndarray:
+    """Máscaras de uma atividade (``bit``) em códigos ``uint8`` (..., 12)."""
+    return masks_from_bools((np.asarray(codes) & bit) > 0)
+
+
+def popcount(masks: Any) -> np.ndarray:
+    """Número de meses de cada máscara."""
+    return _POPCOUNT[_masks(masks)]
+
+
+def month_bits(masks: Any) -> np.ndarray:
+    """Array booleano (..., 12) dos meses de cada máscara."""
+    return _BITS[_masks(masks)].astype(bool)
+
+
+def month_counts(masks: Any, axis: int | None = None) -> np.ndarray:
+    """
+    Quantas máscaras contêm cada mês (soma ao longo de ``axis``; todas as
+    máscaras quando None).
+    """
+    bits = _BITS[_masks(masks)].astype(np.int64)
+    if axis is None:
+        return bits.reshape(-1, 12).sum(axis=0)
+    return bits.sum(axis=axis if axis >= 0 else axis - 1)
+
+
+def _group_reduce(ufunc: np.ufunc, masks: Any, groups: Any, size: int | None, identity: int) -> np.ndarray:
+    masks = _masks(masks)
+    if groups is None:
+        return np.asarray(ufunc.reduce(masks, initial=identity), dtype=np.uint16)
+    groups = np.asarray(groups, dtype=np.int64)
+    size = int(groups.max(initial=-1)) + 1 if size is None else size
+    out = np.full(size, identity, dtype=np.uint16)
+    if len(groups):
+        order = np.argsort(groups, kind="stable")
+        ordered = groups[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        out[ordered[starts]] = ufunc.reduceat(masks[order], starts)
+    return out
+
+
+def union(masks: Any, groups: Any = None, size: int | None = None) -> np.ndarray:
+    """
+    União das máscaras: de todas (escalar) ou por grupo (``groups`` com o
+    índice do grupo de cada máscara; grupos vazios ficam 0).
+    """
+    return _group_reduce(np.bitwise_or, masks, groups, size, 0)
+
+
+def intersection(masks: Any, groups: Any = None, size: int | None = None) -> np.ndarray:
+    """Interseção das máscaras, de todas ou por grupo (grupos vazios ficam 0)."""
+    result = _group_reduce(np.bitwise_and, masks, groups, size, FULL_YEAR)
+    if groups is not None:
+        present = np.bincount(np.asarray(groups, dtype=np.int64), minlength=len(result)) > 0
+        result = np.where(present, result, 0).astype(np.uint16)
+    elif not np.size(masks):
+        result = np.asarray(0, dtype=np.uint16)
+    return result
+
+
+def overlap_matrix(left: Any, right: Any | None = None) -> np.ndarray:
+    """Meses em comum (popcount de ``a & b``) entre cada par de máscaras."""
+    left = _masks(left)
+    right = left if right is None else _masks(right)
+    return _POPCOUNT[left[:, None] & right[None, :]]
+
+
+def longest_run(masks: Any) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Maior sequência circular de meses de cada máscara.
+
+    Returns:
+        (início 0–11, ou -1 para máscara vazia; número de meses)
+    """
+    masks = _masks(masks)
+    return _RUN_START[masks], _RUN_LENGTH[masks]
+
+
+def runs(mask: int) -> list[tuple[int, int]]:
+    """Sequências circulares (início, número de meses) da máscara, por início."""
+    mask = int(mask)
+    if mask == FULL_YEAR:
+        return [(0, 12)]
+    result = []
+    for start in range(12):
+        if mask >> start & 1 and not mask >> ((start - 1) % 12) & 1:
+            length = 0
+            while length < 12 and mask >> ((start + length) % 12) & 1:
+                length += 1
+            result.append((start, length))
+    return result
+
+
+def linear_segments(mask: int) -> list[tuple[int, int]]:
+    """
+    Trechos [início, fim) da máscara sem dar a volta no ano, para eixos de
+    janeiro a dezembro (uma janela out–mar vira out–dez e jan–mar).
+    """
+    segments = []
+    for start, length in runs(mask):
+        end = start + length
+        if end > 12:
+            segments += [(start, 12), (0, end - 12)]
+        else:
+            segments.append((start, end))
+    return sorted(segments)
+
+
+def window_label(mask: int, names: tuple[str, ...] = MONTH_ABBREVIATIONS) -> str:
+    """Rótulo das janelas da máscara, por exemplo ``"Oct–Mar"`` ou ``"Jan, Jun–Jul"``."""
+    if int(mask) == FULL_YEAR:
+        return YEAR_ROUND
+    return ", ".join(
+        names[start] if length == 1 else f"{names[start]}–{names[(start + length - 1) % 12]}"
+        for start, length in runs(mask)
+    )
+
+
+def season_labels(masks: Any) -> np.ndarray:
+    """
+    Estação predominante (mais meses em comum) de cada máscara; empates
+    ficam com a primeira estação em ``SEASONS``.
+    """
+    masks = _masks(masks)
+    counts = _POPCOUNT[masks[..., None] & SEASON_MASKS]
+    labels = np.asarray(list(SEASONS), dtype=object)[counts.argmax(axis=-1)]
+    return np.where(masks == 0, NO_SEASON, labels)
+
+
+def circular_mean(masks: Any) -> np.ndarray:
+    """
+    Centro circular de cada máscara, em meses (0 = janeiro, 11.5 = metade
+    de dezembro para janeiro); NaN para máscara vazia.
+    """
+    masks = _masks(masks)
+    angles = 2 * np.pi * np.arange(12) / 12
+    bits = _BITS[masks].astype(float)
+    centre = np.arctan2(bits @ np.sin(angles), bits @ np.cos(angles)) * 12 / (2 * np.pi) % 12
+    return np.where(masks == 0, np.nan, centre)
+
+
+def circular_shift(before: Any, after: Any) -> np.ndarray:
+    """Deslocamento (meses, entre -6 e 6) do centro circular de ``before`` para ``after``."""
+    return (circular_mean(after) - circular_mean(before) + 6) % 12 - 6
+
+
+def _known_months_mask(months: Iterable[Any] | None) -> int:
+    return mask_from_months(m for m in months or () if str(m).strip().lower() in _MONTH_LOOKUP)
+
+
+def calendar_masks(records: Iterable[Mapping[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Máscaras de plantio e colheita de registros do ``crop_calendar``
+    (``calendar`` mês → ``P``/``H``/``PH``, ou listas ``planting_months`` e
+    ``harvesting_months``). Meses desconhecidos são ignorados.
+
+    Returns:
+        (plantio, colheita), arrays ``uint16`` com uma máscara por registro
+    """
+    planting, harvest = [], []
+    for record in records:
+        if not isinstance(record, Mapping):
+            continue
+        p = h = 0
+        for month, activity in (record.get("calendar") or {}).items():
+            i = _MONTH_LOOKUP.get(str(month).strip().lower())
+            if i is None or not activity:
+                continue
+            activity = str(activity)
+            if "P" in activity:
+                p |= 1 << i
+            if "H" in activity:
+                h |= 1 << i
+        p |= _known_months_mask(record.get("planting_months"))
+        h |= _known_months_mask(record.get("harvesting_months") or record.get("harvest_months"))
+        planting.append(p)
+        harvest.append(h)
+    return np.asarray(planting, dtype=np.uint16), np.asarray(harvest, dtype=np.uint16)
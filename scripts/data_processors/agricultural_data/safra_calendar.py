@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Safra Calendar
+==============
+
+Calendário agrícola CONAB com eixo de safras, guardado em arrays NumPy.
+
+O arquivo ``agricultural_conab_mapping_data_complete.jsonc`` é a safra base;
+calendários de outras safras (mesmo formato, com ``metadata.safra`` ou o
+nome do arquivo como rótulo) ficam em ``data/json/crop_calendar_safras/``.
+
+Características:
+- Atividades codificadas em bits (P = 1, H = 2, PH = 3) num array ``uint8``
+  de forma (safra, cultura, estado, mês), com máscara de presença
+- Carga incremental: os arrays ficam em cache em
+  ``data/processed/crop_calendar_safras.npz`` e somente safras novas (ou
+  alteradas) são lidas do JSON
+- Motor de diferenças vetorizado: células cultura/estado/mês alteradas entre
+  duas safras e deslocamento das janelas de plantio e colheita
+- ``SafraCalendar.calendar`` devolve a safra no formato ``crop_calendar``
+  (congelado e compartilhado) usado por todos os gráficos de calendário
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_processors.agricultural_data.month_masks import MONTHS, circular_shift, masks_from_bools
+from scripts.utilities.data_plane import freeze_value
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+BASE_CALENDAR_PATH = PROJECT_ROOT / "data" / "json" / "agricultural_conab_mapping_data_complete.jsonc"
+SAFRA_DIR = PROJECT_ROOT / "data" / "json" / "crop_calendar_safras"
+CACHE_PATH = PROJECT_ROOT / "data" / "processed" / "crop_calendar_safras.npz"
+BASE_SAFRA = "current"
+FORMAT_VERSION = 1
+
+MONTH_INDEX = {month: i for i, month in enumerate(MONTHS)}
+PLANTING, HARVEST = 1, 2
+ACTIVITY_CODES = {"": 0, "P": PLANTING, "H": HARVEST, "PH": PLANTING | HARVEST}
+ACTIVITY_LABELS = ("", "P", "H", "PH")
+WINDOWS = {"planting": PLANTING, "harvest": HARVEST}
+
+
+def _read_jsonc(path: Path) -> dict[str, Any]:
+    """Lê um arquivo JSONC (comentários de linha inteira)."""
+    with open(path, encoding="utf-8") as file:
+        lines = [line for line in file if not line.strip().startswith("//")]
+    try:
+        return json.loads("".join(lines))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Calendário inválido em {path}: {e}") from e
+
+
+def _source_signature(path: Path) -> list[Any]:
+    stat = path.stat()
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _pad(array: np.ndarray, axis: int, size: int) -> np.ndarray:
+    """Estende ``array`` com zeros ao longo de ``axis`` até ``size``."""
+    missing = size - array.shape[axis]
+    if missing <= 0:
+        return array
+    widths = [(0, 0)] * array.ndim
+    widths[axis] = (0, missing)
+    return np.pad(array, widths)
+
+
+@dataclass(frozen=True)
+class SafraDiff:
+    """Diferenças entre duas safras."""
+
+    before: str
+    after: str
+    cells: pd.DataFrame  # crop, state_code, region, month, before, after
+    shifts: pd.DataFrame  # crop, state_code, region, window, months_before, months_after, shift_months, added, removed
+
+    @property
+    def changed_entries(self) -> int:
+        """Número de pares cultura/estado com alguma célula alterada."""
+        return len(self.cells[["crop", "state_code"]].drop_duplicates())
+
+
+class SafraCalendar:
+    """
+    Calendários de várias safras como arrays (safra, cultura, estado, mês).
+
+    Os arrays são somente leitura; ``add_safra`` devolve um novo calendário
+    que reaproveita os eixos existentes e estende apenas o necessário.
+    """
+
+    def __init__(
+        self,
+        safras: Iterable[str] = (),
+        crops: Iterable[str] = (),
+        states: Iterable[str] = (),
+        codes: np.ndarray | None = None,
+        present: np.ndarray | None = None,
+        rank: np.ndarray | None = None,
+        state_info: Mapping[str, Mapping[str, str]] | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        sources: Iterable[Any] = (),
+    ):
+        """
+        Args:
+            safras: Rótulos das safras, na ordem de carga
+            crops: Culturas (eixo 1)
+            states: Siglas dos estados ou códigos IBGE dos municípios (eixo 2)
+            codes: Bits de atividade, ``uint8`` (safra, cultura, estado, 12)
+            present: Presença do par cultura/estado em cada safra
+            rank: Posição do estado na lista da cultura no arquivo (-1 se ausente)
+            state_info: Sigla → ``{"name", "region"}``
+            metadata: ``metadata`` e ``states`` da safra base
+            sources: Assinatura (caminho, tamanho, mtime) do arquivo de cada safra
+        """
+        self.safras = tuple(safras)
+        self.crops = tuple(crops)
+        self.states = tuple(states)
+        shape = (len(self.safras), len(self.crops), len(self.states))
+        self.codes = codes if codes is not None else np.zeros(shape + (12,), dtype=np.uint8)
+        self.present = present if present is not None else np.zeros(shape, dtype=bool)
+        self.rank = rank if rank is not None else np.full(shape, -1, dtype=np.int16)
+        for array in (self.codes, self.present, self.rank):
+            array.flags.writeable = False
+        self.state_info = freeze_value(dict(state_info or {}))
+        self.metadata = freeze_value(dict(metadata or {}))
+        self.sources = tuple(tuple(source) for source in sources)
+        self._crop_index = {crop: i for i, crop in enumerate(self.crops)}
+        self._state_index = {state: i for i, state in enumerate(self.states)}
+        self._calendars: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _safra_index(self, safra: str) -> int:
+        try:
+            return self.safras.index(safra)
+        except ValueError:
+            raise KeyError(f"Safra desconhecida: {safra!r}") from None
+
+    def add_safra(self, label: str, raw: Mapping[str, Any], source: Any = ()) -> "SafraCalendar":
+        """
+        Acrescenta uma safra (lendo somente o seu ``crop_calendar``).
+
+        Args:
+            label: Rótulo da safra
+            raw: Conteúdo do arquivo de calendário
+            source: Assinatura do arquivo
+
+        Raises:
+            ValueError: Para rótulo repetido ou atividade desconhecida
+        """
+        if label in self.safras:
+            raise ValueError(f"Safra já carregada: {label!r}")
+
+        crops, states = list(self.crops), list(self.states)
+        crop_index, state_index = dict(self._crop_index), dict(self._state_index)
+        state_info = {code: dict(info) for code, info in self.state_info.items()}
+        entries = []
+        for crop, records in (raw.get("crop_calendar") or {}).items():
+            if crop not in crop_index:
+                crop_index[crop] = len(crops)
+                crops.append(crop)
+            for position, record in enumerate(records):
+                # Calendários municipais trazem o código IBGE do município
+                code = str(record.get("municipality_code") or record.get("state_code") or "")
+                if not code:
+                    continue
+                if code not in state_index:
+                    state_index[code] = len(states)
+                    states.append(code)
+                state_info.setdefault(code, {
+                    "name": record.get("municipality_name") or record.get("state_name", code),
+                    "region": record.get("region", "Unknown"),
+                })
+                months = np.zeros(12, dtype=np.uint8)
+                for month, activity in (record.get("calendar") or {}).items():
+                    if month not in MONTH_INDEX:
+                        continue
+                    try:
+                        months[MONTH_INDEX[month]] = ACTIVITY_CODES[str(activity or "").strip()]
+                    except KeyError:
+                        raise ValueError(f"Atividade desconhecida {activity!r} em {crop}/{code}/{month}") from None
+                entries.append((crop_index[crop], state_index[code], position, months))
+
+        codes = _pad(_pad(self.codes, 1, len(crops)), 2, len(states))
+        present = _pad(_pad(self.present, 1, len(crops)), 2, len(states))
+        rank = np.pad(self.rank, [(0, 0), (0, len(crops) - len(self.crops)), (0, len(states) - len(self.states))], constant_values=-1)
+        new_codes = np.zeros((1, len(crops), len(states), 12), dtype=np.uint8)
+        new_present = np.zeros((1, len(crops), len(states)), dtype=bool)
+        new_rank = np.full((1, len(crops), len(states)), -1, dtype=np.int16)
+        for c, s, position, months in entries:
+            new_codes[0, c, s] = months
+            new_present[0, c, s] = True
+            new_rank[0, c, s] = position
+
+        metadata = self.metadata if self.safras else {
+            "metadata": raw.get("metadata", {}),
+            "states": raw.get("states", {}),
+        }
+        return SafraCalendar(
+            self.safras + (label,),
+            crops,
+            states,
+            np.concatenate([codes, new_codes]),
+            np.concatenate([present, new_present]),
+            np.concatenate([rank, new_rank]),
+            state_info,
+            metadata,
+            self.sources + (tuple(source),),
+        )
+
+    def truncate(self, count: int) -> "SafraCalendar":
+        """Calendário com as ``count`` primeiras safras."""
+        return SafraCalendar(
+            self.safras[:count], self.crops, self.states, self.codes[:count], self.present[:count],
+            self.rank[:count], self.state_info, self.metadata, self.sources[:count],
+        )
+
+    def calendar(self, safra: str) -> Mapping[str, Any]:
+        """
+        Safra no formato do arquivo de calendário (``metadata``, ``states``,
+        ``crop_calendar``), montada a partir dos arrays.
+
+        Returns:
+            Dicionário congelado, compartilhado entre chamadas
+
+        Raises:
+            KeyError: Para safra desconhecida
+        """
+        index = self._safra_index(safra)
+        cached = self._calendars.get(safra)
+        if cached is not None:
+            return cached
+
+        metadata = self.metadata.get("metadata", {})
+        season_months = {
+            season: list(info.get("months", []))
+            for season, info in (metadata.get("seasons") or {}).items()
+        }
+        # Ordem dos meses do arquivo base (ano agrícola: outubro → setembro)
+        month_order = [m for months in season_months.values() for m in months if m in MONTH_INDEX]
+        month_order += [m for m in MONTHS if m not in month_order]
+
+        crop_calendar: dict[str, list[dict[str, Any]]] = {}
+        codes, present, rank = self.codes[index], self.present[index], self.rank[index]
+        # Estados na ordem em que aparecem no arquivo da safra
+        c_idx, s_idx = np.nonzero(present)
+        order = np.lexsort((rank[c_idx, s_idx], c_idx))
+        for c, s in zip(c_idx[order], s_idx[order]):
+            state = self.states[s]
+            info = self.state_info.get(state, {})
+            labels = {month: ACTIVITY_LABELS[codes[c, s, MONTH_INDEX[month]]] for month in month_order}
+            crop_calendar.setdefault(self.crops[c], []).append({
+                "state_code": state,
+                "state_name": info.get("name", state),
+                "region": info.get("region", "Unknown"),
+                "calendar": labels,
+                "seasons": {
+                    season: {month: labels[month] for month in months}
+                    for season, months in season_months.items()
+                },
+            })
+
+        calendar = freeze_value({
+            "metadata": {**metadata, "safra": safra},
+            "states": self.metadata.get("states", {}),
+            "crop_calendar": crop_calendar,
+        })
+        with self._lock:
+            return self._calendars.setdefault(safra, calendar)
+
+    def diff(
+        self,
+        before: str,
+        after: str,
+        crops: Iterable[str] | None = None,
+        regions: Iterable[str] | None = None,
+    ) -> SafraDiff:
+        """
+        Compara duas safras célula a célula.
+
+        Pares cultura/estado presentes em só uma das safras contam como
+        calendário vazio na outra.
+
+        Args:
+            before: Safra de referência
+            after: Safra comparada
+            crops: Restringe às culturas dadas
+            regions: Restringe às regiões dadas
+
+        Raises:
+            KeyError: Para safra desconhecida
+        """
+        a_codes = self.codes[self._safra_index(before)]
+        b_codes = self.codes[self._safra_index(after)]
+        a_present = self.present[self._safra_index(before)]
+        b_present = self.present[self._safra_index(after)]
+
+        selected = a_present | b_present
+        if crops is not None:
+            crop_mask = np.isin(np.asarray(self.crops, dtype=object), list(crops))
+            selected &= crop_mask[:, None]
+        regions_of = np.asarray([self.state_info.get(s, {}).get("region", "Unknown") for s in self.states], dtype=object)
+        if regions is not None:
+            selected &= np.isin(regions_of, list(regions))[None, :]
+
+        crops_axis = np.asarray(self.crops, dtype=object)
+        states_axis = np.asarray(self.states, dtype=object)
+        months_axis = np.asarray(MONTHS, dtype=object)
+        labels = np.asarray(ACTIVITY_LABELS, dtype=object)
+
+        c, s, m = np.nonzero((a_codes != b_codes) & selected[..., None])
+        cells = pd.DataFrame({
+            "crop": crops_axis[c],
+            "state_code": states_axis[s],
+            "region": regions_of[s],
+            "month": months_axis[m],
+            "before": labels[a_codes[c, s, m]],
+            "after": labels[b_codes[c, s, m]],
+        })
+
+        frames = []
+        for window, bit in WINDOWS.items():
+            a_mask = (a_codes & bit) > 0
+            b_mask = (b_codes & bit) > 0
+            changed = (a_mask != b_mask).any(axis=-1) & selected
+            c, s = np.nonzero(changed)
+            a_sel, b_sel = a_mask[c, s], b_mask[c, s]
+            # Deslocamento do centro circular da janela (Out–Mar não "salta" em dezembro)
+            shift = circular_shift(masks_from_bools(a_sel), masks_from_bools(b_sel))
+            frames.append(pd.DataFrame({
+                "crop": crops_axis[c],
+                "state_code": states_axis[s],
+                "region": regions_of[s],
+                "window": window,
+                "months_before": a_sel.sum(axis=1),
+                "months_after": b_sel.sum(axis=1),
+                "shift_months": np.round(shift, 1),
+                "added": [", ".join(months_axis[row]) for row in (b_sel & ~a_sel)],
+                "removed": [", ".join(months_axis[row]) for row in (a_sel & ~b_sel)],
+            }))
+        shifts = pd.concat(frames, ignore_index=True).sort_values(["crop", "state_code", "window"], ignore_index=True)
+        return SafraDiff(before, after, cells, shifts)
+
+    def save(self, path: str | Path = CACHE_PATH) -> Path:
+        """Grava os arrays e eixos num ``.npz``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "format": FORMAT_VERSION,
+            "safras": list(self.safras),
+            "crops": list(self.crops),
+            "states": list(self.states),
+            "state_info": self.state_info,
+            "metadata": self.metadata,
+            "sources": [list(source) for source in self.sources],
+        }
+        tmp = path.with_name(path.stem + ".partial.npz")
+        np.savez_compressed(
+            tmp, meta=np.array(json.dumps(meta)), codes=self.codes, present=self.present, rank=self.rank
+        )
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path = CACHE_PATH) -> "SafraCalendar | None":
+        """Lê o cache; None quando ausente ou de outro formato."""
+        try:
+            with np.load(path) as archive:
+                meta = json.loads(str(archive["meta"]))
+                if meta.get("format") != FORMAT_VERSION:
+                    return None
+                codes, present, rank = archive["codes"], archive["present"], archive["rank"]
+        except (OSError, KeyError, ValueError):
+            return None
+        return cls(
+            meta["safras"], meta["crops"], meta["states"], codes, present, rank,
+            meta["state_info"], meta["metadata"], meta["sources"],
+        )
+
+
+def _safra_sources(base_path: Path, safra_dir: Path) -> list[Path]:
+    sources = [base_path] if base_path.exists() else []
+    if safra_dir.is_dir():
+        sources += sorted(p for p in safra_dir.iterdir() if p.suffix in (".json", ".jsonc"))
+    return sources
+
+
+def load_safra_calendar(
+    base_path: str | Path = BASE_CALENDAR_PATH,
+    safra_dir: str | Path = SAFRA_DIR,
+    cache_path: str | Path | None = CACHE_PATH,
+) -> SafraCalendar:
+    """
+    Calendário de todas as safras, lendo do JSON apenas o que o cache não tem.
+
+    As safras em cache cujo arquivo não mudou são reaproveitadas (na ordem);
+    a partir da primeira divergência os arquivos são lidos e acrescentados.
+
+    Args:
+        base_path: Calendário da safra base
+        safra_dir: Diretório com calendários de outras safras
+        cache_path: Cache ``.npz`` (None desativa)
+
+    Raises:
+        ValueError: Para calendário inválido ou rótulo de safra repetido
+    """
+    paths = _safra_sources(Path(base_path), Path(safra_dir))
+    signatures = [_source_signature(path) for path in paths]
+
+    calendar = SafraCalendar.load(cache_path) if cache_path is not None else None
+    kept = 0
+    if calendar is not None:
+        for cached, current in zip(calendar.sources, signatures):
+            if list(cached) != current:
+                break
+            kept += 1
+        stale = len(calendar.sources) != kept
+        calendar = calendar.truncate(kept)
+    else:
+        calendar, stale = SafraCalendar(), False
+
+    for path, signature in zip(paths[kept:], signatures[kept:]):
+        raw = _read_jsonc(path)
+        default = BASE_SAFRA if path == Path(base_path) else path.stem
+        label = str((raw.get("metadata") or {}).get("safra") or default)
+        calendar = calendar.add_safra(label, raw, signature)
+
+    if cache_path is not None and (stale or kept < len(paths)):
+        calendar.save(cache_path)
+    return calendar
+
+
+_calendar_lock = threading.Lock()
+_calendars: dict[tuple, SafraCalendar] = {}
+
+
+def get_safra_calendar() -> SafraCalendar:
+    """Calendário compartilhado, recarregado quando algum arquivo de safra muda."""
+    paths = _safra_sources(BASE_CALENDAR_PATH, SAFRA_DIR)
+    version = tuple(tuple(_source_signature(path)) for path in paths)
+    with _calendar_lock:
+        calendar = _calendars.get(version)
+        if calendar is None:
+            _calendars.clear()
+            calendar = _calendars[version] = load_safra_calendar(BASE_CALENDAR_PATH, SAFRA_DIR, CACHE_PATH)
+        return calendar
@@ -32,6 +32,7 @@ def plot_modern_timeline_chart(
     point_size: int = 12,
     line_width: int = 6,
     shadow_opacity: float = 0.25,
+    consolidate_traces: bool = True,
 ) -> go.Figure:
     """
     Cria um gráfico timeline moderno com pontos de início/fim e intervalos com sombreamento.
@@ -45,6 +46,8 @@ def plot_modern_timeline_chart(
         point_size: Tamanho dos pontos
         line_width: Largura das linhas
         shadow_opacity: Opacidade do sombreamento
+        consolidate_traces: Um trace por categoria visual (início, fim, dados)
+            em vez de até três traces por iniciativa; mesmo resultado visual
 
     Returns:
         go.Figure: Figura Plotly modernizada
@@ -130,6 +133,188 @@ def plot_modern_timeline_chart(
     min_year = min(all_years) if all_years else 1985
     max_year = max(all_years) if all_years else 2024
 
+    colors = [
+        color_map.get(init["name"], modern_colors[i % len(modern_colors)])
+        for i, init in enumerate(initiatives_data)
+    ]
+    if consolidate_traces:
+        _add_consolidated_traces(fig, initiatives_data, colors, point_size)
+    else:
+        _add_traces_per_initiative(fig, initiatives_data, colors, point_size)
+
+    # Configurar layout moderno
+    height = chart_height or max(400, len(initiatives_data) * 40)
+
+    fig.update_layout(
+        title={
+            "text": "<b>Timeline of LULC Monitoring Initiatives</b>",
+            "x": 0.5,
+            "xanchor": "center",
+            "font": {
+                "size": 26,
+                "family": "Arial Black, sans-serif",
+                "color": "#1e293b",
+            },
+        },
+        height=height,
+        margin={"l": 200, "r": 60, "t": 100, "b": 100},
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        hovermode="closest",
+        showlegend=True,
+        legend={
+            "orientation": "v",  # Legenda vertical
+            "yanchor": "top",
+            "y": 1.0,
+            "xanchor": "left",
+            "x": -0.35,  # Posicionada à esquerda, abaixo do eixo Y
+            "bgcolor": "rgba(255,255,255,0.9)",
+            "bordercolor": "rgba(0,0,0,0.2)",
+            "borderwidth": 1,
+            "font": {"size": 11, "color": "#1e293b", "family": "Arial, sans-serif"},
+        },
+    )
+
+    # Configurar eixos
+    fig.update_xaxes(
+        title="<b>Execution Period (Years)</b>",
+        title_font={"size": 16, "color": "#1e293b", "family": "Arial, sans-serif"},
+        range=[min_year - 1, max_year + 1],
+        showgrid=True,
+        gridcolor="rgba(148, 163, 184, 0.4)",
+        gridwidth=1,
+        showline=True,
+        linecolor="#94a3b8",
+        linewidth=2,
+        tickfont={"size": 13, "color": "#374151", "family": "Arial, sans-serif"},
+        tickmode="linear",
+        dtick=5,
+    )
+
+    fig.update_yaxes(
+        title="<b>LULC Monitoring Initiatives</b>",
+        title_font={"size": 16, "color": "#1e293b", "family": "Arial, sans-serif"},
+        tickmode="array",
+        tickvals=y_positions,
+        ticktext=y_labels,
+        tickfont={"size": 12, "color": "#374151", "family": "Arial, sans-serif"},
+        showgrid=False,
+        showline=True,
+        linecolor="#94a3b8",
+        linewidth=2,
+    )  # Aplicar tema moderno final
+    apply_modern_theme(fig, chart_type="timeline")
+
+    return fig
+
+
+def _add_consolidated_traces(
+    fig: go.Figure, initiatives_data: list[dict], colors: list[str], point_size: int
+) -> None:
+    """
+    Adiciona início, fim e dados com um trace por categoria visual.
+
+    Cores por ponto e ``customdata`` para o hover substituem os traces por
+    iniciativa; a legenda continua com uma entrada por categoria.
+    """
+    starts: dict[str, list] = {"x": [], "y": [], "color": [], "data": []}
+    ends: dict[str, list] = {"x": [], "y": [], "color": [], "data": []}
+    points: dict[str, list] = {"x": [], "y": [], "color": [], "data": []}
+
+    for y_pos, (init_data, color) in enumerate(zip(initiatives_data, colors, strict=True)):
+        hover = [init_data["acronym"], init_data["type"], init_data["methodology"]]
+
+        starts["x"].append(init_data["start_year"])
+        starts["y"].append(y_pos)
+        starts["color"].append(color)
+        starts["data"].append(hover)
+
+        if init_data["start_year"] != init_data["end_year"]:
+            ends["x"].append(init_data["end_year"])
+            ends["y"].append(y_pos)
+            ends["color"].append(color)
+            ends["data"].append(hover)
+
+        if len(init_data["years"]) > 2:
+            for year in init_data["years"]:
+                if year != init_data["start_year"] and year != init_data["end_year"]:
+                    points["x"].append(year)
+                    points["y"].append(y_pos)
+                    points["color"].append(color)
+                    points["data"].append(hover)
+
+    fig.add_trace(
+        go.Scatter(
+            x=starts["x"],
+            y=starts["y"],
+            mode="markers",
+            marker={
+                "size": point_size + 2,
+                "color": starts["color"],
+                "symbol": "square",
+                "opacity": 1.0,
+                "line": {"width": 2, "color": "white"},
+            },
+            name="■ Start of Initiative",
+            legendgroup="starts",
+            customdata=starts["data"],
+            hovertemplate="<b>%{customdata[0]} - START</b><br>"
+            + "Year: %{x}<br>"
+            + "Type: %{customdata[1]}<br>"
+            + "Methodology: %{customdata[2]}<extra></extra>",
+        )
+    )
+
+    if ends["x"]:
+        fig.add_trace(
+            go.Scatter(
+                x=ends["x"],
+                y=ends["y"],
+                mode="markers",
+                marker={
+                    "size": point_size + 3,
+                    "color": ends["color"],
+                    "symbol": "square-open",
+                    "opacity": 1.0,
+                    "line": {"width": 3, "color": ends["color"]},
+                },
+                name="□ End of Initiative",
+                legendgroup="ends",
+                customdata=ends["data"],
+                hovertemplate="<b>%{customdata[0]} - END</b><br>"
+                + "Year: %{x}<br>"
+                + "Type: %{customdata[1]}<br>"
+                + "Methodology: %{customdata[2]}<extra></extra>",
+            )
+        )
+
+    if points["x"]:
+        fig.add_trace(
+            go.Scatter(
+                x=points["x"],
+                y=points["y"],
+                mode="markers",
+                marker={
+                    "size": point_size - 2,
+                    "color": points["color"],
+                    "symbol": "circle",
+                    "opacity": 0.8,
+                    "line": {"width": 1, "color": "white"},
+                },
+                name="● Data Available",
+                legendgroup="data_points",
+                customdata=points["data"],
+                hovertemplate="<b>%{customdata[0]}</b><br>"
+                + "Data available at: %{x}<br>"
+                + "Type: %{customdata[1]}<extra></extra>",
+            )
+        )
+
+
+def _add_traces_per_initiative(
+    fig: go.Figure, initiatives_data: list[dict], colors: list[str], point_size: int
+) -> None:
+    """Adiciona pontos de início, fim e dados como traces separados por iniciativa."""
     # Variáveis de controle para legendas únicas
     legend_start_added = False
     legend_end_added = False
@@ -138,7 +323,7 @@ def plot_modern_timeline_chart(
     # Adicionar traces para cada iniciativa
     for i, init_data in enumerate(initiatives_data):
         y_pos = i
-        color = color_map.get(init_data["name"], modern_colors[i % len(modern_colors)])
+        color = colors[i]
 
         # Sombreamento removido temporariamente para evitar sobreposições visuais
 
@@ -223,71 +408,6 @@ def plot_modern_timeline_chart(
                 )
                 legend_data_added = True
 
-    # Configurar layout moderno
-    height = chart_height or max(400, len(initiatives_data) * 40)
-
-    fig.update_layout(
-        title={
-            "text": "<b>Timeline of LULC Monitoring Initiatives</b>",
-            "x": 0.5,
-            "xanchor": "center",
-            "font": {
-                "size": 26,
-                "family": "Arial Black, sans-serif",
-                "color": "#1e293b",
-            },
-        },
-        height=height,
-        margin={"l": 200, "r": 60, "t": 100, "b": 100},
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        hovermode="closest",
-        showlegend=True,
-        legend={
-            "orientation": "v",  # Legenda vertical
-            "yanchor": "top",
-            "y": 1.0,
-            "xanchor": "left",
-            "x": -0.35,  # Posicionada à esquerda, abaixo do eixo Y
-            "bgcolor": "rgba(255,255,255,0.9)",
-            "bordercolor": "rgba(0,0,0,0.2)",
-            "borderwidth": 1,
-            "font": {"size": 11, "color": "#1e293b", "family": "Arial, sans-serif"},
-        },
-    )
-
-    # Configurar eixos
-    fig.update_xaxes(
-        title="<b>Execution Period (Years)</b>",
-        title_font={"size": 16, "color": "#1e293b", "family": "Arial, sans-serif"},
-        range=[min_year - 1, max_year + 1],
-        showgrid=True,
-        gridcolor="rgba(148, 163, 184, 0.4)",
-        gridwidth=1,
-        showline=True,
-        linecolor="#94a3b8",
-        linewidth=2,
-        tickfont={"size": 13, "color": "#374151", "family": "Arial, sans-serif"},
-        tickmode="linear",
-        dtick=5,
-    )
-
-    fig.update_yaxes(
-        title="<b>LULC Monitoring Initiatives</b>",
-        title_font={"size": 16, "color": "#1e293b", "family": "Arial, sans-serif"},
-        tickmode="array",
-        tickvals=y_positions,
-        ticktext=y_labels,
-        tickfont={"size": 12, "color": "#374151", "family": "Arial, sans-serif"},
-        showgrid=False,
-        showline=True,
-        linecolor="#94a3b8",
-        linewidth=2,
-    )  # Aplicar tema moderno final
-    apply_modern_theme(fig, chart_type="timeline")
-
-    return fig
-
 
 def _hex_to_rgba(hex_color: str, alpha: float) -> str:
     """Converte cor hex para rgba com alpha."""
@@ -0,0 +1,316 @@
+"""
+Heatmap Level of Detail
+=======================
+
+Server-side level of detail (LOD) for large heatmaps and matrices.
+
+Coverage matrices (initiatives × years), calendars (crops × months) and
+distribution charts (crops × states) grow with the data; past a few hundred
+rows a browser can no longer draw them smoothly, and the cells would be
+thinner than a pixel anyway. ``HeatmapPyramid`` precomputes coarser levels
+of a matrix, each aggregating blocks of 2×2, 4×4, … rows/columns (mean, sum
+or max, NaN-aware). ``HeatmapPyramid.view`` picks the finest level that fits
+a cell budget for the requested row/column window, so:
+
+- the full matrix is shown aggregated into blocks;
+- a narrower window (drill-down) is shown at a finer level, down to full
+  resolution once it fits the budget;
+- the number of cells sent never exceeds ``max_rows × max_cols``.
+
+Levels are built lazily, the first time a view needs them, and stored as
+read-only arrays, so a pyramid can be shared between reruns and sessions:
+``cached_pyramid`` keeps the pyramids of the last source objects (frozen
+calendars, data plane metadata, memoized filter results) so reruns and
+drill-down slider moves reuse them instead of rebuilding.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+import functools
+import math
+import threading
+from typing import Any
+
+import numpy as np
+import plotly.graph_objects as go
+
+AGGREGATIONS = ("mean", "sum", "max")
+MIN_CELL_PX = 6
+DEFAULT_MAX_ROWS = 120
+DEFAULT_MAX_COLS = 120
+MAX_CACHED_PYRAMIDS = 16
+
+
+def pixel_budget(height_px: int, width_px: int = 1200, min_cell_px: int = MIN_CELL_PX) -> tuple[int, int]:
+    """
+    Rows and columns that fit a plot area with cells of at least ``min_cell_px``.
+
+    Args:
+        height_px: Plot height in pixels
+        width_px: Plot width in pixels
+        min_cell_px: Smallest readable cell size
+
+    Returns:
+        (max_rows, max_cols)
+    """
+    return max(1, height_px // min_cell_px), max(1, width_px // min_cell_px)
+
+
+def _pairwise(values: np.ndarray, axis: int, reduce) -> np.ndarray:
+    """Combine neighbouring pairs along ``axis`` (an odd tail stays alone)."""
+    n = values.shape[axis]
+    even = np.take(values, range(0, n - n % 2), axis=axis)
+    shape = list(even.shape)
+    shape[axis:axis + 1] = [n // 2, 2]
+    combined = reduce(even.reshape(shape), axis=axis + 1)
+    if n % 2:
+        combined = np.concatenate([combined, np.take(values, [n - 1], axis=axis)], axis=axis)
+    return combined
+
+
+def _block_label(labels: Sequence[str], start: int, stop: int) -> str:
+    if stop - start == 1:
+        return str(labels[start])
+    return f"{labels[start]} – {labels[stop - 1]} ({stop - start})"
+
+
+def _level_count(size: int) -> int:
+    """Levels of an axis of ``size`` cells (halved until one block remains)."""
+    count = 1
+    while size > 1:
+        size = (size + 1) // 2
+        count += 1
+    return count
+
+
+def _block_bounds(size: int, step: int, first: int, last: int) -> list[tuple[int, int]]:
+    return [(b * step, min((b + 1) * step, size)) for b in range(first, last)]
+
+
+@dataclass(frozen=True)
+class LodView:
+    """Matrix window at one pyramid level."""
+
+    z: np.ndarray
+    row_labels: list[str]
+    col_labels: list[str]
+    row_step: int
+    col_step: int
+    row_range: tuple[int, int]
+    col_range: tuple[int, int]
+    row_sizes: list[int]
+    col_sizes: list[int]
+    agg: str
+
+    @property
+    def full_resolution(self) -> bool:
+        """True when every cell is one source cell."""
+        return self.row_step == 1 and self.col_step == 1
+
+    @property
+    def cells(self) -> int:
+        return int(self.z.size)
+
+    def describe(self) -> str:
+        """Short caption of the detail level."""
+        if self.full_resolution:
+            return "Full resolution"
+        return (
+            f"Aggregated ({self.agg}) in blocks of {self.row_step} row(s) × "
+            f"{self.col_step} column(s); narrow the window to drill in"
+        )
+
+    def heatmap(self, **trace_kwargs: Any) -> go.Heatmap:
+        """``go.Heatmap`` of this view (``z``/``x``/``y`` filled in)."""
+        return go.Heatmap(z=self.z, x=self.col_labels, y=self.row_labels, **trace_kwargs)
+
+
+class HeatmapPyramid:
+    """
+    Precomputed aggregation levels of a 2-D matrix.
+
+    Args:
+        z: Matrix (rows × columns); NaN marks missing cells
+        row_labels: One label per row
+        col_labels: One label per column
+        agg: Block aggregation, one of ``AGGREGATIONS``
+
+    Raises:
+        ValueError: For an unknown aggregation or mismatched labels
+    """
+
+    def __init__(
+        self,
+        z: Any,
+        row_labels: Sequence[Any],
+        col_labels: Sequence[Any],
+        agg: str = "mean",
+    ):
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {agg!r}; expected one of {AGGREGATIONS}")
+        matrix = np.asarray(z, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape != (len(row_labels), len(col_labels)):
+            raise ValueError(
+                f"Matrix shape {matrix.shape} does not match "
+                f"{len(row_labels)} row and {len(col_labels)} column labels"
+            )
+
+        self.agg = agg
+        self.row_labels = [str(label) for label in row_labels]
+        self.col_labels = [str(label) for label in col_labels]
+        self.shape = matrix.shape
+        self._lock = threading.Lock()
+        self._levels: dict[tuple[int, int], np.ndarray] = {}
+        self._block_sums = {(0, 0): self._base_sums(matrix)}
+
+    @property
+    def n_rows(self) -> int:
+        return self.shape[0]
+
+    @property
+    def n_cols(self) -> int:
+        return self.shape[1]
+
+    @property
+    def levels(self) -> list[tuple[int, int]]:
+        """Available (row level, column level) pairs; step = 2 ** level."""
+        return [
+            (ri, ci)
+            for ri in range(_level_count(self.n_rows))
+            for ci in range(_level_count(self.n_cols))
+        ]
+
+    def _base_sums(self, matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        valid = ~np.isnan(matrix)
+        fill = -np.inf if self.agg == "max" else 0.0
+        return np.where(valid, matrix, fill), valid.astype(np.int64)
+
+    def _sums(self, ri: int, ci: int) -> tuple[np.ndarray, np.ndarray]:
+        """Block values and valid counts of a level (callers hold the lock)."""
+        sums = self._block_sums.get((ri, ci))
+        if sums is None:
+            # Columns are halved from the same row level, rows from level 0 columns
+            value, count = self._sums(ri, ci - 1) if ci else self._sums(ri - 1, 0)
+            axis = 1 if ci else 0
+            reduce = np.max if self.agg == "max" else np.sum
+            sums = (_pairwise(value, axis, reduce), _pairwise(count, axis, np.sum))
+            self._block_sums[(ri, ci)] = sums
+        return sums
+
+    def _level(self, ri: int, ci: int) -> np.ndarray:
+        """Aggregated matrix of a level, built on first use."""
+        with self._lock:
+            level = self._levels.get((ri, ci))
+            if level is None:
+                level = self._levels[(ri, ci)] = self._finish(*self._sums(ri, ci))
+            return level
+
+    def _finish(self, value: np.ndarray, count: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if self.agg == "mean":
+                out = value / count
+            else:
+                out = value.astype(np.float64)
+        out = np.where(count > 0, out, np.nan)
+        out.flags.writeable = False
+        return out
+
+    @staticmethod
+    def _level_for(start: int, stop: int, size: int, budget: int) -> int:
+        level = 0
+        while True:
+            step = 2 ** level
+            if math.ceil(stop / step) - start // step <= budget or step >= size:
+                return level
+            level += 1
+
+    @staticmethod
+    def _check_range(window: tuple[int, int] | None, size: int, axis: str) -> tuple[int, int]:
+        if window is None:
+            return 0, size
+        start, stop = int(window[0]), int(window[1])
+        if not 0 <= start < stop <= size:
+            raise ValueError(f"Invalid {axis} range {window!r} for {size} {axis}")
+        return start, stop
+
+    def view(
+        self,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_cols: int = DEFAULT_MAX_COLS,
+        row_range: tuple[int, int] | None = None,
+        col_range: tuple[int, int] | None = None,
+    ) -> LodView:
+        """
+        Finest view of a window that fits the cell budget.
+
+        Windows snap outwards to block boundaries of the chosen level.
+
+        Args:
+            max_rows: Row budget
+            max_cols: Column budget
+            row_range: Source rows ``(start, stop)``; None for all
+            col_range: Source columns ``(start, stop)``; None for all
+
+        Returns:
+            View with at most ``max_rows × max_cols`` cells
+
+        Raises:
+            ValueError: For a budget below 1 or an invalid range
+        """
+        if max_rows < 1 or max_cols < 1:
+            raise ValueError("Cell budget must allow at least one row and one column")
+        r0, r1 = self._check_range(row_range, self.n_rows, "rows")
+        c0, c1 = self._check_range(col_range, self.n_cols, "columns")
+
+        ri = self._level_for(r0, r1, self.n_rows, max_rows)
+        ci = self._level_for(c0, c1, self.n_cols, max_cols)
+        row_step, col_step = 2 ** ri, 2 ** ci
+        rb0, rb1 = r0 // row_step, math.ceil(r1 / row_step)
+        cb0, cb1 = c0 // col_step, math.ceil(c1 / col_step)
+
+        rows = _block_bounds(self.n_rows, row_step, rb0, rb1)
+        cols = _block_bounds(self.n_cols, col_step, cb0, cb1)
+        return LodView(
+            z=self._level(ri, ci)[rb0:rb1, cb0:cb1],
+            row_labels=[_block_label(self.row_labels, a, b) for a, b in rows],
+            col_labels=[_block_label(self.col_labels, a, b) for a, b in cols],
+            row_step=row_step,
+            col_step=col_step,
+            row_range=(rows[0][0], rows[-1][1]),
+            col_range=(cols[0][0], cols[-1][1]),
+            row_sizes=[b - a for a, b in rows],
+            col_sizes=[b - a for a, b in cols],
+            agg=self.agg,
+        )
+
+
+def cached_pyramid(builder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Reuse the pyramid(s) ``builder`` made from the same source object.
+
+    Sources are compared by identity (``is``), not content: hashing a
+    calendar costs more than building its pyramid, while the sources that
+    matter are shared objects (one frozen calendar per safra and data
+    version, one memoized dict per filter state). Sources must not be
+    mutated after use; the last ``MAX_CACHED_PYRAMIDS`` are kept.
+    """
+    lock = threading.Lock()
+    cache: list[tuple[Any, Any]] = []
+
+    @functools.wraps(builder)
+    def wrapper(source: Any) -> Any:
+        with lock:
+            for cached_source, pyramid in cache:
+                if cached_source is source:
+                    return pyramid
+        pyramid = builder(source)
+        with lock:
+            cache.append((source, pyramid))
+            del cache[:-MAX_CACHED_PYRAMIDS]
+        return pyramid
+
+    wrapper.cache_clear = cache.clear
+    return wrapper
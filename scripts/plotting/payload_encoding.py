@@ -0,0 +1,386 @@
+"""
+Payload Encoding
+================
+
+Figure post-processor shrinking the JSON Streamlit sends for Plotly charts.
+
+Chart builders fill ``x``/``y``/``z`` (and marker colour/size arrays) with
+Python lists, which Plotly serializes as JSON number lists. Numpy arrays are
+serialized with Plotly's base64 typed-array encoding (``{"dtype", "bdata"}``)
+instead, so ``compact_figure`` converts numeric arrays to the smallest dtype
+that holds them:
+
+- integral values (years, counts) → ``int8``/``uint8``/``int16``/… ;
+- colour/intensity values (``z``, marker colour, size, opacity) → ``float32``;
+- other floats (coordinates, ``customdata`` shown verbatim in hover text)
+  stay ``float64`` but are still base64 encoded.
+
+It also drops per-point ``text`` that only repeats the plotted value (e.g. a
+heatmap annotated with ``texttemplate="%{text}"`` and ``text=z``) in favour
+of ``texttemplate="%{z}"``, unless the hover still reads ``%{text}``.
+Figures whose arrays hold fewer than ``MIN_FIGURE_POINTS`` values in total
+are returned unchanged, so small charts skip the ``to_dict`` round trip.
+
+``install_payload_compaction`` applies the post-processor to every figure
+passed to ``st.plotly_chart`` (see ``plotly_chart_hook``);
+``benchmark_payload_encoding`` reports the size reduction per heatmap.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+import base64
+from collections.abc import Callable
+import numbers
+import os
+from typing import Any
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+MIN_ARRAY_SIZE = 8
+MIN_FIGURE_POINTS = 256
+ARRAY_KEYS = ("x", "y", "z", "text", "customdata", "values", "lat", "lon", "r", "theta")
+FLOAT32_KEYS = frozenset({"z", "color", "size", "opacity", "width", "values", "r"})
+SKIPPED_KEYS = frozenset({"text", "hovertext", "ids", "geojson", "colorscale", "range", "tickvals"})
+_INT_DTYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32)
+
+
+def _decode_typed_array(spec: dict) -> np.ndarray:
+    """Numpy array from a Plotly typed-array spec (``figure.to_dict`` output)."""
+    arr = np.frombuffer(base64.b64decode(spec["bdata"]), dtype=np.dtype(spec["dtype"]))
+    shape = spec.get("shape")
+    if shape:
+        arr = arr.reshape(tuple(int(dim) for dim in str(shape).split(",")))
+    return arr
+
+
+def _numeric_object_array(arr: np.ndarray) -> np.ndarray | None:
+    """Float array from an object array of numbers/None (None → NaN)."""
+    for value in arr.flat:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, numbers.Real):
+            return None
+    return np.array([np.nan if v is None else v for v in arr.flat], dtype=np.float64).reshape(arr.shape)
+
+
+def _smallest_int_dtype(lo: float, hi: float) -> type | None:
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return None
+
+
+def compact_array(
+    values: Any,
+    allow_float32: bool = True,
+    allow_missing: bool = False,
+    min_size: int = MIN_ARRAY_SIZE,
+) -> np.ndarray | None:
+    """
+    Convert a numeric array to its most compact dtype.
+
+    Args:
+        values: List, tuple or numpy array (may be 2-D)
+        allow_float32: Downcast non-integral floats to ``float32``
+        allow_missing: Accept ``None`` entries (stored as NaN); otherwise
+            arrays with gaps are left alone, as ``None`` breaks lines
+        min_size: Smaller arrays are not worth converting
+
+    Returns:
+        Compact numpy array, or None when ``values`` is not a numeric array
+    """
+    if isinstance(values, np.ndarray):
+        arr = values
+    elif isinstance(values, (list, tuple)):
+        if len(values) == 0:
+            return None
+        try:
+            arr = np.asarray(values)
+        except ValueError:  # ragged
+            return None
+    else:
+        return None
+
+    if arr.size < min_size:
+        return None
+
+    if arr.dtype.kind == "O":
+        arr = _numeric_object_array(arr)
+        if arr is None:
+            return None
+        if not allow_missing and np.isnan(arr).any():
+            return None
+    elif arr.dtype.kind not in "iuf":
+        return None
+
+    finite = arr[np.isfinite(arr)] if arr.dtype.kind == "f" else arr
+    if finite.size == 0:
+        return None
+    integral = arr.dtype.kind in "iu" or (
+        finite.size == arr.size and np.array_equal(finite, np.round(finite))
+    )
+    if integral:
+        dtype = _smallest_int_dtype(finite.min(), finite.max())
+        if dtype is not None:
+            return arr.astype(dtype)
+    if allow_float32 and np.abs(finite).max() <= np.finfo(np.float32).max:
+        return arr.astype(np.float32)
+    return arr.astype(np.float64)
+
+
+def _compact_props(props: dict, min_size: int = MIN_ARRAY_SIZE) -> int:
+    """Compact numeric arrays of a trace dict in place; returns arrays converted."""
+    converted = 0
+    for key, value in props.items():
+        if key in SKIPPED_KEYS:
+            continue
+        if isinstance(value, dict) and "bdata" in value and "dtype" in value:
+            value = _decode_typed_array(value)
+        elif isinstance(value, dict):
+            converted += _compact_props(value, min_size)
+            continue
+        if isinstance(value, (list, tuple)) and value and isinstance(value[0], dict):
+            for item in value:
+                if isinstance(item, dict):
+                    converted += _compact_props(item, min_size)
+            continue
+        compact = compact_array(
+            value,
+            allow_float32=key in FLOAT32_KEYS,
+            allow_missing=key == "z",
+            min_size=min_size,
+        )
+        if compact is not None:
+            props[key] = compact
+            converted += 1
+    return converted
+
+
+def _integral_equal(left: Any, right: Any) -> bool:
+    """Whether two arrays hold the same integral values."""
+    try:
+        a = np.asarray(left, dtype=np.float64)
+        b = np.asarray(right, dtype=np.float64)
+    except (TypeError, ValueError):
+        return False
+    return (
+        a.shape == b.shape
+        and bool(np.isfinite(a).all())
+        and np.array_equal(a, b)
+        and np.array_equal(a, np.round(a))
+    )
+
+
+def _references_text(template: Any) -> bool:
+    """Whether a template (string or per-point list) reads ``%{text}``."""
+    if isinstance(template, str):
+        return "%{text}" in template
+    if isinstance(template, (list, tuple)):
+        return any(_references_text(item) for item in template)
+    return False
+
+
+def _drop_redundant_text(trace: dict) -> bool:
+    """
+    Replace per-point ``text`` repeating the plotted value with a template.
+
+    Only traces already labelled with ``texttemplate="%{text}"`` are
+    rewritten: without a template, heatmap ``text`` is hover-only. Traces
+    whose hover reads the text are left alone.
+    """
+    text = trace.get("text")
+    if text is None or isinstance(text, str) or trace.get("texttemplate") != "%{text}":
+        return False
+    if _references_text(trace.get("hovertemplate")) or _references_text(trace.get("hovertext")):
+        return False
+    hoverinfo = trace.get("hoverinfo")
+    if isinstance(hoverinfo, str) and "text" in hoverinfo.split("+"):
+        return False
+
+    trace_type = trace.get("type")
+    if trace_type == "heatmap":
+        value_key = "z"
+    elif trace_type == "bar":
+        value_key = "x" if trace.get("orientation") == "h" else "y"
+    else:
+        return False
+
+    values = trace.get(value_key)
+    if isinstance(values, dict) and "bdata" in values:
+        values = _decode_typed_array(values)
+    if not _integral_equal(text, values):
+        return False
+    del trace["text"]
+    trace["texttemplate"] = f"%{{{value_key}}}"
+    return True
+
+
+def _array_points(value: Any) -> int:
+    """Number of values in a trace array (0 for scalars)."""
+    if isinstance(value, np.ndarray):
+        return value.size
+    if isinstance(value, (list, tuple)) and value:
+        first = value[0]
+        return len(value) * (len(first) if isinstance(first, (list, tuple, np.ndarray)) else 1)
+    return 0
+
+
+def figure_points(fig: go.Figure) -> int:
+    """Values held by the data arrays of ``fig`` (read without ``to_dict``)."""
+    total = 0
+    for trace in fig.data:
+        for key in ARRAY_KEYS:
+            total += _array_points(getattr(trace, key, None))
+        marker = getattr(trace, "marker", None)
+        for key in ("color", "size"):
+            total += _array_points(getattr(marker, key, None))
+    return total
+
+
+def compact_figure(
+    fig: go.Figure,
+    min_size: int = MIN_ARRAY_SIZE,
+    min_points: int = MIN_FIGURE_POINTS,
+) -> go.Figure:
+    """
+    Return a copy of ``fig`` with compact numeric arrays.
+
+    The input figure is not modified (it may be shared through a cache).
+
+    Args:
+        fig: Plotly figure
+        min_size: Arrays shorter than this are left as lists
+        min_points: Figures with fewer array values are returned as is
+
+    Returns:
+        New figure serializing numeric arrays as base64 typed arrays (or
+        ``fig`` itself when it is too small to be worth converting)
+    """
+    if not isinstance(fig, go.Figure) or figure_points(fig) < min_points:
+        return fig
+
+    spec = fig.to_dict()
+    for trace in spec.get("data", []):
+        _drop_redundant_text(trace)
+        _compact_props(trace, min_size=min_size)
+    return go.Figure(spec, _validate=False)
+
+
+def payload_size(fig: Any) -> int:
+    """Bytes of the JSON Streamlit sends for ``fig``."""
+    return len(pio.to_json(fig, validate=False))
+
+
+def payload_compaction_enabled() -> bool:
+    """Whether ``LANDAGRI_COMPACT_PAYLOADS`` allows compaction (default on)."""
+    return os.environ.get("LANDAGRI_COMPACT_PAYLOADS", "1").lower() not in ("0", "false", "off")
+
+
+def install_payload_compaction() -> bool:
+    """
+    Compact every figure passed to ``st.plotly_chart``.
+
+    Returns:
+        True when the post-processor is installed
+    """
+    if not payload_compaction_enabled():
+        return False
+
+    from scripts.utilities.plotly_chart_hook import add_plotly_chart_transformer
+
+    add_plotly_chart_transformer(compact_figure)
+    return True
+
+
+def _synthetic_heatmap_inputs(n_rows: int, seed: int) -> dict[str, Any]:
+    """Inputs of the benchmarked heatmaps, built from synthetic data."""
+    import pandas as pd
+
+    from scripts.plotting.trace_consolidation import (
+        synthetic_crop_calendar,
+        synthetic_timeline_metadata,
+    )
+
+    rng = np.random.default_rng(seed)
+    performance = pd.DataFrame(
+        rng.random((n_rows, 6)),
+        columns=["Accuracy", "Resolution", "Classes", "Frequency", "Coverage", "Years"],
+    )
+    performance.insert(0, "Initiative", [f"Initiative {i:04d}" for i in range(n_rows)])
+    metadata = synthetic_timeline_metadata(n_rows, seed)
+    temporal = pd.DataFrame(
+        {"Name": name, "Display_Name": details["acronym"], "Years_List": details["available_years"]}
+        for name, details in metadata.items()
+    )
+    return {
+        "calendar": {"crop_calendar": synthetic_crop_calendar(n_rows, seed)},
+        "metadata": metadata,
+        "temporal": temporal,
+        "performance": performance,
+    }
+
+
+def benchmark_payload_encoding(n_rows: int = 200, seed: int = 42) -> dict[str, dict[str, float]]:
+    """
+    JSON payload of the heatmaps before and after ``compact_figure``.
+
+    Args:
+        n_rows: Crops/initiatives in the synthetic inputs
+        seed: Random seed
+
+    Returns:
+        Chart name → {"raw_bytes", "compact_bytes", "reduction_pct"}
+    """
+    from dashboard.components.agricultural_analysis.charts.calendar.activity_intensity import (
+        build_intensity_heatmap,
+    )
+    from dashboard.components.agricultural_analysis.charts.calendar.national_calendar_matrix import (
+        create_calendar_heatmap_chart,
+    )
+    from dashboard.components.initiative_analysis.charts.comparison.performance_heatmap_component import (
+        create_performance_heatmap,
+    )
+    from dashboard.components.initiative_analysis.charts.temporal.coverage_heatmap_component import (
+        plot_coverage_heatmap_chart,
+    )
+    from dashboard.components.initiative_analysis.charts.temporal.coverage_matrix_heatmap_component import (
+        build_coverage_availability_figure,
+    )
+
+    inputs = _synthetic_heatmap_inputs(n_rows, seed)
+    performance_heatmap = getattr(create_performance_heatmap, "__wrapped__", create_performance_heatmap)
+    builders: dict[str, Callable[[], go.Figure | None]] = {
+        "intensity_heatmap": lambda: build_intensity_heatmap(inputs["calendar"]),
+        "coverage_heatmap": lambda: build_coverage_availability_figure(inputs["metadata"]),
+        "coverage_matrix": lambda: plot_coverage_heatmap_chart(inputs["temporal"], 1990, 2023, "Coverage"),
+        "calendar_heatmap": lambda: create_calendar_heatmap_chart(inputs["calendar"]),
+        "performance_heatmap": lambda: performance_heatmap(inputs["performance"]),
+    }
+
+    report = {}
+    for chart, build in builders.items():
+        fig = build()
+        if fig is None:
+            continue
+        raw = payload_size(fig)
+        compact = payload_size(compact_figure(fig))
+        report[chart] = {
+            "raw_bytes": raw,
+            "compact_bytes": compact,
+            "reduction_pct": round(100 * (1 - compact / raw), 1),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for chart, metrics in benchmark_payload_encoding(size).items():
+        print(f"{chart:>20}: {metrics}")
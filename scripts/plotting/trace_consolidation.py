@@ -0,0 +1,204 @@
+"""
+Trace Consolidation
+===================
+
+Helpers to draw many small marks (initiative rows, year segments, Gantt
+bars) with one Plotly trace per visual category instead of one per item.
+
+Figures that called ``fig.add_trace`` per initiative and per segment grew in
+JSON size and browser render time with initiatives × years: plotly.js lays
+out, styles and hit-tests every trace separately. Consolidated traces carry
+per-point colour arrays and ``customdata`` for hover text, and line
+segments of the same style are joined with ``None`` separators (Plotly
+breaks the line at each gap).
+
+``benchmark_trace_consolidation`` compares both modes for the timeline
+and Gantt charts at a configurable number of items.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Callable, Hashable, Iterable, Sequence
+import random
+import time
+from typing import Any
+
+
+def join_segments(
+    segments: Iterable[tuple[Sequence[Any], Sequence[Any]]],
+) -> tuple[list[Any], list[Any]]:
+    """
+    Join line segments into single x/y arrays separated by ``None``.
+
+    Args:
+        segments: ``(xs, ys)`` pairs, one per segment
+
+    Returns:
+        x and y lists for one ``go.Scatter(mode="lines")`` trace
+    """
+    xs: list[Any] = []
+    ys: list[Any] = []
+    for seg_x, seg_y in segments:
+        if xs:
+            xs.append(None)
+            ys.append(None)
+        xs.extend(seg_x)
+        ys.extend(seg_y)
+    return xs, ys
+
+
+def group_segments(
+    items: Iterable[Any],
+    style: Callable[[Any], Hashable],
+    segment: Callable[[Any], tuple[Sequence[Any], Sequence[Any]] | None],
+) -> dict[Hashable, tuple[list[Any], list[Any]]]:
+    """
+    Group line segments by style (e.g. colour) and join each group.
+
+    Lines cannot vary colour along a trace, so segments are consolidated
+    into one trace per distinct style, in first-seen order.
+
+    Args:
+        items: Rows to draw
+        style: Returns the style key of a row
+        segment: Returns the ``(xs, ys)`` segment of a row, or None to skip
+
+    Returns:
+        Style key → joined ``(xs, ys)`` arrays
+    """
+    grouped: dict[Hashable, list[tuple[Sequence[Any], Sequence[Any]]]] = {}
+    for item in items:
+        seg = segment(item)
+        if seg is not None:
+            grouped.setdefault(style(item), []).append(seg)
+    return {key: join_segments(segs) for key, segs in grouped.items()}
+
+
+def synthetic_timeline_metadata(
+    n_initiatives: int = 1000, seed: int = 42
+) -> dict[str, dict[str, Any]]:
+    """
+    Initiative metadata with random year coverage (for benchmarks).
+
+    Args:
+        n_initiatives: Number of initiatives
+        seed: Random seed
+
+    Returns:
+        Metadata dict in the ``initiatives_metadata.jsonc`` layout
+    """
+    rng = random.Random(seed)
+    coverages = ["Global", "Regional", "National"]
+    methodologies = ["Machine Learning", "Deep Learning", "Visual Interpretation"]
+    metadata = {}
+    for i in range(n_initiatives):
+        start = rng.randint(1985, 2020)
+        end = rng.randint(start, 2024)
+        years = sorted(y for y in range(start, end + 1) if rng.random() > 0.2) or [start]
+        metadata[f"Initiative {i:04d}"] = {
+            "acronym": f"I{i:04d}",
+            "available_years": years,
+            "coverage": rng.choice(coverages),
+            "type": rng.choice(coverages),
+            "methodology": rng.choice(methodologies),
+        }
+    return metadata
+
+
+def _measure(build: Callable[[], Any]) -> dict[str, float]:
+    started = time.perf_counter()
+    fig = build()
+    build_s = time.perf_counter() - started
+    started = time.perf_counter()
+    payload = fig.to_json()
+    serialize_s = time.perf_counter() - started
+    return {
+        "traces": len(fig.data),
+        "json_bytes": len(payload),
+        "build_s": round(build_s, 3),
+        "serialize_s": round(serialize_s, 3),
+    }
+
+
+def synthetic_crop_calendar(n_crops: int = 1000, seed: int = 42) -> dict[str, list[dict]]:
+    """
+    Crop calendar data with random planting/harvest months (for benchmarks).
+
+    Args:
+        n_crops: Number of crops
+        seed: Random seed
+
+    Returns:
+        Crop → state entries in the ``filtered_data`` layout of the Gantt chart
+    """
+    rng = random.Random(seed)
+    months = [
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December",
+    ]
+    data = {}
+    for i in range(n_crops):
+        calendar = {month: rng.choice(["", "P", "H", "PH"]) for month in months}
+        data[f"Crop {i:04d}"] = [{"state": "BR", "calendar": calendar}]
+    return data
+
+
+def benchmark_trace_consolidation(n_initiatives: int = 1000) -> dict[str, dict[str, dict]]:
+    """
+    Compare per-item and consolidated traces for the timeline and Gantt charts.
+
+    Trace count and JSON size drive the browser cost (plotly.js work grows
+    with the number of traces); client render time itself needs a browser
+    and is not measured here.
+
+    Args:
+        n_initiatives: Synthetic initiatives (and crops) to draw
+
+    Returns:
+        Chart name → {"per_item": metrics, "consolidated": metrics}
+    """
+    import pandas as pd
+
+    from dashboard.components.agricultural_analysis.charts.calendar.crop_gantt_chart import (
+        build_crop_gantt_figure,
+        build_gantt_rows,
+    )
+    from dashboard.components.initiative_analysis.charts.temporal.timeline_component import (
+        plot_timeline_chart,
+    )
+    from scripts.plotting.charts.modern_timeline_chart import plot_modern_timeline_chart
+
+    metadata = synthetic_timeline_metadata(n_initiatives)
+    temporal_data = pd.DataFrame({"Name": list(metadata)})
+    modern_data = pd.DataFrame({"Name": list(metadata), "Acronym": [m["acronym"] for m in metadata.values()]})
+    timeline = getattr(plot_timeline_chart, "__wrapped__", plot_timeline_chart)
+    gantt_rows = build_gantt_rows(synthetic_crop_calendar(n_initiatives), max_crops=None)
+
+    charts = {
+        "timeline": lambda consolidate: timeline(
+            metadata, temporal_data, True, False, True, consolidate_traces=consolidate
+        ),
+        "modern": lambda consolidate: plot_modern_timeline_chart(
+            metadata, modern_data, consolidate_traces=consolidate
+        ),
+        "gantt": lambda consolidate: build_crop_gantt_figure(gantt_rows, consolidate_traces=consolidate),
+    }
+    return {
+        chart: {
+            mode: _measure(lambda build=build, consolidate=consolidate: build(consolidate))
+            for mode, consolidate in (("per_item", False), ("consolidated", True))
+        }
+        for chart, build in charts.items()
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for chart, modes in benchmark_trace_consolidation(size).items():
+        for mode, metrics in modes.items():
+            print(f"{chart:>10} {mode:>12}: {metrics}")
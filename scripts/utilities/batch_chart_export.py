@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Batch Chart Export Service
+==========================
+
+Exports many Plotly figures at once (e.g. every chart rendered on a page) to a
+zip archive or a multi-page PDF.
+
+Figures are rendered by a pool of long-lived worker processes. Each worker
+starts Kaleido once and reuses it for every figure it receives, so the
+renderer startup cost is paid per worker instead of per figure. Identical
+figures are detected by hashing their JSON and rendered only once.
+
+Page capture: wrap a page render in ``capture_page_figures(page)`` and every
+figure passed to ``st.plotly_chart`` inside it is recorded, so the page can be
+exported later with ``export_page_charts``.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import contextvars
+from dataclasses import dataclass, field
+import hashlib
+import io
+import multiprocessing
+import os
+from pathlib import Path
+import re
+import tempfile
+import threading
+import time
+import zipfile
+
+from scripts.utilities.chart_saver import save_chart_robust
+from scripts.utilities.plotly_chart_hook import add_plotly_chart_observer
+
+STATIC_FORMATS = ("png", "jpeg", "webp", "svg", "pdf")
+
+# Session-state key holding the latest captured figures per page
+CAPTURE_STATE_KEY = "_captured_page_figures"
+# Pages kept per session; the least recently rendered page is dropped first
+MAX_CAPTURED_PAGES = 8
+
+# Figures recorded by capture_page_figures for the current script run
+_capture_target: contextvars.ContextVar[list | None] = contextvars.ContextVar(
+    "_capture_target", default=None
+)
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+def _init_worker() -> None:
+    """Start Kaleido once per worker process and keep it alive."""
+    try:
+        import kaleido
+
+        if hasattr(kaleido, "start_sync_server"):
+            # kaleido>=1.0: keep one browser instance for the worker lifetime
+            kaleido.start_sync_server(silence_warnings=True)
+    except Exception:
+        # kaleido<1.0 keeps its subprocess alive after the first to_image call
+        pass
+
+
+def _render_in_worker(
+    fig_json: str, file_format: str, width: int, height: int, scale: float
+) -> bytes:
+    """Render a serialized figure to image bytes inside a worker process."""
+    import plotly.io as pio
+
+    fig = pio.from_json(fig_json)
+    return pio.to_image(
+        fig, format=file_format, width=width, height=height, scale=scale
+    )
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+@dataclass
+class BatchExportResult:
+    """Summary of a batch export."""
+
+    output_path: Path | None
+    exported: list[str] = field(default_factory=list)
+    fallbacks: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    unique_renders: int = 0
+    duplicates: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """True when at least one figure was written and none failed."""
+        return bool(self.exported) and not self.failed
+
+
+def _safe_name(name: str) -> str:
+    """Return a filesystem-safe file name stem."""
+    cleaned = re.sub(r"[^\w\-. ]+", "_", str(name)).strip().replace(" ", "_")
+    return cleaned or "chart"
+
+
+def _normalize_figures(figures) -> list[tuple[str, object]]:
+    """Accept a mapping, a sequence of figures or of (name, figure) pairs."""
+    if isinstance(figures, Mapping):
+        items = list(figures.items())
+    else:
+        items = []
+        for i, item in enumerate(figures):
+            if isinstance(item, tuple) and len(item) == 2:
+                items.append(item)
+            else:
+                items.append((f"chart_{i + 1:02d}", item))
+
+    # Guarantee unique names inside the archive
+    used: set[str] = set()
+    normalized = []
+    for name, fig in items:
+        stem = _safe_name(name)
+        unique_name, suffix = stem, 1
+        while unique_name in used:
+            suffix += 1
+            unique_name = f"{stem}_{suffix}"
+        used.add(unique_name)
+        normalized.append((unique_name, fig))
+    return normalized
+
+
+def _figure_json(fig) -> str:
+    """Serialize a figure (or an already serialized figure) to JSON."""
+    if isinstance(fig, str):
+        return fig
+    return fig.to_json()
+
+
+# ---------------------------------------------------------------------------
+# Exporter
+# ---------------------------------------------------------------------------
+class BatchChartExporter:
+    """
+    Render and package many figures through a persistent worker pool.
+
+    The pool is created lazily on first use and reused by every subsequent
+    export until ``shutdown`` is called.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        width: int = 1200,
+        height: int = 800,
+        scale: float = 2.0,
+    ):
+        """
+        Args:
+            max_workers: Number of renderer processes (default: up to 4)
+            width: Image width in pixels
+            height: Image height in pixels
+            scale: Image scale factor
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # "spawn": forking the multithreaded Streamlit server can
+                # deadlock the children
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def render(
+        self, figures, file_format: str = "png"
+    ) -> tuple[dict[str, bytes], dict[str, str], int]:
+        """
+        Render figures to image bytes, rendering identical figures once.
+
+        Args:
+            figures: Mapping name -> figure, or a sequence of figures/pairs
+            file_format: One of ``STATIC_FORMATS``
+
+        Returns:
+            tuple: (bytes per name, error message per failed name, unique renders)
+        """
+        file_format = file_format.lower()
+        if file_format not in STATIC_FORMATS:
+            raise ValueError(f"Unsupported static format: {file_format}")
+
+        items = _normalize_figures(figures)
+        if not items:
+            return {}, {}, 0
+
+        names_by_hash: dict[str, list[str]] = {}
+        json_by_hash: dict[str, str] = {}
+        for name, fig in items:
+            fig_json = _figure_json(fig)
+            digest = hashlib.sha1(fig_json.encode("utf-8")).hexdigest()
+            names_by_hash.setdefault(digest, []).append(name)
+            json_by_hash[digest] = fig_json
+
+        pool = self._get_pool()
+        futures = {
+            digest: pool.submit(
+                _render_in_worker,
+                fig_json,
+                file_format,
+                self.width,
+                self.height,
+                self.scale,
+            )
+            for digest, fig_json in json_by_hash.items()
+        }
+
+        rendered: dict[str, bytes] = {}
+        errors: dict[str, str] = {}
+        for digest, future in futures.items():
+            try:
+                data = future.result()
+                for name in names_by_hash[digest]:
+                    rendered[name] = data
+            except Exception as e:
+                for name in names_by_hash[digest]:
+                    errors[name] = str(e)
+
+        # Preserve input order
+        ordered = {name: rendered[name] for name, _ in items if name in rendered}
+        return ordered, errors, len(futures)
+
+    def export_zip(
+        self, figures, output_path: str | Path, file_format: str = "png"
+    ) -> BatchExportResult:
+        """
+        Export figures into a zip archive.
+
+        Figures that cannot be rendered as static images are stored as HTML,
+        mirroring the fallback used by ``save_chart_robust``.
+
+        Args:
+            figures: Mapping name -> figure, or a sequence of figures/pairs
+            output_path: Target ``.zip`` path
+            file_format: Static image format for every figure
+
+        Returns:
+            BatchExportResult
+        """
+        start = time.perf_counter()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        items = _normalize_figures(figures)
+        rendered, errors, unique = self.render(items, file_format)
+        result = BatchExportResult(
+            output_path=output_path,
+            unique_renders=unique,
+            duplicates=len(items) - unique,
+        )
+
+        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, fig in items:
+                if name in rendered:
+                    zf.writestr(f"{name}.{file_format.lower()}", rendered[name])
+                    result.exported.append(name)
+                    continue
+                try:
+                    if isinstance(fig, str):
+                        import plotly.io as pio
+
+                        fig = pio.from_json(fig)
+                    html = fig.to_html(include_plotlyjs="cdn")
+                    zf.writestr(f"{name}_fallback.html", html)
+                    result.fallbacks.append(name)
+                except Exception as e:
+                    result.failed[name] = errors.get(name, str(e))
+
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+    def export_pdf(self, figures, output_path: str | Path) -> BatchExportResult:
+        """
+        Export figures as a single multi-page PDF (one figure per page).
+
+        Args:
+            figures: Mapping name -> figure, or a sequence of figures/pairs
+            output_path: Target ``.pdf`` path
+
+        Returns:
+            BatchExportResult
+        """
+        from PIL import Image  # Pillow ships with Streamlit
+
+        start = time.perf_counter()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        items = _normalize_figures(figures)
+        rendered, errors, unique = self.render(items, "png")
+        result = BatchExportResult(
+            output_path=output_path,
+            unique_renders=unique,
+            duplicates=len(items) - unique,
+        )
+        result.failed.update(errors)
+
+        pages = []
+        for name, _fig in items:
+            if name in rendered:
+                pages.append(Image.open(io.BytesIO(rendered[name])).convert("RGB"))
+                result.exported.append(name)
+
+        if pages:
+            pages[0].save(
+                output_path, format="PDF", save_all=True, append_images=pages[1:]
+            )
+        else:
+            result.output_path = None
+
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+
+_exporter: BatchChartExporter | None = None
+_exporter_lock = threading.Lock()
+
+
+def get_batch_exporter() -> BatchChartExporter:
+    """Return the process-wide exporter (its worker pool stays warm)."""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = BatchChartExporter()
+            import atexit
+
+            atexit.register(_exporter.shutdown)
+        return _exporter
+
+
+# ---------------------------------------------------------------------------
+# Page capture
+# ---------------------------------------------------------------------------
+def _capture_observer(figure_or_data) -> None:
+    """Append figures shown during an active capture."""
+    target = _capture_target.get()
+    if target is not None and hasattr(figure_or_data, "to_json"):
+        title = getattr(figure_or_data.layout.title, "text", None)
+        target.append((title or f"chart_{len(target) + 1:02d}", figure_or_data))
+
+
+def _captured_store() -> dict | None:
+    """Return this session's page -> figures store (None outside Streamlit)."""
+    try:
+        import streamlit as st
+
+        return st.session_state.setdefault(CAPTURE_STATE_KEY, {})
+    except Exception:
+        return None
+
+
+@contextlib.contextmanager
+def capture_page_figures(page: str) -> Iterator[list]:
+    """
+    Record every figure rendered with ``st.plotly_chart`` during a page run.
+
+    Figures are kept in the session state, so concurrent sessions never see
+    each other's charts; only the last ``MAX_CAPTURED_PAGES`` pages are kept.
+
+    Args:
+        page: Page name used as the export key
+    """
+    add_plotly_chart_observer(_capture_observer)
+    captured: list = []
+    token = _capture_target.set(captured)
+    try:
+        yield captured
+    finally:
+        _capture_target.reset(token)
+        store = _captured_store()
+        if store is not None:
+            # Keep references only; serialization happens at export time
+            store.pop(page, None)
+            store[page] = list(captured)
+            while len(store) > MAX_CAPTURED_PAGES:
+                store.pop(next(iter(store)))
+
+
+def get_page_figures(page: str) -> list[tuple[str, object]]:
+    """Return the (name, figure) pairs captured for a page in this session."""
+    store = _captured_store() or {}
+    return list(store.get(page, []))
+
+
+def export_page_charts(
+    page: str, output_path: str | Path, file_format: str = "png"
+) -> BatchExportResult:
+    """
+    Export every chart captured on a page.
+
+    Args:
+        page: Page name passed to ``capture_page_figures``
+        output_path: ``.zip`` or ``.pdf`` target
+        file_format: Image format inside the zip (ignored for PDF)
+
+    Returns:
+        BatchExportResult
+    """
+    figures = get_page_figures(page)
+    exporter = get_batch_exporter()
+    if str(output_path).lower().endswith(".pdf"):
+        return exporter.export_pdf(figures, output_path)
+    return exporter.export_zip(figures, output_path, file_format)
+
+
+def export_report(
+    pages: Sequence[str], output_path: str | Path, file_format: str = "png"
+) -> BatchExportResult:
+    """
+    Export the captured charts of several pages into one archive or PDF.
+
+    Args:
+        pages: Page names, in report order
+        output_path: ``.zip`` or ``.pdf`` target
+        file_format: Image format inside the zip (ignored for PDF)
+
+    Returns:
+        BatchExportResult
+    """
+    figures = [
+        (f"{_safe_name(page)}__{name}", fig)
+        for page in pages
+        for name, fig in get_page_figures(page)
+    ]
+    exporter = get_batch_exporter()
+    if str(output_path).lower().endswith(".pdf"):
+        return exporter.export_pdf(figures, output_path)
+    return exporter.export_zip(figures, output_path, file_format)
+
+
+def save_charts_batch(
+    figures, file_path: str | Path, file_format: str = "png", **kwargs
+) -> list[tuple[bool, str | None, str | None]]:
+    """
+    Batch counterpart of ``save_chart_robust`` writing loose files.
+
+    Renders through the shared worker pool and falls back to
+    ``save_chart_robust`` (HTML fallback included) for figures that fail.
+
+    Args:
+        figures: Mapping name -> figure, or a sequence of figures/pairs
+        file_path: Output directory
+        file_format: Static image format
+        **kwargs: Passed to ``save_chart_robust`` on fallback
+
+    Returns:
+        List of (success, saved_path, format_used), in input order
+    """
+    Path(file_path).mkdir(parents=True, exist_ok=True)
+    items = _normalize_figures(figures)
+    rendered, _errors, _unique = get_batch_exporter().render(items, file_format)
+
+    results = []
+    for name, fig in items:
+        if name in rendered:
+            target = Path(file_path) / f"{name}.{file_format.lower()}"
+            target.write_bytes(rendered[name])
+            results.append((True, str(target), file_format.upper()))
+        else:
+            if isinstance(fig, str):
+                import plotly.io as pio
+
+                fig = pio.from_json(fig)
+            results.append(
+                save_chart_robust(fig, file_path, name, file_format=file_format, **kwargs)
+            )
+    return results
+
+
+def render_chart_export_controls(page: str) -> None:
+    """
+    Sidebar entry point exporting every chart captured on ``page``.
+
+    The archive is only rendered when the user asks for it.
+
+    Args:
+        page: Page name passed to ``capture_page_figures``
+    """
+    import streamlit as st
+
+    figures = get_page_figures(page)
+    if not figures:
+        return
+
+    with st.expander(f"📦 Export charts ({len(figures)})", expanded=False):
+        choice = st.radio(
+            "Format",
+            ["ZIP (PNG)", "ZIP (SVG)", "PDF"],
+            key=f"chart_export_format_{page}",
+            horizontal=True,
+        )
+        if not st.button("Prepare export", key=f"chart_export_run_{page}"):
+            return
+
+        suffix = ".pdf" if choice == "PDF" else ".zip"
+        file_format = "svg" if choice == "ZIP (SVG)" else "png"
+        with st.spinner("Rendering charts..."), tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / f"{_safe_name(page)}{suffix}"
+            result = export_page_charts(page, target, file_format)
+            if result.output_path is None:
+                st.error("❌ No chart could be exported.")
+                return
+            payload = result.output_path.read_bytes()
+
+        if result.fallbacks or result.failed:
+            st.warning(
+                f"⚠️ {len(result.fallbacks)} chart(s) saved as HTML, "
+                f"{len(result.failed)} failed."
+            )
+        st.download_button(
+            "⬇️ Download",
+            data=payload,
+            file_name=f"{_safe_name(page)}{suffix}",
+            mime="application/pdf" if suffix == ".pdf" else "application/zip",
+            key=f"chart_export_download_{page}",
+        )
@@ -9,7 +9,8 @@ Features:
 - Cache em memória com TTL configurável
 - Cache persistente em disco
 - Cache de dados transformados
-- Invalidação inteligente
+- Invalidação inteligente (fingerprint dos arquivos de origem)
+- Stale-while-revalidate com recomputação única em segundo plano
 - Compressão automática
 - Métricas de performance
 
@@ -17,12 +18,15 @@ Author: Sistema de Otimização Dashboard LULC
 Date: 2025-07-22
 """
 
+import copy
 import gzip
 import hashlib
 import json
 import os
 import pickle
+import threading
 from collections.abc import Callable
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import wraps
@@ -32,6 +36,11 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
+from scripts.utilities.single_flight import SingleFlightGroup
+
+# Nome das recomputações do cache nas métricas do grupo single-flight
+CACHE_FLIGHT = "SmartCacheManager.get_or_compute"
+
 
 @dataclass
 class CacheEntry:
@@ -45,6 +54,54 @@ class CacheEntry:
     ttl_seconds: int | None = None
     compressed: bool = False
     checksum: str = ""
+    fingerprint: str = ""
+
+    def is_expired(self) -> bool:
+        """Indica se o TTL da entrada expirou."""
+        if not self.ttl_seconds:
+            return False
+        age = (datetime.now() - self.created_at).total_seconds()
+        return age > self.ttl_seconds
+
+
+def file_fingerprint(*paths: str | Path) -> str:
+    """
+    Fingerprint de arquivos de origem (caminho, mtime e tamanho).
+
+    Args:
+        paths: Arquivos dos quais o valor em cache depende
+
+    Returns:
+        Hash curto; muda sempre que algum arquivo muda
+    """
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+
+def _key_repr(value: Any) -> str:
+    """Representação estável de argumentos para chaves de cache.
+
+    ``str(DataFrame)`` trunca linhas e colunas, então DataFrames diferentes
+    colidiam na mesma chave; eles são representados pelo hash do conteúdo.
+    """
+    if isinstance(value, pd.DataFrame | pd.Series):
+        try:
+            content = pd.util.hash_pandas_object(value, index=True).values.tobytes()
+        except TypeError:
+            content = pickle.dumps(value)
+        columns = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        return f"<{type(value).__name__} {columns} {hashlib.md5(content).hexdigest()}>"
+    if isinstance(value, tuple | list):
+        return "(" + ", ".join(_key_repr(item) for item in value) + ")"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{k!r}: {_key_repr(v)}" for k, v in sorted(value.items(), key=str)) + "}"
+    return str(value)
 
 
 class SmartCacheManager:
@@ -77,14 +134,27 @@ class SmartCacheManager:
         self.compression_threshold = 1024 * 100  # 100KB
 
         # Métricas
-        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "compressions": 0}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "compressions": 0,
+            "stale_hits": 0,
+            "revalidations": 0,
+            "invalidations": 0,
+            "coalesced": 0,
+        }
+
+        # Recomputações em andamento (single-flight por chave)
+        self._lock = threading.RLock()
+        self._flights = SingleFlightGroup()
 
         # Carrega cache persistente
         self._load_persistent_cache()
 
     def _generate_key(self, *args, **kwargs) -> str:
         """Gera chave única para cache baseada nos argumentos."""
-        key_data = str(args) + str(sorted(kwargs.items()))
+        key_data = _key_repr(args) + _key_repr(kwargs)
         return hashlib.md5(key_data.encode()).hexdigest()
 
     def _calculate_size(self, data: Any) -> int:
@@ -225,7 +295,12 @@ class SmartCacheManager:
         return default
 
     def set(
-        self, key: str, data: Any, ttl_seconds: int | None = None, persist: bool = True
+        self,
+        key: str,
+        data: Any,
+        ttl_seconds: int | None = None,
+        persist: bool = True,
+        fingerprint: str = "",
     ):
         """
         Armazena dados no cache.
@@ -235,6 +310,7 @@ class SmartCacheManager:
             data: Dados para armazenar
             ttl_seconds: Tempo de vida em segundos
             persist: Se deve persistir no disco
+            fingerprint: Versão dos dados de origem
         """
         size_bytes = self._calculate_size(data)
         should_compress = self._should_compress(data, size_bytes)
@@ -255,8 +331,14 @@ class SmartCacheManager:
             ttl_seconds=ttl_seconds or self.default_ttl,
             compressed=should_compress,
             checksum=hashlib.md5(str(data).encode()).hexdigest(),
+            fingerprint=fingerprint,
         )
 
+        # Substitui a entrada anterior da mesma chave
+        previous = self.memory_cache.pop(key, None)
+        if previous is not None:
+            self.current_memory_usage -= previous.size_bytes
+
         # Armazena na memória se há espaço
         if self.current_memory_usage + size_bytes <= self.memory_limit_bytes:
             self.memory_cache[key] = entry
@@ -277,6 +359,143 @@ class SmartCacheManager:
             except Exception as e:
                 st.warning(f"Erro ao persistir cache {key}: {e}")
 
+    def _lookup(self, key: str) -> CacheEntry | None:
+        """Entrada da memória ou do disco, sem verificar o TTL."""
+        entry = self.memory_cache.get(key)
+        if entry is not None:
+            return entry
+
+        cache_file = self.cache_dir / f"{key}.cache"
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            cache_file.unlink(missing_ok=True)
+            return None
+
+        if self.current_memory_usage + entry.size_bytes <= self.memory_limit_bytes:
+            self.memory_cache[key] = entry
+            self.current_memory_usage += entry.size_bytes
+        return entry
+
+    def _drop(self, key: str) -> None:
+        """Remove uma chave da memória e do disco."""
+        entry = self.memory_cache.pop(key, None)
+        if entry is not None:
+            self.current_memory_usage -= entry.size_bytes
+        (self.cache_dir / f"{key}.cache").unlink(missing_ok=True)
+
+    def _read(self, entry: CacheEntry) -> Any:
+        entry.last_accessed = datetime.now()
+        entry.access_count += 1
+        return entry.data if not entry.compressed else self._decompress_data(entry.data)
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        """Registra a recomputação de uma chave; retorna (future, é_dono)."""
+        future, owner = self._flights.claim(CACHE_FLIGHT, key)
+        if not owner:
+            with self._lock:
+                self.stats["coalesced"] += 1
+        return future, owner
+
+    def in_flight(self) -> int:
+        """Número de recomputações em andamento."""
+        return self._flights.in_flight()
+
+    def _compute_into(
+        self,
+        key: str,
+        future: Future,
+        compute: Callable[[], Any],
+        ttl_seconds: int | None,
+        persist: bool,
+        fingerprint: str,
+    ) -> Any:
+        """Executa ``compute``, grava no cache e resolve o future da chave."""
+
+        def compute_and_store():
+            result = compute()
+            with self._lock:
+                self.set(key, result, ttl_seconds, persist, fingerprint)
+            return result
+
+        return self._flights.resolve(CACHE_FLIGHT, key, future, compute_and_store)
+
+    def _revalidate_into(self, key: str, future: Future, *args) -> None:
+        # Em segundo plano o erro só chega a quem espera pelo future
+        try:
+            self._compute_into(key, future, *args)
+        except Exception:
+            pass
+
+    def _revalidate(self, key: str, *args) -> None:
+        """Agenda a recomputação de uma entrada expirada em segundo plano."""
+        future, owner = self._claim(key)
+        if not owner:
+            return
+        self.stats["revalidations"] += 1
+        threading.Thread(
+            target=self._revalidate_into,
+            args=(key, future, *args),
+            name=f"cache-revalidate-{key[:8]}",
+            daemon=True,
+        ).start()
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl_seconds: int | None = None,
+        persist: bool = True,
+        fingerprint: str = "",
+        stale_while_revalidate: bool = False,
+    ) -> Any:
+        """
+        Recupera do cache ou calcula o valor (uma vez por chave).
+
+        Entradas cujo ``fingerprint`` de origem mudou são invalidadas na hora.
+        Com ``stale_while_revalidate``, uma entrada com TTL expirado é
+        devolvida imediatamente e recalculada em segundo plano; chamadas
+        concorrentes compartilham a mesma recomputação.
+
+        Args:
+            key: Chave do cache
+            compute: Função sem argumentos que produz o valor
+            ttl_seconds: Tempo de vida em segundos
+            persist: Se deve persistir no disco
+            fingerprint: Versão dos dados de origem (ex.: ``file_fingerprint``)
+            stale_while_revalidate: Servir valor expirado enquanto recalcula
+
+        Returns:
+            Valor em cache ou recém-calculado
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and entry.fingerprint != fingerprint:
+                self._drop(key)
+                self.stats["invalidations"] += 1
+                entry = None
+
+            if entry is not None and not entry.is_expired():
+                self.stats["hits"] += 1
+                return self._read(entry)
+
+            if entry is not None and stale_while_revalidate:
+                self.stats["stale_hits"] += 1
+                value = self._read(entry)
+                self._revalidate(key, compute, ttl_seconds, persist, fingerprint)
+                return value
+
+            self.stats["misses"] += 1
+
+        # Single-flight: chamadas concorrentes esperam a mesma recomputação
+        future, owner = self._claim(key)
+        if owner:
+            return self._compute_into(key, future, compute, ttl_seconds, persist, fingerprint)
+        return future.result()
+
     def invalidate(self, pattern: str | None = None):
         """
         Invalida cache baseado em padrão.
@@ -335,7 +554,14 @@ def get_cache_manager() -> SmartCacheManager:
     return _cache_manager
 
 
-def cached(ttl_seconds: int | None = None, persist: bool = True, key_prefix: str = ""):
+def cached(
+    ttl_seconds: int | None = None,
+    persist: bool = True,
+    key_prefix: str = "",
+    stale_while_revalidate: bool = False,
+    fingerprint: Callable[..., str] | None = None,
+    copy_result: bool = False,
+):
     """
     🎯 Decorator para cache automático de funções.
 
@@ -343,11 +569,21 @@ def cached(ttl_seconds: int | None = None, persist: bool = True, key_prefix: str
         ttl_seconds: Tempo de vida do cache
         persist: Se deve persistir no disco
         key_prefix: Prefixo para a chave
+        stale_while_revalidate: Ao expirar o TTL, devolve o valor antigo e
+            recalcula em segundo plano (uma recomputação por chave)
+        fingerprint: Recebe os argumentos da função e retorna a versão dos
+            dados de origem; quando muda, a entrada é invalidada na hora
+        copy_result: Devolve uma cópia do valor em cache (como ``st.cache_data``)
 
     Usage:
         @cached(ttl_seconds=3600, persist=True)
         def load_heavy_data():
             return expensive_computation()
+
+        @cached(ttl_seconds=3600, stale_while_revalidate=True,
+                fingerprint=lambda path: file_fingerprint(path))
+        def load_file(path):
+            ...
     """
 
     def decorator(func: Callable) -> Callable:
@@ -356,21 +592,18 @@ def cached(ttl_seconds: int | None = None, persist: bool = True, key_prefix: str
             cache_manager = get_cache_manager()
 
             # Gera chave única
-            key_data = (
-                f"{key_prefix}{func.__name__}{str(args)}{str(sorted(kwargs.items()))}"
-            )
+            key_data = f"{key_prefix}{func.__name__}{_key_repr(args)}{_key_repr(kwargs)}"
             cache_key = hashlib.md5(key_data.encode()).hexdigest()
 
-            # Tenta recuperar do cache
-            cached_result = cache_manager.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-
-            # Executa função e cacheia resultado
-            result = func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl_seconds, persist)
-
-            return result
+            result = cache_manager.get_or_compute(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl_seconds,
+                persist,
+                fingerprint(*args, **kwargs) if fingerprint else "",
+                stale_while_revalidate,
+            )
+            return copy.deepcopy(result) if copy_result else result
 
         return wrapper
 
@@ -0,0 +1,269 @@
+"""
+Cache Warm-up Worker
+====================
+
+Background thread that pre-renders every dashboard page in its default
+widget state whenever the data version changes.
+
+Pages are rendered "bare" (outside any browser session): Streamlit calls
+become no-ops, widgets return their defaults and every ``st.tabs`` body
+runs, so all default tabs are covered. Bare runs have no session state (each
+``st.session_state`` access is a fresh, empty state), so the page to render
+is passed to ``render_page`` explicitly and the data plane snapshot is
+loaded directly. What remains are the side effects we want: the shared data
+plane snapshot, ``st.cache_data`` entries for data and figures and the
+processors' in-memory caches. The first visitor after a deploy or a data
+refresh then hits warm caches.
+
+The worker is started from ``app.py`` on the first script run of the server
+process (Streamlit has no earlier hook) and afterwards polls the data
+directory, re-warming after each change. Progress is exposed through
+``get_warmup_status()`` and shown on the hidden Performance page.
+
+Environment:
+    LANDAGRI_WARMUP: ``0`` disables the worker (default ``1``)
+    LANDAGRI_WARMUP_INTERVAL: Seconds between data-version checks (default 30)
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Callable, Iterable
+import hashlib
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+DATA_SUFFIXES = (".json", ".jsonc", ".xlsx", ".csv", ".parquet")
+DEFAULT_INTERVAL = 30.0
+
+RenderPage = Callable[[str, str], None]
+
+
+def data_version(data_dir: Path = DATA_DIR) -> str:
+    """
+    Fingerprint of the data files (name, modification time and size).
+
+    Args:
+        data_dir: Directory scanned recursively
+
+    Returns:
+        Short hex digest; changes whenever a data file changes
+    """
+    digest = hashlib.sha1()
+    for path in sorted(data_dir.rglob("*")):
+        if path.suffix.lower() not in DATA_SUFFIXES or not path.is_file():
+            continue
+        stat = path.stat()
+        digest.update(
+            f"{path.relative_to(data_dir)}:{stat.st_mtime_ns}:{stat.st_size}|".encode()
+        )
+    return digest.hexdigest()[:12]
+
+
+class WarmupWorker(threading.Thread):
+    """Daemon thread re-warming page caches after each data-version change."""
+
+    def __init__(
+        self,
+        pages: Iterable[tuple[str, str]],
+        render_page: RenderPage,
+        interval: float = DEFAULT_INTERVAL,
+        version_fn: Callable[[], str] = data_version,
+    ):
+        """
+        Args:
+            pages: (category, page) pairs to pre-render
+            render_page: Renders one page (same entry point as the app)
+            interval: Seconds between data-version checks
+            version_fn: Returns the current data version
+        """
+        super().__init__(name="landagri-cache-warmup", daemon=True)
+        self.pages = list(pages)
+        self.render_page = render_page
+        self.interval = interval
+        self.version_fn = version_fn
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._lock = threading.Lock()
+        # Notified whenever a warm-up run finishes
+        self._finished = threading.Condition(self._lock)
+        self._status: dict[str, Any] = {
+            "state": "starting",
+            "version": None,
+            "completed": 0,
+            "total": len(self.pages),
+            "current": None,
+            "errors": {},
+            "durations": {},
+            "started_at": None,
+            "finished_at": None,
+            "runs": 0,
+        }
+
+    # --- Status -----------------------------------------------------------
+    def _update(self, **changes: Any) -> None:
+        with self._lock:
+            self._status.update(changes)
+
+    def status(self) -> dict[str, Any]:
+        """Snapshot of the worker progress."""
+        with self._lock:
+            status = dict(self._status)
+            status["errors"] = dict(status["errors"])
+            status["durations"] = dict(status["durations"])
+        status["progress"] = (
+            status["completed"] / status["total"] if status["total"] else 1.0
+        )
+        return status
+
+    def wait_for_runs(self, runs: int, timeout: float | None = None) -> bool:
+        """
+        Block until ``runs`` warm-up runs have finished.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._finished:
+            return self._finished.wait_for(lambda: self._status["runs"] >= runs, timeout)
+
+    # --- Control ----------------------------------------------------------
+    def request_warmup(self) -> None:
+        """Re-warm on the next loop iteration even if the data did not change."""
+        with self._lock:
+            self._status["version"] = None
+        self._wake_event.set()
+
+    def stop(self) -> None:
+        """Ask the worker to exit after the current page."""
+        self._stop_event.set()
+        self._wake_event.set()
+
+    # --- Work -------------------------------------------------------------
+    def warm(self, version: str) -> None:
+        """Pre-render every page once for a data version."""
+        from scripts.utilities.data_plane import get_data_plane
+        from scripts.utilities.render_tracing import trace_render
+
+        self._update(
+            state="running",
+            completed=0,
+            current=None,
+            errors={},
+            durations={},
+            started_at=time.time(),
+            finished_at=None,
+        )
+        logger.info("Cache warm-up started for data version %s", version)
+
+        try:
+            # Sessions read the current snapshot when they have no version yet
+            get_data_plane().snapshot()
+        except Exception as exc:
+            logger.warning("Warm-up of the data plane failed: %s", exc)
+
+        for category, page in self.pages:
+            if self._stop_event.is_set():
+                break
+            self._update(current=page)
+            started = time.perf_counter()
+            try:
+                # Bare run: default widgets, page chosen by argument
+                with trace_render(f"warmup:{page}"):
+                    self.render_page(category, page)
+            except Exception as exc:  # keep warming the other pages
+                logger.warning("Warm-up of %s failed: %s", page, exc)
+                with self._lock:
+                    self._status["errors"][page] = f"{type(exc).__name__}: {exc}"
+            with self._lock:
+                self._status["durations"][page] = round(time.perf_counter() - started, 3)
+                self._status["completed"] += 1
+
+        with self._finished:
+            self._status.update(
+                state="idle",
+                version=version,
+                current=None,
+                finished_at=time.time(),
+                runs=self._status["runs"] + 1,
+            )
+            self._finished.notify_all()
+        logger.info("Cache warm-up finished for data version %s", version)
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                version = self.version_fn()
+                if version != self.status()["version"]:
+                    self.warm(version)
+            except Exception as exc:
+                logger.warning("Cache warm-up loop error: %s", exc)
+                self._update(state="error")
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+
+
+_worker: WarmupWorker | None = None
+_worker_lock = threading.Lock()
+
+
+def warmup_enabled() -> bool:
+    """True unless ``LANDAGRI_WARMUP=0``."""
+    return os.environ.get("LANDAGRI_WARMUP", "1").lower() not in ("0", "false", "no")
+
+
+def ensure_warmup_started(
+    pages: Iterable[tuple[str, str]], render_page: RenderPage
+) -> WarmupWorker | None:
+    """
+    Start the process-wide warm-up worker once (inside a Streamlit server).
+
+    Later calls only refresh the render entry point, so a reloaded
+    ``app.py`` is used for the next warm-up.
+
+    Args:
+        pages: (category, page) pairs of the menu
+        render_page: Renders one page
+
+    Returns:
+        The worker, or None when disabled, under ``AppTest`` or not running
+        under ``streamlit run``
+    """
+    global _worker
+
+    if not warmup_enabled():
+        return None
+    try:
+        from streamlit import config, runtime
+
+        # AppTest installs a mock runtime; only real servers warm up
+        if not runtime.exists() or config.get_option("global.appTest"):
+            return None
+    except ImportError:
+        return None
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            interval = float(os.environ.get("LANDAGRI_WARMUP_INTERVAL", DEFAULT_INTERVAL))
+            _worker = WarmupWorker(pages, render_page, interval=interval)
+            _worker.start()
+        else:
+            _worker.render_page = render_page
+        return _worker
+
+
+def get_warmup_worker() -> WarmupWorker | None:
+    """Return the running worker, if any."""
+    return _worker
+
+
+def get_warmup_status() -> dict[str, Any] | None:
+    """Progress of the warm-up worker (None when it is not running)."""
+    return _worker.status() if _worker is not None else None
@@ -15,6 +15,8 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
+from scripts.utilities.cache_manager import cached
+
 
 def load_optimized_data() -> tuple[pd.DataFrame | None, dict[str, Any], dict[str, Any]]:
     """
@@ -98,7 +100,7 @@ def setup_performance_sidebar():
             st.code("pip install -r requirements.txt")
 
 
-@st.cache_data(ttl=3600, show_spinner="🔄 Processando filtros...")
+@cached(ttl_seconds=3600, persist=False, stale_while_revalidate=True, copy_result=True)
 def get_filtered_data(df: pd.DataFrame, filters: dict[str, Any]) -> pd.DataFrame:
     """
     Aplica filtros aos dados com cache inteligente.
@@ -122,7 +124,7 @@ def get_filtered_data(df: pd.DataFrame, filters: dict[str, Any]) -> pd.DataFrame
     return filtered_df
 
 
-@st.cache_data(ttl=1800, show_spinner="📊 Gerando estatísticas...")
+@cached(ttl_seconds=1800, persist=False, stale_while_revalidate=True, copy_result=True)
 def calculate_statistics(df: pd.DataFrame) -> dict[str, Any]:
     """
     Calcula estatísticas do dataset com cache.
@@ -154,7 +156,7 @@ def calculate_statistics(df: pd.DataFrame) -> dict[str, Any]:
     return stats
 
 
-@st.cache_data(ttl=1800, show_spinner="🗺️ Processando dados geográficos...")
+@cached(ttl_seconds=1800, persist=False, stale_while_revalidate=True, copy_result=True)
 def prepare_geographic_data(df: pd.DataFrame) -> dict[str, Any]:
     """
     Prepara dados geográficos com cache.
@@ -182,7 +184,7 @@ def prepare_geographic_data(df: pd.DataFrame) -> dict[str, Any]:
     return geo_data
 
 
-@st.cache_data(ttl=1800, show_spinner="📈 Preparando gráficos...")
+@cached(ttl_seconds=1800, persist=False, stale_while_revalidate=True, copy_result=True)
 def prepare_chart_data(df: pd.DataFrame) -> dict[str, Any]:
     """
     Prepara dados para gráficos com cache otimizado.
@@ -260,34 +262,49 @@ def display_performance_metrics():
             st.metric("Cache Entries", "N/A")
 
     with col2:
-        data_size = (
-            st.session_state.get("df_interpreted", pd.DataFrame())
-            .memory_usage(deep=True)
-            .sum()
-        )
-        st.metric("Data Size", f"{data_size / 1024:.1f}KB")
+        from scripts.utilities.data_plane import frame_memory_bytes, session_initiatives
+
+        data_size = frame_memory_bytes(session_initiatives())
+        st.metric("Data Size (shared)", f"{data_size / 1024:.1f}KB")
+
+    from scripts.utilities.render_tracing import get_tracer
+
+    tracer = get_tracer()
+    last_rerun = tracer.last_rerun()
+    components = [r for r in last_rerun if not r.component.startswith("page:")]
 
     with col3:
-        st.metric("Cached Functions", "5+")
+        st.metric("Traced Components", len(components))
 
     with col4:
-        st.metric("Optimization", "✅ Active")
+        page_runs = [r for r in last_rerun if r.component.startswith("page:")]
+        if page_runs:
+            slowest = max(components, key=lambda r: r.wall_ms, default=None)
+            st.metric(
+                "Last Render",
+                f"{page_runs[-1].wall_ms:.0f} ms",
+                f"slowest: {slowest.component}" if slowest else None,
+                delta_color="off",
+            )
+        else:
+            st.metric("Last Render", "N/A")
 
 
 def preload_dashboard_data():
     """
     Pré-carrega todos os dados necessários para o dashboard.
+
+    Os dados vêm do data plane compartilhado: a sessão guarda apenas o
+    identificador de versão, nunca uma cópia do DataFrame.
     """
+    from scripts.utilities.data_plane import attach_session
+
     try:
         with st.spinner("🚀 Inicializando sistema otimizado..."):
-            # Carrega dados principais
-            df, optimized_data, sensors_meta = load_optimized_data()
-
-            if df is not None:
-                st.session_state.df_interpreted = df
-                st.session_state.optimized_data = optimized_data
-                st.session_state.sensors_meta = sensors_meta
+            # Fixa a sessão na versão atual dos dados
+            df = attach_session().initiatives
 
+            if not df.empty:
                 # Pré-computa estatísticas
                 calculate_statistics(df)
                 prepare_geographic_data(df)
@@ -23,7 +23,7 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
-from .cache_manager import cached, get_cache_manager
+from .cache_manager import cached, file_fingerprint, get_cache_manager
 
 
 class DataOptimizer:
@@ -228,51 +228,21 @@ class DataOptimizer:
 
         return chart_data
 
-    @cached(ttl_seconds=3600, persist=True, key_prefix="search_")
+    @cached(ttl_seconds=3600, persist=True, key_prefix="search_v2_")
     def optimize_search_indices(self, df: pd.DataFrame) -> dict[str, Any]:
         """
-        🔍 Cria índices otimizados para busca e filtros.
+        🔍 Cria o índice invertido de busca das iniciativas.
 
         Args:
             df: DataFrame com dados das iniciativas
 
         Returns:
-            Índices otimizados para busca
+            {"search_index": SearchIndex} com busca ranqueada (BM25), por
+            prefixo e tolerante a erros de digitação
         """
-        indices = {}
+        from .search_index import build_search_index
 
-        # ===== ÍNDICE DE TEXTO COMPLETO =====
-        text_columns = ["Name", "Description", "Organization", "Country"]
-        searchable_text = []
-
-        for _, row in df.iterrows():
-            text_parts = []
-            for col in text_columns:
-                if col in df.columns and pd.notna(row[col]):
-                    text_parts.append(str(row[col]).lower())
-
-            searchable_text.append(" ".join(text_parts))
-
-        indices["searchable_text"] = searchable_text
-        indices["row_indices"] = df.index.tolist()
-
-        # ===== ÍNDICES CATEGÓRICOS =====
-        categorical_columns = df.select_dtypes(include=["object", "category"]).columns
-
-        for col in categorical_columns:
-            if col in df.columns:
-                # Cria mapeamento de valor -> lista de índices
-                value_to_indices = {}
-                for idx, value in enumerate(df[col]):
-                    if pd.notna(value):
-                        value_str = str(value).lower()
-                        if value_str not in value_to_indices:
-                            value_to_indices[value_str] = []
-                        value_to_indices[value_str].append(idx)
-
-                indices[f"{col}_index"] = value_to_indices
-
-        return indices
+        return {"search_index": build_search_index(df)}
 
     def get_optimized_data(self, key: str) -> Any:
         """Recupera dados otimizados do cache."""
@@ -298,7 +268,13 @@ def get_data_optimizer() -> DataOptimizer:
     return _data_optimizer
 
 
-@cached(ttl_seconds=3600, persist=True, key_prefix="processed_")
+@cached(
+    ttl_seconds=3600,
+    persist=True,
+    key_prefix="processed_",
+    stale_while_revalidate=True,
+    fingerprint=file_fingerprint,
+)
 def load_and_optimize_initiatives(
     file_path: str | Path,
 ) -> tuple[pd.DataFrame, dict[str, Any]]:
@@ -363,7 +339,13 @@ def load_and_optimize_initiatives(
     return df, full_optimization
 
 
-@cached(ttl_seconds=1800, persist=True, key_prefix="sensors_")
+@cached(
+    ttl_seconds=1800,
+    persist=True,
+    key_prefix="sensors_",
+    stale_while_revalidate=True,
+    fingerprint=file_fingerprint,
+)
 def load_and_optimize_sensors(file_path: str) -> tuple[pd.DataFrame, dict[str, Any]]:
     """
     📡 Carrega e otimiza dados de sensores.
@@ -0,0 +1,426 @@
+"""
+Shared Data Plane
+=================
+
+Process-level, read-only copy of the dashboard's initiative data.
+
+``st.cache_data`` hands every session its own unpickled copy of the
+initiatives DataFrame and each session also kept the raw metadata dict, so
+memory grew linearly with concurrent users. The data plane loads the data
+once per source version and shares it between sessions:
+
+- DataFrames are ``FrozenFrame``s: their NumPy buffers are write-protected,
+  adding/replacing/removing columns raises ``TypeError``, and they carry the
+  derived columns pages used to add on their own copies. Every derived frame
+  (``copy()``, filters, ``assign``) is a plain, writable DataFrame;
+- metadata is exposed as a ``MappingProxyType`` whose nested dicts and lists
+  are read-only (they still pass ``isinstance(x, dict/list)`` checks, and
+  pickle/deepcopy into plain, mutable objects);
+- sessions only keep a version handle (``st.session_state.data_version``).
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+import copy
+from dataclasses import dataclass, field
+import hashlib
+import json
+from pathlib import Path
+import pickle
+import sys
+import threading
+import time
+import tracemalloc
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+INITIATIVES_PATH = PROJECT_ROOT / "data" / "json" / "initiatives_metadata.jsonc"
+SENSORS_PATH = PROJECT_ROOT / "data" / "json" / "sensors_metadata.jsonc"
+SENSORS_FALLBACK_PATH = PROJECT_ROOT / "data" / "json" / "sensors_metadata_original.jsonc"
+
+# Session key holding the data version a session is pinned to
+SESSION_VERSION_KEY = "data_version"
+# Versions kept alive for sessions pinned to an older snapshot
+MAX_VERSIONS = 2
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} from the shared data plane is read-only")
+
+
+class FrozenDict(dict):
+    """Read-only ``dict``; ``copy()``, pickling and deepcopy give plain dicts."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __deepcopy__(self, memo):
+        return {copy.deepcopy(k, memo): copy.deepcopy(v, memo) for k, v in self.items()}
+
+
+class FrozenList(list):
+    """Read-only ``list``; ``copy()``, pickling and deepcopy give plain lists."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def copy(self) -> list:
+        return list(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(item, memo) for item in self]
+
+
+def freeze_value(value: Any) -> Any:
+    """Read-only copy of parsed JSON (nested dicts and lists)."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze_value(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze_value(item) for item in value)
+    return value
+
+
+def freeze_metadata(metadata: Mapping[str, Any] | None) -> Mapping[str, Any]:
+    """
+    Returns a read-only view of a metadata mapping.
+
+    Args:
+        metadata: Parsed JSON metadata
+
+    Returns:
+        ``MappingProxyType`` over read-only nested dicts and lists
+    """
+    return MappingProxyType(
+        {key: freeze_value(value) for key, value in (metadata or {}).items()}
+    )
+
+
+def thaw(value: Any) -> Any:
+    """Returns a plain, mutable deep copy of frozen metadata."""
+    if isinstance(value, MappingProxyType):
+        value = dict(value)
+    return copy.deepcopy(value)
+
+
+class FrozenFrame(pd.DataFrame):
+    """
+    DataFrame shared between sessions.
+
+    Column assignment and removal (``df["x"] = ...``, ``df.loc[:, "x"] = ...``,
+    ``insert``, ``pop``, ``del``) raise ``TypeError`` and in-place value
+    writes raise ``ValueError`` (write-protected buffers). Operations that
+    build a new frame return a plain ``pd.DataFrame``; pickling and deepcopy
+    also give plain frames.
+    """
+
+    _metadata: list[str] = []
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def __setitem__(self, key, value):
+        _read_only(self)
+
+    def __delitem__(self, key):
+        _read_only(self)
+
+    def insert(self, *args, **kwargs):
+        _read_only(self)
+
+    def pop(self, *args, **kwargs):
+        _read_only(self)
+
+    def __setattr__(self, name, value):
+        if name in ("columns", "index"):
+            _read_only(self)
+        super().__setattr__(name, value)
+
+    def __reduce__(self):
+        return pd.DataFrame, (), self.__getstate__()
+
+
+def freeze_frame(df: pd.DataFrame) -> FrozenFrame:
+    """
+    Wraps a DataFrame as a ``FrozenFrame`` without copying its data.
+
+    The NumPy buffers are write-protected, so the source ``df`` (which
+    shares them) must not be written to afterwards either.
+
+    Args:
+        df: DataFrame to freeze
+
+    Returns:
+        FrozenFrame over the same buffers
+    """
+    for block in df._mgr.blocks:
+        values = block.values
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    frozen = FrozenFrame(df)
+    frozen.attrs = {**df.attrs, "frozen": True}
+    return frozen
+
+
+def frame_memory_bytes(df: pd.DataFrame) -> int:
+    """
+    Deep memory footprint of a DataFrame, frozen or not.
+
+    ``DataFrame.memory_usage(deep=True)`` cannot read write-protected object
+    buffers, so object columns are measured element by element.
+    """
+    total = int(df.index.memory_usage())
+    for _name, column in df.items():
+        values = column.to_numpy()
+        total += values.nbytes
+        if values.dtype == object:
+            total += sum(sys.getsizeof(item) for item in values)
+    return total
+
+
+def _file_version(path: Path) -> str:
+    try:
+        stat = path.stat()
+    except OSError:
+        return f"{path.name}:missing"
+    return f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Adds the columns pages used to derive on their own copies."""
+    if df.empty:
+        return df
+    if "Display_Name" not in df.columns:
+        if "Acronym" in df.columns:
+            df["Display_Name"] = df["Acronym"]
+        else:
+            df["Display_Name"] = df["Name"].str[:10]
+    if "Available_Years_List" in df.columns and "Available_Years" not in df.columns:
+        df["Available_Years"] = [
+            tuple(json.loads(years)) if years else () for years in df["Available_Years_List"]
+        ]
+    return df
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """One immutable version of the dashboard data."""
+
+    version: str
+    initiatives: pd.DataFrame
+    metadata: Mapping[str, Any]
+    sensors: Mapping[str, Any]
+    loaded_at: float = field(default_factory=time.time)
+
+
+class DataPlane:
+    """Loads, freezes and shares data snapshots between sessions."""
+
+    def __init__(
+        self,
+        initiatives_path: Path = INITIATIVES_PATH,
+        sensors_paths: tuple[Path, ...] = (SENSORS_PATH, SENSORS_FALLBACK_PATH),
+    ):
+        self.initiatives_path = Path(initiatives_path)
+        self.sensors_paths = tuple(Path(path) for path in sensors_paths)
+        self._snapshots: OrderedDict[str, DataSnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sensors_path(self) -> Path | None:
+        return next((path for path in self.sensors_paths if path.exists()), None)
+
+    def source_version(self) -> str:
+        """Fingerprint of the source files (path, mtime and size)."""
+        sources = [_file_version(self.initiatives_path)]
+        sensors_path = self._sensors_path()
+        if sensors_path is not None:
+            sources.append(_file_version(sensors_path))
+        return hashlib.sha1("|".join(sources).encode("utf-8")).hexdigest()[:12]
+
+    def _load(self, version: str) -> DataSnapshot:
+        from scripts.utilities.json_interpreter import (
+            _load_jsonc_file,
+            interpret_initiatives_metadata,
+        )
+
+        df = interpret_initiatives_metadata(self.initiatives_path)
+        if df is None:
+            df = pd.DataFrame()
+        metadata = _load_jsonc_file(self.initiatives_path) if not df.empty else {}
+        sensors_path = self._sensors_path()
+        sensors = _load_jsonc_file(sensors_path) if sensors_path else {}
+
+        return DataSnapshot(
+            version=version,
+            initiatives=freeze_frame(_add_derived_columns(df)),
+            metadata=freeze_metadata(metadata),
+            sensors=freeze_metadata(sensors if isinstance(sensors, dict) else {}),
+        )
+
+    def snapshot(self) -> DataSnapshot:
+        """
+        Returns the snapshot of the current source version, loading it once.
+
+        Returns:
+            Current DataSnapshot
+        """
+        version = self.source_version()
+        with self._lock:
+            snapshot = self._snapshots.get(version)
+            if snapshot is None:
+                snapshot = self._load(version)
+                self._snapshots[version] = snapshot
+                while len(self._snapshots) > MAX_VERSIONS:
+                    self._snapshots.popitem(last=False)
+            else:
+                self._snapshots.move_to_end(version)
+            return snapshot
+
+    def get(self, version: str | None) -> DataSnapshot:
+        """
+        Returns the snapshot for a version handle, or the current one if
+        that version is unknown or was evicted.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(version) if version else None
+        return snapshot or self.snapshot()
+
+    def versions(self) -> list[str]:
+        """Versions currently kept in memory (oldest first)."""
+        with self._lock:
+            return list(self._snapshots)
+
+    def clear(self) -> None:
+        """Drops every snapshot."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+_data_plane = DataPlane()
+
+
+def get_data_plane() -> DataPlane:
+    """Returns the process-wide data plane."""
+    return _data_plane
+
+
+# --- Session helpers ---
+
+
+def attach_session() -> DataSnapshot:
+    """
+    Pins the current session to the current data version.
+
+    Sessions already pinned to a version that is still in memory keep it, so
+    a data refresh never changes the data under a running session.
+
+    Returns:
+        Snapshot the session is pinned to
+    """
+    import streamlit as st
+
+    snapshot = _data_plane.get(st.session_state.get(SESSION_VERSION_KEY))
+    st.session_state[SESSION_VERSION_KEY] = snapshot.version
+    return snapshot
+
+
+def session_snapshot() -> DataSnapshot:
+    """Returns the snapshot of the current session's version handle."""
+    import streamlit as st
+
+    return _data_plane.get(st.session_state.get(SESSION_VERSION_KEY))
+
+
+def session_initiatives() -> pd.DataFrame:
+    """Frozen initiatives DataFrame of the current session."""
+    return session_snapshot().initiatives
+
+
+def session_metadata() -> Mapping[str, Any]:
+    """Read-only initiatives metadata of the current session."""
+    return session_snapshot().metadata
+
+
+def session_sensors() -> Mapping[str, Any]:
+    """Read-only sensors metadata of the current session."""
+    return session_snapshot().sensors
+
+
+# --- Measurement ---
+
+
+def _traced_bytes(factory, count: int) -> float:
+    """Average bytes kept alive by ``factory()`` over ``count`` calls."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [factory() for _ in range(count)]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    del kept
+    return used / count
+
+
+def measure_session_overhead(
+    sessions: int = 20, snapshot: DataSnapshot | None = None
+) -> dict[str, float]:
+    """
+    Compares the per-session memory of copied data vs. a version handle.
+
+    The "copy" figure reproduces the previous behaviour: every session held
+    an unpickled ``st.cache_data`` copy of the initiatives frame plus the
+    raw metadata dict.
+
+    Args:
+        sessions: Simulated sessions
+        snapshot: Snapshot to measure (current one by default)
+
+    Returns:
+        Bytes per session for both strategies and the shared snapshot size
+    """
+    snapshot = snapshot or _data_plane.snapshot()
+    payload = pickle.dumps((pd.DataFrame(snapshot.initiatives), thaw(snapshot.metadata)))
+    version = snapshot.version
+
+    copy_bytes = _traced_bytes(
+        lambda: dict(zip(("df_interpreted", "metadata"), pickle.loads(payload))),
+        sessions,
+    )
+    handle_bytes = _traced_bytes(
+        lambda: {SESSION_VERSION_KEY: version, "filters": {}}, sessions
+    )
+    shared_bytes = float(frame_memory_bytes(snapshot.initiatives)) + len(payload)
+    return {
+        "sessions": sessions,
+        "copy_bytes_per_session": copy_bytes,
+        "handle_bytes_per_session": handle_bytes,
+        "shared_snapshot_bytes": shared_bytes,
+    }
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(PROJECT_ROOT))
+    for key, value in measure_session_overhead().items():
+        print(f"{key:>26}: {value:,.0f}")
@@ -0,0 +1,190 @@
+"""
+Facet Counts
+============
+
+Incremental facet counts for the Overview filter panel.
+
+For every control the panel shows how many initiatives each choice would
+leave given the *other* active filters (the usual faceted-search rule: a
+control never narrows its own options). Re-filtering once per option would
+cost one full query per Type value and slider; ``FacetEngine`` instead:
+
+- keeps one row bitmap per predicate (built from the ``FilterIndex``
+  range bounds and category codes) and, per row, the number of predicates
+  it fails; a row counts for facet ``f`` when it fails no predicate, or
+  fails only ``f``;
+- keeps running tallies of every facet (rows per category value, rows
+  with a value per range column, total matches);
+- when a control moves, rebuilds only that predicate's bitmap and updates
+  the failure counts and the tallies on the rows whose bit flipped
+  (remove their old contribution, add the new one), so a small slider
+  move costs a few rows instead of a pass over every row and facet;
+- memoizes results per filter state, so toggling back is a lookup.
+
+The engine holds per-session state (the last bitmaps); keep one per session
+(e.g. in ``st.session_state``) on top of the shared, immutable FilterIndex.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+
+from scripts.utilities.filter_index import FilterIndex
+
+MAX_CACHED_STATES = 32
+
+
+@dataclass(frozen=True)
+class FacetCounts:
+    """
+    Counts of one filter state.
+
+    Attributes:
+        total: Rows matching every filter
+        categories: Column → value → rows matching the other filters and
+            that value
+        ranges: Column → rows with a value in this column that match the
+            other filters (what the slider could keep at full range)
+    """
+
+    total: int
+    categories: Mapping[str, Mapping[Any, int]]
+    ranges: Mapping[str, int]
+
+
+def _state_key(ranges: dict, categories: dict) -> tuple:
+    return (
+        tuple(sorted((col, float(lo), float(hi)) for col, (lo, hi) in ranges.items())),
+        tuple(sorted((col, frozenset(values)) for col, values in categories.items())),
+    )
+
+
+class FacetEngine:
+    """
+    Facet counts over a FilterIndex, updated incrementally.
+
+    Every indexed column is a facet. A column missing from a query is an
+    inactive filter (all rows pass it).
+
+    Args:
+        index: Index of the frame being filtered
+        max_cached_states: Filter states kept in the result cache
+    """
+
+    def __init__(self, index: FilterIndex, max_cached_states: int = MAX_CACHED_STATES):
+        self.index = index
+        self.max_cached_states = max_cached_states
+        self._facets = [("range", col) for col in index.numeric] + [
+            ("category", col) for col in index.categorical
+        ]
+        self._specs: dict[tuple[str, str], Any] = {facet: None for facet in self._facets}
+        self._masks = {facet: np.ones(index.n_rows, dtype=bool) for facet in self._facets}
+        self._fails = np.zeros(index.n_rows, dtype=np.int16)
+        self._has_value = {col: ~np.isnan(column.values) for col, column in index.numeric.items()}
+        self._cache: OrderedDict[tuple, FacetCounts] = OrderedDict()
+        self._total = 0
+        self._range_counts = {col: 0 for col in index.numeric}
+        self._tallies = {
+            col: np.zeros(len(column.categories), dtype=np.int64) for col, column in index.categorical.items()
+        }
+        self._tally(np.arange(index.n_rows), 1)
+        self.predicates_rebuilt = 0
+        self.rows_recounted = 0
+
+    def _mask(self, facet: tuple[str, str], spec: Any) -> np.ndarray:
+        kind, col = facet
+        if spec is None:
+            return np.ones(self.index.n_rows, dtype=bool)
+        if kind == "range":
+            column = self.index.numeric[col]
+            start, stop = column.bounds(*spec)
+            mask = np.zeros(self.index.n_rows, dtype=bool)
+            mask[column.order[start:stop]] = True
+            return mask
+        column = self.index.categorical[col]
+        return column.bitmap(spec)[column.codes]
+
+    def _tally(self, rows: np.ndarray, sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) the contribution of ``rows``."""
+        fails = self._fails[rows]
+        matches = fails == 0
+        only_one = fails == 1
+        self._total += sign * int(np.count_nonzero(matches))
+        for facet in self._facets:
+            kind, col = facet
+            others = matches | (only_one & ~self._masks[facet][rows])
+            if kind == "category":
+                codes = self.index.categorical[col].codes[rows[others]]
+                self._tallies[col] += sign * np.bincount(codes[codes >= 0], minlength=len(self._tallies[col]))
+            else:
+                self._range_counts[col] += sign * int(np.count_nonzero(others & self._has_value[col][rows]))
+
+    def _update(self, specs: dict[tuple[str, str], Any]) -> None:
+        for facet in self._facets:
+            spec = specs.get(facet)
+            if spec == self._specs[facet]:
+                continue
+            mask = self._mask(facet, spec)
+            old = self._masks[facet]
+            flipped = np.flatnonzero(old != mask)
+            self._tally(flipped, -1)
+            self._fails[flipped] += np.where(mask[flipped], -1, 1).astype(np.int16)
+            self._masks[facet] = mask
+            self._tally(flipped, 1)
+            self._specs[facet] = spec
+            self.predicates_rebuilt += 1
+            self.rows_recounted += flipped.size
+
+    def counts(
+        self,
+        ranges: dict[str, tuple[float, float]] | None = None,
+        categories: dict[str, Iterable[Any]] | None = None,
+    ) -> FacetCounts:
+        """
+        Facet counts for a filter state.
+
+        Args:
+            ranges: Column → inclusive ``(lo, hi)`` (as in ``FilterIndex.select``)
+            categories: Column → accepted values
+
+        Returns:
+            Counts of the state (cached)
+
+        Raises:
+            KeyError: For a column that is not indexed
+            ValueError: For a range with ``lo > hi``
+        """
+        ranges = dict(ranges or {})
+        categories = {col: frozenset(values) for col, values in (categories or {}).items()}
+        self.index.validate_query(ranges, categories)
+
+        key = _state_key(ranges, categories)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        specs = {("range", col): (float(lo), float(hi)) for col, (lo, hi) in ranges.items()}
+        specs.update({("category", col): values for col, values in categories.items()})
+        self._update(specs)
+
+        category_counts = {
+            col: MappingProxyType({value: int(n) for value, n in zip(column.categories, self._tallies[col])})
+            for col, column in self.index.categorical.items()
+        }
+        result = FacetCounts(
+            total=self._total,
+            categories=MappingProxyType(category_counts),
+            ranges=MappingProxyType(dict(self._range_counts)),
+        )
+        self._cache[key] = result
+        while len(self._cache) > self.max_cached_states:
+            self._cache.popitem(last=False)
+        return result
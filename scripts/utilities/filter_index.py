@@ -0,0 +1,294 @@
+"""
+Filter Index
+============
+
+Precomputed index answering the Overview range/category filters without
+rescanning the frame.
+
+``apply_filters`` used to copy the whole initiatives frame, re-run
+``pd.to_numeric`` on every numeric column and build one boolean mask per
+filter on every rerun. ``FilterIndex`` does the parsing once per frame:
+
+- numeric columns keep their typed values and an ``argsort`` order, so a
+  range ``[lo, hi]`` is two ``searchsorted`` calls returning the matching
+  row IDs as a slice of the order (NaN never matches, as before);
+- categorical columns are factorized; a selection becomes a per-category
+  bitmap and a row matches when the bit of its code is set;
+- a combined query starts from the most selective predicate (its size is
+  known from the ``searchsorted`` bounds / category counts) and probes the
+  remaining predicates on those row IDs only.
+
+``get_filter_index`` keeps the index of the last few frames, keyed by
+object identity: the shared data plane hands every session the same frozen
+frame per data version, so the index is built once per version.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any
+import weakref
+
+import numpy as np
+import pandas as pd
+
+MAX_CACHED_INDEXES = 4
+
+
+@dataclass(frozen=True)
+class NumericColumnIndex:
+    """Typed values of one column and their ascending order (NaN excluded)."""
+
+    values: np.ndarray
+    order: np.ndarray
+    sorted_values: np.ndarray
+
+    @classmethod
+    def build(cls, column: pd.Series) -> "NumericColumnIndex":
+        values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = valid[np.argsort(values[valid], kind="stable")]
+        return cls(values=values, order=order, sorted_values=values[order])
+
+    def bounds(self, lo: float, hi: float) -> tuple[int, int]:
+        """Positions in ``order`` of the rows with ``lo <= value <= hi``."""
+        start = int(np.searchsorted(self.sorted_values, lo, side="left"))
+        stop = int(np.searchsorted(self.sorted_values, hi, side="right"))
+        return start, max(start, stop)
+
+    @property
+    def min(self) -> float | None:
+        return float(self.sorted_values[0]) if self.sorted_values.size else None
+
+    @property
+    def max(self) -> float | None:
+        return float(self.sorted_values[-1]) if self.sorted_values.size else None
+
+
+@dataclass(frozen=True)
+class CategoricalColumnIndex:
+    """Factorized column: per-row category codes and rows of each category."""
+
+    codes: np.ndarray
+    categories: tuple
+    rows_by_code: tuple[np.ndarray, ...]
+
+    @classmethod
+    def build(cls, column: pd.Series) -> "CategoricalColumnIndex":
+        codes, uniques = pd.factorize(column, use_na_sentinel=True)
+        codes = codes.astype(np.int32)
+        order = np.argsort(codes, kind="stable")
+        splits = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        rows_by_code = tuple(order[splits[i]:splits[i + 1]] for i in range(len(uniques)))
+        return cls(codes=codes, categories=tuple(uniques), rows_by_code=rows_by_code)
+
+    def bitmap(self, values: Iterable[Any]) -> np.ndarray:
+        """Bitmap over category codes (last slot: missing values, never set)."""
+        wanted = set(values)
+        bits = np.zeros(len(self.categories) + 1, dtype=bool)
+        for code, category in enumerate(self.categories):
+            if category in wanted:
+                bits[code] = True
+        return bits
+
+    def counts(self) -> dict[Any, int]:
+        """Rows per category."""
+        return {category: len(rows) for category, rows in zip(self.categories, self.rows_by_code)}
+
+
+class FilterIndex:
+    """
+    Range and membership index over selected columns of a frame.
+
+    Args:
+        df: Source frame (row IDs are positions in it)
+        numeric_columns: Columns filtered by ``[lo, hi]`` ranges
+        categorical_columns: Columns filtered by membership
+
+    Raises:
+        KeyError: When a requested column is missing
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        numeric_columns: Sequence[str] = (),
+        categorical_columns: Sequence[str] = (),
+    ):
+        missing = [c for c in (*numeric_columns, *categorical_columns) if c not in df.columns]
+        if missing:
+            raise KeyError(f"Columns not in frame: {missing}")
+
+        self.n_rows = len(df)
+        self.numeric = {col: NumericColumnIndex.build(df[col]) for col in numeric_columns}
+        self.categorical = {col: CategoricalColumnIndex.build(df[col]) for col in categorical_columns}
+
+    def validate_query(self, ranges: dict, categories: dict) -> None:
+        """Raise KeyError for unindexed columns, ValueError for lo > hi."""
+        unknown = [c for c in ranges if c not in self.numeric]
+        unknown += [c for c in categories if c not in self.categorical]
+        if unknown:
+            raise KeyError(f"Columns not indexed: {unknown}")
+        for col, (lo, hi) in ranges.items():
+            if lo > hi:
+                raise ValueError(f"Invalid range for {col!r}: ({lo}, {hi})")
+
+    def select(
+        self,
+        ranges: dict[str, tuple[float, float]] | None = None,
+        categories: dict[str, Iterable[Any]] | None = None,
+    ) -> np.ndarray:
+        """
+        Row IDs (ascending) matching every predicate.
+
+        Args:
+            ranges: Column → inclusive ``(lo, hi)``; rows with missing
+                values never match a range
+            categories: Column → accepted values
+
+        Returns:
+            Sorted ``int64`` row positions
+
+        Raises:
+            KeyError: For a column that is not indexed
+            ValueError: For a range with ``lo > hi``
+        """
+        ranges = dict(ranges or {})
+        categories = {col: list(values) for col, values in (categories or {}).items()}
+        self.validate_query(ranges, categories)
+
+        # (size, kind, column, payload) of every predicate
+        predicates = []
+        for col, (lo, hi) in ranges.items():
+            start, stop = self.numeric[col].bounds(lo, hi)
+            predicates.append((stop - start, "range", col, (lo, hi, start, stop)))
+        for col, values in categories.items():
+            index = self.categorical[col]
+            bits = index.bitmap(values)
+            size = sum(len(index.rows_by_code[code]) for code in np.flatnonzero(bits[:-1]))
+            predicates.append((size, "category", col, bits))
+
+        if not predicates:
+            return np.arange(self.n_rows, dtype=np.int64)
+
+        predicates.sort(key=lambda predicate: predicate[0])
+        size, kind, col, payload = predicates[0]
+        if size == 0:
+            return np.empty(0, dtype=np.int64)
+
+        if kind == "range":
+            _, _, start, stop = payload
+            rows = self.numeric[col].order[start:stop]
+        else:
+            index = self.categorical[col]
+            rows = np.concatenate([index.rows_by_code[code] for code in np.flatnonzero(payload[:-1])])
+
+        # Probe the remaining predicates on the candidate row IDs only
+        for _, kind, col, payload in predicates[1:]:
+            if kind == "range":
+                lo, hi, _, _ = payload
+                values = self.numeric[col].values[rows]
+                rows = rows[(values >= lo) & (values <= hi)]
+            else:
+                rows = rows[payload[self.categorical[col].codes[rows]]]
+            if rows.size == 0:
+                break
+
+        return np.sort(rows).astype(np.int64, copy=False)
+
+
+_cache_lock = threading.Lock()
+_cache: list[tuple[weakref.ref, tuple, FilterIndex]] = []
+
+
+def get_filter_index(
+    df: pd.DataFrame,
+    numeric_columns: Sequence[str] = (),
+    categorical_columns: Sequence[str] = (),
+) -> FilterIndex:
+    """
+    Index of ``df``, built once per frame object and column set.
+
+    Args:
+        df: Source frame (e.g. the data plane's snapshot frame)
+        numeric_columns: Columns filtered by ranges
+        categorical_columns: Columns filtered by membership
+
+    Returns:
+        Cached or new FilterIndex
+    """
+    columns = (tuple(numeric_columns), tuple(categorical_columns))
+    with _cache_lock:
+        _cache[:] = [entry for entry in _cache if entry[0]() is not None]
+        for ref, cached_columns, index in _cache:
+            if ref() is df and cached_columns == columns and index.n_rows == len(df):
+                return index
+
+    index = FilterIndex(df, numeric_columns, categorical_columns)
+    with _cache_lock:
+        _cache.append((weakref.ref(df), columns, index))
+        del _cache[:-MAX_CACHED_INDEXES]
+    return index
+
+
+def synthetic_initiatives(n_rows: int = 1_000_000, seed: int = 42) -> pd.DataFrame:
+    """Initiatives-like frame for benchmarks (string-typed numeric columns)."""
+    rng = np.random.default_rng(seed)
+    resolution = rng.choice([10, 20, 30, 56, 100, 250, 500, 1000], n_rows).astype(object)
+    resolution[rng.random(n_rows) < 0.02] = "N/A"
+    return pd.DataFrame({
+        "Type": rng.choice(["Global", "National", "Regional", "Continental"], n_rows),
+        "Resolution": resolution,
+        "Accuracy (%)": np.round(rng.uniform(50, 99, n_rows), 1),
+        "Num_Agri_Classes": rng.integers(0, 20, n_rows),
+    })
+
+
+def benchmark_filter_index(n_rows: int = 1_000_000, repeats: int = 50) -> dict[str, float]:
+    """
+    Build and query times of a FilterIndex versus boolean masks.
+
+    Returns:
+        Milliseconds: ``build``, ``query`` (selective combined filter),
+        ``full_query`` (default sliders) and ``masks`` (previous approach)
+    """
+    df = synthetic_initiatives(n_rows)
+    numeric = ("Resolution", "Accuracy (%)", "Num_Agri_Classes")
+
+    started = time.perf_counter()
+    index = FilterIndex(df, numeric, ("Type",))
+    build_ms = (time.perf_counter() - started) * 1000
+
+    def timed(fn, runs: int = repeats) -> float:
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        return (time.perf_counter() - started) * 1000 / runs
+
+    selective = {"Resolution": (10, 10), "Accuracy (%)": (95, 99), "Num_Agri_Classes": (18, 19)}
+    full = {col: (index.numeric[col].min, index.numeric[col].max) for col in numeric}
+
+    def masks():
+        mask = df["Type"].isin(["Regional"])
+        for col, (lo, hi) in selective.items():
+            values = pd.to_numeric(df[col], errors="coerce")
+            mask &= (values >= lo) & (values <= hi)
+        return df[mask]
+
+    return {
+        "build": round(build_ms, 2),
+        "query": round(timed(lambda: index.select(selective, {"Type": ["Regional"]})), 3),
+        "full_query": round(timed(lambda: index.select(full, {"Type": ["Global", "National"]})), 3),
+        "masks": round(timed(masks, runs=3), 2),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(benchmark_filter_index(size))
@@ -0,0 +1,349 @@
+"""
+Footprint Index
+===============
+
+Coverage footprints of initiatives and a spatial index over them.
+
+Every entry of ``initiatives_metadata.jsonc`` carries a ``footprint``:
+
+- ``{"extent": "global"}``, ``{"extent": "south_america"}`` or
+  ``{"extent": "brazil"}``;
+- ``{"extent": "states", "states": [...]}`` for biome or state-level
+  products (the UFs the product maps, e.g. the Legal Amazon).
+
+Entries without one fall back to their textual ``coverage`` (global,
+continental, national; anything else is treated as national).
+
+Footprint geometries are built from the UF outlines of the geometry store
+(``geometry_store.py``) when its archive exists, and from the approximate
+UF bounding boxes in ``UF_EXTENTS`` otherwise. ``FootprintIndex`` keeps
+them in a shapely ``STRtree`` and answers which initiatives cover a state,
+a mesoregion or a point, and how much two footprints overlap (km², on a
+sinusoidal equal-area projection). One index is built per data version.
+
+Neighbouring UF boxes overlap, so area tests between box footprints give
+false positives (a Legal Amazon box union overlaps most of Piauí).
+``states`` footprints therefore answer state queries from their UF list,
+and mesoregion queries from the areas of their member UFs unless exact
+mesoregion outlines are loaded.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+import math
+import threading
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .data_plane import freeze_value
+
+EXTENTS = ("global", "south_america", "brazil", "states")
+# (min lon, min lat, max lon, max lat)
+REGION_EXTENTS: dict[str, tuple[float, float, float, float]] = {
+    "global": (-180.0, -90.0, 180.0, 90.0),
+    "south_america": (-82.0, -56.0, -34.0, 13.0),
+}
+# Approximate UF bounding boxes, used when the geometry store is not built
+UF_EXTENTS: dict[str, tuple[float, float, float, float]] = {
+    "AC": (-74.0, -11.2, -66.6, -7.1), "AM": (-73.8, -9.8, -56.1, 2.3),
+    "AP": (-54.9, -1.3, -49.9, 4.5), "PA": (-58.9, -9.9, -46.0, 2.6),
+    "RO": (-66.8, -13.7, -59.8, -7.9), "RR": (-64.8, -1.6, -58.9, 5.3),
+    "TO": (-50.8, -13.5, -45.7, -5.2), "AL": (-38.3, -10.5, -35.2, -8.8),
+    "BA": (-46.6, -18.4, -37.3, -8.5), "CE": (-41.4, -7.9, -37.3, -2.8),
+    "MA": (-48.8, -10.3, -41.8, -1.0), "PB": (-38.8, -8.3, -34.8, -6.0),
+    "PE": (-41.4, -9.5, -34.8, -7.3), "PI": (-45.9, -10.9, -40.4, -2.7),
+    "RN": (-38.6, -7.0, -35.0, -4.8), "SE": (-38.3, -11.6, -36.4, -9.5),
+    "DF": (-48.3, -16.1, -47.3, -15.5), "GO": (-53.3, -19.5, -45.9, -12.4),
+    "MT": (-61.6, -18.1, -50.2, -7.3), "MS": (-58.2, -24.1, -50.9, -17.2),
+    "ES": (-41.9, -21.3, -39.7, -17.9), "MG": (-51.1, -22.9, -39.9, -14.2),
+    "RJ": (-44.9, -23.4, -40.9, -20.8), "SP": (-53.1, -25.3, -44.2, -19.8),
+    "PR": (-54.6, -26.7, -48.0, -22.5), "RS": (-57.7, -33.8, -49.7, -27.1),
+    "SC": (-53.9, -29.4, -48.3, -25.9),
+}
+_COVERAGE_EXTENTS = {"global": "global", "continental": "south_america", "national": "brazil"}
+# Share of a region's area a footprint must overlap to cover it
+COVER_FRACTION = 0.5
+EARTH_RADIUS_KM = 6371.0088
+AREA_SEGMENT_DEGREES = 0.25
+MAX_CACHED_INDEXES = 2
+
+
+def footprint_spec(details: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Footprint of a metadata entry, derived from ``coverage`` when absent.
+
+    Raises:
+        ValueError: For an unknown extent or unknown UF codes
+    """
+    spec = details.get("footprint")
+    if spec is None:
+        coverage = str(details.get("coverage") or "").lower()
+        extent = next((e for word, e in _COVERAGE_EXTENTS.items() if word in coverage), "brazil")
+        return {"extent": extent}
+
+    extent = spec.get("extent")
+    if extent not in EXTENTS:
+        raise ValueError(f"Unknown footprint extent {extent!r}; expected one of {EXTENTS}")
+    if extent != "states":
+        return {"extent": extent}
+    states = [str(code).upper() for code in spec.get("states") or ()]
+    unknown = sorted(set(states) - set(UF_EXTENTS))
+    if not states or unknown:
+        raise ValueError(f"Footprint needs known UF codes, got {spec.get('states')!r}")
+    return {"extent": "states", "states": sorted(set(states))}
+
+
+def _geometry_shape(geometry: Mapping[str, Any]) -> Any:
+    from shapely import make_valid
+    from shapely.geometry import shape
+
+    return make_valid(shape(geometry))
+
+
+def state_geometries(store: Any = None, level: str = "medium") -> dict[str, Any]:
+    """
+    UF sigla → shapely geometry, from the geometry store when given and
+    ``UF_EXTENTS`` boxes for every UF the store lacks.
+    """
+    from shapely import box
+
+    states = {}
+    if store is not None:
+        for feature in store.geojson("state", level)["features"]:
+            states[feature["id"]] = _geometry_shape(feature["geometry"])
+    for code, bounds in UF_EXTENTS.items():
+        states.setdefault(code, box(*bounds))
+    return states
+
+
+def state_mesoregions() -> dict[str, str]:
+    """UF sigla → mesoregion (North, Northeast, ...) from ``json_dictionary.json``."""
+    from .json_interpreter import MesoregionIndex, load_mesoregions_dictionary
+
+    regions = MesoregionIndex(load_mesoregions_dictionary())
+    return {
+        state["sigla"]: region
+        for region in regions.palette()
+        for state in regions.states(region)
+        if state.get("sigla") in UF_EXTENTS
+    }
+
+
+def area_km2(geometry: Any) -> float:
+    """Area of a lon/lat geometry on the sinusoidal (equal-area) projection."""
+    from shapely import segmentize, transform
+
+    if geometry.is_empty:
+        return 0.0
+    # Edges are densified so the projected outline follows the parallels
+    scale = math.pi / 180 * EARTH_RADIUS_KM
+
+    def sinusoidal(coords: np.ndarray) -> np.ndarray:
+        return np.column_stack([coords[:, 0] * np.cos(np.radians(coords[:, 1])) * scale, coords[:, 1] * scale])
+
+    return float(transform(segmentize(geometry, AREA_SEGMENT_DEGREES), sinusoidal).area)
+
+
+class FootprintIndex:
+    """
+    STRtree over initiative footprints.
+
+    Args:
+        metadata: ``initiatives_metadata.jsonc`` content (name → details)
+        store: Geometry store for UF and mesoregion outlines (optional)
+        level: Store level used for the outlines
+
+    Raises:
+        ValueError: For an invalid footprint (see ``footprint_spec``)
+    """
+
+    def __init__(self, metadata: Mapping[str, Any], store: Any = None, level: str = "medium"):
+        from shapely import STRtree, box, union_all
+
+        self.store = store
+        self._states = state_geometries(store, level)
+        self._mesoregions: dict[str, Any] = {}
+        # Mesoregion → member UFs and UF areas, when mesoregions are unions of UF outlines
+        self._mesoregion_states: dict[str, list[str]] = {}
+        self._state_areas: dict[str, float] = {}
+        if store is not None:
+            for feature in store.geojson("mesoregion", level)["features"]:
+                self._mesoregions[feature["id"]] = _geometry_shape(feature["geometry"])
+        if not self._mesoregions:
+            for code, region in state_mesoregions().items():
+                self._mesoregion_states.setdefault(region, []).append(code)
+            self._mesoregions = {
+                region: union_all([self._states[code] for code in codes])
+                for region, codes in self._mesoregion_states.items()
+            }
+            self._state_areas = {code: area_km2(geometry) for code, geometry in self._states.items()}
+        brazil = union_all(list(self._states.values()))
+
+        self.specs: dict[str, dict[str, Any]] = {}
+        geometries = []
+        for name, details in metadata.items():
+            if not isinstance(details, Mapping):
+                continue
+            spec = footprint_spec(details)
+            if spec["extent"] == "states":
+                geometry = union_all([self._states[code] for code in spec["states"]])
+            elif spec["extent"] == "brazil":
+                geometry = brazil
+            else:
+                geometry = box(*REGION_EXTENTS[spec["extent"]])
+            self.specs[str(name)] = spec
+            geometries.append(geometry)
+
+        self.names: list[str] = list(self.specs)
+        self.specs = freeze_value(self.specs)
+        self.geometries = np.asarray(geometries, dtype=object)
+        self.geometries.flags.writeable = False
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        self._tree = STRtree(self.geometries)
+        self._areas = {name: area_km2(geometry) for name, geometry in zip(self.names, geometries)}
+
+    def _position(self, name: str) -> int:
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise KeyError(f"Unknown initiative {name!r}") from None
+
+    @property
+    def mesoregions(self) -> list[str]:
+        """Mesoregion names that can be queried."""
+        return list(self._mesoregions)
+
+    def footprint(self, name: str) -> Any:
+        """Footprint geometry of an initiative."""
+        return self.geometries[self._position(name)]
+
+    def area(self, name: str) -> float:
+        """Footprint area of an initiative in km²."""
+        return self._areas[self.names[self._position(name)]]
+
+    def covering(self, geometry: Any, fraction: float = COVER_FRACTION) -> list[str]:
+        """
+        Initiatives whose footprint covers ``fraction`` of a geometry's area.
+
+        Points (and lines) are covered when the footprint intersects them.
+        """
+        candidates = sorted(self._tree.query(geometry, predicate="intersects"))
+        if geometry.area == 0:
+            return [self.names[i] for i in candidates]
+        needed = fraction * geometry.area
+        return [self.names[i] for i in candidates if self.geometries[i].intersection(geometry).area >= needed]
+
+    def _covering_with_states(self, geometry: Any, fraction: float, covers_states) -> list[str]:
+        """``covering`` for whole-region footprints, ``covers_states(states)`` for UF lists."""
+        overlapping = set(self.covering(geometry, fraction))
+        return [
+            name for name in self.names
+            if (covers_states(self.specs[name]["states"]) if self.specs[name]["extent"] == "states"
+                else name in overlapping)
+        ]
+
+    def covering_state(self, code: str, fraction: float = COVER_FRACTION) -> list[str]:
+        """Initiatives covering a UF (by sigla); ``states`` footprints cover the UFs they list."""
+        code = str(code).upper()
+        geometry = self._states.get(code)
+        if geometry is None:
+            raise KeyError(f"Unknown state {code!r}")
+        return self._covering_with_states(geometry, fraction, lambda states: code in states)
+
+    def covering_mesoregion(self, region: str, fraction: float = COVER_FRACTION) -> list[str]:
+        """
+        Initiatives covering a mesoregion (North, Northeast, ...).
+
+        Without exact mesoregion outlines, a ``states`` footprint covers the
+        mesoregion when its UFs make up ``fraction`` of the member UF area.
+        """
+        geometry = self._mesoregions.get(region)
+        if geometry is None:
+            raise KeyError(f"Unknown mesoregion {region!r}")
+        members = self._mesoregion_states.get(region)
+        if members is None:
+            return self.covering(geometry, fraction)
+
+        total = sum(self._state_areas[code] for code in members)
+
+        def covers_states(states) -> bool:
+            return sum(self._state_areas[code] for code in members if code in states) >= fraction * total
+
+        return self._covering_with_states(geometry, fraction, covers_states)
+
+    def covering_point(self, lon: float, lat: float) -> list[str]:
+        """Initiatives whose footprint contains a point."""
+        from shapely import Point
+
+        return self.covering(Point(lon, lat))
+
+    def state_coverage(self, names: Iterable[str] | None = None) -> dict[str, list[str]]:
+        """UF sigla → covering initiatives (restricted to ``names`` when given)."""
+        allowed = None if names is None else set(names)
+        return {
+            code: [name for name in self.covering_state(code) if allowed is None or name in allowed]
+            for code in sorted(self._states)
+        }
+
+    def overlap_area(self, first: str, second: str) -> float:
+        """Area (km²) shared by two footprints."""
+        a, b = self._position(first), self._position(second)
+        if a == b:
+            return self.area(first)
+        if not self.geometries[a].intersects(self.geometries[b]):
+            return 0.0
+        return area_km2(self.geometries[a].intersection(self.geometries[b]))
+
+    def overlap_matrix(self, names: Iterable[str] | None = None) -> pd.DataFrame:
+        """
+        Pairwise overlap of footprints as a share of the row initiative's area.
+
+        Returns:
+            Square frame (names × names) with values in [0, 1]
+        """
+        names = self.names if names is None else [n for n in names if n in self._positions]
+        matrix = pd.DataFrame(0.0, index=names, columns=names)
+        for i, first in enumerate(names):
+            for second in names[i:]:
+                shared = self.overlap_area(first, second)
+                matrix.loc[first, second] = shared / self.area(first) if self.area(first) else 0.0
+                matrix.loc[second, first] = shared / self.area(second) if self.area(second) else 0.0
+        return matrix
+
+
+_cache_lock = threading.Lock()
+_cache: OrderedDict[tuple[str, Any], FootprintIndex] = OrderedDict()
+
+
+def get_footprint_index(snapshot: Any) -> FootprintIndex:
+    """
+    Footprint index of a data-plane snapshot, built once per data version
+    (and geometry store archive).
+
+    Args:
+        snapshot: ``DataSnapshot`` (``version``, ``metadata``)
+
+    Returns:
+        Shared index
+    """
+    from . import geometry_store
+
+    store = geometry_store.get_geometry_store()
+    key = (snapshot.version, None if store is None else store.path.stat().st_mtime_ns)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+
+    index = FootprintIndex(snapshot.metadata, store)
+    with _cache_lock:
+        index = _cache.setdefault(key, index)
+        while len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index
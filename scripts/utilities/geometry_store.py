@@ -0,0 +1,506 @@
+"""
+Geometry Store
+==============
+
+Offline, multi-resolution store of Brazilian state (UF) and mesoregion
+boundaries for choropleth maps.
+
+The store is built once from an official boundary file (e.g. the IBGE
+"malha" of UFs, as GeoJSON, or any format geopandas can read) with
+``build_geometry_store`` and saved next to the data as a compressed numpy
+archive (``data/geo/brazil_regions.npz``). Mesoregions are the groups of
+states listed in ``json_dictionary.json``; their outlines are the union of
+their states.
+
+Like TopoJSON, the archive stores each shared border once:
+
+- coordinates are quantized to ``QUANTIZATION`` degrees and stored as
+  ``int32`` deltas along each arc;
+- rings are cut into arcs at junctions (vertices where neighbouring
+  outlines diverge); a border between two states is one arc referenced by
+  both (in opposite directions);
+- every level in ``LEVELS`` simplifies each arc once (Douglas-Peucker,
+  end points fixed), so neighbouring states never gain gaps or overlaps.
+
+``GeometryStore`` reads the archive lazily: the metadata on first use and
+the arcs of a level only when a map at that level is drawn. GeoJSON built
+for a (layer, level) is frozen and shared, so repeated maps cost nothing
+and the browser payload shrinks with the level (see
+``GeometryStore.payload_bytes``). Building needs shapely (and geopandas for
+non-GeoJSON sources); loading needs only numpy.
+
+Usage:
+    python -m scripts.utilities.geometry_store <ufs.geojson> [output.npz]
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+import json
+from pathlib import Path
+import threading
+from typing import Any
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_STORE_PATH = PROJECT_ROOT / "data" / "geo" / "brazil_regions.npz"
+FORMAT_VERSION = 1
+
+QUANTIZATION = 1e-5  # degrees (about 1 m)
+# Simplification tolerance (degrees) of each level, finest first
+LEVELS: dict[str, float] = {"full": 0.0, "detail": 0.005, "medium": 0.02, "overview": 0.08}
+# Map zoom (geo projection scale) from which a level is used
+ZOOM_LEVELS = ((8.0, "full"), (4.0, "detail"), (2.0, "medium"), (0.0, "overview"))
+LAYERS = ("state", "mesoregion")
+
+IBGE_UF_CODES = {
+    "11": "RO", "12": "AC", "13": "AM", "14": "RR", "15": "PA", "16": "AP", "17": "TO",
+    "21": "MA", "22": "PI", "23": "CE", "24": "RN", "25": "PB", "26": "PE", "27": "AL",
+    "28": "SE", "29": "BA", "31": "MG", "32": "ES", "33": "RJ", "35": "SP", "41": "PR",
+    "42": "SC", "43": "RS", "50": "MS", "51": "MT", "52": "GO", "53": "DF",
+}
+_STATE_PROPERTIES = ("sigla", "SIGLA_UF", "SIGLA", "uf", "UF", "codarea", "CD_UF", "state_code")
+_NAME_PROPERTIES = ("nome", "NM_UF", "name", "NAME")
+
+Ring = list[tuple[int, int]]
+
+
+def _state_code(properties: Mapping[str, Any]) -> str | None:
+    """UF code of a boundary feature (sigla or IBGE numeric code)."""
+    for key in _STATE_PROPERTIES:
+        value = properties.get(key)
+        if value is None:
+            continue
+        text = str(value).strip()
+        if text.upper() in IBGE_UF_CODES.values():
+            return text.upper()
+        if text in IBGE_UF_CODES:
+            return IBGE_UF_CODES[text]
+    return None
+
+
+def _signed_area(ring: Sequence[tuple[int, int]]) -> float:
+    xs = np.array([p[0] for p in ring], dtype=np.float64)
+    ys = np.array([p[1] for p in ring], dtype=np.float64)
+    return 0.5 * float(np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1)))
+
+
+def _open_ring(
+    coords: Iterable[Sequence[float]],
+    origin: tuple[float, float] = (0.0, 0.0),
+    scale: float = 1.0,
+) -> Ring:
+    """Integer ring (``(coord - origin) / scale``) without the closing point or repeats."""
+    ring: Ring = []
+    for x, y, *_ in coords:
+        point = (round((x - origin[0]) / scale), round((y - origin[1]) / scale))
+        if not ring or ring[-1] != point:
+            ring.append(point)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    return ring
+
+
+# --- Topology ---
+
+
+def _junctions(rings: Iterable[Ring]) -> set[tuple[int, int]]:
+    """Vertices where the neighbouring outlines diverge."""
+    neighbours: dict[tuple[int, int], frozenset] = {}
+    junctions: set[tuple[int, int]] = set()
+    for ring in rings:
+        n = len(ring)
+        for i, point in enumerate(ring):
+            pair = frozenset((ring[i - 1], ring[(i + 1) % n]))
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _canonical_closed(ring: Ring) -> tuple[tuple[int, int], ...]:
+    start = ring.index(min(ring))
+    forward = ring[start:] + ring[:start]
+    backward = [forward[0]] + forward[:0:-1]
+    best = min(forward, backward)
+    return tuple(best) + (best[0],)
+
+
+class _ArcBuilder:
+    """Cuts rings into shared arcs; arc refs are ``i`` or ``~i`` (reversed)."""
+
+    def __init__(self, junctions: set[tuple[int, int]]):
+        self.junctions = junctions
+        self.arcs: list[tuple[tuple[int, int], ...]] = []
+        self._ids: dict[tuple[tuple[int, int], ...], int] = {}
+
+    def _ref(self, arc: tuple[tuple[int, int], ...]) -> int:
+        if arc in self._ids:
+            return self._ids[arc]
+        reverse = arc[::-1]
+        if reverse in self._ids:
+            return ~self._ids[reverse]
+        self._ids[arc] = len(self.arcs)
+        self.arcs.append(arc)
+        return self._ids[arc]
+
+    def ring(self, ring: Ring) -> list[int]:
+        cuts = [i for i, point in enumerate(ring) if point in self.junctions]
+        if not cuts:
+            closed = _canonical_closed(ring)
+            ref = self._ref(closed)
+            # The ring may run against the canonical direction
+            if _signed_area(closed[:-1]) * _signed_area(ring) < 0:
+                return [~ref]
+            return [ref]
+        start = cuts[0]
+        rotated = ring[start:] + ring[:start] + [ring[start]]
+        positions = [i - start for i in cuts] + [len(ring)]
+        return [
+            self._ref(tuple(rotated[a:b + 1]))
+            for a, b in zip(positions[:-1], positions[1:])
+        ]
+
+
+def _simplify_arc(arc: np.ndarray, tolerance_units: float) -> np.ndarray:
+    if tolerance_units <= 0 or len(arc) <= 2:
+        return arc
+    from shapely.geometry import LineString
+
+    closed = bool((arc[0] == arc[-1]).all())
+    simplified = np.asarray(LineString(arc).simplify(tolerance_units, preserve_topology=False).coords)
+    if closed and len(simplified) < 4:
+        return arc  # keep small islands rather than dropping them
+    return np.rint(simplified).astype(np.int64)
+
+
+def _encode_arcs(arcs: Sequence[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Delta-encoded ``int32`` coordinates and arc offsets."""
+    offsets = np.zeros(len(arcs) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(arc) for arc in arcs])
+    coords = np.concatenate(arcs).astype(np.int64) if arcs else np.zeros((0, 2), dtype=np.int64)
+    deltas = coords.copy()
+    starts = offsets[:-1]
+    deltas[1:] -= coords[:-1]
+    deltas[starts] = coords[starts]
+    return deltas.astype(np.int32), offsets
+
+
+def _decode_arcs(deltas: np.ndarray, offsets: np.ndarray) -> list[np.ndarray]:
+    arcs = []
+    for a, b in zip(offsets[:-1], offsets[1:]):
+        arcs.append(np.cumsum(deltas[a:b].astype(np.int64), axis=0))
+    return arcs
+
+
+# --- Building ---
+
+
+def _read_features(source: str | Path) -> list[dict[str, Any]]:
+    path = Path(source)
+    if path.suffix.lower() in (".geojson", ".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("features", [])
+    try:
+        import geopandas as gpd
+    except ImportError as e:
+        raise ImportError(f"geopandas is required to read {path.suffix} boundary files") from e
+    return gpd.read_file(path).to_crs(4326).__geo_interface__["features"]
+
+
+def _polygons(geometry: Mapping[str, Any]) -> list[list[list[Sequence[float]]]]:
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return list(geometry["coordinates"])
+    return []
+
+
+def build_geometry_store(
+    source: str | Path,
+    output: str | Path = DEFAULT_STORE_PATH,
+    mesoregions_dict: Mapping[str, Any] | None = None,
+    levels: Mapping[str, float] | None = None,
+) -> Path:
+    """
+    Build the archive from a UF boundary file.
+
+    Args:
+        source: GeoJSON (or, with geopandas, any vector format) with one
+            feature per UF, identified by sigla or IBGE code
+        output: Archive path
+        mesoregions_dict: ``json_dictionary.json`` content (default: the
+            project dictionary)
+        levels: Level name → simplification tolerance in degrees
+
+    Returns:
+        Path of the written archive
+
+    Raises:
+        ValueError: When no feature can be matched to a UF
+    """
+    from shapely import make_valid, union_all
+    from shapely.geometry import MultiPolygon, Polygon
+
+    from .json_interpreter import MesoregionIndex, load_mesoregions_dictionary
+
+    levels = dict(levels or LEVELS)
+    raw = [(feature, _state_code(feature.get("properties") or {})) for feature in _read_features(source)]
+    raw = [(feature, code) for feature, code in raw if code and feature.get("geometry")]
+    if not raw:
+        raise ValueError(f"No UF features found in {source}")
+
+    all_x = [p[0] for feature, _ in raw for poly in _polygons(feature["geometry"]) for ring in poly for p in ring]
+    all_y = [p[1] for feature, _ in raw for poly in _polygons(feature["geometry"]) for ring in poly for p in ring]
+    origin = (float(np.floor(min(all_x))), float(np.floor(min(all_y))))
+
+    # Quantize first so that shared borders (and mesoregion unions) match exactly
+    def quantized_polygon(poly):
+        rings = [_open_ring(ring, origin, QUANTIZATION) for ring in poly]
+        return Polygon(rings[0], rings[1:]) if len(rings[0]) >= 3 else None
+
+    features: list[dict[str, Any]] = []
+    shapes: list[Any] = []
+    states: dict[str, Any] = {}
+    for feature, code in raw:
+        polys = [p for p in (quantized_polygon(poly) for poly in _polygons(feature["geometry"])) if p is not None]
+        geometry = make_valid(MultiPolygon(polys))
+        states[code] = union_all([states[code], geometry]) if code in states else geometry
+
+    props = {code: next(f.get("properties") or {} for f, c in raw if c == code) for code in states}
+    for code in sorted(states):
+        name = next((str(props[code][k]) for k in _NAME_PROPERTIES if props[code].get(k)), code)
+        features.append({"id": code, "layer": "state", "name": name})
+        shapes.append(states[code])
+
+    index = MesoregionIndex(mesoregions_dict if mesoregions_dict is not None else load_mesoregions_dictionary())
+    for region, info in sorted(index.palette().items()):
+        members = [states[s["sigla"]] for s in index.states(region) if s.get("sigla") in states]
+        if members:
+            features.append({"id": region, "layer": "mesoregion", "name": info.get("name_pt") or region})
+            shapes.append(union_all(members))
+
+    # Polygons → rings (exterior first) with consistent orientation
+    feature_rings: list[list[list[Ring]]] = []
+    for shape in shapes:
+        parts = shape.geoms if hasattr(shape, "geoms") else [shape]
+        polygons = []
+        for part in parts:
+            if part.geom_type != "Polygon" or part.is_empty:
+                continue
+            rings = [_open_ring(part.exterior.coords)]
+            rings += [_open_ring(interior.coords) for interior in part.interiors]
+            polygons.append([ring for ring in rings if len(ring) >= 3])
+        feature_rings.append(polygons)
+
+    all_rings = [ring for polygons in feature_rings for rings in polygons for ring in rings]
+    builder = _ArcBuilder(_junctions(all_rings))
+    refs: list[int] = []
+    ring_offsets = [0]
+    polygon_offsets = [0]
+    feature_offsets = [0]
+    for polygons in feature_rings:
+        for rings in polygons:
+            for ring in rings:
+                refs.extend(builder.ring(ring))
+                ring_offsets.append(len(refs))
+            polygon_offsets.append(len(ring_offsets) - 1)
+        feature_offsets.append(len(polygon_offsets) - 1)
+
+    base_arcs = [np.array(arc, dtype=np.int64) for arc in builder.arcs]
+    arrays: dict[str, np.ndarray] = {
+        "refs": np.array(refs, dtype=np.int32),
+        "ring_offsets": np.array(ring_offsets, dtype=np.int64),
+        "polygon_offsets": np.array(polygon_offsets, dtype=np.int64),
+        "feature_offsets": np.array(feature_offsets, dtype=np.int64),
+    }
+    for level, tolerance in levels.items():
+        arcs = [_simplify_arc(arc, tolerance / QUANTIZATION) for arc in base_arcs]
+        arrays[f"arcs_{level}"], arrays[f"arc_offsets_{level}"] = _encode_arcs(arcs)
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "origin": origin,
+        "quantization": QUANTIZATION,
+        "levels": levels,
+        "features": features,
+    }
+    arrays["meta"] = np.array(json.dumps(meta))
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(output, **arrays)
+    return output
+
+
+# --- Loading ---
+
+
+class GeometryStore:
+    """
+    Lazily loaded geometry archive.
+
+    Args:
+        path: Archive written by ``build_geometry_store``
+
+    Raises:
+        FileNotFoundError: When the archive does not exist
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(self.path)
+        self._lock = threading.Lock()
+        self._archive: Any = None
+        self._meta: dict[str, Any] | None = None
+        self._arcs: dict[str, list[np.ndarray]] = {}
+        self._geojson: dict[tuple[str, str], Any] = {}
+
+    def _load_meta(self) -> dict[str, Any]:
+        with self._lock:
+            if self._meta is None:
+                self._archive = np.load(self.path)
+                self._meta = json.loads(str(self._archive["meta"]))
+            return self._meta
+
+    @property
+    def levels(self) -> list[str]:
+        """Level names, finest first."""
+        return list(self._load_meta()["levels"])
+
+    def feature_ids(self, layer: str = "state") -> list[str]:
+        """Feature ids (UF codes or mesoregion names) of a layer."""
+        return [f["id"] for f in self._load_meta()["features"] if f["layer"] == layer]
+
+    def level_for_zoom(self, zoom: float) -> str:
+        """Coarsest available level for a geo projection scale."""
+        levels = self.levels
+        for min_zoom, level in ZOOM_LEVELS:
+            if zoom >= min_zoom and level in levels:
+                return level
+        return levels[-1]
+
+    def _level_arcs(self, level: str) -> list[np.ndarray]:
+        meta = self._load_meta()
+        if level not in meta["levels"]:
+            raise ValueError(f"Unknown level {level!r}; expected one of {list(meta['levels'])}")
+        with self._lock:
+            if level not in self._arcs:
+                self._arcs[level] = _decode_arcs(
+                    self._archive[f"arcs_{level}"], self._archive[f"arc_offsets_{level}"]
+                )
+            return self._arcs[level]
+
+    def _ring(self, refs: np.ndarray, arcs: list[np.ndarray]) -> np.ndarray | None:
+        parts = []
+        for ref in refs:
+            arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+            parts.append(arc if not parts else arc[1:])
+        ring = np.concatenate(parts)
+        if len(np.unique(ring, axis=0)) < 3:
+            return None  # collapsed at this level
+        if not (ring[0] == ring[-1]).all():
+            ring = np.vstack([ring, ring[:1]])
+        return ring
+
+    def geojson(self, layer: str = "state", level: str = "medium") -> Mapping[str, Any]:
+        """
+        FeatureCollection of a layer at a level (frozen, shared).
+
+        Exterior rings are clockwise (the d3-geo convention used by Plotly
+        geo traces); feature ``id`` is the UF code or mesoregion name.
+
+        Raises:
+            ValueError: For an unknown layer or level
+        """
+        if layer not in LAYERS:
+            raise ValueError(f"Unknown layer {layer!r}; expected one of {LAYERS}")
+        key = (layer, level)
+        cached = self._geojson.get(key)
+        if cached is not None:
+            return cached
+
+        from .data_plane import freeze_value
+
+        meta = self._load_meta()
+        arcs = self._level_arcs(level)
+        archive = self._archive
+        refs, ring_offsets = archive["refs"], archive["ring_offsets"]
+        polygon_offsets, feature_offsets = archive["polygon_offsets"], archive["feature_offsets"]
+        ox, oy = meta["origin"]
+        q = meta["quantization"]
+
+        features = []
+        for i, feature in enumerate(meta["features"]):
+            if feature["layer"] != layer:
+                continue
+            polygons = []
+            for p in range(feature_offsets[i], feature_offsets[i + 1]):
+                rings = []
+                for r in range(polygon_offsets[p], polygon_offsets[p + 1]):
+                    ring = self._ring(refs[ring_offsets[r]:ring_offsets[r + 1]], arcs)
+                    if ring is None:
+                        if not rings:
+                            break  # exterior collapsed: drop the polygon
+                        continue
+                    clockwise = _signed_area(ring[:-1].tolist()) < 0
+                    if clockwise != (not rings):
+                        ring = ring[::-1]
+                    coords = np.round(ring * q + (ox, oy), 5)
+                    rings.append(coords.tolist())
+                if rings:
+                    polygons.append(rings)
+            features.append({
+                "type": "Feature",
+                "id": feature["id"],
+                "properties": {"name": feature["name"], "layer": layer},
+                "geometry": {"type": "MultiPolygon", "coordinates": polygons},
+            })
+
+        collection = freeze_value({"type": "FeatureCollection", "features": features})
+        with self._lock:
+            return self._geojson.setdefault(key, collection)
+
+    def payload_bytes(self, layer: str = "state") -> dict[str, int]:
+        """JSON size of the layer at every level."""
+        return {level: len(json.dumps(self.geojson(layer, level))) for level in self.levels}
+
+
+_store_lock = threading.Lock()
+_stores: dict[tuple[str, int, int], GeometryStore] = {}
+
+
+def get_geometry_store(path: str | Path = DEFAULT_STORE_PATH) -> GeometryStore | None:
+    """
+    Shared store of an archive, reopened when the file changes.
+
+    Returns:
+        GeometryStore, or None when the archive has not been built
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    version = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _store_lock:
+        store = _stores.get(version)
+        if store is None:
+            _stores.clear()
+            store = _stores[version] = GeometryStore(path)
+        return store
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    written = build_geometry_store(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else DEFAULT_STORE_PATH)
+    print(f"Wrote {written}")
+    print(GeometryStore(written).payload_bytes("state"))
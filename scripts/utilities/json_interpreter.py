@@ -13,13 +13,25 @@ Key Features:
 - Robust handling of various data formats and missing information.
 """
 
+from collections.abc import Iterable
+import copy
+from functools import lru_cache
 import json
 import re
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from scripts.utilities.metadata_normalization import (
+    accuracy_range,
+    methodology_category,
+    reference_system_text,
+    resolution_range,
+)
+from scripts.utilities.single_flight import single_flight
+
 
 # Helper function to load and clean JSONC content
 def _load_jsonc_file(file_path: str | Path) -> dict[str, Any]:
@@ -83,18 +95,7 @@ def _load_jsonc_file(file_path: str | Path) -> dict[str, Any]:
         return {}
 
 
-# --- Parsing functions adapted from lulc_data_engine.py ---
-
-
-def _parse_single_resolution(res_value: Any) -> float | None:
-    """Parses a single resolution value."""
-    if isinstance(res_value, int | float):
-        return float(res_value)
-    if isinstance(res_value, str):
-        res_str = re.sub(r"[^\d.]", "", res_value)
-        if res_str:
-            return float(res_str)
-    return None
+# --- Parsing functions (shared normalization kernel) ---
 
 
 def parse_resolution(resolution_field: Any) -> dict[str, float | None]:
@@ -102,60 +103,8 @@ def parse_resolution(resolution_field: Any) -> dict[str, float | None]:
     Parses the 'spatial_resolution' field which can be a number, string, or list of objects.
     Returns a dictionary with 'value', 'min_val', 'max_val'.
     """
-    default_res = 30.0
-    parsed_values = []
-
-    if isinstance(resolution_field, list):
-        current_res_obj = None
-        for item in resolution_field:
-            if isinstance(item, dict) and item.get("current", False):
-                current_res_obj = item
-                break
-
-        if current_res_obj:  # Prioritize 'current' object
-            val = _parse_single_resolution(current_res_obj.get("resolution"))
-            if val is not None:
-                parsed_values.append(val)
-        else:  # Process all resolution values in the list
-            for item in resolution_field:
-                if isinstance(item, dict):
-                    val = _parse_single_resolution(item.get("resolution"))
-                    if val is not None:
-                        parsed_values.append(val)
-                else:  # Handle direct values in list
-                    val = _parse_single_resolution(item)
-                    if val is not None:
-                        parsed_values.append(val)
-    else:  # Single value
-        val = _parse_single_resolution(resolution_field)
-        if val is not None:
-            parsed_values.append(val)
-
-    if not parsed_values:
-        return {"value": default_res, "min_val": default_res, "max_val": default_res}
-
-    # For simplicity, if multiple values, use the first as 'value', and actual min/max
-    # This matches the slider behavior needing min/max for range.
-    # If only one value, it's used for all.
-    final_value = parsed_values[0]
-    min_val = min(parsed_values)
-    max_val = max(parsed_values)
-
-    return {"value": final_value, "min_val": min_val, "max_val": max_val}
-
-
-def _parse_single_accuracy(acc_value: Any) -> float | None:
-    """Parses a single accuracy value."""
-    if isinstance(acc_value, int | float):
-        return float(acc_value)
-    if isinstance(acc_value, str):
-        # Handle cases like "80.3%" or "Not available"
-        if acc_value.lower() in ["not informed", "incomplete", "n/a", "not available"]:
-            return 0.0  # Or None, depending on how downstream handles it
-        acc_str = re.sub(r"[^\d.]", "", acc_value)
-        if acc_str:
-            return float(acc_str)
-    return None
+    value, min_val, max_val = resolution_range(resolution_field)
+    return {"value": value, "min_val": min_val, "max_val": max_val}
 
 
 def parse_accuracy(accuracy_field: Any) -> dict[str, float | None]:
@@ -164,66 +113,8 @@ def parse_accuracy(accuracy_field: Any) -> dict[str, float | None]:
     Handles numbers, strings, or dicts with 'overall', 'status', 'by_product', etc.
     Returns a dictionary with 'value', 'min_val', 'max_val'.
     """
-    default_acc = 0.0
-    accuracies = []
-
-    if isinstance(accuracy_field, dict):
-        if accuracy_field.get("status") == "not_available":
-            return {"value": 0.0, "min_val": 0.0, "max_val": 0.0}
-
-        # Prioritize 'current' product if available
-        if "by_product" in accuracy_field and isinstance(
-            accuracy_field["by_product"], list
-        ):
-            current_product_acc = None
-            for prod in accuracy_field["by_product"]:
-                if isinstance(prod, dict) and prod.get("current", False):
-                    current_product_acc = _parse_single_accuracy(prod.get("accuracy"))
-                    break
-            if current_product_acc is not None:
-                accuracies.append(current_product_acc)
-
-        if not accuracies and "overall" in accuracy_field:  # Fallback to main 'overall'
-            val = _parse_single_accuracy(accuracy_field["overall"])
-            if val is not None:
-                accuracies.append(val)
-
-        # If still no accuracies, check other nested structures like by_collection
-        if (
-            not accuracies
-            and "by_collection" in accuracy_field
-            and isinstance(accuracy_field["by_collection"], list)
-        ):
-            current_collection_acc = None
-            for coll in accuracy_field["by_collection"]:
-                if isinstance(coll, dict) and coll.get("current", False):
-                    current_collection_acc = _parse_single_accuracy(
-                        coll.get("accuracy")
-                    )
-                    break
-            if current_collection_acc is not None:
-                accuracies.append(current_collection_acc)
-            elif accuracy_field["by_collection"]:  # take first if no current
-                first_coll_acc = _parse_single_accuracy(
-                    accuracy_field["by_collection"][0].get("accuracy")
-                )
-                if first_coll_acc is not None:
-                    accuracies.append(first_coll_acc)
-
-    else:  # Single value
-        val = _parse_single_accuracy(accuracy_field)
-        if val is not None:
-            accuracies.append(val)
-
-    if not accuracies:
-        return {"value": default_acc, "min_val": default_acc, "max_val": default_acc}
-
-    # Use the first found accuracy as the primary 'value', and actual min/max
-    final_value = accuracies[0]
-    min_val = min(accuracies)
-    max_val = max(accuracies)
-
-    return {"value": final_value, "min_val": min_val, "max_val": max_val}
+    value, min_val, max_val = accuracy_range(accuracy_field)
+    return {"value": value, "min_val": min_val, "max_val": max_val}
 
 
 def parse_reference_system(reference_system_field: Any) -> str:
@@ -231,32 +122,7 @@ def parse_reference_system(reference_system_field: Any) -> str:
     Parses the 'reference_system' field and returns a string representation.
     Handles strings, lists of strings, or lists containing dictionaries.
     """
-    parsed_systems: list[str] = []
-    if isinstance(reference_system_field, str):
-        # Split if it's a comma-separated string, otherwise add as is
-        if "," in reference_system_field:
-            parsed_systems.extend(
-                [s.strip() for s in reference_system_field.split(",") if s.strip()]
-            )
-        else:
-            parsed_systems.append(reference_system_field.strip())
-    elif isinstance(reference_system_field, list):
-        for item in reference_system_field:
-            if isinstance(item, str):
-                parsed_systems.append(item.strip())
-            elif isinstance(item, dict):
-                # Try to extract a common key for the system name
-                epsg_code = item.get("epsg_code", "")
-                description = item.get("description", "")
-                if epsg_code:
-                    parsed_systems.append(
-                        f"{epsg_code} ({description})" if description else epsg_code
-                    )
-                elif description:
-                    parsed_systems.append(description)
-    # Remove duplicates and return as comma-separated string
-    unique_systems = sorted({s for s in parsed_systems if s})
-    return ", ".join(unique_systems) if unique_systems else "Not specified"
+    return reference_system_text(reference_system_field)
 
 
 def _generate_display_name(name: str, acronym: str | None) -> str:
@@ -286,41 +152,7 @@ def _standardize_methodology(
     methodology: str | None, classification_method: str | None
 ) -> str:
     """Standardizes methodology from available fields."""
-    text_to_check = ""
-    if methodology:
-        text_to_check += methodology.lower() + " "
-    if classification_method:
-        text_to_check += classification_method.lower()
-
-    if not text_to_check.strip():
-        return "Unknown"
-
-    if any(
-        term in text_to_check
-        for term in ["deep learning", "neural network", "cnn", "u-net"]
-    ):
-        return "Deep Learning"
-    if any(
-        term in text_to_check
-        for term in [
-            "machine learning",
-            "random forest",
-            "gradient boost",
-            "catboost",
-            "decision tree",
-        ]
-    ):  # Added decision tree here
-        return "Machine Learning"
-    if any(term in text_to_check for term in ["visual interpretation", "visual"]):
-        return "Visual Interpretation"
-    if "hybrid" in text_to_check or (
-        "combined" in text_to_check
-        and not ("learning" in text_to_check or "visual" in text_to_check)
-    ):  # Refined 'Combined'
-        return "Hybrid/Combined"
-    if "statistical" in text_to_check or "regression" in text_to_check:
-        return "Statistical Methods"
-    return "Other"
+    return methodology_category((methodology, classification_method))
 
 
 def _parse_available_years(years_field: Any) -> list[int]:
@@ -354,6 +186,7 @@ def _get_safe_value(data: dict, key: str, default: Any = None) -> Any:
 
 
 # Main interpreter function
+@single_flight()
 def interpret_initiatives_metadata(file_path: str | Path | None = None) -> pd.DataFrame:
     """
     Reads initiatives_metadata.jsonc, processes it, and returns a Pandas DataFrame.
@@ -376,24 +209,44 @@ def interpret_initiatives_metadata(file_path: str | Path | None = None) -> pd.Da
     if not raw_data:
         return pd.DataFrame()  # Return empty DataFrame if loading failed
 
-    processed_initiatives = []
+    initiatives = []
     for initiative_name, details in raw_data.items():
         if not isinstance(details, dict):  # Skip if details are not a dictionary
             print(
                 f"Warning: Skipping initiative '{initiative_name}' due to unexpected data format: {type(details)}"
             )
             continue
+        initiatives.append((initiative_name, details))
 
+    # Normalize each metadata column in one batch (memoized per distinct value)
+    resolutions = resolution_range.batch(
+        details.get("spatial_resolution") for _, details in initiatives
+    )
+    accuracies = accuracy_range.batch(
+        details.get("overall_accuracy") or details.get("accuracy")  # Check both keys
+        for _, details in initiatives
+    )
+    methodologies = methodology_category.batch(
+        (details.get("methodology"), details.get("classification_method"))
+        for _, details in initiatives
+    )
+    reference_systems = reference_system_text.batch(
+        details.get("reference_system") for _, details in initiatives
+    )
+
+    processed_initiatives = []
+    for (
+        (initiative_name, details),
+        resolution,
+        accuracy,
+        methodology,
+        reference_system,
+    ) in zip(initiatives, resolutions, accuracies, methodologies, reference_systems):
         acronym = _get_safe_value(details, "acronym")
         display_name = _generate_display_name(initiative_name, acronym)
 
-        resolution_data = parse_resolution(
-            _get_safe_value(details, "spatial_resolution")
-        )
-        accuracy_data = parse_accuracy(
-            _get_safe_value(details, "overall_accuracy")
-            or _get_safe_value(details, "accuracy")
-        )  # Check both keys
+        resolution_data = dict(zip(("value", "min_val", "max_val"), resolution))
+        accuracy_data = dict(zip(("value", "min_val", "max_val"), accuracy))
         available_years_list = _parse_available_years(
             _get_safe_value(details, "available_years")
         )
@@ -464,10 +317,7 @@ def interpret_initiatives_metadata(file_path: str | Path | None = None) -> pd.Da
             "Accuracy_min_val": accuracy_data["min_val"],
             "Accuracy_max_val": accuracy_data["max_val"],
             "Type": _standardize_type(_get_safe_value(details, "coverage")),
-            "Methodology": _standardize_methodology(
-                _get_safe_value(details, "methodology"),
-                _get_safe_value(details, "classification_method"),
-            ),
+            "Methodology": methodology,
             "Coverage": _get_safe_value(details, "coverage"),
             "Provider": _get_safe_value(details, "provider"),
             "Source": _get_safe_value(details, "source"),
@@ -507,9 +357,7 @@ def interpret_initiatives_metadata(file_path: str | Path | None = None) -> pd.Da
                 if resolution_data["value"] is not None
                 else "-"
             ),
-            "Reference_System": parse_reference_system(
-                _get_safe_value(details, "reference_system")
-            ),
+            "Reference_System": reference_system,
             "Sensors_Referenced": json.dumps(sensors_referenced_list),
         }
         processed_initiatives.append(initiative_dict)
@@ -634,6 +482,25 @@ def get_conab_crop_availability(
     }
 
 
+# Default location of the mesoregions dictionary
+DEFAULT_DICTIONARY_PATH = (
+    Path(__file__).resolve().parent.parent.parent / "data" / "json_dictionary.json"
+)
+
+# "Rondônia (RO)" -> "RO"
+_STATE_CODE_PATTERN = re.compile(r"\(([A-Z]{2})\)")
+
+
+def _file_version(path: str | Path) -> tuple[str, int, int] | None:
+    """Returns (resolved path, mtime_ns, size) for a file, or None if missing."""
+    path = Path(path).resolve()
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
 def load_mesoregions_dictionary(
     dictionary_path: str | Path | None = None,
 ) -> dict[str, Any]:
@@ -647,11 +514,7 @@ def load_mesoregions_dictionary(
         Dictionary with mesoregions data
     """
     if dictionary_path is None:
-        dictionary_path = (
-            Path(__file__).resolve().parent.parent.parent
-            / "data"
-            / "json_dictionary.json"
-        )
+        dictionary_path = DEFAULT_DICTIONARY_PATH
     else:
         dictionary_path = Path(dictionary_path)
 
@@ -666,6 +529,203 @@ def load_mesoregions_dictionary(
         return {}
 
 
+@lru_cache(maxsize=256)
+def _state_code_from_region(region_name: str) -> str | None:
+    """Extracts the state code from a region label like "Rondônia (RO)"."""
+    match = _STATE_CODE_PATTERN.search(region_name)
+    return match.group(1) if match else None
+
+
+class MesoregionIndex:
+    """
+    Compiled lookup tables over the mesoregions dictionary.
+
+    Built once per dictionary version (see ``get_mesoregion_index``); every
+    lookup is a dict access instead of a scan over mesoregions and states.
+    """
+
+    def __init__(self, mesoregions_dict: dict[str, Any] | None):
+        """
+        Builds the index.
+
+        Args:
+            mesoregions_dict: Dictionary with mesoregions data
+        """
+        mesoregions = (mesoregions_dict or {}).get("mesoregions") or {}
+        self.is_empty = not mesoregions
+
+        self._info: dict[str, dict[str, Any]] = {}
+        self._pt_to_en: dict[str, str] = {}
+        self._state_to_mesoregion: dict[str, str] = {}
+        self._palette: dict[str, dict[str, str]] = {}
+
+        for eng_name, data in mesoregions.items():
+            info = dict(data)
+            info["name_en"] = eng_name
+            self._info[eng_name] = info
+            if "name_pt" in data:
+                self._pt_to_en.setdefault(data["name_pt"], eng_name)
+            self._palette[eng_name] = {
+                "color": data.get("color", "#CCCCCC"),
+                "name_pt": data.get("name_pt", eng_name),
+                "name_en": eng_name,
+            }
+            for state in data.get("states", []):
+                if isinstance(state, dict) and state.get("sigla"):
+                    # First mesoregion listing a state wins, as in the old scan
+                    self._state_to_mesoregion.setdefault(
+                        state["sigla"].upper(), eng_name
+                    )
+
+        # One shared record per known state code
+        self._state_records: dict[str, tuple[str, str | None, str | None]] = {
+            code: (
+                name,
+                self._info[name].get("color"),
+                self._info[name].get("name_pt"),
+            )
+            for code, name in self._state_to_mesoregion.items()
+        }
+
+    def mesoregion_for(self, state_code: str) -> str | None:
+        """Returns the mesoregion (English name) of a state code."""
+        return self._state_to_mesoregion.get(state_code.upper())
+
+    def _english_name(self, mesoregion_name: str) -> str | None:
+        """Resolves an English or Portuguese name (English names first)."""
+        if mesoregion_name in self._info:
+            return mesoregion_name
+        return self._pt_to_en.get(mesoregion_name)
+
+    def info(self, mesoregion_name: str) -> dict[str, Any] | None:
+        """
+        Returns mesoregion information for an English or Portuguese name.
+
+        The returned dictionary is a copy and may be modified by the caller.
+        """
+        eng_name = self._english_name(mesoregion_name)
+        if eng_name is None:
+            return None
+        return dict(self._info[eng_name])
+
+    def color(self, mesoregion_name: str) -> str | None:
+        """Returns the color code of a mesoregion (English or Portuguese name)."""
+        eng_name = self._english_name(mesoregion_name)
+        return self._info[eng_name].get("color") if eng_name else None
+
+    def name_pt(self, mesoregion_name: str) -> str | None:
+        """Returns the Portuguese name of a mesoregion."""
+        info = self._info.get(mesoregion_name)
+        return info.get("name_pt") if info else None
+
+    def states(self, mesoregion_name: str) -> list[dict[str, str]]:
+        """Returns the states of a mesoregion (English name)."""
+        return list(self._info.get(mesoregion_name, {}).get("states", []))
+
+    def palette(self) -> dict[str, dict[str, str]]:
+        """Returns all mesoregions with their colors and names."""
+        return {name: dict(entry) for name, entry in self._palette.items()}
+
+    def record(self, state_code: str | None) -> dict[str, Any]:
+        """
+        Returns the enrichment record of a single state code.
+
+        Args:
+            state_code: Two-letter state code (None for unknown)
+
+        Returns:
+            Dictionary with state_code, mesoregion, mesoregion_color and
+            mesoregion_pt
+        """
+        entry = (
+            self._state_records.get(state_code.upper()) if state_code else None
+        ) or (None, None, None)
+        return {
+            "state_code": state_code,
+            "mesoregion": entry[0],
+            "mesoregion_color": entry[1],
+            "mesoregion_pt": entry[2],
+        }
+
+    def enrich(self, state_codes: Iterable[str] | pd.Series) -> pd.DataFrame:
+        """
+        Enriches a column of state codes in bulk.
+
+        Each distinct code is resolved once and the result is broadcast with
+        a single take, so the cost stays flat for municipality-level data
+        with many repeated state codes.
+
+        Args:
+            state_codes: State codes (a Series keeps its index)
+
+        Returns:
+            DataFrame with state_code, mesoregion, mesoregion_color and
+            mesoregion_pt columns
+        """
+        codes = (
+            state_codes
+            if isinstance(state_codes, pd.Series)
+            else pd.Series(list(state_codes), dtype="object")
+        )
+        positions, uniques = pd.factorize(codes.astype("string").str.upper())
+
+        # Trailing None row receives missing codes (position -1)
+        resolved = [self._state_records.get(code) for code in uniques]
+        columns = {}
+        for offset, column in enumerate(
+            ("mesoregion", "mesoregion_color", "mesoregion_pt")
+        ):
+            lookup = np.array(
+                [entry[offset] if entry else None for entry in resolved] + [None],
+                dtype=object,
+            )
+            columns[column] = lookup[positions]
+
+        return pd.DataFrame({"state_code": codes.to_numpy(), **columns}, index=codes.index)
+
+
+@lru_cache(maxsize=4)
+def _index_for_version(version: tuple[str, int, int]) -> MesoregionIndex:
+    return MesoregionIndex(load_mesoregions_dictionary(version[0]))
+
+
+@lru_cache(maxsize=8)
+def _index_for_content(mesoregions_json: str) -> MesoregionIndex:
+    # Built from the serialized content, so the index shares no objects
+    # with the caller's dictionary
+    return MesoregionIndex({"mesoregions": json.loads(mesoregions_json)})
+
+
+def get_mesoregion_index(
+    mesoregions_dict: dict[str, Any] | None = None,
+    dictionary_path: str | Path | None = None,
+) -> MesoregionIndex:
+    """
+    Returns the mesoregion index for a dictionary.
+
+    Without an explicit dictionary the file is read and compiled once per
+    version (path, modification time and size) and reused afterwards. An
+    explicit dictionary is compiled once per content (its JSON
+    serialization) and reused for equal dictionaries.
+
+    Args:
+        mesoregions_dict: Optional dictionary with mesoregions data
+        dictionary_path: Path to json_dictionary.json (default data file)
+
+    Returns:
+        Compiled MesoregionIndex
+    """
+    if mesoregions_dict is not None:
+        mesoregions = mesoregions_dict.get("mesoregions") or {}
+        return _index_for_content(json.dumps(mesoregions, ensure_ascii=False, default=str))
+
+    version = _file_version(dictionary_path or DEFAULT_DICTIONARY_PATH)
+    if version is None:
+        # Keep the original error message for a missing file
+        return MesoregionIndex(load_mesoregions_dictionary(dictionary_path))
+    return _index_for_version(version)
+
+
 def get_mesoregion_by_state(
     state_code: str, mesoregions_dict: dict[str, Any] | None = None
 ) -> str | None:
@@ -679,24 +739,7 @@ def get_mesoregion_by_state(
     Returns:
         Mesoregion name or None if not found
     """
-    if mesoregions_dict is None:
-        mesoregions_dict = load_mesoregions_dictionary()
-
-    if not mesoregions_dict or "mesoregions" not in mesoregions_dict:
-        return None
-
-    state_code_upper = state_code.upper()
-
-    for mesoregion_name, mesoregion_data in mesoregions_dict["mesoregions"].items():
-        if "states" in mesoregion_data:
-            for state in mesoregion_data["states"]:
-                if (
-                    isinstance(state, dict)
-                    and state.get("sigla", "").upper() == state_code_upper
-                ):
-                    return mesoregion_name
-
-    return None
+    return get_mesoregion_index(mesoregions_dict).mesoregion_for(state_code)
 
 
 def get_states_by_mesoregion(
@@ -712,14 +755,7 @@ def get_states_by_mesoregion(
     Returns:
         List of dictionaries with state information
     """
-    if mesoregions_dict is None:
-        mesoregions_dict = load_mesoregions_dictionary()
-
-    if not mesoregions_dict or "mesoregions" not in mesoregions_dict:
-        return []
-
-    mesoregion_data = mesoregions_dict["mesoregions"].get(mesoregion_name, {})
-    return mesoregion_data.get("states", [])
+    return get_mesoregion_index(mesoregions_dict).states(mesoregion_name)
 
 
 def enrich_conab_data_with_mesoregions(
@@ -735,117 +771,82 @@ def enrich_conab_data_with_mesoregions(
     Returns:
         Enriched CONAB data with mesoregion mappings
     """
-    if mesoregions_dict is None:
-        mesoregions_dict = load_mesoregions_dictionary()
+    index = get_mesoregion_index(mesoregions_dict)
 
     enriched_data = conab_data.copy()
 
     if "crop_coverage" in enriched_data:
-        for _crop_name, crop_data in enriched_data["crop_coverage"].items():
-            if "regions" in crop_data:
-                # Add mesoregion mapping for each state
-                regions_with_mesoregions = []
-                for state_code in crop_data["regions"]:
-                    mesoregion = get_mesoregion_by_state(state_code, mesoregions_dict)
-                    mesoregion_info = (
-                        get_mesoregion_info(mesoregion, mesoregions_dict)
-                        if mesoregion
-                        else None
-                    )
-
-                    regions_with_mesoregions.append(
-                        {
-                            "state_code": state_code,
-                            "mesoregion": mesoregion,
-                            "mesoregion_color": (
-                                mesoregion_info.get("color")
-                                if mesoregion_info
-                                else None
-                            ),
-                            "mesoregion_pt": (
-                                mesoregion_info.get("name_pt")
-                                if mesoregion_info
-                                else None
-                            ),
+        crops = [
+            crop_data
+            for crop_data in enriched_data["crop_coverage"].values()
+            if "regions" in crop_data
+        ]
+        # One bulk lookup over the states of every crop
+        records = index.enrich(
+            [state_code for crop_data in crops for state_code in crop_data["regions"]]
+        ).to_dict("records")
+
+        offset = 0
+        for crop_data in crops:
+            # Add mesoregion mapping for each state
+            regions_with_mesoregions = records[offset : offset + len(crop_data["regions"])]
+            offset += len(regions_with_mesoregions)
+            crop_data["regions_with_mesoregions"] = regions_with_mesoregions
+
+            # Group by mesoregion with enhanced information
+            mesoregion_groups = {}
+            for region_info in regions_with_mesoregions:
+                mesoregion = region_info["mesoregion"]
+                if mesoregion:
+                    if mesoregion not in mesoregion_groups:
+                        mesoregion_groups[mesoregion] = {
+                            "states": [],
+                            "color": region_info["mesoregion_color"],
+                            "name_pt": region_info["mesoregion_pt"],
                         }
+                    mesoregion_groups[mesoregion]["states"].append(
+                        region_info["state_code"]
                     )
 
-                crop_data["regions_with_mesoregions"] = regions_with_mesoregions
-
-                # Group by mesoregion with enhanced information
-                mesoregion_groups = {}
-                for region_info in regions_with_mesoregions:
-                    mesoregion = region_info["mesoregion"]
-                    if mesoregion:
-                        if mesoregion not in mesoregion_groups:
-                            mesoregion_groups[mesoregion] = {
-                                "states": [],
-                                "color": region_info["mesoregion_color"],
-                                "name_pt": region_info["mesoregion_pt"],
-                            }
-                        mesoregion_groups[mesoregion]["states"].append(
-                            region_info["state_code"]
-                        )
-
-                crop_data["mesoregion_groups"] = mesoregion_groups
+            crop_data["mesoregion_groups"] = mesoregion_groups
 
     # Add mesoregion mapping for regional_coverage with enhanced information
     if "regional_coverage" in enriched_data:
-        regional_coverage_with_mesoregions = []
-        for region_name in enriched_data["regional_coverage"]:
-            # Extract state code from region name (e.g., "Rondônia (RO)" -> "RO")
-            state_code_match = re.search(r"\(([A-Z]{2})\)", region_name)
-            if state_code_match:
-                state_code = state_code_match.group(1)
-                mesoregion = get_mesoregion_by_state(state_code, mesoregions_dict)
-                mesoregion_info = (
-                    get_mesoregion_info(mesoregion, mesoregions_dict)
-                    if mesoregion
-                    else None
-                )
-
-                regional_coverage_with_mesoregions.append(
-                    {
-                        "region_name": region_name,
-                        "state_code": state_code,
-                        "mesoregion": mesoregion,
-                        "mesoregion_color": (
-                            mesoregion_info.get("color") if mesoregion_info else None
-                        ),
-                        "mesoregion_pt": (
-                            mesoregion_info.get("name_pt") if mesoregion_info else None
-                        ),
-                    }
-                )
-            else:
-                regional_coverage_with_mesoregions.append(
-                    {
-                        "region_name": region_name,
-                        "state_code": None,
-                        "mesoregion": None,
-                        "mesoregion_color": None,
-                        "mesoregion_pt": None,
-                    }
-                )
-
-        enriched_data["regional_coverage_with_mesoregions"] = (
-            regional_coverage_with_mesoregions
-        )
+        region_names = list(enriched_data["regional_coverage"])
+        enriched_data["regional_coverage_with_mesoregions"] = [
+            {"region_name": region_name, **record}
+            for region_name, record in zip(
+                region_names,
+                index.enrich(
+                    [_state_code_from_region(name) for name in region_names]
+                ).to_dict("records"),
+            )
+        ]
 
     # Add mesoregions color palette
-    enriched_data["mesoregions_palette"] = get_all_mesoregions_with_colors(
-        mesoregions_dict
-    )
+    enriched_data["mesoregions_palette"] = index.palette()
 
     return enriched_data
 
 
+@lru_cache(maxsize=4)
+def _integrated_analysis_for_versions(
+    conab_version: tuple[str, int, int], dictionary_version: tuple[str, int, int]
+) -> dict[str, Any]:
+    conab_data = get_conab_crop_availability(conab_version[0])
+    mesoregions_dict = load_mesoregions_dictionary(dictionary_version[0])
+    return _build_integrated_conab_analysis(conab_data, mesoregions_dict)
+
+
 def get_integrated_conab_analysis(
     conab_file_path: str | Path | None = None, dictionary_path: str | Path | None = None
 ) -> dict[str, Any]:
     """
     Gets integrated analysis of CONAB data with mesoregion information.
 
+    The analysis is memoized per version (modification time and size) of
+    both input files; each call returns an independent copy.
+
     Args:
         conab_file_path: Path to CONAB detailed initiative file
         dictionary_path: Path to json_dictionary.json file
@@ -853,10 +854,31 @@ def get_integrated_conab_analysis(
     Returns:
         Dictionary with integrated analysis
     """
-    # Load both datasets
-    conab_data = get_conab_crop_availability(conab_file_path)
-    mesoregions_dict = load_mesoregions_dictionary(dictionary_path)
+    if conab_file_path is None:
+        conab_file_path = (
+            Path(__file__).resolve().parent.parent.parent
+            / "data"
+            / "conab_detailed_initiative.jsonc"
+        )
+    conab_version = _file_version(conab_file_path)
+    dictionary_version = _file_version(dictionary_path or DEFAULT_DICTIONARY_PATH)
+
+    if conab_version is None or dictionary_version is None:
+        # Missing input: nothing worth caching (loaders report the error)
+        return _build_integrated_conab_analysis(
+            get_conab_crop_availability(conab_file_path),
+            load_mesoregions_dictionary(dictionary_path),
+        )
+
+    return copy.deepcopy(
+        _integrated_analysis_for_versions(conab_version, dictionary_version)
+    )
+
 
+def _build_integrated_conab_analysis(
+    conab_data: dict[str, Any], mesoregions_dict: dict[str, Any]
+) -> dict[str, Any]:
+    """Builds the integrated CONAB/mesoregion analysis from loaded data."""
     if not conab_data or not mesoregions_dict:
         return {}
 
@@ -934,26 +956,7 @@ def get_mesoregion_info(
     Returns:
         Dictionary with mesoregion information or None if not found
     """
-    if mesoregions_dict is None:
-        mesoregions_dict = load_mesoregions_dictionary()
-
-    if not mesoregions_dict or "mesoregions" not in mesoregions_dict:
-        return None
-
-    # First try direct match (English names)
-    if mesoregion_name in mesoregions_dict["mesoregions"]:
-        data = mesoregions_dict["mesoregions"][mesoregion_name].copy()
-        data["name_en"] = mesoregion_name
-        return data
-
-    # Try matching Portuguese names
-    for eng_name, mesoregion_data in mesoregions_dict["mesoregions"].items():
-        if mesoregion_data.get("name_pt") == mesoregion_name:
-            data = mesoregion_data.copy()
-            data["name_en"] = eng_name
-            return data
-
-    return None
+    return get_mesoregion_index(mesoregions_dict).info(mesoregion_name)
 
 
 def get_mesoregion_color(
@@ -969,8 +972,7 @@ def get_mesoregion_color(
     Returns:
         Color code (hex) or None if not found
     """
-    info = get_mesoregion_info(mesoregion_name, mesoregions_dict)
-    return info.get("color") if info else None
+    return get_mesoregion_index(mesoregions_dict).color(mesoregion_name)
 
 
 def get_all_mesoregions_with_colors(
@@ -985,21 +987,7 @@ def get_all_mesoregions_with_colors(
     Returns:
         Dictionary mapping English names to color and Portuguese name info
     """
-    if mesoregions_dict is None:
-        mesoregions_dict = load_mesoregions_dictionary()
-
-    if not mesoregions_dict or "mesoregions" not in mesoregions_dict:
-        return {}
-
-    result = {}
-    for eng_name, data in mesoregions_dict["mesoregions"].items():
-        result[eng_name] = {
-            "color": data.get("color", "#CCCCCC"),
-            "name_pt": data.get("name_pt", eng_name),
-            "name_en": eng_name,
-        }
-
-    return result
+    return get_mesoregion_index(mesoregions_dict).palette()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,555 @@
+"""
+Metadata Normalization Kernel
+=============================
+
+Shared normalization of initiative metadata fields (spatial resolution,
+accuracy, reference system and methodology) used by ``json_interpreter`` and
+``lulc_data_engine``.
+
+Key Features:
+- Patterns and keyword tables compiled once at import time.
+- Every normalizer is memoized per distinct raw value (most values repeat
+  across initiatives), including lists and dicts.
+- ``batch`` normalizes a whole column in one call.
+
+The dashboard readers (``json_interpreter``) and the auxiliary data generator
+(``lulc_data_engine``) historically disagree on defaults and categories, so
+both flavours are kept here side by side:
+
+- ``resolution_range``, ``accuracy_range``, ``reference_system_text`` and
+  ``methodology_category`` follow ``json_interpreter``;
+- ``resolution_value``, ``accuracy_value``, ``reference_system_epsg``,
+  ``methodology_group`` and ``method_category`` follow
+  ``UnifiedDataProcessor``.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Callable, Iterable
+import re
+import time
+from typing import Any
+
+# Distinct raw values remembered per normalizer before the memo is reset
+MEMO_SIZE = 8192
+
+DEFAULT_RESOLUTION = 30.0
+DEFAULT_REFERENCE_SYSTEM = "EPSG:4326"
+
+_NON_NUMERIC = re.compile(r"[^\d.]")
+_NOT_AVAILABLE_LOWER = frozenset({"not informed", "incomplete", "n/a", "not available"})
+_NOT_AVAILABLE_EXACT = frozenset({"Not informed", "Incomplete", "N/A", "Not available"})
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _keywords(*terms: str) -> re.Pattern:
+    """Compiles a substring alternation equivalent to ``any(t in text ...)``."""
+    return re.compile("|".join(re.escape(term) for term in terms))
+
+
+# json_interpreter methodology categories
+_DEEP_LEARNING = _keywords("deep learning", "neural network", "cnn", "u-net")
+_MACHINE_LEARNING = _keywords(
+    "machine learning", "random forest", "gradient boost", "catboost", "decision tree"
+)
+_VISUAL = _keywords("visual interpretation", "visual")
+_STATISTICAL = _keywords("statistical", "regression")
+
+# UnifiedDataProcessor methodology groups
+_GROUP_DEEP_LEARNING = _keywords(
+    "deep learning", "neural network", "u-net", "cnn", "convolutional"
+)
+_GROUP_MACHINE_LEARNING = _keywords(
+    "random forest", "gradient boost", "decision tree", "machine learning", "catboost"
+)
+_GROUP_HYBRID_VISUAL = _keywords(
+    "machine learning",
+    "spectral",
+    "classification",
+    "random forest",
+    "deep learning",
+    "bhattacharya",
+)
+
+# UnifiedDataProcessor method categories
+_CATEGORY_MACHINE_LEARNING = _keywords(
+    "machine learning", "random forest", "gradient boost", "catboost"
+)
+_CATEGORY_STATISTICAL = _keywords("statistical", "regression", "decision tree")
+
+
+def _memo_key(value: Any) -> Any:
+    """
+    Returns a hashable key for a raw value, or None if it cannot be keyed.
+
+    Scalars are keyed by type and value (so ``1`` and ``True`` differ),
+    tuples of scalars directly, and JSON containers by their ``repr``
+    (equal text implies equal content; dicts that only differ in key order
+    simply get separate entries).
+    """
+    cls = value.__class__
+    if cls in _SCALAR_TYPES:
+        return (cls, value)
+    if cls is tuple:
+        types = tuple(map(type, value))
+        if _SCALAR_TYPES.issuperset(types):
+            return (tuple, value, types)
+        return None
+    if cls is list or cls is dict:
+        return (cls, repr(value))
+    return None
+
+
+class MemoizedNormalizer:
+    """
+    Normalization function memoized per distinct raw value.
+
+    Results must be immutable (floats, strings or tuples) because they are
+    shared between every caller that passes an equal raw value.
+    """
+
+    def __init__(self, func: Callable[[Any], Any], maxsize: int = MEMO_SIZE):
+        self._func = func
+        self._maxsize = maxsize
+        self._memo: dict[Any, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __call__(self, value: Any) -> Any:
+        key = _memo_key(value)
+        if key is None:
+            return self._func(value)
+        try:
+            result = self._memo[key]
+            self.hits += 1
+            return result
+        except KeyError:
+            pass
+        self.misses += 1
+        result = self._func(value)
+        if len(self._memo) >= self._maxsize:
+            self._memo.clear()
+        self._memo[key] = result
+        return result
+
+    def batch(self, values: Iterable[Any]) -> list[Any]:
+        """
+        Normalizes a whole column of raw values.
+
+        Args:
+            values: Raw values
+
+        Returns:
+            Normalized values, in input order
+        """
+        memo = self._memo
+        results = []
+        append = results.append
+        hits = 0
+        for value in values:
+            key = _memo_key(value)
+            if key is not None and key in memo:
+                hits += 1
+                append(memo[key])
+            else:
+                append(self(value))
+        self.hits += hits
+        return results
+
+    def cache_clear(self) -> None:
+        """Drops the memo and resets its counters."""
+        self._memo.clear()
+        self.hits = self.misses = 0
+
+
+def normalizer(func: Callable[[Any], Any]) -> MemoizedNormalizer:
+    """Decorator turning a pure single-argument function into a normalizer."""
+    return MemoizedNormalizer(func)
+
+
+# --- Scalar primitives ---
+
+
+def _parse_number(value: Any) -> float | None:
+    """Parses a number, stripping units and symbols from strings."""
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str):
+        digits = _NON_NUMERIC.sub("", value)
+        if digits:
+            try:
+                return float(digits)
+            except ValueError:
+                return None
+    return None
+
+
+def _parse_accuracy_number(value: Any) -> float | None:
+    """Parses an accuracy value; "not available"-like strings map to 0."""
+    if isinstance(value, str) and value.lower() in _NOT_AVAILABLE_LOWER:
+        return 0.0
+    return _parse_number(value)
+
+
+def _as_range(values: list[float], default: float) -> tuple[float, float, float]:
+    """(first, min, max) of parsed values, or the default for all three."""
+    if not values:
+        return default, default, default
+    return values[0], min(values), max(values)
+
+
+# --- json_interpreter flavour ---
+
+
+@normalizer
+def resolution_range(resolution_field: Any) -> tuple[float, float, float]:
+    """
+    Parses 'spatial_resolution' (number, string or list of objects).
+
+    Returns:
+        (value, min_val, max_val); the 'current' entry wins when present
+    """
+    parsed: list[float] = []
+
+    if isinstance(resolution_field, list):
+        current = next(
+            (
+                item
+                for item in resolution_field
+                if isinstance(item, dict) and item.get("current", False)
+            ),
+            None,
+        )
+        if current:
+            candidates = [current.get("resolution")]
+        else:
+            candidates = [
+                item.get("resolution") if isinstance(item, dict) else item
+                for item in resolution_field
+            ]
+    else:
+        candidates = [resolution_field]
+
+    for candidate in candidates:
+        value = _parse_number(candidate)
+        if value is not None:
+            parsed.append(value)
+
+    return _as_range(parsed, DEFAULT_RESOLUTION)
+
+
+def _current_accuracy(entries: list) -> float | None:
+    for entry in entries:
+        if isinstance(entry, dict) and entry.get("current", False):
+            return _parse_accuracy_number(entry.get("accuracy"))
+    return None
+
+
+@normalizer
+def accuracy_range(accuracy_field: Any) -> tuple[float, float, float]:
+    """
+    Parses 'overall_accuracy'/'accuracy' (number, string or dict with
+    'overall', 'status', 'by_product' or 'by_collection').
+
+    Returns:
+        (value, min_val, max_val)
+    """
+    accuracies: list[float] = []
+
+    if isinstance(accuracy_field, dict):
+        if accuracy_field.get("status") == "not_available":
+            return 0.0, 0.0, 0.0
+
+        # Prioritize 'current' product if available
+        by_product = accuracy_field.get("by_product")
+        if isinstance(by_product, list):
+            current = _current_accuracy(by_product)
+            if current is not None:
+                accuracies.append(current)
+
+        if not accuracies and "overall" in accuracy_field:
+            value = _parse_accuracy_number(accuracy_field["overall"])
+            if value is not None:
+                accuracies.append(value)
+
+        by_collection = accuracy_field.get("by_collection")
+        if not accuracies and isinstance(by_collection, list):
+            current = _current_accuracy(by_collection)
+            if current is None and by_collection and isinstance(by_collection[0], dict):
+                # Take the first collection when none is marked as current
+                current = _parse_accuracy_number(by_collection[0].get("accuracy"))
+            if current is not None:
+                accuracies.append(current)
+    else:
+        value = _parse_accuracy_number(accuracy_field)
+        if value is not None:
+            accuracies.append(value)
+
+    return _as_range(accuracies, 0.0)
+
+
+@normalizer
+def reference_system_text(reference_system_field: Any) -> str:
+    """
+    Parses 'reference_system' (string, list of strings or list of dicts)
+    into a sorted, de-duplicated, comma-separated string.
+    """
+    systems: list[str] = []
+    if isinstance(reference_system_field, str):
+        systems.extend(part.strip() for part in reference_system_field.split(","))
+    elif isinstance(reference_system_field, list):
+        for item in reference_system_field:
+            if isinstance(item, str):
+                systems.append(item.strip())
+            elif isinstance(item, dict):
+                epsg_code = item.get("epsg_code", "")
+                description = item.get("description", "")
+                if epsg_code:
+                    systems.append(
+                        f"{epsg_code} ({description})" if description else epsg_code
+                    )
+                elif description:
+                    systems.append(description)
+
+    unique_systems = sorted({system for system in systems if system})
+    return ", ".join(unique_systems) if unique_systems else "Not specified"
+
+
+@normalizer
+def methodology_category(fields: tuple[str | None, str | None]) -> str:
+    """
+    Standardizes (methodology, classification_method) into a category.
+
+    Returns:
+        Deep Learning, Machine Learning, Visual Interpretation,
+        Hybrid/Combined, Statistical Methods, Other or Unknown
+    """
+    methodology, classification_method = fields
+    text = ""
+    if methodology:
+        text += methodology.lower() + " "
+    if classification_method:
+        text += classification_method.lower()
+
+    if not text.strip():
+        return "Unknown"
+    if _DEEP_LEARNING.search(text):
+        return "Deep Learning"
+    if _MACHINE_LEARNING.search(text):
+        return "Machine Learning"
+    if _VISUAL.search(text):
+        return "Visual Interpretation"
+    if "hybrid" in text or (
+        "combined" in text and not ("learning" in text or "visual" in text)
+    ):
+        return "Hybrid/Combined"
+    if _STATISTICAL.search(text):
+        return "Statistical Methods"
+    return "Other"
+
+
+# --- UnifiedDataProcessor flavour ---
+
+
+def _resolution_value(raw: Any) -> float:
+    """
+    Parses a resolution into meters, preferring the 'current' entry of
+    structured lists; defaults to 30 m.
+    """
+    if isinstance(raw, list):
+        for item in raw:
+            if isinstance(item, dict) and item.get("current", False):
+                return _resolution_value(item.get("resolution", 30))
+        if raw and isinstance(raw[0], dict):
+            return _resolution_value(raw[0].get("resolution", 30))
+        for item in raw:
+            if isinstance(item, int | float):
+                return float(item)
+        return DEFAULT_RESOLUTION
+
+    if isinstance(raw, int | float):
+        return float(raw)
+    if not raw:
+        return DEFAULT_RESOLUTION
+
+    parsed = _parse_number(str(raw))
+    return parsed if parsed is not None else DEFAULT_RESOLUTION
+
+
+def _accuracy_value(raw: Any) -> float:
+    """Parses an accuracy (number, string or structured dict) into a percentage."""
+    if isinstance(raw, dict):
+        if "status" in raw:
+            if raw.get("status") == "not_available":
+                return 0.0
+            return _accuracy_value(raw.get("overall", 0))
+        if "overall" in raw:
+            return _accuracy_value(raw.get("overall", 0))
+        return 0.0
+
+    if isinstance(raw, int | float):
+        return float(raw)
+    if not raw or (isinstance(raw, str) and raw in _NOT_AVAILABLE_EXACT):
+        return 0.0
+
+    parsed = _parse_number(str(raw))
+    return parsed if parsed is not None else 0.0
+
+
+# Recursive on nested entries, so memoized after definition
+resolution_value = MemoizedNormalizer(_resolution_value)
+accuracy_value = MemoizedNormalizer(_accuracy_value)
+
+
+@normalizer
+def reference_system_epsg(reference_system_value: Any) -> str:
+    """Formats structured reference systems as 'EPSG (hemisphere)' codes."""
+    if isinstance(reference_system_value, list):
+        codes = []
+        for item in reference_system_value:
+            if isinstance(item, dict) and item.get("epsg_code", ""):
+                hemisphere = item.get("hemisphere", "")
+                codes.append(
+                    f"{item['epsg_code']} ({hemisphere})"
+                    if hemisphere
+                    else item["epsg_code"]
+                )
+        return ", ".join(codes) if codes else DEFAULT_REFERENCE_SYSTEM
+
+    if isinstance(reference_system_value, str):
+        return reference_system_value
+    return DEFAULT_REFERENCE_SYSTEM
+
+
+@normalizer
+def methodology_group(classification_method: str | None) -> str:
+    """Groups a classification method into broad chart categories."""
+    if not classification_method:
+        return "Unknown"
+
+    method = classification_method.lower()
+    if _GROUP_DEEP_LEARNING.search(method):
+        return "Deep Learning"
+    if _GROUP_MACHINE_LEARNING.search(method):
+        return "Machine Learning"
+    if "visual interpretation" in method:
+        if _GROUP_HYBRID_VISUAL.search(method):
+            return "Hybrid"
+        return "Visual Interpretation"
+    if "combined" in method or "," in method:
+        return "Hybrid"
+    return "Machine Learning"
+
+
+@normalizer
+def method_category(method: str | None) -> str:
+    """Categorizes a classification method (UnifiedDataProcessor rules)."""
+    method_lower = (method or "").lower()
+    if _DEEP_LEARNING.search(method_lower):
+        return "Deep Learning"
+    if _CATEGORY_MACHINE_LEARNING.search(method_lower):
+        return "Machine Learning"
+    if _VISUAL.search(method_lower):
+        return "Visual Interpretation"
+    if _CATEGORY_STATISTICAL.search(method_lower):
+        return "Statistical Methods"
+    return "Combined"
+
+
+NORMALIZERS = (
+    resolution_range,
+    accuracy_range,
+    reference_system_text,
+    methodology_category,
+    resolution_value,
+    accuracy_value,
+    reference_system_epsg,
+    methodology_group,
+    method_category,
+)
+
+
+def clear_normalization_memos() -> None:
+    """Drops the memo of every normalizer."""
+    for item in NORMALIZERS:
+        item.cache_clear()
+
+
+def synthetic_initiative_records(n_records: int = 100_000) -> list[dict[str, Any]]:
+    """
+    Builds synthetic initiative records mixing the formats found in
+    initiatives_metadata.jsonc (used for benchmarking).
+    """
+    resolutions = [
+        30,
+        "10 m",
+        "30m",
+        [{"resolution": 30, "current": True}, {"resolution": 60}],
+        [{"resolution": "250 m"}, {"resolution": "500 m"}],
+    ]
+    accuracies = [
+        "85%",
+        91.3,
+        "Not available",
+        {"status": "not_available"},
+        {"overall": "80.3%", "by_product": [{"accuracy": 82, "current": True}]},
+    ]
+    reference_systems = [
+        "EPSG:4326",
+        "EPSG:4326, SIRGAS 2000",
+        [{"epsg_code": "EPSG:31983", "description": "UTM 23S"}],
+    ]
+    methods = [
+        ("Random Forest", "Supervised classification"),
+        ("U-Net", None),
+        ("Visual interpretation", "Visual interpretation, spectral rules"),
+        (None, None),
+        ("Regression trees", "Statistical"),
+    ]
+    return [
+        {
+            "spatial_resolution": resolutions[i % len(resolutions)],
+            "overall_accuracy": accuracies[i % len(accuracies)],
+            "reference_system": reference_systems[i % len(reference_systems)],
+            "methodology": methods[i % len(methods)][0],
+            "classification_method": methods[i % len(methods)][1],
+        }
+        for i in range(n_records)
+    ]
+
+
+def benchmark_normalization(n_records: int = 100_000) -> dict[str, float]:
+    """
+    Times the batch normalization of synthetic initiative records.
+
+    Returns:
+        Seconds spent per field and in total (cold memo)
+    """
+    records = synthetic_initiative_records(n_records)
+    clear_normalization_memos()
+
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    for name, func, values in (
+        ("resolution", resolution_range, (r["spatial_resolution"] for r in records)),
+        ("accuracy", accuracy_range, (r["overall_accuracy"] for r in records)),
+        ("reference_system", reference_system_text, (r["reference_system"] for r in records)),
+        (
+            "methodology",
+            methodology_category,
+            ((r["methodology"], r["classification_method"]) for r in records),
+        ),
+    ):
+        field_started = time.perf_counter()
+        func.batch(values)
+        timings[name] = time.perf_counter() - field_started
+    timings["total"] = time.perf_counter() - started
+    return timings
+
+
+if __name__ == "__main__":
+    for field, seconds in benchmark_normalization().items():
+        print(f"{field:>16}: {seconds * 1000:8.1f} ms")
@@ -79,9 +79,14 @@ class ModernColorPalettes:
 class ModernThemes:
     """Classe para configurar temas modernos do Plotly"""
 
+    _theme_ready = False
+
     @staticmethod
     def setup_modern_theme():
-        """Configura tema moderno padrão para todo o projeto"""
+        """Configura tema moderno padrão para todo o projeto (uma vez por processo)"""
+        if ModernThemes._theme_ready and "modern" in pio.templates:
+            pio.templates.default = "modern"
+            return
 
         # Define tema moderno global
         modern_template = go.layout.Template()
@@ -188,6 +193,7 @@ class ModernThemes:
         # Registra o tema no Plotly
         pio.templates["modern"] = modern_template
         pio.templates.default = "modern"
+        ModernThemes._theme_ready = True
 
     @staticmethod
     def get_responsive_height(
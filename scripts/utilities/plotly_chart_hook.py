@@ -0,0 +1,78 @@
+"""
+Plotly Chart Hook
+=================
+
+Wraps ``st.plotly_chart`` once per process so other utilities (batch export
+capture, render tracing, payload compaction) can observe or post-process the
+figures a page displays without touching every call site.
+
+Transformers run first and return the figure to display (e.g. a compacted
+copy); observers are then called with that figure before it is handed to
+Streamlit and must be cheap. Exceptions raised by either are swallowed so
+they can never break a page (a failing transformer leaves the figure as is).
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Callable
+import threading
+
+_observers: list[Callable[[object], None]] = []
+_transformers: list[Callable[[object], object]] = []
+_install_lock = threading.Lock()
+_installed = False
+
+
+def install_plotly_chart_hook() -> None:
+    """Wrap ``st.plotly_chart`` (idempotent)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+
+        import streamlit as st
+
+        original = st.plotly_chart
+
+        def plotly_chart(figure_or_data, *args, **kwargs):
+            for transformer in tuple(_transformers):
+                try:
+                    figure_or_data = transformer(figure_or_data)
+                except Exception:
+                    pass
+            for observer in tuple(_observers):
+                try:
+                    observer(figure_or_data)
+                except Exception:
+                    pass
+            return original(figure_or_data, *args, **kwargs)
+
+        plotly_chart.__wrapped__ = original
+        st.plotly_chart = plotly_chart
+        _installed = True
+
+
+def add_plotly_chart_observer(observer: Callable[[object], None]) -> None:
+    """
+    Register a callback receiving every figure passed to ``st.plotly_chart``.
+
+    Args:
+        observer: Callable taking the figure (registered once)
+    """
+    install_plotly_chart_hook()
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def add_plotly_chart_transformer(transformer: Callable[[object], object]) -> None:
+    """
+    Register a callable replacing figures passed to ``st.plotly_chart``.
+
+    Args:
+        transformer: Callable taking the figure and returning the figure to
+            display; it must not modify its input (registered once)
+    """
+    install_plotly_chart_hook()
+    if transformer not in _transformers:
+        _transformers.append(transformer)
@@ -0,0 +1,442 @@
+"""
+Render Tracing
+==============
+
+Lightweight per-component render instrumentation for the dashboard.
+
+Wrap a component with ``trace_render`` (decorator or context manager) or
+instrument whole packages with ``instrument_components``; each call records
+wall time, CPU time and, in ``full`` mode, allocations (``tracemalloc``) and
+the JSON size of the figures it displayed. ``tracemalloc`` is process-wide:
+allocation and peak figures include concurrent sessions, and tracing is
+stopped again when ``full`` mode is turned off. Records live in a rolling window
+in process memory and are exposed through ``get_tracer()`` (summary, JSON
+dump) and the hidden Performance page.
+
+Modes (``LANDAGRI_TRACING`` environment variable or ``set_tracing_mode``):
+``off``, ``basic`` (default: wall + CPU time) and ``full``.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterable
+import contextvars
+from dataclasses import asdict, dataclass
+import functools
+import itertools
+import json
+import os
+from pathlib import Path
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from typing import Any
+
+TRACING_MODES = ("off", "basic", "full")
+DEFAULT_WINDOW = 5000
+TRACED_PREFIXES = ("render_", "plot_", "create_")
+
+_mode = os.environ.get("LANDAGRI_TRACING", "basic").lower()
+if _mode not in TRACING_MODES:
+    _mode = "basic"
+
+# Active span stack and rerun id of the current script run
+_span_stack: contextvars.ContextVar[tuple] = contextvars.ContextVar(
+    "_span_stack", default=()
+)
+_rerun_id: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "_rerun_id", default=None
+)
+_rerun_counter = itertools.count(1)
+
+
+@dataclass
+class ComponentTiming:
+    """One traced component call."""
+
+    component: str
+    rerun_id: int | None
+    page: str | None
+    started_at: float
+    wall_ms: float
+    cpu_ms: float
+    # tracemalloc figures cover the whole process, not just this call
+    process_alloc_kb: float | None = None
+    process_peak_kb: float | None = None
+    payload_bytes: int = 0
+    figures: int = 0
+    error: str | None = None
+
+
+class _Span:
+    """Mutable accumulator for a running trace."""
+
+    __slots__ = ("name", "payload_bytes", "figures")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.payload_bytes = 0
+        self.figures = 0
+
+
+class RenderTracer:
+    """Rolling window of component timings kept in process memory."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._records: deque[ComponentTiming] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, timing: ComponentTiming) -> None:
+        """Append a timing to the window."""
+        with self._lock:
+            self._records.append(timing)
+
+    def records(self) -> list[ComponentTiming]:
+        """Return a snapshot of the window (oldest first)."""
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        """Drop every record."""
+        with self._lock:
+            self._records.clear()
+
+    def last_rerun(self) -> list[ComponentTiming]:
+        """Records of the most recent traced rerun."""
+        records = [r for r in self.records() if r.rerun_id is not None]
+        if not records:
+            return []
+        last_id = max(r.rerun_id for r in records)
+        return [r for r in records if r.rerun_id == last_id]
+
+    def summary(self) -> list[dict[str, Any]]:
+        """
+        Aggregate the window per component.
+
+        Returns:
+            One dict per component, slowest (by mean wall time) first
+        """
+        grouped: dict[str, list[ComponentTiming]] = {}
+        for record in self.records():
+            grouped.setdefault(record.component, []).append(record)
+
+        rows = []
+        for component, records in grouped.items():
+            walls = sorted(r.wall_ms for r in records)
+            peaks = [r.process_peak_kb for r in records if r.process_peak_kb is not None]
+            rows.append(
+                {
+                    "component": component,
+                    "calls": len(records),
+                    "mean_wall_ms": round(statistics.fmean(walls), 3),
+                    "p95_wall_ms": round(walls[int(0.95 * (len(walls) - 1))], 3),
+                    "max_wall_ms": round(walls[-1], 3),
+                    "mean_cpu_ms": round(
+                        statistics.fmean(r.cpu_ms for r in records), 3
+                    ),
+                    "mean_process_peak_kb": round(statistics.fmean(peaks), 1)
+                    if peaks
+                    else None,
+                    "mean_payload_kb": round(
+                        statistics.fmean(r.payload_bytes for r in records) / 1024, 1
+                    ),
+                    "errors": sum(1 for r in records if r.error),
+                }
+            )
+        rows.sort(key=lambda row: row["mean_wall_ms"], reverse=True)
+        return rows
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Serialize the summary and raw records to JSON."""
+        return json.dumps(
+            {
+                "mode": get_tracing_mode(),
+                "summary": self.summary(),
+                "records": [asdict(r) for r in self.records()],
+            },
+            indent=indent,
+            default=str,
+        )
+
+    def dump_json(self, path: str | Path) -> Path:
+        """Write ``to_json()`` to a file and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json(), encoding="utf-8")
+        return path
+
+
+_tracer = RenderTracer()
+_current_page: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "_current_page", default=None
+)
+
+# tracemalloc bookkeeping: whether this module started tracing and how many
+# top-level ``full`` spans are open (across all sessions/threads)
+_memory_lock = threading.Lock()
+_started_tracemalloc = False
+_open_memory_spans = 0
+
+
+def get_tracer() -> RenderTracer:
+    """Return the process-wide tracer."""
+    return _tracer
+
+
+def get_tracing_mode() -> str:
+    """Return the current tracing mode."""
+    return _mode
+
+
+def set_tracing_mode(mode: str) -> None:
+    """
+    Change the tracing mode at runtime.
+
+    Args:
+        mode: One of ``TRACING_MODES``
+    """
+    global _mode
+    if mode not in TRACING_MODES:
+        raise ValueError(f"Unknown tracing mode: {mode}")
+    _mode = mode
+    if mode == "full":
+        _ensure_payload_observer()
+    else:
+        _stop_memory_tracing()
+
+
+def _start_memory_span(top_level: bool) -> int:
+    """Start tracemalloc if needed and return the current traced memory."""
+    global _started_tracemalloc, _open_memory_spans
+    with _memory_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+        if top_level:
+            # The peak is process-wide: only reset it when no other
+            # session is inside a traced span, so their peaks stay valid
+            if _open_memory_spans == 0:
+                tracemalloc.reset_peak()
+            _open_memory_spans += 1
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _end_memory_span(top_level: bool) -> None:
+    global _open_memory_spans
+    if top_level:
+        with _memory_lock:
+            _open_memory_spans = max(0, _open_memory_spans - 1)
+
+
+def _stop_memory_tracing() -> None:
+    """Stop tracemalloc if this module started it (leaving ``full`` mode)."""
+    global _started_tracemalloc
+    with _memory_lock:
+        if _started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def _figure_observer(figure) -> None:
+    """Attribute figure payload size to the innermost active span."""
+    stack = _span_stack.get()
+    if not stack or _mode != "full" or not hasattr(figure, "to_json"):
+        return
+    span = stack[-1]
+    span.figures += 1
+    span.payload_bytes += len(figure.to_json())
+
+
+_payload_observer_installed = False
+
+
+def _ensure_payload_observer() -> None:
+    global _payload_observer_installed
+    if _payload_observer_installed:
+        return
+    try:
+        from scripts.utilities.plotly_chart_hook import add_plotly_chart_observer
+
+        add_plotly_chart_observer(_figure_observer)
+        _payload_observer_installed = True
+    except ImportError:
+        pass
+
+
+class trace_render:
+    """
+    Trace a component call, as a decorator or a context manager.
+
+    Examples:
+        >>> @trace_render()
+        ... def render_chart(df): ...
+        >>> with trace_render("overview.summary_cards"):
+        ...     render_cards(df)
+    """
+
+    def __init__(self, name: str | None = None):
+        self.name = name
+        self._state: list[tuple] = []
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _mode == "off":
+                return func(*args, **kwargs)
+            with trace_render(name):
+                return func(*args, **kwargs)
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    def __enter__(self):
+        if _mode == "off":
+            self._state.append(None)
+            return self
+
+        span = _Span(self.name or "anonymous")
+        stack = _span_stack.get()
+        token = _span_stack.set(stack + (span,))
+
+        memory = None
+        if _mode == "full":
+            _ensure_payload_observer()
+            memory = _start_memory_span(top_level=not stack)
+
+        self._state.append(
+            (span, token, time.time(), time.perf_counter(), time.process_time(), memory, not stack)
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        state = self._state.pop()
+        if state is None:
+            return False
+
+        span, token, started_at, wall0, cpu0, memory0, top_level = state
+        wall_ms = (time.perf_counter() - wall0) * 1000
+        cpu_ms = (time.process_time() - cpu0) * 1000
+        _span_stack.reset(token)
+
+        alloc_kb = peak_kb = None
+        if memory0 is not None:
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                alloc_kb = (current - memory0) / 1024
+                peak_kb = max(0, peak - memory0) / 1024
+            _end_memory_span(top_level)
+
+        # Figures shown by nested spans also count for their parents
+        parent_stack = _span_stack.get()
+        if parent_stack:
+            parent_stack[-1].payload_bytes += span.payload_bytes
+            parent_stack[-1].figures += span.figures
+
+        _tracer.record(
+            ComponentTiming(
+                component=span.name,
+                rerun_id=_rerun_id.get(),
+                page=_current_page.get(),
+                started_at=started_at,
+                wall_ms=wall_ms,
+                cpu_ms=cpu_ms,
+                process_alloc_kb=alloc_kb,
+                process_peak_kb=peak_kb,
+                payload_bytes=span.payload_bytes,
+                figures=span.figures,
+                error=exc_type.__name__ if exc_type else None,
+            )
+        )
+        return False
+
+
+class trace_rerun:
+    """Context manager marking one script run of a page."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self._tokens: tuple | None = None
+        self._span = trace_render(f"page:{page}")
+
+    def __enter__(self):
+        self._tokens = (
+            _rerun_id.set(next(_rerun_counter)),
+            _current_page.set(self.page),
+        )
+        self._span.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.__exit__(exc_type, exc, tb)
+        rerun_token, page_token = self._tokens
+        _current_page.reset(page_token)
+        _rerun_id.reset(rerun_token)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Package instrumentation
+# ---------------------------------------------------------------------------
+_wrapped: dict[Callable, Callable] = {}
+_scanned_modules: set[str] = set()
+_instrument_lock = threading.Lock()
+
+
+def _should_trace(obj: Any, packages: tuple[str, ...], prefixes: tuple[str, ...]) -> bool:
+    return (
+        isinstance(obj, types.FunctionType)
+        and not getattr(obj, "__traced__", False)
+        and obj.__name__.startswith(prefixes)
+        and (obj.__module__ or "").startswith(packages)
+    )
+
+
+def instrument_components(
+    packages: Iterable[str] = ("dashboard.components",),
+    prefixes: Iterable[str] = TRACED_PREFIXES,
+    scope: str = "dashboard",
+) -> int:
+    """
+    Wrap ``render_*``/``plot_*``/``create_*`` functions of loaded modules.
+
+    Every loaded module under ``scope`` referencing such a function
+    (including ``from x import render_y`` imports in page modules) is
+    rebound to the same traced wrapper. Modules are scanned once, so calling
+    this on every rerun only costs a lookup per newly imported module.
+
+    Args:
+        packages: Module prefixes whose functions should be traced
+        prefixes: Function name prefixes to trace
+        scope: Only modules whose name starts with this prefix are rebound
+
+    Returns:
+        Number of functions traced so far
+    """
+    packages = tuple(packages)
+    prefixes = tuple(prefixes)
+
+    with _instrument_lock:
+        for module_name, module in list(sys.modules.items()):
+            if module_name in _scanned_modules or not module_name.startswith(scope):
+                continue
+            _scanned_modules.add(module_name)
+            namespace = getattr(module, "__dict__", None)
+            if not isinstance(namespace, dict):
+                continue
+            for attr, obj in list(namespace.items()):
+                if not _should_trace(obj, packages, prefixes):
+                    continue
+                wrapper = _wrapped.get(obj)
+                if wrapper is None:
+                    short_module = obj.__module__.rsplit(".", 1)[-1]
+                    wrapper = trace_render(f"{short_module}.{obj.__qualname__}")(obj)
+                    _wrapped[obj] = wrapper
+                namespace[attr] = wrapper
+        return len(_wrapped)
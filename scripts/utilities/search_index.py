@@ -0,0 +1,377 @@
+"""
+Search Index
+============
+
+Inverted full-text index over initiatives and sensors with ranked,
+prefix- and typo-tolerant matching.
+
+Documents are built from the initiative name, acronym, provider,
+methodology, class legend and referenced sensors, and from the sensor key,
+``display_name``, ``instrument_names``, family and platform of
+``sensors_metadata.jsonc``. Each field has a weight (a name match counts
+more than a legend match). Scoring is BM25 over the weighted term
+frequencies, precomputed per (term, document) when the index is built.
+
+A query token matches a vocabulary term:
+
+- exactly (full score);
+- as a prefix, e.g. ``senti`` → ``sentinel`` (``PREFIX_WEIGHT``);
+- within one edit (insertion, deletion, substitution or transposition),
+  found through a deletion-neighbourhood table (``FUZZY_WEIGHT``).
+
+Every query token must match for a document to be returned (the picker
+narrows as the user types). The index is immutable and built once per data
+version by ``get_search_index``; a query only touches the postings of the
+matched terms, so it is answered in microseconds at the dashboard's scale.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import json
+import math
+import re
+import threading
+import time
+from typing import Any
+import unicodedata
+
+import pandas as pd
+
+K1 = 1.2
+B = 0.75
+PREFIX_WEIGHT = 0.7
+FUZZY_WEIGHT = 0.5
+MIN_PREFIX_LENGTH = 2
+MIN_FUZZY_LENGTH = 4
+MAX_EXPANSIONS = 50
+MAX_CACHED_INDEXES = 2
+
+INITIATIVE_FIELDS = {"name": 3.0, "acronym": 3.0, "provider": 1.5, "methodology": 1.0, "classes": 1.0, "sensors": 0.5}
+SENSOR_FIELDS = {"display_name": 3.0, "key": 2.0, "instruments": 2.0, "family": 1.5, "platform": 1.5}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Any) -> list[str]:
+    """Lowercase, accent-free alphanumeric tokens of ``text``."""
+    if text is None:
+        return []
+    normalized = unicodedata.normalize("NFKD", str(text))
+    ascii_text = normalized.encode("ascii", "ignore").decode("ascii").lower()
+    return _TOKEN_RE.findall(ascii_text.replace("_", " "))
+
+
+def _deletions(term: str) -> set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Damerau-Levenshtein distance of ``a`` and ``b`` is at most 1."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diffs = [i for i in range(la) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """One searchable item: ``kind`` is "initiative" or "sensor"."""
+
+    kind: str
+    key: str
+    title: str
+    fields: Mapping[str, str]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """Ranked search result."""
+
+    kind: str
+    key: str
+    title: str
+    score: float
+
+
+def _join(value: Any) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(_join(item) for item in value)
+    if isinstance(value, Mapping):
+        return " ".join(_join(item) for item in value.values())
+    text = str(value)
+    if text.startswith(("[", "{")):
+        try:
+            return _join(json.loads(text))
+        except ValueError:
+            pass
+    return text
+
+
+def initiative_documents(df: pd.DataFrame, metadata: Mapping[str, Any] | None = None) -> list[SearchDocument]:
+    """
+    Search documents of the initiatives frame.
+
+    Args:
+        df: Initiatives DataFrame (``Name`` required)
+        metadata: Initiatives metadata, used for class legends missing in ``df``
+
+    Returns:
+        One document per initiative, keyed by name
+    """
+    if df.empty or "Name" not in df.columns:
+        return []
+    metadata = metadata or {}
+    columns = {column: df[column].tolist() if column in df.columns else [None] * len(df) for column in (
+        "Acronym", "Provider", "Methodology", "Class_Legend", "Sensors_Referenced", "Primary_Sensor",
+    )}
+    documents = []
+    for i, name in enumerate(df["Name"].tolist()):
+        classes = _join(columns["Class_Legend"][i]) or _join(metadata.get(name, {}).get("class_legend"))
+        acronym = _join(columns["Acronym"][i])
+        documents.append(SearchDocument(
+            kind="initiative",
+            key=str(name),
+            title=f"{name} ({acronym})" if acronym and acronym != "N/A" else str(name),
+            fields={
+                "name": str(name),
+                "acronym": acronym,
+                "provider": _join(columns["Provider"][i]),
+                "methodology": _join(columns["Methodology"][i]),
+                "classes": classes,
+                "sensors": f"{_join(columns['Sensors_Referenced'][i])} {_join(columns['Primary_Sensor'][i])}",
+            },
+        ))
+    return documents
+
+
+def sensor_documents(sensors: Mapping[str, Any]) -> list[SearchDocument]:
+    """Search documents of ``sensors_metadata.jsonc`` entries, keyed by sensor key."""
+    documents = []
+    for key, sensor in sensors.items():
+        if not isinstance(sensor, Mapping):
+            continue
+        display_name = _join(sensor.get("display_name")) or str(key)
+        documents.append(SearchDocument(
+            kind="sensor",
+            key=str(key),
+            title=display_name,
+            fields={
+                "display_name": display_name,
+                "key": str(key),
+                "instruments": _join(sensor.get("instrument_names")),
+                "family": _join(sensor.get("sensor_family")),
+                "platform": _join(sensor.get("platform_name")),
+            },
+        ))
+    return documents
+
+
+class SearchIndex:
+    """
+    Immutable BM25 inverted index.
+
+    Args:
+        documents: Documents to index
+        field_weights: Kind → field → weight (defaults: ``INITIATIVE_FIELDS``
+            and ``SENSOR_FIELDS``)
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[SearchDocument],
+        field_weights: Mapping[str, Mapping[str, float]] | None = None,
+    ):
+        weights = field_weights or {"initiative": INITIATIVE_FIELDS, "sensor": SENSOR_FIELDS}
+        self.documents = tuple(documents)
+
+        term_freqs: list[dict[str, float]] = []
+        for document in self.documents:
+            kind_weights = weights.get(document.kind, {})
+            freqs: dict[str, float] = {}
+            for field, text in document.fields.items():
+                weight = kind_weights.get(field, 1.0)
+                for token in tokenize(text):
+                    freqs[token] = freqs.get(token, 0.0) + weight
+            term_freqs.append(freqs)
+
+        n_docs = len(self.documents)
+        lengths = [sum(freqs.values()) for freqs in term_freqs]
+        avg_length = (sum(lengths) / n_docs) if n_docs else 1.0
+        doc_freq: dict[str, int] = {}
+        for freqs in term_freqs:
+            for term in freqs:
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+
+        postings: dict[str, dict[int, float]] = {}
+        for doc_id, freqs in enumerate(term_freqs):
+            norm = K1 * (1 - B + B * lengths[doc_id] / avg_length)
+            for term, tf in freqs.items():
+                idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                postings.setdefault(term, {})[doc_id] = idf * tf * (K1 + 1) / (tf + norm)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+        deletes: dict[str, set[str]] = {}
+        for term in self._vocabulary:
+            if len(term) >= MIN_FUZZY_LENGTH - 1:
+                for variant in _deletions(term):
+                    deletes.setdefault(variant, set()).add(term)
+        self._deletes = {variant: tuple(sorted(terms)) for variant, terms in deletes.items()}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def expand(self, token: str, prefix: bool = True) -> dict[str, float]:
+        """
+        Vocabulary terms matched by a query token, with their weights.
+
+        Args:
+            token: Normalized query token
+            prefix: Also match terms starting with ``token``
+
+        Returns:
+            Term → weight (1 exact, ``PREFIX_WEIGHT``, ``FUZZY_WEIGHT``)
+        """
+        matches: dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = 1.0
+
+        if prefix and len(token) >= MIN_PREFIX_LENGTH:
+            start = bisect_left(self._vocabulary, token)
+            for term in self._vocabulary[start:start + MAX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                matches.setdefault(term, PREFIX_WEIGHT)
+
+        if len(token) >= MIN_FUZZY_LENGTH:
+            candidates = set(self._deletes.get(token, ()))
+            for variant in _deletions(token):
+                if variant in self._postings:
+                    candidates.add(variant)
+                candidates.update(self._deletes.get(variant, ()))
+            for term in candidates:
+                if term not in matches and _within_one_edit(token, term):
+                    matches[term] = FUZZY_WEIGHT
+        return matches
+
+    def search(self, query: str, kind: str | None = None, limit: int | None = 10) -> list[SearchHit]:
+        """
+        Ranked documents matching every token of ``query``.
+
+        The last token is matched as a prefix (the user may still be typing);
+        earlier tokens match exactly or within one edit.
+
+        Args:
+            query: Free text
+            kind: Restrict to "initiative" or "sensor"
+            limit: Maximum hits (None for all)
+
+        Returns:
+            Hits by descending score (ties by title)
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        scores: dict[int, float] | None = None
+        for position, token in enumerate(tokens):
+            token_scores: dict[int, float] = {}
+            for term, weight in self.expand(token, prefix=position == len(tokens) - 1).items():
+                for doc_id, score in self._postings[term].items():
+                    weighted = weight * score
+                    if weighted > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = weighted
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_id: s + token_scores[doc_id] for doc_id, s in scores.items() if doc_id in token_scores}
+            if not scores:
+                return []
+
+        hits = []
+        for doc_id, score in scores.items():
+            document = self.documents[doc_id]
+            if kind is None or document.kind == kind:
+                hits.append(SearchHit(document.kind, document.key, document.title, round(score, 6)))
+        hits.sort(key=lambda hit: (-hit.score, hit.title))
+        return hits if limit is None else hits[:limit]
+
+
+def build_search_index(
+    df: pd.DataFrame,
+    metadata: Mapping[str, Any] | None = None,
+    sensors: Mapping[str, Any] | None = None,
+) -> SearchIndex:
+    """Index of the initiatives (and sensors, when given)."""
+    return SearchIndex(initiative_documents(df, metadata) + sensor_documents(sensors or {}))
+
+
+_cache_lock = threading.Lock()
+_cache: OrderedDict[str, SearchIndex] = OrderedDict()
+
+
+def get_search_index(snapshot: Any) -> SearchIndex:
+    """
+    Search index of a data-plane snapshot, built once per data version.
+
+    Args:
+        snapshot: ``DataSnapshot`` (``version``, ``initiatives``,
+            ``metadata`` and ``sensors``)
+
+    Returns:
+        Shared, immutable SearchIndex
+    """
+    with _cache_lock:
+        index = _cache.get(snapshot.version)
+        if index is not None:
+            _cache.move_to_end(snapshot.version)
+            return index
+
+    index = build_search_index(snapshot.initiatives, snapshot.metadata, snapshot.sensors)
+    with _cache_lock:
+        index = _cache.setdefault(snapshot.version, index)
+        while len(_cache) > MAX_CACHED_INDEXES:
+            _cache.popitem(last=False)
+    return index
+
+
+def benchmark_search_index(index: SearchIndex, queries: Iterable[str], repeats: int = 1000) -> dict[str, float]:
+    """Microseconds per query for each of ``queries``."""
+    report = {}
+    for query in queries:
+        started = time.perf_counter()
+        for _ in range(repeats):
+            index.search(query)
+        report[query] = round((time.perf_counter() - started) * 1e6 / repeats, 1)
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+    from scripts.utilities.data_plane import get_data_plane
+
+    search_index = get_search_index(get_data_plane().snapshot())
+    print(f"{len(search_index)} documents")
+    print(benchmark_search_index(search_index, ["sentinel", "senti", "mapbiomas", "landsta", "deep learning crop"]))
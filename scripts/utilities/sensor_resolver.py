@@ -0,0 +1,190 @@
+"""
+Sensor Resolver
+===============
+
+Resolves the free-text sensor fields of initiatives to entries of
+``sensors_metadata.jsonc``.
+
+The overview used to loop over every sensor on each render, comparing the
+initiative's sensor text with each key and display name by substring.
+``SensorResolver`` is built once per data version and answers from:
+
+- a hash map of normalized aliases (sensor key, display name, family and
+  platform name; stronger aliases win when two sensors share one);
+- alias lookups for every contiguous token span of the text, so
+  "Landsat 8 and Sentinel-2" resolves to the first sensor it names;
+- a character-trigram index for fuzzy matches (Dice similarity of at least
+  ``FUZZY_THRESHOLD``), e.g. a misspelled or reworded sensor name.
+
+The resolution of every initiative is computed when the resolver is built,
+so a rerun of the overview never scans the sensor metadata.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+import threading
+from typing import Any
+
+import pandas as pd
+
+from .search_index import tokenize
+
+SENSOR_FIELDS = ("Sensor", "Primary_Sensor", "Sensors_Used", "Data_Source")
+EMPTY_VALUES = frozenset({"n/a", "none", "-", ""})
+ALIAS_FIELDS = ("key", "display_name", "sensor_family", "platform_name")
+FUZZY_THRESHOLD = 0.5
+MAX_SPAN_TOKENS = 6
+MAX_CACHED_RESOLVERS = 2
+
+
+def normalize_alias(text: Any) -> str:
+    """Alias form of ``text``: lowercase, accent-free tokens joined by spaces."""
+    return " ".join(tokenize(text))
+
+
+def _trigrams(alias: str) -> set[str]:
+    padded = f"  {alias} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class SensorResolution:
+    """Sensor text of an initiative and the sensor key it resolves to."""
+
+    sensor_info: str | None
+    sensor_key: str | None
+    match: str | None = None  # "alias", "span" or "fuzzy"
+
+
+def sensor_info_of(row: Mapping[str, Any] | pd.Series) -> str | None:
+    """First non-empty sensor field of an initiative row (as the overview shows it)."""
+    for field in SENSOR_FIELDS:
+        value = row.get(field) if hasattr(row, "get") else None
+        if value is not None and pd.notna(value) and str(value).strip():
+            text = str(value).strip()
+            return None if text.lower() in EMPTY_VALUES else text
+    return None
+
+
+class SensorResolver:
+    """
+    Alias and trigram index over sensor metadata.
+
+    Args:
+        sensors: ``sensors_metadata.jsonc`` content (key → sensor dict)
+        initiatives: Initiatives frame whose resolutions are precomputed
+    """
+
+    def __init__(self, sensors: Mapping[str, Any], initiatives: pd.DataFrame | None = None):
+        self.sensors = sensors
+        self._aliases: dict[str, str] = {}
+        for field in ALIAS_FIELDS:
+            for key, sensor in sensors.items():
+                if not isinstance(sensor, Mapping):
+                    continue
+                value = key if field == "key" else sensor.get(field)
+                alias = normalize_alias(value)
+                if alias:
+                    self._aliases.setdefault(alias, key)
+
+        self._trigram_index: dict[str, list[str]] = {}
+        self._alias_trigrams: dict[str, set[str]] = {}
+        for alias in self._aliases:
+            grams = _trigrams(alias)
+            self._alias_trigrams[alias] = grams
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(alias)
+
+        self.resolutions: dict[str, SensorResolution] = {}
+        if initiatives is not None and not initiatives.empty and "Name" in initiatives.columns:
+            for row in initiatives.to_dict("records"):
+                self.resolutions[str(row["Name"])] = self.resolve_row(row)
+
+    def _span_match(self, tokens: list[str]) -> str | None:
+        # Longest alias first at each position, earliest position first
+        for start in range(len(tokens)):
+            for stop in range(min(len(tokens), start + MAX_SPAN_TOKENS), start, -1):
+                key = self._aliases.get(" ".join(tokens[start:stop]))
+                if key is not None:
+                    return key
+        return None
+
+    def _fuzzy_match(self, alias: str) -> str | None:
+        grams = _trigrams(alias)
+        shared: dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._trigram_index.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        best, best_score = None, FUZZY_THRESHOLD
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._alias_trigrams[candidate]))
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = candidate, score
+        return self._aliases[best] if best is not None else None
+
+    def resolve(self, text: Any) -> tuple[str | None, str | None]:
+        """
+        Sensor key named by ``text``.
+
+        Returns:
+            ``(sensor_key, match)``; ``(None, None)`` when nothing matches
+        """
+        alias = normalize_alias(text)
+        if not alias:
+            return None, None
+        key = self._aliases.get(alias)
+        if key is not None:
+            return key, "alias"
+        key = self._span_match(alias.split())
+        if key is not None:
+            return key, "span"
+        key = self._fuzzy_match(alias)
+        if key is not None:
+            return key, "fuzzy"
+        return None, None
+
+    def resolve_row(self, row: Mapping[str, Any] | pd.Series) -> SensorResolution:
+        """Resolution of an initiative row (see ``sensor_info_of``)."""
+        sensor_info = sensor_info_of(row)
+        if sensor_info is None:
+            return SensorResolution(None, None)
+        key, match = self.resolve(sensor_info)
+        return SensorResolution(sensor_info, key, match)
+
+    def for_initiative(self, row: Mapping[str, Any] | pd.Series) -> SensorResolution:
+        """Precomputed resolution of an initiative, resolving unknown rows on the fly."""
+        resolution = self.resolutions.get(str(row.get("Name")))
+        return resolution if resolution is not None else self.resolve_row(row)
+
+
+_cache_lock = threading.Lock()
+_cache: OrderedDict[str, SensorResolver] = OrderedDict()
+
+
+def get_sensor_resolver(snapshot: Any) -> SensorResolver:
+    """
+    Sensor resolver of a data-plane snapshot, built once per data version.
+
+    Args:
+        snapshot: ``DataSnapshot`` (``version``, ``initiatives``, ``sensors``)
+
+    Returns:
+        Shared resolver with every initiative resolved
+    """
+    with _cache_lock:
+        resolver = _cache.get(snapshot.version)
+        if resolver is not None:
+            _cache.move_to_end(snapshot.version)
+            return resolver
+
+    resolver = SensorResolver(snapshot.sensors, snapshot.initiatives)
+    with _cache_lock:
+        resolver = _cache.setdefault(snapshot.version, resolver)
+        while len(_cache) > MAX_CACHED_RESOLVERS:
+            _cache.popitem(last=False)
+    return resolver
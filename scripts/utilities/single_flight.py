@@ -0,0 +1,207 @@
+"""
+Single-Flight Call Coalescing
+=============================
+
+Collapses concurrent calls of the same expensive loader into one execution.
+
+When many sessions start at once (e.g. right after a redeploy) each one
+used to parse the same JSON files and rebuild the same DataFrames. A
+``single_flight`` function keys every call by function name and an argument
+fingerprint; while a call for that key is running, other callers wait for
+it and receive its result instead of computing it again. Nothing is cached
+once the call returns, so this sits in front of (not instead of) the
+regular caches.
+
+Waiters receive a deep copy of the result by default, so sessions never
+share a mutable object through this layer. ``SingleFlightGroup`` is the one
+in-flight registry of the project: ``SmartCacheManager`` uses its
+``claim``/``resolve`` pair for cache misses and background revalidation.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+import copy
+from dataclasses import asdict, dataclass
+import functools
+import hashlib
+import pickle
+import threading
+from typing import Any
+
+
+@dataclass
+class FlightStats:
+    """Counters of one single-flight function."""
+
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+    errors: int = 0
+
+
+def argument_fingerprint(*args: Any, **kwargs: Any) -> str:
+    """
+    Content fingerprint of call arguments.
+
+    Equal arguments built independently by different sessions (e.g. the
+    same JSON parsed twice) get the same fingerprint.
+
+    Returns:
+        Hex digest of the pickled arguments (``repr`` when unpicklable)
+    """
+    try:
+        payload = pickle.dumps((args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        payload = repr((args, sorted(kwargs.items()))).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class SingleFlightGroup:
+    """Tracks in-flight calls and per-function coalescing metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, Future] = {}
+        self._stats: dict[str, FlightStats] = {}
+
+    def claim(self, name: str, key: Hashable) -> tuple[Future, bool]:
+        """
+        Registers a call of ``key``.
+
+        The owner must finish the call with ``resolve``; other callers wait
+        on the returned future.
+
+        Args:
+            name: Function name used for metrics
+            key: Call key
+
+        Returns:
+            (future of the call, whether the caller owns the execution)
+        """
+        with self._lock:
+            stats = self._stats.setdefault(name, FlightStats())
+            stats.calls += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                stats.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            stats.executions += 1
+            return future, True
+
+    def resolve(self, name: str, key: Hashable, future: Future, fn: Callable[[], Any]) -> Any:
+        """
+        Runs ``fn`` for a claimed key and hands the outcome to the waiters.
+
+        Returns:
+            Result of ``fn`` (exceptions are re-raised after reaching the waiters)
+        """
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._stats[name].errors += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def do(
+        self,
+        name: str,
+        key: Hashable,
+        fn: Callable[[], Any],
+        copy_for_waiters: bool = True,
+    ) -> Any:
+        """
+        Runs ``fn`` unless a call with the same key is already running.
+
+        Args:
+            name: Function name used for metrics
+            key: Call key (function and argument fingerprint)
+            fn: Computation without arguments
+            copy_for_waiters: Give waiting callers a deep copy of the result
+
+        Returns:
+            Result of ``fn`` (own or shared execution)
+        """
+        future, owner = self.claim(name, key)
+        if owner:
+            return self.resolve(name, key, future, fn)
+        result = future.result()
+        return copy.deepcopy(result) if copy_for_waiters else result
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Counters per function name."""
+        with self._lock:
+            return {name: asdict(stats) for name, stats in self._stats.items()}
+
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        with self._lock:
+            return len(self._inflight)
+
+    def reset_stats(self) -> None:
+        """Zeroes every counter."""
+        with self._lock:
+            self._stats.clear()
+
+
+_group = SingleFlightGroup()
+
+
+def get_single_flight_group() -> SingleFlightGroup:
+    """Returns the process-wide single-flight group."""
+    return _group
+
+
+def get_single_flight_stats() -> dict[str, dict[str, int]]:
+    """Coalescing counters of every single-flight function."""
+    return _group.stats()
+
+
+def single_flight(
+    name: str | None = None,
+    key: Callable[..., Hashable] | None = None,
+    copy_for_waiters: bool = True,
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator coalescing concurrent calls with equal arguments.
+
+    Args:
+        name: Metrics name (defaults to ``module.qualname``)
+        key: Receives the call arguments and returns the call key
+            (defaults to ``argument_fingerprint``)
+        copy_for_waiters: Give waiting callers a deep copy of the result
+
+    Examples:
+        >>> @single_flight()
+        ... def load_data(path): ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        flight_name = name or f"{func.__module__}.{func.__qualname__}"
+        make_key = key or argument_fingerprint
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call_key = (flight_name, make_key(*args, **kwargs))
+            return _group.do(
+                flight_name,
+                call_key,
+                lambda: func(*args, **kwargs),
+                copy_for_waiters,
+            )
+
+        return wrapper
+
+    return decorator
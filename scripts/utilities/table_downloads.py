@@ -0,0 +1,283 @@
+"""
+Lazy Table Downloads
+====================
+
+Download buttons for DataFrames that do not serialize anything on reruns.
+
+The payload is produced only when the user clicks (Streamlit's deferred
+``data`` callable, or a "Prepare" step on older Streamlit versions), written
+in row chunks and cached by frame fingerprint, so repeated downloads of the
+same table are free. Large frames are also offered as Parquet.
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+import hashlib
+import io
+from pathlib import Path
+import re
+import threading
+from typing import BinaryIO
+
+import pandas as pd
+
+# Rows written per chunk when streaming CSV output
+CHUNK_ROWS = 50_000
+# Frames with at least this many rows are also offered as Parquet
+PARQUET_ROW_THRESHOLD = 50_000
+# Upper bound for the in-memory payload cache
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+FORMATS = {
+    "csv": ("📄 CSV", "text/csv"),
+    "xlsx": (
+        "📊 Excel",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+    "parquet": ("🧱 Parquet", "application/vnd.apache.parquet"),
+}
+
+_payload_cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_payload_cache_bytes = 0
+_payload_cache_lock = threading.Lock()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Return a content hash of a DataFrame (values, columns and dtypes).
+
+    Args:
+        df: DataFrame to fingerprint
+
+    Returns:
+        Hex digest identifying the frame contents
+    """
+    digest = hashlib.sha1()
+    digest.update(repr(list(df.columns)).encode("utf-8"))
+    digest.update(repr([str(dtype) for dtype in df.dtypes]).encode("utf-8"))
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=False)
+        digest.update(row_hashes.to_numpy().tobytes())
+    except TypeError:
+        # Unhashable cells (lists/dicts): fall back to their text form
+        digest.update(df.astype(str).to_csv(index=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Yield a DataFrame as UTF-8 CSV, ``chunk_rows`` rows at a time.
+
+    Args:
+        df: DataFrame to serialize
+        chunk_rows: Rows per chunk
+
+    Yields:
+        Encoded CSV chunks (the first one includes the header)
+    """
+    if df.empty:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start : start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def write_frame(
+    df: pd.DataFrame, target: str | Path | BinaryIO, file_format: str = "csv"
+) -> None:
+    """
+    Write a DataFrame to a path or binary buffer, streaming CSV in chunks.
+
+    Args:
+        df: DataFrame to write
+        target: File path or writable binary buffer
+        file_format: ``csv``, ``xlsx``/``excel``, ``parquet`` or ``json``
+
+    Raises:
+        ValueError: For unsupported formats
+    """
+    file_format = file_format.lower()
+    if file_format == "excel":
+        file_format = "xlsx"
+
+    if file_format == "csv":
+        if isinstance(target, (str, Path)):
+            with open(target, "wb") as handle:
+                for chunk in iter_csv_chunks(df):
+                    handle.write(chunk)
+        else:
+            for chunk in iter_csv_chunks(df):
+                target.write(chunk)
+    elif file_format == "xlsx":
+        df.to_excel(target, index=False)
+    elif file_format == "parquet":
+        df.to_parquet(target, index=False)
+    elif file_format == "json":
+        df.to_json(target, orient="records", indent=2)
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+
+def serialize_frame(df: pd.DataFrame, file_format: str = "csv") -> bytes:
+    """
+    Serialize a DataFrame, reusing the cached payload for identical frames.
+
+    Args:
+        df: DataFrame to serialize
+        file_format: ``csv``, ``xlsx`` or ``parquet``
+
+    Returns:
+        File contents
+    """
+    global _payload_cache_bytes
+
+    key = (frame_fingerprint(df), file_format)
+    with _payload_cache_lock:
+        if key in _payload_cache:
+            _payload_cache.move_to_end(key)
+            return _payload_cache[key]
+
+    buffer = io.BytesIO()
+    write_frame(df, buffer, file_format)
+    payload = buffer.getvalue()
+
+    with _payload_cache_lock:
+        if len(payload) <= MAX_CACHE_BYTES:
+            _payload_cache[key] = payload
+            _payload_cache_bytes += len(payload)
+            while _payload_cache_bytes > MAX_CACHE_BYTES:
+                _old_key, old_payload = _payload_cache.popitem(last=False)
+                _payload_cache_bytes -= len(old_payload)
+    return payload
+
+
+def clear_download_cache() -> None:
+    """Drop every cached payload."""
+    global _payload_cache_bytes
+    with _payload_cache_lock:
+        _payload_cache.clear()
+        _payload_cache_bytes = 0
+
+
+def available_formats(df: pd.DataFrame) -> list[str]:
+    """
+    Return the download formats offered for a frame.
+
+    Excel needs ``openpyxl`` and Parquet needs ``pyarrow``; Parquet is only
+    offered for frames of at least ``PARQUET_ROW_THRESHOLD`` rows.
+    """
+    formats = ["csv"]
+    try:
+        import openpyxl  # noqa: F401
+
+        formats.append("xlsx")
+    except ImportError:
+        pass
+    if len(df) >= PARQUET_ROW_THRESHOLD:
+        try:
+            import pyarrow  # noqa: F401
+
+            formats.append("parquet")
+        except ImportError:
+            pass
+    return formats
+
+
+def _supports_deferred_data() -> bool:
+    """True when ``st.download_button`` accepts a callable ``data`` argument."""
+    try:
+        from streamlit.elements.widgets.button import DownloadButtonDataType
+
+        return "Callable" in str(DownloadButtonDataType)
+    except Exception:
+        return False
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^\w\-]+", "_", text.strip().lower()).strip("_") or "table"
+
+
+def lazy_download_button(
+    payload: Callable[[], bytes],
+    label: str,
+    file_name: str,
+    mime: str,
+    key: str,
+    **button_kwargs,
+) -> None:
+    """
+    Download button whose contents are produced only on click.
+
+    Args:
+        payload: Zero-argument callable returning the file contents
+        label: Button label
+        file_name: Downloaded file name
+        mime: MIME type
+        key: Unique widget key
+        **button_kwargs: Extra ``st.download_button`` arguments
+    """
+    import streamlit as st
+
+    if _supports_deferred_data():
+        st.download_button(
+            label, data=payload, file_name=file_name, mime=mime, key=key,
+            **button_kwargs,
+        )
+        return
+
+    # Older Streamlit: explicit prepare step, result kept for this session only
+    prepared_key = f"{key}_prepared"
+    if st.button(f"{label} (prepare)", key=f"{key}_prepare"):
+        st.session_state[prepared_key] = payload()
+    if prepared_key in st.session_state:
+        st.download_button(
+            label,
+            data=st.session_state[prepared_key],
+            file_name=file_name,
+            mime=mime,
+            key=key,
+            **button_kwargs,
+        )
+
+
+def render_table_downloads(
+    df: pd.DataFrame,
+    base_name: str,
+    key_prefix: str,
+    formats: list[str] | None = None,
+    **button_kwargs,
+) -> None:
+    """
+    Render one lazy download button per available format.
+
+    Args:
+        df: DataFrame to offer for download
+        base_name: File name without extension
+        key_prefix: Unique widget key prefix
+        formats: Formats to offer (default: ``available_formats(df)``)
+        **button_kwargs: Extra ``st.download_button`` arguments
+    """
+    import streamlit as st
+
+    if df is None or df.empty:
+        return
+
+    formats = formats or available_formats(df)
+    stem = _slug(base_name)
+    columns = st.columns(len(formats))
+    for column, file_format in zip(columns, formats):
+        label, mime = FORMATS[file_format]
+        with column:
+            lazy_download_button(
+                lambda file_format=file_format: serialize_frame(df, file_format),
+                f"{label}",
+                f"{stem}.{file_format}",
+                mime,
+                key=f"{key_prefix}_{file_format}_download",
+                **button_kwargs,
+            )
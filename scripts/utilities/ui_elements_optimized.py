@@ -12,6 +12,11 @@ Date: 2025
 import plotly.graph_objects as go
 import streamlit as st
 
+from scripts.utilities.table_downloads import (
+    lazy_download_button,
+    render_table_downloads,
+)
+
 
 def simple_download_button(
     fig: go.Figure, filename: str = "chart", key_prefix: str = "download"
@@ -19,13 +24,33 @@ def simple_download_button(
     """
     Simple, modern download button with minimal customization.
 
+    The image is only rendered when the button is clicked.
+
     Args:
         fig: Plotly figure to download
         filename: Base filename for download
         key_prefix: Unique key prefix for widget
     """
-    if fig and st.button(f"📥 Download {filename}", key=f"{key_prefix}_btn"):
-        st.success("Chart ready for download! Use browser context menu to save.")
+    if not fig:
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        lazy_download_button(
+            lambda: fig.to_image(format="png"),
+            f"📥 Download {filename} (PNG)",
+            f"{filename}.png",
+            "image/png",
+            key=f"{key_prefix}_png",
+        )
+    with col2:
+        lazy_download_button(
+            lambda: fig.to_html(include_plotlyjs="cdn").encode("utf-8"),
+            "🌐 HTML",
+            f"{filename}.html",
+            "text/html",
+            key=f"{key_prefix}_html",
+        )
 
 
 def modern_metric_cards(metrics: dict, columns: int = 4) -> None:
@@ -164,7 +189,7 @@ def loading_placeholder(message: str = "Loading...") -> None:
 def data_table_modern(df, title: str = "", show_download: bool = False) -> None:
     """
     Display data in modern table format with optional download.
-    CSV downloads disabled per user request.
+    Downloads are disabled by default and serialized only on click.
 
     Args:
         df: DataFrame to display
@@ -177,24 +202,8 @@ def data_table_modern(df, title: str = "", show_download: bool = False) -> None:
     st.dataframe(df, use_container_width=True, hide_index=True)
 
     if show_download and not df.empty:
-        col1, col2, col3 = st.columns([1, 1, 2])
-        with col1:
-            csv = df.to_csv(index=False)
-            st.download_button(
-                "📄 Download CSV",
-                csv,
-                file_name=f"{title.lower().replace(' ', '_')}.csv",
-                mime="text/csv",
-            )
-        with col2:
-            excel_buffer = df.to_excel(index=False)
-            if excel_buffer:
-                st.download_button(
-                    "📊 Download Excel",
-                    excel_buffer,
-                    file_name=f"{title.lower().replace(' ', '_')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                )
+        base_name = title.lower().replace(" ", "_") or "table"
+        render_table_downloads(df, base_name, key_prefix=f"table_{base_name}")
 
 
 def setup_download_form(
@@ -0,0 +1,531 @@
+"""
+Zonal Statistics
+================
+
+Per-state and per-mesoregion class areas of local LULC rasters (MapBiomas
+and other GeoTIFF exports), computed without holding a raster in memory.
+
+- The raster is read in tiles (``TILE_SIZE`` pixels, aligned to its
+  blocks); GeoTIFFs are read through rasterio, which is optional and only
+  needed for them. ``ArrayRaster`` wraps numpy arrays and ``.npy`` memmaps.
+- State polygons are rasterized once per grid (pixel centre rule) into a
+  ``uint8`` zone raster kept as a ``.npy`` memmap in the cache directory.
+  Mesoregions are unions of states, so their statistics are rolled up from
+  the state table instead of being rasterized again.
+- Each tile is counted with a single ``np.bincount`` over
+  ``zone * n_classes + class`` (pixel counts, and pixel areas as weights).
+- Tiles are fanned out over a process pool; workers return sparse counts
+  that the parent adds up.
+- Results are cached per (raster hash, zone set) as a columnar ``.npz``
+  table (``zone``, ``class_value``, ``pixels``, ``area_km2``) with the
+  raster label, initiative and year in its metadata, which the Initiative
+  Analysis pages list and chart (``list_zonal_tables``).
+
+Usage:
+    python -m scripts.utilities.zonal_stats <raster.tif> --initiative MapBiomas --year 2022
+
+Author: LANDAGRI-B Project Team
+Date: 2025
+"""
+
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+ZONAL_CACHE_DIR = PROJECT_ROOT / "data" / "processed" / "zonal_stats"
+TILE_SIZE = 1024  # pixels per tile side
+HASH_CHUNK_BYTES = 8 << 20
+MAX_ZONES = 255  # zone ids are stored as uint8 (0 = outside every zone)
+EARTH_RADIUS_KM = 6371.0088
+LAYERS = ("state", "mesoregion")
+TABLE_COLUMNS = ("zone", "class_value", "pixels", "area_km2")
+
+Window = tuple[int, int, int, int]  # row offset, column offset, rows, columns
+Transform = tuple[float, float, float, float, float, float]  # rasterio Affine order (a, b, c, d, e, f)
+
+
+def _class_count(dtype: np.dtype) -> int:
+    """Number of class values of an integer raster dtype."""
+    dtype = np.dtype(dtype)
+    if dtype.kind not in "ui" or dtype.itemsize > 2:
+        raise ValueError(f"Class rasters must be 8 or 16-bit integers, got {dtype}")
+    return 1 << (dtype.itemsize * 8 - (dtype.kind == "i"))
+
+
+class ArrayRaster:
+    """
+    Raster backed by a numpy array (or a ``.npy`` memmap).
+
+    Args:
+        array: 2-D integer class array
+        transform: Affine transform (a, b, c, d, e, f), north-up
+        nodata: Value ignored when counting
+        geographic: Whether coordinates are lon/lat degrees (else metres)
+        block_shape: Natural read block of the array
+    """
+
+    def __init__(
+        self,
+        array: np.ndarray,
+        transform: Sequence[float],
+        nodata: int | None = None,
+        geographic: bool = True,
+        block_shape: tuple[int, int] = (256, 256),
+    ):
+        if array.ndim != 2:
+            raise ValueError("Raster arrays must be 2-D")
+        self.array = array
+        self.transform: Transform = tuple(float(v) for v in transform[:6])
+        self.nodata = nodata
+        self.geographic = geographic
+        self.block_shape = block_shape
+        self.label = Path(array.filename).name if isinstance(array, np.memmap) and array.filename else "array"
+
+    @classmethod
+    def from_npy(cls, path: str | Path, transform: Sequence[float], **kwargs: Any) -> "ArrayRaster":
+        """Memory-mapped ``.npy`` raster."""
+        return cls(np.load(path, mmap_mode="r"), transform, **kwargs)
+
+    def __reduce__(self):
+        # Workers reopen memmaps instead of receiving a copy of the data
+        if isinstance(self.array, np.memmap) and self.array.filename:
+            return (_reopen_npy, (self.array.filename, self.transform, self.nodata, self.geographic, self.block_shape))
+        return (ArrayRaster, (self.array, self.transform, self.nodata, self.geographic, self.block_shape))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.array.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.array.dtype
+
+    def read(self, window: Window) -> np.ndarray:
+        row, col, rows, cols = window
+        return np.asarray(self.array[row:row + rows, col:col + cols])
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha256(repr((self.shape, str(self.dtype), self.transform, self.nodata)).encode())
+        rows_per_chunk = max(1, HASH_CHUNK_BYTES // max(1, self.array.strides[0]))
+        for row in range(0, self.shape[0], rows_per_chunk):
+            digest.update(np.ascontiguousarray(self.array[row:row + rows_per_chunk]).tobytes())
+        return digest.hexdigest()
+
+
+def _reopen_npy(path, transform, nodata, geographic, block_shape) -> ArrayRaster:
+    return ArrayRaster.from_npy(path, transform, nodata=nodata, geographic=geographic, block_shape=block_shape)
+
+
+_file_hash_lock = threading.Lock()
+_file_hashes: dict[tuple[str, int, int], str] = {}
+
+
+def file_hash(path: str | Path) -> str:
+    """SHA-256 of a file, streamed in chunks and memoized per (path, size, mtime)."""
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _file_hash_lock:
+        if key in _file_hashes:
+            return _file_hashes[key]
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    with _file_hash_lock:
+        return _file_hashes.setdefault(key, digest.hexdigest())
+
+
+class GeoTiffRaster:
+    """
+    GeoTIFF (first band) read window by window through rasterio.
+
+    Raises:
+        ImportError: When rasterio is not installed
+    """
+
+    def __init__(self, path: str | Path):
+        try:
+            import rasterio
+        except ImportError as e:
+            raise ImportError("rasterio is required to read GeoTIFF rasters") from e
+
+        self.path = Path(path)
+        self.label = self.path.name
+        with rasterio.open(self.path) as src:
+            self.shape = (src.height, src.width)
+            self.dtype = np.dtype(src.dtypes[0])
+            self.transform = tuple(src.transform)[:6]
+            self.nodata = None if src.nodata is None else int(src.nodata)
+            self.geographic = bool(src.crs and src.crs.is_geographic)
+            self.block_shape = src.block_shapes[0]
+        self._src: Any = None
+
+    def __reduce__(self):
+        return (GeoTiffRaster, (self.path,))
+
+    def read(self, window: Window) -> np.ndarray:
+        from rasterio.windows import Window as RioWindow
+
+        if self._src is None:
+            import rasterio
+
+            self._src = rasterio.open(self.path)
+        row, col, rows, cols = window
+        return self._src.read(1, window=RioWindow(col, row, cols, rows))
+
+    def fingerprint(self) -> str:
+        return file_hash(self.path)
+
+
+def open_raster(path: str | Path) -> GeoTiffRaster:
+    """Open a local raster export (GeoTIFF)."""
+    return GeoTiffRaster(path)
+
+
+@dataclass(frozen=True)
+class ZoneSet:
+    """Named polygons (WKB) rasterized as zones 1..n."""
+
+    name: str
+    codes: tuple[str, ...]
+    wkb: tuple[bytes, ...]
+
+    def __post_init__(self):
+        if len(self.codes) != len(self.wkb) or not self.codes:
+            raise ValueError("A zone set needs one geometry per code")
+        if len(self.codes) > MAX_ZONES:
+            raise ValueError(f"At most {MAX_ZONES} zones are supported, got {len(self.codes)}")
+
+    @classmethod
+    def from_geometries(cls, name: str, geometries: Mapping[str, Any]) -> "ZoneSet":
+        codes = tuple(sorted(geometries))
+        return cls(name, codes, tuple(geometries[code].wkb for code in codes))
+
+    @property
+    def fingerprint(self) -> str:
+        digest = hashlib.sha256(self.name.encode())
+        for code, wkb in zip(self.codes, self.wkb):
+            digest.update(code.encode() + b"\0" + wkb)
+        return digest.hexdigest()
+
+
+def state_zones(store: Any = None, level: str = "full") -> ZoneSet:
+    """
+    UF zone set, from the geometry store when built (else approximate boxes).
+
+    Args:
+        store: ``GeometryStore`` (default: the project archive, if present)
+        level: Store level of the outlines
+    """
+    from . import geometry_store
+    from .footprint_index import state_geometries
+
+    store = store if store is not None else geometry_store.get_geometry_store()
+    name = "state" if store is not None else "state-approx"
+    return ZoneSet.from_geometries(name, state_geometries(store, level if store is not None else "full"))
+
+
+def tiles(shape: tuple[int, int], block_shape: tuple[int, int], tile_size: int = TILE_SIZE) -> Iterator[Window]:
+    """Windows covering a raster, aligned to its blocks."""
+    height, width = shape
+    tile_rows = max(block_shape[0], tile_size // block_shape[0] * block_shape[0])
+    tile_cols = max(block_shape[1], tile_size // block_shape[1] * block_shape[1])
+    for row in range(0, height, tile_rows):
+        for col in range(0, width, tile_cols):
+            yield row, col, min(tile_rows, height - row), min(tile_cols, width - col)
+
+
+def _pixel_centres(transform: Transform, window: Window) -> tuple[np.ndarray, np.ndarray]:
+    a, _, c, _, e, f = transform
+    row, col, rows, cols = window
+    xs = c + (col + np.arange(cols) + 0.5) * a
+    ys = f + (row + np.arange(rows) + 0.5) * e
+    return xs, ys
+
+
+def _row_areas_km2(transform: Transform, window: Window, geographic: bool) -> np.ndarray:
+    """Pixel area (km²) of every row of a window."""
+    a, _, _, _, e, _ = transform
+    _, ys = _pixel_centres(transform, window)
+    if not geographic:
+        return np.full(len(ys), abs(a * e) / 1e6)
+    scale = (math.pi / 180 * EARTH_RADIUS_KM) ** 2
+    return abs(a * e) * scale * np.cos(np.radians(ys))
+
+
+class _TileJob:
+    """State shared by the tiles of one run (one per worker process)."""
+
+    def __init__(self, raster: Any, zones: ZoneSet, zone_path: Path, build_zones: bool):
+        self.raster = raster
+        self.zones = zones
+        self.zone_path = zone_path
+        self.build_zones = build_zones
+        self.n_classes = _class_count(raster.dtype)
+        self._geometries: list[Any] | None = None
+        self._tree: Any = None
+        self._zone_array: np.ndarray | None = None
+
+    def _zone_index(self):
+        if self._tree is None:
+            from shapely import STRtree, from_wkb, prepare
+
+            self._geometries = list(from_wkb(list(self.zones.wkb)))
+            for geometry in self._geometries:
+                prepare(geometry)
+            self._tree = STRtree(self._geometries)
+        return self._geometries, self._tree
+
+    def rasterize(self, window: Window) -> np.ndarray:
+        """Zone ids (1-based, 0 outside) of the pixel centres of a window."""
+        from shapely import box, contains_xy
+
+        geometries, tree = self._zone_index()
+        xs, ys = _pixel_centres(self.raster.transform, window)
+        out = np.zeros((len(ys), len(xs)), dtype=np.uint8)
+        tile_box = box(xs.min(), ys.min(), xs.max(), ys.max())
+        for i in sorted(tree.query(tile_box, predicate="intersects")):
+            geometry = geometries[i]
+            if geometry.contains(tile_box):
+                out[out == 0] = i + 1
+                continue
+            x0, y0, x1, y1 = geometry.bounds
+            cols = np.flatnonzero((xs >= x0) & (xs <= x1))
+            rows = np.flatnonzero((ys >= y0) & (ys <= y1))
+            if not len(cols) or not len(rows):
+                continue
+            rs, cs = slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1)
+            grid_x, grid_y = np.meshgrid(xs[cs], ys[rs])
+            block = out[rs, cs]
+            block[contains_xy(geometry, grid_x, grid_y) & (block == 0)] = i + 1
+        return out
+
+    def zone_tile(self, window: Window) -> np.ndarray:
+        row, col, rows, cols = window
+        if self.build_zones:
+            zones = self.rasterize(window)
+            target = np.load(self.zone_path, mmap_mode="r+")
+            target[row:row + rows, col:col + cols] = zones
+            target.flush()
+            return zones
+        if self._zone_array is None:
+            self._zone_array = np.load(self.zone_path, mmap_mode="r")
+        return np.asarray(self._zone_array[row:row + rows, col:col + cols])
+
+    def count(self, window: Window) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse (cell, pixels, area) counts of a window; cell = zone index * n_classes + class."""
+        zones = self.zone_tile(window)
+        values = self.raster.read(window)
+        valid = zones > 0
+        if self.raster.nodata is not None:
+            valid &= values != self.raster.nodata
+        if values.dtype.kind == "i":
+            valid &= values >= 0
+        cells = (zones[valid].astype(np.int64) - 1) * self.n_classes + values[valid]
+        areas = np.broadcast_to(_row_areas_km2(self.raster.transform, window, self.raster.geographic)[:, None], values.shape)
+        size = len(self.zones.codes) * self.n_classes
+        pixels = np.bincount(cells, minlength=size)
+        area = np.bincount(cells, weights=areas[valid], minlength=size)
+        nonzero = np.flatnonzero(pixels)
+        return nonzero, pixels[nonzero], area[nonzero]
+
+
+_worker_job: _TileJob | None = None
+
+
+def _init_worker(job: _TileJob) -> None:
+    global _worker_job
+    _worker_job = job
+
+
+def _count_in_worker(window: Window) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _worker_job.count(window)
+
+
+def _grid_fingerprint(raster: Any) -> str:
+    return hashlib.sha256(repr((tuple(raster.shape), tuple(raster.transform))).encode()).hexdigest()
+
+
+def _table_path(cache_dir: Path, raster_hash: str, zones: ZoneSet) -> Path:
+    return cache_dir / f"stats_{raster_hash[:16]}_{zones.fingerprint[:16]}.npz"
+
+
+def _save_table(path: Path, table: pd.DataFrame, meta: Mapping[str, Any]) -> None:
+    tmp = path.with_name(path.stem + ".partial.npz")
+    np.savez_compressed(
+        tmp,
+        meta=np.array(json.dumps(dict(meta))),
+        zone=table["zone"].to_numpy(dtype=str),
+        class_value=table["class_value"].to_numpy(np.int32),
+        pixels=table["pixels"].to_numpy(np.int64),
+        area_km2=table["area_km2"].to_numpy(np.float64),
+    )
+    os.replace(tmp, path)
+
+
+def load_zonal_table(path: str | Path) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """Cached state table and its metadata."""
+    with np.load(path) as archive:
+        meta = json.loads(str(archive["meta"]))
+        table = pd.DataFrame({column: archive[column] for column in TABLE_COLUMNS})
+    return table, meta
+
+
+def list_zonal_tables(cache_dir: str | Path = ZONAL_CACHE_DIR) -> pd.DataFrame:
+    """Metadata of every cached table (one row per raster and zone set)."""
+    rows = []
+    for path in sorted(Path(cache_dir).glob("stats_*.npz")):
+        if path.name.endswith(".partial.npz"):
+            continue
+        with np.load(path) as archive:
+            meta = json.loads(str(archive["meta"]))
+        rows.append({**meta, "path": str(path)})
+    return pd.DataFrame(rows)
+
+
+def rollup(table: pd.DataFrame, layer: str = "state", mapping: Mapping[str, str] | None = None) -> pd.DataFrame:
+    """
+    State table at a layer, with each class's share of its zone.
+
+    Args:
+        table: State table (``TABLE_COLUMNS``)
+        layer: "state" or "mesoregion"
+        mapping: UF sigla → mesoregion (default: ``json_dictionary.json``)
+
+    Raises:
+        ValueError: For an unknown layer
+    """
+    if layer not in LAYERS:
+        raise ValueError(f"Unknown layer {layer!r}; expected one of {LAYERS}")
+    if layer == "mesoregion":
+        from .footprint_index import state_mesoregions
+
+        mapping = mapping or state_mesoregions()
+        table = table.assign(zone=table["zone"].map(mapping))
+        table = table.dropna(subset=["zone"]).groupby(["zone", "class_value"], as_index=False)[["pixels", "area_km2"]].sum()
+    table = table.sort_values(["zone", "class_value"], ignore_index=True)
+    totals = table.groupby("zone")["area_km2"].transform("sum")
+    return table.assign(share=np.where(totals > 0, table["area_km2"] / totals, 0.0))
+
+
+def zonal_statistics(
+    raster: Any,
+    layer: str = "state",
+    zones: ZoneSet | None = None,
+    workers: int | None = None,
+    cache_dir: str | Path = ZONAL_CACHE_DIR,
+    tile_size: int = TILE_SIZE,
+    initiative: str | None = None,
+    year: int | None = None,
+) -> pd.DataFrame:
+    """
+    Class areas of a raster per zone, cached per (raster hash, zone set).
+
+    Args:
+        raster: ``ArrayRaster`` or ``GeoTiffRaster`` (integer classes)
+        layer: "state" or "mesoregion" (rolled up from the state zones)
+        zones: State zone set (default: ``state_zones()``)
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        cache_dir: Directory of zone rasters and result tables
+        tile_size: Tile side in pixels
+        initiative: Initiative name stored with the table
+        year: Map year stored with the table
+
+    Returns:
+        Frame with zone, class_value, pixels, area_km2 and share
+
+    Raises:
+        ValueError: For an unknown layer, a rotated grid or a non-integer raster
+    """
+    if layer not in LAYERS:
+        raise ValueError(f"Unknown layer {layer!r}; expected one of {LAYERS}")
+    a, b, _, d, e, _ = raster.transform
+    if b or d or not a or not e:
+        raise ValueError("Only north-up (unrotated) raster grids are supported")
+    _class_count(raster.dtype)
+
+    zones = zones or state_zones()
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    raster_hash = raster.fingerprint()
+    table_path = _table_path(cache_dir, raster_hash, zones)
+    if table_path.exists():
+        return rollup(load_zonal_table(table_path)[0], layer)
+
+    started = time.perf_counter()
+    zone_path = cache_dir / f"zones_{_grid_fingerprint(raster)[:16]}_{zones.fingerprint[:16]}.npy"
+    build_zones = not zone_path.exists()
+    partial_zone_path = zone_path.with_name(zone_path.stem + ".partial.npy")
+    if build_zones:
+        np.lib.format.open_memmap(partial_zone_path, mode="w+", dtype=np.uint8, shape=tuple(raster.shape)).flush()
+    job = _TileJob(raster, zones, partial_zone_path if build_zones else zone_path, build_zones)
+
+    windows = list(tiles(tuple(raster.shape), tuple(raster.block_shape), tile_size))
+    workers = min(workers or os.cpu_count() or 1, len(windows))
+    if workers <= 1:
+        results = map(job.count, windows)
+        pixels, area = _accumulate(results, job)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(job,)) as pool:
+            pixels, area = _accumulate(pool.map(_count_in_worker, windows), job)
+    if build_zones:
+        os.replace(partial_zone_path, zone_path)
+
+    cells = np.flatnonzero(pixels)
+    table = pd.DataFrame({
+        "zone": np.asarray(zones.codes)[cells // job.n_classes],
+        "class_value": (cells % job.n_classes).astype(np.int32),
+        "pixels": pixels[cells],
+        "area_km2": area[cells],
+    })
+    _save_table(table_path, table, {
+        "raster": getattr(raster, "label", "raster"),
+        "raster_hash": raster_hash,
+        "zone_set": zones.name,
+        "zone_hash": zones.fingerprint,
+        "initiative": initiative,
+        "year": year,
+        "shape": list(raster.shape),
+        "seconds": round(time.perf_counter() - started, 3),
+    })
+    return rollup(table, layer)
+
+
+def _accumulate(results: Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]], job: _TileJob) -> tuple[np.ndarray, np.ndarray]:
+    size = len(job.zones.codes) * job.n_classes
+    pixels = np.zeros(size, dtype=np.int64)
+    area = np.zeros(size, dtype=np.float64)
+    for cells, cell_pixels, cell_area in results:
+        pixels[cells] += cell_pixels
+        area[cells] += cell_area
+    return pixels, area
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-state class areas of a local LULC raster")
+    parser.add_argument("raster", help="GeoTIFF export (first band holds class values)")
+    parser.add_argument("--initiative", help="Initiative name, as in initiatives_metadata.jsonc")
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--layer", choices=LAYERS, default="state")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    result = zonal_statistics(
+        open_raster(args.raster), layer=args.layer, workers=args.workers, initiative=args.initiative, year=args.year
+    )
+    print(result.to_string(index=False))
@@ -9,5 +9,12 @@ a manutenção e reutilização.
 from .menu_styles import MenuStyles
 from .dashboard_styles import DashboardStyles
 from .menu_renderer import MenuRenderer
+from .style_bundle import get_style_bundle, inject_style_bundle
 
-__all__ = ['MenuStyles', 'DashboardStyles', 'MenuRenderer']
+__all__ = [
+    'MenuStyles',
+    'DashboardStyles',
+    'MenuRenderer',
+    'get_style_bundle',
+    'inject_style_bundle',
+]
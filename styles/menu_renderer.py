@@ -8,7 +8,7 @@ separadas da lógica de estilos para melhor organização.
 import streamlit as st
 import streamlit.components.v1 as components
 from typing import Dict, Any, List, Optional
-from .menu_styles import MenuStyles
+from .style_bundle import inject_style_bundle
 
 
 def generate_css_vars(config: Dict[str, Any]) -> str:
@@ -33,6 +33,95 @@ def generate_css_vars(config: Dict[str, Any]) -> str:
     """
 
 
+# Estilos dos menus, construídos uma vez por processo (usados quando css_only=False)
+MODERN_MENU_STYLES: Dict[str, Dict[str, str]] = {
+    "container": {
+        "padding": "0.8rem",
+        "background": "linear-gradient(135deg, #f8fdf8 0%, #f1faf1 50%, #e8f5e8 100%)",
+        "border-radius": "16px",
+        "box-shadow": "0 10px 40px rgba(102, 122, 0, 0.15)",
+        "backdrop-filter": "blur(10px)",
+        "border": "1px solid rgba(102, 122, 0, 0.2)",
+    },
+    "nav-link": {
+        "font-size": "16px",
+        "text-align": "left",
+        "margin": "0.4rem 0",
+        "padding": "1.2rem 1.4rem",
+        "border-radius": "12px",
+        "transition": "all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94)",
+        "background": "rgba(255, 255, 255, 0.8)",
+        "border-left": "4px solid transparent",
+        "backdrop-filter": "blur(5px)",
+        "color": "#667A00",
+        "font-weight": "500",
+        "box-shadow": "0 2px 8px rgba(102, 122, 0, 0.08)",
+        "border": "1px solid rgba(102, 122, 0, 0.1)",
+    },
+    "nav-link-selected": {
+        "background": "linear-gradient(135deg, #667A00 0%, #4a5a00 100%)",
+        "color": "#ffffff",
+        "font-weight": "600",
+        "transform": "translateX(8px) scale(1.02)",
+        "box-shadow": "0 8px 25px rgba(102, 122, 0, 0.4)",
+        "border-left": "4px solid #8ba300",
+        "border": "1px solid rgba(102, 122, 0, 0.3)",
+    },
+    "nav-link:hover": {
+        "background": "rgba(102, 122, 0, 0.05)",
+        "transform": "translateX(4px)",
+        "box-shadow": "0 4px 15px rgba(102, 122, 0, 0.15)",
+    },
+    "icon": {"display": "none"},
+    "menu-title": {
+        "color": "#667A00",
+        "font-weight": "700",
+        "font-size": "20px",
+        "text-align": "center",
+        "margin-bottom": "1rem",
+        "padding": "0.8rem",
+        "text-shadow": "0 1px 2px rgba(102, 122, 0, 0.1)",
+    },
+}
+
+SUB_MENU_STYLES: Dict[str, Dict[str, str]] = {
+    "container": {
+        "padding": "0.6rem",
+        "background": "linear-gradient(135deg, rgba(102, 122, 0, 0.08) 0%, rgba(102, 122, 0, 0.05) 100%)",
+        "border-radius": "12px",
+        "border": "1px solid rgba(102, 122, 0, 0.15)",
+        "box-shadow": "0 4px 15px rgba(102, 122, 0, 0.1)",
+    },
+    "nav-link": {
+        "font-size": "14px",
+        "text-align": "left",
+        "margin": "0.3rem 0",
+        "padding": "1rem 1.2rem",
+        "border-radius": "8px",
+        "transition": "all 0.3s ease",
+        "color": "#4a5a00",
+        "background": "rgba(255, 255, 255, 0.7)",
+        "font-weight": "500",
+        "box-shadow": "0 1px 4px rgba(102, 122, 0, 0.05)",
+        "border": "1px solid rgba(102, 122, 0, 0.08)",
+    },
+    "nav-link-selected": {
+        "background": "linear-gradient(135deg, rgba(102, 122, 0, 0.2) 0%, rgba(102, 122, 0, 0.15) 100%)",
+        "color": "#667A00",
+        "font-weight": "600",
+        "transform": "translateX(4px)",
+        "box-shadow": "0 3px 12px rgba(102, 122, 0, 0.25)",
+        "border": "1px solid rgba(102, 122, 0, 0.2)",
+    },
+    "nav-link:hover": {
+        "background": "rgba(102, 122, 0, 0.1)",
+        "color": "#667A00",
+        "transform": "translateX(2px)",
+    },
+    "icon": {"display": "none"},
+}
+
+
 class MenuRenderer:
     """Classe responsável pela renderização dos menus do dashboard."""
     
@@ -49,95 +138,6 @@ class MenuRenderer:
 
         categories = list(MENU_STRUCTURE.keys())
 
-        # Main menu styles (only used when css_only=False)
-        modern_menu_styles = {
-            "container": {
-                "padding": "0.8rem",
-                "background": "linear-gradient(135deg, #f8fdf8 0%, #f1faf1 50%, #e8f5e8 100%)",
-                "border-radius": "16px",
-                "box-shadow": "0 10px 40px rgba(102, 122, 0, 0.15)",
-                "backdrop-filter": "blur(10px)",
-                "border": "1px solid rgba(102, 122, 0, 0.2)",
-            },
-            "nav-link": {
-                "font-size": "16px",
-                "text-align": "left",
-                "margin": "0.4rem 0",
-                "padding": "1.2rem 1.4rem",
-                "border-radius": "12px",
-                "transition": "all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94)",
-                "background": "rgba(255, 255, 255, 0.8)",
-                "border-left": "4px solid transparent",
-                "backdrop-filter": "blur(5px)",
-                "color": "#667A00",
-                "font-weight": "500",
-                "box-shadow": "0 2px 8px rgba(102, 122, 0, 0.08)",
-                "border": "1px solid rgba(102, 122, 0, 0.1)",
-            },
-            "nav-link-selected": {
-                "background": "linear-gradient(135deg, #667A00 0%, #4a5a00 100%)",
-                "color": "#ffffff",
-                "font-weight": "600",
-                "transform": "translateX(8px) scale(1.02)",
-                "box-shadow": "0 8px 25px rgba(102, 122, 0, 0.4)",
-                "border-left": "4px solid #8ba300",
-                "border": "1px solid rgba(102, 122, 0, 0.3)",
-            },
-            "nav-link:hover": {
-                "background": "rgba(102, 122, 0, 0.05)",
-                "transform": "translateX(4px)",
-                "box-shadow": "0 4px 15px rgba(102, 122, 0, 0.15)",
-            },
-            "icon": {"display": "none"},
-            "menu-title": {
-                "color": "#667A00",
-                "font-weight": "700",
-                "font-size": "20px",
-                "text-align": "center",
-                "margin-bottom": "1rem",
-                "padding": "0.8rem",
-                "text-shadow": "0 1px 2px rgba(102, 122, 0, 0.1)",
-            },
-        }
-
-        # Sub menu styles (only used when css_only=False)
-        sub_menu_styles = {
-            "container": {
-                "padding": "0.6rem",
-                "background": "linear-gradient(135deg, rgba(102, 122, 0, 0.08) 0%, rgba(102, 122, 0, 0.05) 100%)",
-                "border-radius": "12px",
-                "border": "1px solid rgba(102, 122, 0, 0.15)",
-                "box-shadow": "0 4px 15px rgba(102, 122, 0, 0.1)",
-            },
-            "nav-link": {
-                "font-size": "14px",
-                "text-align": "left",
-                "margin": "0.3rem 0",
-                "padding": "1rem 1.2rem",
-                "border-radius": "8px",
-                "transition": "all 0.3s ease",
-                "color": "#4a5a00",
-                "background": "rgba(255, 255, 255, 0.7)",
-                "font-weight": "500",
-                "box-shadow": "0 1px 4px rgba(102, 122, 0, 0.05)",
-                "border": "1px solid rgba(102, 122, 0, 0.08)",
-            },
-            "nav-link-selected": {
-                "background": "linear-gradient(135deg, rgba(102, 122, 0, 0.2) 0%, rgba(102, 122, 0, 0.15) 100%)",
-                "color": "#667A00",
-                "font-weight": "600",
-                "transform": "translateX(4px)",
-                "box-shadow": "0 3px 12px rgba(102, 122, 0, 0.25)",
-                "border": "1px solid rgba(102, 122, 0, 0.2)",
-            },
-            "nav-link:hover": {
-                "background": "rgba(102, 122, 0, 0.1)",
-                "color": "#667A00",
-                "transform": "translateX(2px)",
-            },
-            "icon": {"display": "none"},
-        }
-
         # Render main category menu inside sidebar
         with st.sidebar:
             selected_cat = option_menu(
@@ -146,7 +146,7 @@ class MenuRenderer:
                 icons=None,
                 menu_icon=None,
                 default_index=0,
-                styles=(None if css_only else modern_menu_styles),
+                styles=(None if css_only else MODERN_MENU_STYLES),
                 key=f"{key_prefix}_cat",
             )
 
@@ -176,7 +176,7 @@ class MenuRenderer:
                     icons=(page_icons if page_icons else None),
                     menu_icon=None,
                     default_index=0,
-                    styles=(None if css_only else sub_menu_styles),
+                    styles=(None if css_only else SUB_MENU_STYLES),
                     key=f"{key_prefix}_sub_{selected_cat.replace(' ', '_')}",
                 )
 
@@ -212,13 +212,10 @@ class MenuRenderer:
         """
         Unified public entrypoint to render the sidebar menu and breadcrumb.
         """
-        # Centralize menu-related styles so app.py doesn't inject HTML/styles
-        # Inject menu styles only once per session to avoid duplicate <style> blocks.
+        # Menu and breadcrumb styles are part of the global style bundle,
+        # injected only once per session.
         try:
-            if not st.session_state.get("_menu_styles_injected", False):
-                st.markdown(MenuStyles.get_option_menu_styles(), unsafe_allow_html=True)
-                st.markdown(MenuStyles.get_breadcrumb_styles(), unsafe_allow_html=True)
-                st.session_state["_menu_styles_injected"] = True
+            inject_style_bundle()
         except Exception:
             pass
 
@@ -257,9 +254,7 @@ class MenuRenderer:
             category (str, optional): Categoria atual
             home_label (str): Label para a página inicial
         """
-        breadcrumb_styles = MenuStyles.get_breadcrumb_styles()
-        st.markdown(breadcrumb_styles, unsafe_allow_html=True)
-        
+        # Estilos do breadcrumb vêm do bundle global (inject_style_bundle)
         breadcrumb_html = '<div class="breadcrumb">'
         
         # Home
@@ -0,0 +1,107 @@
+"""
+Style Bundle para LANDAGRI-B Dashboard
+
+Este módulo concatena os estilos globais do dashboard (containers, cards,
+cabeçalhos, sidebar, menu e breadcrumb) em um único bundle minificado e
+identificado por hash, construído uma única vez por processo.
+
+O bundle é injetado uma vez por sessão: um componente HTML de altura zero
+copia o CSS para o ``<head>`` da página, onde ele permanece entre reruns.
+Nas execuções seguintes da mesma sessão nada é reenviado ao navegador.
+"""
+
+from functools import lru_cache
+import hashlib
+import json
+import re
+from typing import Tuple
+
+import streamlit as st
+
+from .dashboard_styles import DashboardStyles
+from .menu_styles import MenuStyles
+
+# Flag de sessão (mesmo padrão de ``_menu_styles_injected``)
+SESSION_FLAG = "_style_bundle_injected"
+
+_STYLE_TAG = re.compile(r"</?style[^>]*>", re.IGNORECASE)
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"\s*([{};:,>])\s*")
+
+
+def minify_css(css: str) -> str:
+    """
+    Remove tags ``<style>``, comentários e espaços redundantes de um CSS.
+
+    Args:
+        css (str): CSS (opcionalmente envolto em ``<style>``)
+
+    Returns:
+        str: CSS minificado
+    """
+    css = _STYLE_TAG.sub("", css)
+    css = _COMMENT.sub("", css)
+    css = _WHITESPACE.sub(" ", css)
+    css = _PUNCTUATION.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=1)
+def get_style_bundle() -> Tuple[str, str]:
+    """
+    Constrói (uma vez por processo) o bundle de estilos globais.
+
+    Returns:
+        Tuple[str, str]: CSS minificado e seu hash curto
+    """
+    parts = [
+        DashboardStyles.get_main_container_styles(),
+        DashboardStyles.get_header_styles(),
+        DashboardStyles.get_card_styles(),
+        DashboardStyles.get_responsive_styles(),
+        DashboardStyles.get_sidebar_styles(),
+        MenuStyles.get_option_menu_styles(),
+        MenuStyles.get_breadcrumb_styles(),
+    ]
+    css = "".join(minify_css(part) for part in parts)
+    digest = hashlib.sha1(css.encode("utf-8")).hexdigest()[:12]
+    return css, digest
+
+
+@lru_cache(maxsize=1)
+def _injector_html() -> str:
+    """HTML do componente que copia o bundle para o ``<head>`` da página."""
+    css, digest = get_style_bundle()
+    return f"""<script>
+(function() {{
+  const doc = window.parent.document;
+  const id = "landagri-styles-{digest}";
+  if (doc.getElementById(id)) return;
+  doc.querySelectorAll('style[id^="landagri-styles-"]').forEach(el => el.remove());
+  const style = doc.createElement("style");
+  style.id = id;
+  style.textContent = {json.dumps(css)};
+  doc.head.appendChild(style);
+}})();
+</script>"""
+
+
+def inject_style_bundle() -> None:
+    """
+    Injeta o bundle de estilos uma única vez por sessão.
+
+    Se o componente HTML não estiver disponível, recorre a um único
+    ``st.markdown`` por rerun com o bundle já pronto em cache.
+    """
+    if st.session_state.get(SESSION_FLAG, False):
+        return
+
+    try:
+        import streamlit.components.v1 as components
+
+        components.html(_injector_html(), height=0)
+        st.session_state[SESSION_FLAG] = True
+    except Exception:
+        css, _digest = get_style_bundle()
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
@@ -0,0 +1,186 @@
+"""Tests for the IBGE admin hierarchy and the crop calendar rollups."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from scripts.data_processors.agricultural_data.admin_hierarchy import (
+    AdminHierarchy,
+    CalendarRollup,
+    get_calendar_rollup,
+    unit_region,
+)
+from scripts.data_processors.agricultural_data.safra_calendar import MONTHS, SafraCalendar, load_safra_calendar
+from scripts.utilities.geometry_store import IBGE_UF_CODES
+
+UFS = sorted(IBGE_UF_CODES.items())
+
+
+def _municipalities(count=5570):
+    """IBGE localidades records: 27 UFs, 5 mesoregions and 20 microregions each."""
+    records = []
+    for i in range(count):
+        uf_id, sigla = UFS[i % 27]
+        meso, micro = f"{uf_id}{(i // 27) % 5 + 1:02d}", f"{uf_id}{(i // 27) % 20 + 1:03d}"
+        uf = {"id": int(uf_id), "sigla": sigla, "nome": sigla}
+        records.append({
+            "id": int(f"{uf_id}{i:05d}"),
+            "nome": f"Município {i}",
+            "microrregiao": {"id": int(micro), "nome": f"Micro {micro}", "mesorregiao": {
+                "id": int(meso), "nome": f"Meso {meso}", "UF": uf,
+            }},
+        })
+    return records
+
+
+@pytest.fixture(scope="module")
+def hierarchy():
+    return AdminHierarchy.from_ibge(_municipalities())
+
+
+@pytest.fixture(scope="module")
+def municipal_calendar(hierarchy):
+    rng = np.random.default_rng(3)
+    crop_calendar = {}
+    for crop in ("Soybean", "Corn"):
+        crop_calendar[crop] = [
+            {
+                "municipality_code": code,
+                "municipality_name": name,
+                "region": region,
+                "calendar": {month: ["", "P", "H", "PH"][v] for month, v in zip(MONTHS, rng.integers(0, 4, 12))},
+            }
+            for code, name, region in zip(*(getattr(hierarchy, a)["municipality"] for a in ("units", "names", "regions")))
+            if rng.random() < 0.7
+        ]
+    return SafraCalendar().add_safra("2024/25", {"crop_calendar": crop_calendar})
+
+
+def test_hierarchy_levels_and_codes(hierarchy):
+    assert len(hierarchy) == 5570
+    assert {level: hierarchy.size(level) for level in hierarchy.levels} == {
+        "municipality": 5570, "microregion": 540, "mesoregion": 135, "state": 27, "region": 5,
+    }
+    assert hierarchy.locate("SP")[0] == "state"
+    assert hierarchy.locate("North")[0] == "region"
+    assert hierarchy.locate("9999999") is None
+    assert unit_region("3550308") == "Southeast"
+    assert unit_region("MT") == "Central-West"
+    assert unit_region("Foo") is None
+
+    states_only = AdminHierarchy.from_states({"SP": "São Paulo"})
+    assert states_only.levels == ("state", "region")
+    with pytest.raises(KeyError):
+        states_only.size("municipality")
+    with pytest.raises(ValueError):
+        AdminHierarchy(pd.DataFrame({"municipality_code": ["1"], "state_code": ["RO"], "region_code": ["North"]}))
+
+
+def test_rollups_match_grouped_reference(hierarchy, municipal_calendar):
+    rollup = CalendarRollup.from_safra(municipal_calendar, "2024/25", hierarchy)
+    assert rollup.levels == hierarchy.levels and rollup.native and not rollup.unplaced
+
+    # Reference: municipalities planting soybean in each state and month
+    rows = [
+        (hierarchy.locate(record["state_code"])[1], month)
+        for record in municipal_calendar.calendar("2024/25")["crop_calendar"]["Soybean"]
+        for month, activity in record["calendar"].items() if "P" in activity
+    ]
+    reference = pd.DataFrame(rows, columns=["row", "month"]).assign(
+        state=lambda df: np.asarray(hierarchy.units["state"])[hierarchy.index["state"][df["row"]]]
+    ).groupby(["state", "month"]).size()
+
+    counts = rollup.activity_counts("state")
+    soybean = rollup.crops.index("Soybean")
+    for (state, month), expected in reference.items():
+        assert counts[hierarchy.units["state"].index(state), soybean, MONTHS.index(month)] == expected
+    assert not counts.flags.writeable
+
+    # 5,570 municipalities × 2 crops do not fit in 14,400 cells; 540 microregions do
+    assert rollup.choose_level() == "microregion"
+    assert rollup.choose_level(budget=1000) == "state"
+    assert rollup.choose_level(crops=["Corn"], budget=60_000) == "municipality"
+    with pytest.raises(ValueError):
+        rollup.choose_level(budget=0)
+
+    calendar = rollup.crop_calendar("state")
+    assert calendar is rollup.crop_calendar("state")
+    record = calendar["crop_calendar"]["Soybean"][0]
+    assert (record["level"], record["region"]) == ("state", unit_region(record["state_code"]))
+    assert record["units"] == counts[hierarchy.units["state"].index(record["state_code"]), soybean, 24]
+    # With a majority threshold fewer months remain active
+    strict = rollup.crop_calendar("state", min_share=0.5)["crop_calendar"]["Soybean"][0]["calendar"]
+    assert sum(map(len, strict.values())) < sum(map(len, record["calendar"].values()))
+    with pytest.raises(ValueError):
+        rollup.crop_calendar("state", min_share=1.0)
+
+
+def test_state_calendar_rolls_up_to_regions_and_production():
+    calendar = load_safra_calendar(cache_path=None)
+    rollup = get_calendar_rollup(calendar, "current")
+    assert rollup is get_calendar_rollup(calendar, "current")
+    assert rollup.levels == ("state", "region") and rollup.native
+    assert rollup.choose_level() == "state"
+    with pytest.raises(KeyError):
+        rollup.crop_calendar("municipality")
+
+    regions = rollup.crop_calendar("region")["crop_calendar"]
+    assert {record["state_code"] for records in regions.values() for record in records} <= {
+        "North", "Northeast", "Central-West", "Southeast", "South",
+    }
+
+    production = pd.DataFrame({
+        "code": ["5103403", "MT", "PR", "GO"],
+        "crop": ["Soybean", "Soybean", "Soybean", "Corn"],
+        "tonnes": [10.0, 100.0, 50.0, 20.0],
+    })
+    hierarchy = AdminHierarchy.from_ibge(_municipalities(200) + [{
+        "id": 5103403, "nome": "Cuiabá", "microrregiao": {"id": 51017, "nome": "Cuiabá", "mesorregiao": {
+            "id": 5104, "nome": "Centro-Sul Mato-grossense", "UF": {"id": 51, "sigla": "MT", "nome": "Mato Grosso"},
+        }},
+    }])
+    rollup = CalendarRollup(hierarchy, ["Soybean"], ["MT"], np.zeros((1, 1, 12), np.uint8), np.ones((1, 1), bool), production)
+    table = rollup.production("region").set_index(["code", "crop"])["tonnes"]
+    assert table.to_dict() == {("Central-West", "Corn"): 20.0, ("Central-West", "Soybean"): 110.0, ("South", "Soybean"): 50.0}
+    assert rollup.production("state").loc[lambda df: df["code"] == "MT", ["region", "tonnes"]].values.tolist() == [
+        ["Central-West", 110.0]
+    ]
+
+
+def test_state_charts_stay_within_budget(hierarchy, municipal_calendar):
+    from dashboard.components.agricultural_analysis.charts.availability import (
+        plot_state_activity_comparison,
+        plot_state_activity_timeline,
+    )
+    from dashboard.components.agricultural_analysis.charts.availability.color_palettes import (
+        MODERN_COLORS,
+        REGIONAL_COLORS,
+        get_state_color,
+    )
+
+    data = CalendarRollup.from_safra(municipal_calendar, "2024/25", hierarchy).crop_calendar("microregion")
+    bars = plot_state_activity_comparison(data)
+    assert len(bars.data[0].x) == 60 and bars.data[0].x[-1] == "Others (481, avg)"
+    assert len(plot_state_activity_timeline(data).data) == 30
+
+    assert get_state_color("1100015") == REGIONAL_COLORS["North"]
+    assert get_state_color("South") == REGIONAL_COLORS["South"]
+    assert get_state_color("??", use_dark=True) == MODERN_COLORS["primary"]
+
+
+def _calendar_page():
+    from dashboard.agricultural_analysis import render_crop_calendar_page
+
+    render_crop_calendar_page()
+
+
+def test_calendar_page_aggregation_level():
+    at = AppTest.from_function(_calendar_page, default_timeout=120).run()
+    assert not at.exception
+    level = at.selectbox(key="crop_calendar_level")
+    assert (level.options, level.value) == (["State", "Region"], "state")
+
+    at = level.set_value("region").run()
+    assert not at.exception
+    assert set(at.multiselect[1].options) == {"North", "Northeast", "Central-West", "Southeast", "South"}
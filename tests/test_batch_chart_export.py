@@ -0,0 +1,121 @@
+"""Tests for the batch chart export service (renderer stubbed out)."""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import zipfile
+
+import pytest
+
+from scripts.utilities import batch_chart_export
+from scripts.utilities.batch_chart_export import (
+    BatchChartExporter,
+    _normalize_figures,
+)
+
+
+class FakeFigure:
+    """Minimal stand-in for a Plotly figure."""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def to_json(self):
+        return json.dumps(self.payload)
+
+    def to_html(self, include_plotlyjs="cdn"):
+        return f"<html>{self.payload}</html>"
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    calls = []
+
+    def fake_render(fig_json, file_format, width, height, scale):
+        calls.append(fig_json)
+        if "broken" in fig_json:
+            raise RuntimeError("renderer failed")
+        return f"{file_format}:{fig_json}".encode()
+
+    monkeypatch.setattr(batch_chart_export, "_render_in_worker", fake_render)
+    exp = BatchChartExporter(max_workers=2)
+    exp._pool = ThreadPoolExecutor(max_workers=2)
+    exp.calls = calls
+    yield exp
+    exp.shutdown()
+
+
+def test_normalize_figures_names_never_collide():
+    names = [name for name, _ in _normalize_figures([("a", 1), ("a", 2), ("a_2", 3)])]
+
+    assert names == ["a", "a_2", "a_2_2"]
+    assert len(set(names)) == 3
+
+
+def test_normalize_figures_accepts_plain_sequences_and_mappings():
+    assert [n for n, _ in _normalize_figures([1, 2])] == ["chart_01", "chart_02"]
+    assert [n for n, _ in _normalize_figures({"my chart/1": 1})] == ["my_chart_1"]
+
+
+def test_render_dedupes_identical_figures(exporter):
+    fig = FakeFigure({"data": [1, 2, 3]})
+    rendered, errors, unique = exporter.render(
+        {"a": fig, "b": FakeFigure({"data": [1, 2, 3]}), "c": FakeFigure({"x": 1})}
+    )
+
+    assert unique == 2
+    assert len(exporter.calls) == 2
+    assert list(rendered) == ["a", "b", "c"]
+    assert rendered["a"] == rendered["b"]
+    assert errors == {}
+
+
+def test_render_empty_input_does_not_start_pool():
+    exp = BatchChartExporter()
+
+    assert exp.render([]) == ({}, {}, 0)
+    assert exp._pool is None
+
+
+def test_export_zip_with_html_fallback(exporter, tmp_path):
+    figures = [
+        ("ok", FakeFigure({"x": 1})),
+        ("dup", FakeFigure({"x": 1})),
+        ("broken", FakeFigure("broken")),
+    ]
+    result = exporter.export_zip(figures, tmp_path / "report.zip")
+
+    assert result.exported == ["ok", "dup"]
+    assert result.fallbacks == ["broken"]
+    assert result.duplicates == 1
+    with zipfile.ZipFile(tmp_path / "report.zip") as zf:
+        assert sorted(zf.namelist()) == ["broken_fallback.html", "dup.png", "ok.png"]
+        assert zf.read("broken_fallback.html").startswith(b"<html>")
+
+
+def test_export_zip_fallback_renders_json_strings_as_html(exporter, tmp_path):
+    pytest.importorskip("plotly")
+    result = exporter.export_zip(
+        [("broken", json.dumps({"data": [], "layout": {"title": {"text": "broken"}}}))],
+        tmp_path / "report.zip",
+    )
+
+    assert result.fallbacks == ["broken"]
+    with zipfile.ZipFile(tmp_path / "report.zip") as zf:
+        assert b"<html>" in zf.read("broken_fallback.html")
+
+
+def test_export_pdf_packs_one_page_per_figure(exporter, tmp_path, monkeypatch):
+    image = pytest.importorskip("PIL.Image")
+    import io
+
+    buffer = io.BytesIO()
+    image.new("RGB", (10, 10), "white").save(buffer, format="PNG")
+    png = buffer.getvalue()
+    monkeypatch.setattr(batch_chart_export, "_render_in_worker", lambda *a: png)
+
+    result = exporter.export_pdf(
+        [FakeFigure({"a": 1}), FakeFigure({"b": 2})], tmp_path / "report.pdf"
+    )
+
+    assert result.exported == ["chart_01", "chart_02"]
+    assert (tmp_path / "report.pdf").read_bytes().startswith(b"%PDF")
@@ -0,0 +1,117 @@
+"""Tests for stale-while-revalidate and single-flight in SmartCacheManager."""
+
+from datetime import datetime, timedelta
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from scripts.utilities.cache_manager import SmartCacheManager, _key_repr, file_fingerprint
+
+
+@pytest.fixture()
+def manager(tmp_path):
+    return SmartCacheManager(cache_dir=str(tmp_path / "cache"))
+
+
+class SlowCounter:
+    def __init__(self, delay=0.05):
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            value = self.calls
+        time.sleep(self.delay)
+        return value
+
+
+def _expire(manager, key):
+    manager.memory_cache[key].created_at = datetime.now() - timedelta(hours=2)
+
+
+def _wait_idle(manager, timeout=2.0):
+    deadline = time.time() + timeout
+    while manager.in_flight() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_concurrent_misses_compute_once(manager):
+    compute = SlowCounter()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get_or_compute("k", compute, persist=False)))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert compute.calls == 1
+    assert results == [1] * 20
+    assert manager.stats["coalesced"] == 19
+
+
+def test_expired_entry_is_served_stale_and_revalidated_once(manager):
+    compute = SlowCounter()
+    manager.get_or_compute("k", compute, ttl_seconds=60, persist=False, stale_while_revalidate=True)
+    _expire(manager, "k")
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                manager.get_or_compute(
+                    "k", compute, ttl_seconds=60, persist=False, stale_while_revalidate=True
+                )
+            )
+        )
+        for _ in range(50)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    _wait_idle(manager)
+
+    assert results == [1] * 50
+    assert compute.calls == 2
+    assert manager.stats["revalidations"] == 1
+    assert manager.get_or_compute("k", compute, ttl_seconds=60, persist=False) == 2
+
+
+def test_without_swr_expired_entry_is_recomputed_synchronously(manager):
+    compute = SlowCounter(delay=0)
+    manager.get_or_compute("k", compute, ttl_seconds=60, persist=False)
+    _expire(manager, "k")
+    assert manager.get_or_compute("k", compute, ttl_seconds=60, persist=False) == 2
+
+
+def test_fingerprint_change_hard_invalidates(manager, tmp_path):
+    source = tmp_path / "source.json"
+    source.write_text("{}", encoding="utf-8")
+    compute = SlowCounter(delay=0)
+
+    first = manager.get_or_compute(
+        "k", compute, fingerprint=file_fingerprint(source), stale_while_revalidate=True
+    )
+    source.write_text('{"changed": 1}', encoding="utf-8")
+    second = manager.get_or_compute(
+        "k", compute, fingerprint=file_fingerprint(source), stale_while_revalidate=True
+    )
+
+    assert (first, second) == (1, 2)
+    assert manager.stats["invalidations"] == 1
+
+
+def test_key_repr_distinguishes_large_frames():
+    left = pd.DataFrame({"a": range(1000)})
+    right = left.copy()
+    right.loc[500, "a"] = -1
+    assert str(left) == str(right)
+    assert _key_repr((left,)) != _key_repr((right,))
+    assert _key_repr((left,)) == _key_repr((left.copy(),))
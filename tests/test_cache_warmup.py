@@ -0,0 +1,103 @@
+"""Tests for the background cache warm-up worker."""
+
+import pytest
+
+from scripts.utilities import cache_warmup, data_plane
+from scripts.utilities.cache_warmup import WarmupWorker, data_version
+
+PAGES = [("Overview", "Dashboard Overview"), ("About", "About the Dashboard")]
+
+
+@pytest.fixture(autouse=True)
+def data_plane_loads(monkeypatch):
+    loads = []
+
+    class Plane:
+        def snapshot(self):
+            loads.append(1)
+
+    monkeypatch.setattr(data_plane, "get_data_plane", Plane)
+    return loads
+
+
+def test_warm_renders_every_page_and_records_errors(data_plane_loads):
+    rendered = []
+
+    def render_page(category, page):
+        rendered.append((category, page))
+        if page == "About the Dashboard":
+            raise RuntimeError("boom")
+
+    worker = WarmupWorker(PAGES, render_page, version_fn=lambda: "v1")
+    worker.warm("v1")
+
+    status = worker.status()
+    assert rendered == PAGES
+    assert status["state"] == "idle"
+    assert status["version"] == "v1"
+    assert status["progress"] == 1.0
+    assert set(status["durations"]) == {page for _, page in PAGES}
+    assert status["errors"] == {"About the Dashboard": "RuntimeError: boom"}
+    assert data_plane_loads == [1]
+
+
+def test_worker_rewarms_only_on_version_change():
+    versions = iter(["v1", "v1", "v2"])
+    rendered = []
+    worker = WarmupWorker(
+        PAGES[:1],
+        lambda category, page: rendered.append(page),
+        interval=0.01,
+        version_fn=lambda: next(versions, "v2"),
+    )
+    worker.start()
+    assert worker.wait_for_runs(2, timeout=10)
+    worker.stop()
+    worker.join(10)
+
+    assert worker.status()["runs"] == 2
+    assert rendered == ["Dashboard Overview", "Dashboard Overview"]
+
+
+def test_data_version_tracks_data_files(tmp_path):
+    (tmp_path / "a.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+    before = data_version(tmp_path)
+
+    (tmp_path / "notes.txt").write_text("still ignored", encoding="utf-8")
+    assert data_version(tmp_path) == before
+
+    (tmp_path / "a.json").write_text('{"changed": true}', encoding="utf-8")
+    assert data_version(tmp_path) != before
+
+
+def test_not_started_outside_streamlit_server():
+    assert cache_warmup.ensure_warmup_started(PAGES, lambda c, p: None) is None
+    assert cache_warmup.get_warmup_status() is None
+
+
+def test_app_warms_each_menu_page_with_its_own_render(monkeypatch):
+    import app
+
+    rendered = []
+
+    class Page:
+        def __init__(self, name):
+            self.name = name
+
+        def run(self, page=None):
+            rendered.append((self.name, page))
+
+    pages = [
+        ("Initiative Analysis", "Temporal Analysis"),
+        ("Initiative Analysis", "Detailed Analysis"),
+        ("Agricultural Analysis", "Crop Calendar"),
+    ]
+    worker = WarmupWorker(pages, lambda c, p: app._render_current_page(c, p, Page))
+    worker.warm("v1")
+
+    assert rendered == [
+        ("initiative_analysis", "Temporal Analysis"),
+        ("initiative_analysis", "Detailed Analysis"),
+        ("agricultural_analysis", "Crop Calendar"),
+    ]
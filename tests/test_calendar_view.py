@@ -0,0 +1,150 @@
+"""Tests for the zero-copy calendar views of the CONAB processor."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.data_processors.agricultural_data import conab_processor
+from scripts.data_processors.agricultural_data.calendar_view import (
+    CropRowIndex,
+    build_calendar_view,
+)
+from scripts.data_processors.agricultural_data.conab_processor import CONABProcessor
+from scripts.data_processors.agricultural_data.data_wrapper import (
+    AgriculturalDataWrapper,
+)
+
+RAW_DATA = {
+    "metadata": {},
+    "states": {
+        "MT": {"region": "Central-West"},
+        "PR": {"region": "South"},
+        "BA": {"region": "Northeast"},
+    },
+    "crop_calendar": {
+        "Soybean": [
+            {"state_code": "MT", "state_name": "Mato Grosso", "calendar": {"January": "H"}},
+            {"state_code": "PR", "state_name": "Paraná", "calendar": {"January": "H"}},
+        ],
+        "Corn": [
+            {"state_code": "PR", "state_name": "Paraná", "calendar": {"March": "P"}},
+            {"state_code": "BA", "state_name": "Bahia", "calendar": {"March": "P"}},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def processor():
+    proc = CONABProcessor()
+    proc.process_data(RAW_DATA)
+    return proc
+
+
+@pytest.fixture
+def interleaved_df():
+    return pd.DataFrame(
+        {
+            "crop": ["Soy", "Corn", "Soy", "Rice", "Corn"],
+            "region": ["South", "South", "North", "North", "North"],
+            "state_code": ["PR", "PR", "PA", "PA", "TO"],
+        }
+    )
+
+
+def test_rows_for_contiguous_crop_returns_slice(processor):
+    index = CropRowIndex(processor.get_crop_calendar())
+
+    assert index.order is None
+    assert index.rows_for(["Soybean"]) == slice(0, 2)
+    np.testing.assert_array_equal(index.rows_for(["Soybean", "Corn"]), [0, 1, 2, 3])
+    assert len(index.rows_for(["Unknown"])) == 0
+
+
+def test_rows_for_interleaved_crops_uses_order(interleaved_df):
+    index = CropRowIndex(interleaved_df)
+
+    assert index.order is not None
+    np.testing.assert_array_equal(index.rows_for(["Soy"]), [0, 2])
+    np.testing.assert_array_equal(index.rows_for(["Corn", "Rice"]), [1, 3, 4])
+
+
+def test_combined_filters(interleaved_df):
+    index = CropRowIndex(interleaved_df)
+    view = build_calendar_view(
+        interleaved_df, index, crops=["Soy", "Corn"], regions=["North"], states=["PA"]
+    )
+
+    assert view.select(["crop", "state_code"]).to_dict("records") == [
+        {"crop": "Soy", "state_code": "PA"}
+    ]
+
+
+def test_missing_filter_columns(interleaved_df):
+    df = interleaved_df.drop(columns=["region"])
+
+    with pytest.raises(KeyError):
+        build_calendar_view(df, CropRowIndex(df), regions=["North"])
+
+    # Without state columns the state filter is a no-op, as in the wrapper
+    stateless = interleaved_df.drop(columns=["state_code"])
+    view = build_calendar_view(stateless, CropRowIndex(stateless), crops=["Soy"], states=["PA"])
+    assert list(view.column("region")) == ["South", "North"]
+
+
+def test_view_columns_are_read_only(processor):
+    view = processor.calendar_view(crops=["Soybean"])
+    states = view.column("state_code")
+
+    assert list(states) == ["MT", "PR"]
+    with pytest.raises(ValueError):
+        states[0] = "XX"
+    assert processor.get_crop_calendar()["state_code"].iloc[0] == "MT"
+
+
+def test_views_are_memoized(processor):
+    view = processor.calendar_view(crops=["Corn"], regions=["South"])
+
+    assert processor.calendar_view(crops=["Corn"], regions=["South"]) is view
+    assert view.to_frame() is view.to_frame()
+
+
+def test_view_cache_eviction(processor, monkeypatch):
+    monkeypatch.setattr(conab_processor, "MAX_CACHED_VIEWS", 2)
+    first = processor.calendar_view(crops=["Corn"])
+    processor.calendar_view(crops=["Soybean"])
+    processor.calendar_view(regions=["South"])
+
+    assert len(processor._view_cache) == 2
+    assert processor.calendar_view(crops=["Corn"]) is not first
+
+
+def test_index_invalidated_when_calendar_rebuilt(processor):
+    old_view = processor.calendar_view(crops=["Corn"])
+    processor.process_data(
+        {**RAW_DATA, "crop_calendar": {"Corn": RAW_DATA["crop_calendar"]["Corn"]}}
+    )
+    new_view = processor.calendar_view(crops=["Corn"])
+
+    assert new_view is not old_view
+    assert new_view.rows == slice(0, 2)
+
+
+def test_get_filtered_calendar_reuses_view_frame(processor):
+    wrapper = AgriculturalDataWrapper.__new__(AgriculturalDataWrapper)
+    wrapper.processors = {"CONAB": processor}
+
+    frame = wrapper.get_filtered_calendar(crops=["Soybean"])
+    assert wrapper.get_filtered_calendar(crops=["Soybean"]) is frame
+    assert list(frame["state_code"]) == ["MT", "PR"]
+
+
+def test_filter_by_crop_returns_processor_and_summary_uses_views(processor):
+    filtered = processor.filter_by_crop(["Corn", "Rice"])
+    assert isinstance(filtered, CONABProcessor)
+    assert filtered.supported_crops == ["Rice", "Corn"]
+
+    summary = processor.get_calendar_summary().set_index(["crop", "region"])
+    assert summary.loc[("Soybean", "South"), "harvest_months"] == "January"
+    assert summary.loc[("Corn", "Northeast"), "planting_months"] == "March"
+    assert summary["states_count"].tolist() == [1, 1, 1, 1]
@@ -0,0 +1,131 @@
+"""Tests for the shared, read-only data plane."""
+
+import copy
+import json
+import pickle
+from types import MappingProxyType
+
+import pandas as pd
+import pytest
+
+from scripts.utilities.data_plane import (
+    DataPlane,
+    freeze_frame,
+    freeze_metadata,
+    frame_memory_bytes,
+    measure_session_overhead,
+)
+
+INITIATIVES = {
+    "MapBiomas Collection": {
+        "acronym": "MapBiomas",
+        "coverage": "National",
+        "spatial_resolution": 30,
+        "overall_accuracy": "89%",
+        "available_years": [2000, 2001],
+    },
+    "Global Land Cover": {"coverage": "Global", "spatial_resolution": "10 m"},
+}
+
+
+@pytest.fixture()
+def plane(tmp_path):
+    path = tmp_path / "initiatives_metadata.jsonc"
+    path.write_text(json.dumps(INITIATIVES), encoding="utf-8")
+    sensors = tmp_path / "sensors_metadata.jsonc"
+    sensors.write_text(json.dumps({"OLI": {"platform": "Landsat 8"}}), encoding="utf-8")
+    return DataPlane(path, (sensors,))
+
+
+def test_frozen_frame_rejects_in_place_writes():
+    df = freeze_frame(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+
+    with pytest.raises(ValueError):
+        df.loc[0, "a"] = 10
+    with pytest.raises(ValueError):
+        df.iloc[0, 1] = "z"
+
+    writable = df.copy()
+    writable.loc[0, "a"] = 10
+    assert df.loc[0, "a"] == 1
+    assert frame_memory_bytes(df) > 0
+
+
+def test_frozen_frame_rejects_column_changes_but_derived_frames_are_plain():
+    df = freeze_frame(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+
+    for mutate in (
+        lambda: df.__setitem__("c", 1),
+        lambda: df.__setitem__("a", [3, 4]),
+        lambda: df.loc.__setitem__((slice(None), "c"), 1),
+        lambda: df.insert(0, "c", 1),
+        lambda: df.pop("a"),
+        lambda: df.__delitem__("a"),
+        lambda: setattr(df, "columns", ["x", "y"]),
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    assert list(df.columns) == ["a", "b"]
+
+    for derived in (df.copy(), df[df["a"] > 1], df.assign(c=1), pickle.loads(pickle.dumps(df)), copy.deepcopy(df)):
+        assert type(derived) is pd.DataFrame
+    derived["c"] = 1
+
+
+def test_preload_reads_the_shared_snapshot(plane, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    from scripts.utilities import data_plane
+
+    monkeypatch.setattr(data_plane, "_data_plane", plane)
+
+    def app():
+        from scripts.utilities.dashboard_optimizer import preload_dashboard_data
+
+        assert preload_dashboard_data()
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    assert at.session_state[data_plane.SESSION_VERSION_KEY] == plane.snapshot().version
+    assert "df_interpreted" not in at.session_state
+
+
+def test_frozen_metadata_is_read_only_but_copies_are_plain():
+    meta = freeze_metadata({"A": {"years": [2000], "info": {"x": 1}}})
+
+    assert isinstance(meta, MappingProxyType)
+    assert isinstance(meta["A"], dict) and isinstance(meta["A"]["years"], list)
+    with pytest.raises(TypeError):
+        meta["A"]["years"].append(2001)
+    with pytest.raises(TypeError):
+        meta["A"]["info"]["x"] = 2
+
+    for plain in (copy.deepcopy(meta["A"]), pickle.loads(pickle.dumps(meta["A"]))):
+        plain["years"].append(2001)
+        assert type(plain) is dict
+    assert json.loads(json.dumps(meta["A"])) == {"years": [2000], "info": {"x": 1}}
+
+
+def test_snapshot_is_shared_until_source_changes(plane):
+    first = plane.snapshot()
+    assert plane.snapshot() is first
+    assert "Display_Name" in first.initiatives.columns
+    assert first.initiatives.loc[0, "Available_Years"] == (2000, 2001)
+    assert first.sensors["OLI"]["platform"] == "Landsat 8"
+
+    changed = dict(INITIATIVES, Extra={"coverage": "Regional"})
+    plane.initiatives_path.write_text(json.dumps(changed) + " ", encoding="utf-8")
+    second = plane.snapshot()
+
+    assert second.version != first.version
+    assert len(second.initiatives) == 3
+    # Sessions pinned to the previous version keep their data
+    assert plane.get(first.version) is first
+    assert plane.get("unknown") is second
+
+
+def test_session_overhead_drops_to_a_handle(plane):
+    result = measure_session_overhead(sessions=10, snapshot=plane.snapshot())
+
+    assert result["handle_bytes_per_session"] < 1024
+    assert result["copy_bytes_per_session"] > 10 * result["handle_bytes_per_session"]
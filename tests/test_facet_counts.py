@@ -0,0 +1,134 @@
+"""Tests for incremental facet counts of the Overview filter panel."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from scripts.utilities.facet_counts import FacetEngine
+from scripts.utilities.filter_index import FilterIndex, synthetic_initiatives
+
+NUMERIC = ("Resolution", "Accuracy (%)", "Num_Agri_Classes")
+SLIDER_KEYS = ("overview_filter_resolution", "overview_filter_accuracy", "overview_filter_agri_classes")
+
+
+def _brute_force(df, ranges, types):
+    def mask(skip=None):
+        keep = pd.Series(True, index=df.index)
+        if types and skip != "Type":
+            keep &= df["Type"].isin(types)
+        for col, (lo, hi) in ranges.items():
+            if col != skip:
+                values = pd.to_numeric(df[col], errors="coerce")
+                keep &= (values >= lo) & (values <= hi)
+        return keep
+
+    type_counts = df.loc[mask("Type"), "Type"].value_counts().to_dict()
+    range_counts = {
+        col: int((mask(col) & pd.to_numeric(df[col], errors="coerce").notna()).sum()) for col in ranges
+    }
+    return int(mask().sum()), type_counts, range_counts
+
+
+@pytest.fixture()
+def data():
+    df = synthetic_initiatives(3000, seed=3)
+    return df, FacetEngine(FilterIndex(df, NUMERIC, ("Type",)))
+
+
+@pytest.mark.parametrize(
+    "ranges, types",
+    [
+        ({}, []),
+        ({"Resolution": (10, 100), "Num_Agri_Classes": (2, 9)}, ["Regional", "Global"]),
+        ({"Accuracy (%)": (90, 99)}, ["Continental"]),
+    ],
+)
+def test_counts_match_refiltering_per_option(data, ranges, types):
+    df, engine = data
+    facets = engine.counts(ranges, {"Type": types} if types else {})
+    total, type_counts, range_counts = _brute_force(df, ranges, types)
+
+    assert facets.total == total
+    assert {k: v for k, v in facets.categories["Type"].items() if v} == type_counts
+    for col, count in range_counts.items():
+        assert facets.ranges[col] == count
+
+
+def test_moving_one_control_rebuilds_one_predicate(data):
+    df, engine = data
+    ranges = {"Resolution": (10, 100), "Accuracy (%)": (60, 95)}
+    engine.counts(ranges, {"Type": ["Regional"]})
+    rebuilt = engine.predicates_rebuilt
+
+    moved = engine.counts({**ranges, "Accuracy (%)": (70, 95)}, {"Type": ["Regional"]})
+    assert engine.predicates_rebuilt == rebuilt + 1
+    assert moved.total == _brute_force(df, {**ranges, "Accuracy (%)": (70, 95)}, ["Regional"])[0]
+
+    # Returning to a previous state is served from the cache
+    first = engine.counts(ranges, {"Type": ["Regional"]})
+    assert engine.counts(ranges, {"Type": ["Regional"]}) is first
+    with pytest.raises(ValueError):
+        engine.counts({"Resolution": (100, 10)})
+
+
+def test_counts_are_updated_from_flipped_rows_only(data):
+    df, engine = data
+    rng = np.random.default_rng(7)
+    types = ["Global", "National", "Regional", "Continental"]
+    for _ in range(25):
+        lo = float(rng.choice([0, 10, 30, 100]))
+        ranges = {"Resolution": (lo, lo + float(rng.choice([20, 500, 2000]))), "Accuracy (%)": (float(rng.integers(50, 90)), 99.0)}
+        selected = list(rng.choice(types, rng.integers(1, 4), replace=False))
+        facets = engine.counts(ranges, {"Type": selected})
+        total, type_counts, range_counts = _brute_force(df, ranges, selected)
+        assert facets.total == total
+        assert {k: v for k, v in facets.categories["Type"].items() if v} == type_counts
+        assert all(facets.ranges[col] == count for col, count in range_counts.items())
+
+    engine.counts({"Accuracy (%)": (60, 95)})
+    recounted = engine.rows_recounted
+    engine.counts({"Accuracy (%)": (60, 94.5)})
+    flipped = int(((df["Accuracy (%)"] > 94.5) & (df["Accuracy (%)"] <= 95)).sum())
+    assert engine.rows_recounted - recounted == flipped < len(df) // 10
+
+
+def _filters_app():
+    from dashboard.components.overview.filters import apply_filters, render_initiative_filters
+    from scripts.utilities.filter_index import synthetic_initiatives
+
+    import streamlit as st
+
+    df = st.session_state.setdefault("df", synthetic_initiatives(200, seed=5))
+    selection = render_initiative_filters(df)
+    st.markdown(f"rows={len(apply_filters(df, *selection))}")
+
+
+def _expected_rows(at, types):
+    ranges = {col: at.slider(key=key).value for col, key in zip(NUMERIC, SLIDER_KEYS)}
+    return _brute_force(at.session_state["df"], ranges, types)[0]
+
+
+def test_filter_panel_shows_counts():
+    at = AppTest.from_function(_filters_app).run()
+    assert not at.exception
+    assert at.markdown[-1].value == f"rows={_expected_rows(at, [])}"
+    assert at.caption[0].value.endswith("iniciativas no intervalo")
+
+    at.multiselect(key="overview_filter_type").set_value(["Regional"]).run()
+    assert not at.exception
+    assert at.markdown[-1].value == f"rows={_expected_rows(at, ['Regional'])}"
+    assert at.caption[0].value.startswith(f"{_expected_rows(at, ['Regional'])} de ")
+
+
+def _overview_page():
+    from dashboard import overview
+
+    overview.run()
+
+
+def test_overview_shows_facet_counts():
+    at = AppTest.from_function(_overview_page, default_timeout=120).run()
+    assert not at.exception
+    assert any(caption.value.endswith("iniciativas no intervalo") for caption in at.caption)
+    assert all(option.endswith(")") for option in at.multiselect(key="overview_filter_type").options)
@@ -0,0 +1,101 @@
+"""Tests for the sorted-range filter index behind the Overview filters."""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from dashboard.components.overview.filters import apply_filters
+from scripts.utilities.filter_index import FilterIndex, get_filter_index, synthetic_initiatives
+
+NUMERIC = ("Resolution", "Accuracy (%)", "Num_Agri_Classes")
+
+
+def _mask_filter(df, types, ranges):
+    mask = pd.Series(True, index=df.index)
+    if types:
+        mask &= df["Type"].isin(types)
+    for col, (lo, hi) in ranges.items():
+        values = pd.to_numeric(df[col], errors="coerce")
+        mask &= (values >= lo) & (values <= hi)
+    return df[mask]
+
+
+@pytest.mark.parametrize(
+    "types, ranges",
+    [
+        ([], {"Resolution": (0, 2000), "Accuracy (%)": (0, 100), "Num_Agri_Classes": (0, 20)}),
+        (["Regional"], {"Resolution": (10, 30), "Accuracy (%)": (80, 90), "Num_Agri_Classes": (3, 7)}),
+        (["Global", "National"], {"Resolution": (250, 250), "Accuracy (%)": (0, 100), "Num_Agri_Classes": (0, 0)}),
+        (["Missing"], {"Resolution": (0, 2000), "Accuracy (%)": (0, 100), "Num_Agri_Classes": (0, 20)}),
+    ],
+)
+def test_apply_filters_matches_boolean_masks(types, ranges):
+    df = synthetic_initiatives(5000, seed=1)
+    expected = _mask_filter(df, types, ranges)
+    result = apply_filters(df, types, *(ranges[col] for col in NUMERIC))
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_inverted_ranges_are_swapped_and_full_ranges_keep_the_frame():
+    df = synthetic_initiatives(500, seed=2)
+    expected = apply_filters(df, ["Regional"], (10, 100), (60, 99), (2, 9))
+    pd.testing.assert_frame_equal(apply_filters(df, ["Regional"], (100, 10), (99, 60), (9, 2)), expected)
+    numeric = df.assign(Resolution=pd.to_numeric(df["Resolution"], errors="coerce").fillna(30))
+    assert apply_filters(numeric, [], (0, 5000), (0, 100), (0, 50)) is numeric
+
+
+def _overview_page():
+    from dashboard import overview
+
+    overview.run()
+
+
+def test_overview_mounts_the_filter_panel():
+    from scripts.utilities.data_plane import get_data_plane
+
+    at = AppTest.from_function(_overview_page, default_timeout=120).run()
+    assert not at.exception
+
+    # Slider bounds come from the shared index of the data plane frame
+    index = get_filter_index(get_data_plane().snapshot().initiatives, NUMERIC, ("Type",))
+    resolution = at.slider(key="overview_filter_resolution")
+    assert (resolution.min, resolution.max) == (index.numeric["Resolution"].min, index.numeric["Resolution"].max)
+
+    types = at.multiselect(key="overview_filter_type")
+    at = types.set_value(types.value[:1]).run()
+    assert not at.exception
+    assert any("Filtros Aplicados" in markdown.value for markdown in at.markdown)
+
+
+def test_index_is_cached_per_frame_object():
+    df = synthetic_initiatives(100)
+    index = get_filter_index(df, NUMERIC, ("Type",))
+    assert get_filter_index(df, NUMERIC, ("Type",)) is index
+    assert get_filter_index(df.copy(), NUMERIC, ("Type",)) is not index
+
+
+def test_invalid_queries_raise():
+    index = FilterIndex(synthetic_initiatives(100), NUMERIC, ("Type",))
+    with pytest.raises(ValueError):
+        index.select({"Resolution": (30, 10)})
+    with pytest.raises(KeyError):
+        index.select({"Unknown": (0, 1)})
+    with pytest.raises(KeyError):
+        FilterIndex(synthetic_initiatives(10), ("Unknown",))
+
+
+def test_selective_query_is_fast_at_one_million_rows():
+    index = FilterIndex(synthetic_initiatives(1_000_000), NUMERIC, ("Type",))
+    ranges = {"Resolution": (10, 10), "Accuracy (%)": (95, 99), "Num_Agri_Classes": (18, 19)}
+
+    index.select(ranges, {"Type": ["Regional"]})
+    started = time.perf_counter()
+    for _ in range(20):
+        rows = index.select(ranges, {"Type": ["Regional"]})
+    elapsed_ms = (time.perf_counter() - started) * 1000 / 20
+
+    assert rows.size > 0 and np.all(np.diff(rows) > 0)
+    assert elapsed_ms < 50  # loose bound for shared CI machines
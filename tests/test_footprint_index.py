@@ -0,0 +1,98 @@
+"""Tests for the initiative footprint index and the views built on it."""
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from scripts.utilities import footprint_index, geometry_store
+from scripts.utilities.data_plane import DataSnapshot
+from scripts.utilities.footprint_index import FootprintIndex, footprint_spec, get_footprint_index
+
+METADATA = {
+    "World": {"coverage": "Global", "footprint": {"extent": "global"}},
+    "Soy": {"coverage": "Continental"},
+    "Brazil": {"coverage": "National", "footprint": {"extent": "brazil"}},
+    "Amazon": {"coverage": "Regional", "footprint": {"extent": "states", "states": ["pa", "AM", "AM"]}},
+    "South": {"coverage": "Regional", "footprint": {"extent": "states", "states": ["PR", "SC", "RS"]}},
+}
+
+
+def test_footprint_spec_validates_and_falls_back_to_coverage():
+    assert footprint_spec(METADATA["Soy"]) == {"extent": "south_america"}
+    assert footprint_spec({"coverage": "Regional"}) == {"extent": "brazil"}
+    assert footprint_spec(METADATA["Amazon"]) == {"extent": "states", "states": ["AM", "PA"]}
+    with pytest.raises(ValueError):
+        footprint_spec({"footprint": {"extent": "planet"}})
+    with pytest.raises(ValueError):
+        footprint_spec({"footprint": {"extent": "states", "states": ["XX"]}})
+
+
+def test_region_queries_and_overlaps():
+    index = FootprintIndex(METADATA)
+
+    assert index.covering_state("pa") == ["World", "Soy", "Brazil", "Amazon"]
+    assert index.covering_state("SC") == ["World", "Soy", "Brazil", "South"]
+    assert index.covering_mesoregion("South") == ["World", "Soy", "Brazil", "South"]
+    assert index.covering_point(2.35, 48.85) == ["World"]
+    with pytest.raises(KeyError):
+        index.covering_state("XX")
+
+    assert index.overlap_area("Amazon", "South") == 0.0
+    assert index.overlap_area("Amazon", "Brazil") == pytest.approx(index.area("Amazon"))
+    # Brazil is roughly 8.5 million km² (its UF boxes overestimate it a little)
+    assert 8e6 < index.area("Brazil") < 1.2e7
+
+    matrix = index.overlap_matrix(["Amazon", "Brazil", "South"])
+    assert matrix.loc["Amazon", "Brazil"] == pytest.approx(1.0)
+    assert 0 < matrix.loc["Brazil", "Amazon"] < 1
+    assert matrix.loc["Amazon", "South"] == 0.0
+    with pytest.raises(TypeError):
+        index.specs["Amazon"]["extent"] = "global"
+
+
+def test_state_footprints_answer_from_their_uf_lists():
+    index = FootprintIndex({
+        "TerraClass Amazonia": {"footprint": {"extent": "states", "states": [
+            "AC", "AM", "AP", "MA", "MT", "PA", "RO", "RR", "TO",
+        ]}},
+        "TerraClass Cerrado": {"footprint": {"extent": "states", "states": [
+            "BA", "DF", "GO", "MA", "MG", "MS", "MT", "PI", "PR", "SP", "TO",
+        ]}},
+        "Brazil": {"footprint": {"extent": "brazil"}},
+    })
+
+    # Overlapping UF boxes used to report both as covering their neighbours
+    assert index.covering_state("PI") == ["TerraClass Cerrado", "Brazil"]
+    coverage = index.state_coverage()
+    for code in ("ES", "RJ", "SE"):
+        assert coverage[code] == ["Brazil"]
+    assert coverage["MA"] == ["TerraClass Amazonia", "TerraClass Cerrado", "Brazil"]
+    assert index.covering_mesoregion("South") == ["Brazil"]
+    assert "TerraClass Amazonia" in index.covering_mesoregion("North")
+
+
+def test_index_is_built_once_per_version(monkeypatch):
+    monkeypatch.setattr(geometry_store, "get_geometry_store", lambda: None)
+    snapshot = DataSnapshot("footprint-v1", None, METADATA, {})
+    index = get_footprint_index(snapshot)
+    assert get_footprint_index(snapshot) is index
+    assert get_footprint_index(DataSnapshot("footprint-v2", None, METADATA, {})) is not index
+    assert len(footprint_index._cache) <= footprint_index.MAX_CACHED_INDEXES
+
+
+def _comparison_app():
+    from dashboard.components.initiative_analysis.charts.comparison import render_spatial_overlap_tab
+    from dashboard.components.overview import initiative_map
+    from scripts.utilities.data_plane import session_snapshot
+
+    df = session_snapshot().initiatives
+    initiative_map.render(df)
+    render_spatial_overlap_tab(df)
+
+
+def test_map_and_comparison_render_from_the_index():
+    at = AppTest.from_function(_comparison_app, default_timeout=60).run()
+    assert not at.exception
+
+    at.selectbox(key="comparison_overlap_state").select("PA").run()
+    assert not at.exception
+    assert any(m.value.endswith("initiatives cover **PA**") for m in at.markdown)
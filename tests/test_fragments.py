@@ -0,0 +1,53 @@
+"""Tests for fragment-scoped reruns and per-fragment stores."""
+
+from streamlit.testing.v1 import AppTest
+
+
+def _app():
+    import streamlit as st
+
+    from dashboard.components.shared.fragments import fragment_memo, isolated_fragment
+
+    st.session_state.setdefault("page_runs", 0)
+    st.session_state.setdefault("filter_runs", 0)
+    st.session_state["page_runs"] += 1
+
+    source = st.session_state.setdefault("source", {"items": list(range(10))})
+
+    @isolated_fragment
+    def explorer():
+        threshold = st.slider("threshold", 0, 10, 5, key="threshold")
+        st.checkbox("detail", key="detail")
+
+        def compute():
+            st.session_state["filter_runs"] += 1
+            return [item for item in source["items"] if item >= threshold]
+
+        selected = fragment_memo("explorer", "selected", threshold, compute, source=source)
+        st.markdown(f"count={len(selected)}")
+
+    explorer()
+
+
+def test_fragment_store_recomputes_only_on_filter_change():
+    # AppTest always reruns the whole script; the fragment body must still
+    # render there and its store must survive reruns
+    at = AppTest.from_function(_app).run()
+    assert at.markdown[0].value == "count=5"
+
+    at.slider(key="threshold").set_value(8).run()
+    assert at.markdown[0].value == "count=2"
+    assert at.session_state["filter_runs"] == 2
+
+    # A chart-level widget reuses the filtered data
+    at.checkbox(key="detail").check().run()
+    assert at.session_state["filter_runs"] == 2
+    assert at.session_state["page_runs"] == 3
+
+
+def test_bare_call_renders_directly():
+    from dashboard.components.shared.fragments import isolated_fragment
+
+    calls = []
+    isolated_fragment(lambda value: calls.append(value))(3)
+    assert calls == [3]
@@ -0,0 +1,92 @@
+"""Tests for the offline multi-resolution geometry store and the coverage choropleths."""
+
+import json
+import math
+
+import numpy as np
+import pytest
+from shapely import union_all
+from shapely.geometry import shape
+
+from scripts.utilities import geometry_store
+from scripts.utilities.geometry_store import GeometryStore, build_geometry_store
+
+CODES = ["MT", "MS", "GO", "SP", "PR", "MG"]
+
+
+def _wiggly_grid(nx=3, ny=2, n=200, x0=-60.0, y0=-20.0, size=4.0):
+    """Square states whose vertical borders are detailed sine waves."""
+    def vline(i, ya, yb):
+        wiggle = 0 if i in (0, nx) else 0.3
+        return [(x0 + i * size + wiggle * math.sin(6 * math.pi * (y - y0) / size), y) for y in np.linspace(ya, yb, n)]
+
+    def hline(j, xa, xb):
+        return [(x, y0 + j * size) for x in np.linspace(xa, xb, n)]
+
+    features = []
+    for k, (i, j) in enumerate((i, j) for i in range(nx) for j in range(ny)):
+        xa, xb, ya, yb = x0 + i * size, x0 + (i + 1) * size, y0 + j * size, y0 + (j + 1) * size
+        ring = hline(j, xa, xb)[:-1] + vline(i + 1, ya, yb)[:-1] + hline(j + 1, xa, xb)[::-1][:-1] + vline(i, ya, yb)[::-1][:-1]
+        features.append({
+            "type": "Feature",
+            "properties": {"sigla": CODES[k]},
+            "geometry": {"type": "Polygon", "coordinates": [ring + [ring[0]]]},
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+@pytest.fixture(scope="module")
+def store_path(tmp_path_factory):
+    source = tmp_path_factory.mktemp("geo") / "ufs.geojson"
+    source.write_text(json.dumps(_wiggly_grid()))
+    return build_geometry_store(source, source.with_suffix(".npz"))
+
+
+def test_levels_preserve_shared_borders(store_path):
+    store = GeometryStore(store_path)
+    assert store.feature_ids("state") == sorted(CODES)
+    assert store.feature_ids("mesoregion") == ["Central-West", "South", "Southeast"]
+
+    for level in store.levels:
+        polygons = [shape(feature["geometry"]) for feature in store.geojson("state", level)["features"]]
+        assert all(polygon.is_valid for polygon in polygons)
+        # No gaps or overlaps between neighbouring states at any level
+        assert sum(p.area for p in polygons) == pytest.approx(96.0, abs=1e-6)
+        assert union_all(polygons).area == pytest.approx(96.0, abs=1e-6)
+
+    sizes = store.payload_bytes("state")
+    assert sizes["overview"] < sizes["medium"] < sizes["full"] / 5
+
+
+def test_store_loads_lazily_and_shares_frozen_geojson(store_path):
+    store = GeometryStore(store_path)
+    assert store._archive is None
+    assert store.level_for_zoom(1.0) == "overview"
+
+    collection = store.geojson("mesoregion", "overview")
+    assert list(store._arcs) == ["overview"]
+    assert store.geojson("mesoregion", "overview") is collection
+    with pytest.raises(TypeError):
+        collection["features"].append({})
+    with pytest.raises(ValueError):
+        store.geojson("state", "ultra")
+
+
+def test_coverage_choropleth_uses_store(store_path, monkeypatch):
+    from dashboard.components.agricultural_analysis.charts.availability import (
+        plot_conab_spatial_coverage_map,
+    )
+
+    calendar = {"crop_calendar": {"Soja": [
+        {"state": "Mato Grosso", "calendar": {"January": "P", "February": "H"}},
+        {"state": "Paraná", "calendar": {"March": "PH"}},
+    ]}}
+    monkeypatch.setattr(geometry_store, "get_geometry_store", lambda: None)
+    assert plot_conab_spatial_coverage_map(calendar) is None
+
+    monkeypatch.setattr(geometry_store, "get_geometry_store", lambda: GeometryStore(store_path))
+    fig = plot_conab_spatial_coverage_map(calendar)
+    assert list(fig.data[0].locations) == ["MT", "PR"]
+
+    regions = plot_conab_spatial_coverage_map(calendar, layer="mesoregion", level="overview")
+    assert list(regions.data[0].locations) == ["Central-West", "South"]
@@ -0,0 +1,106 @@
+"""Tests for level-of-detail heatmap pyramids and the heatmap builders using them."""
+
+import numpy as np
+import pytest
+
+from dashboard.components.agricultural_analysis.charts.availability.regional_activity import (
+    plot_state_crop_distribution,
+)
+from dashboard.components.agricultural_analysis.charts.calendar.national_calendar_matrix import (
+    calendar_heatmap_pyramids,
+    create_calendar_heatmap_chart,
+)
+from dashboard.components.initiative_analysis.charts.temporal.coverage_matrix_heatmap_component import (
+    build_coverage_availability_figure,
+    coverage_pyramid,
+)
+from scripts.plotting.heatmap_lod import HeatmapPyramid
+from scripts.plotting.trace_consolidation import synthetic_crop_calendar, synthetic_timeline_metadata
+
+
+@pytest.fixture()
+def pyramid():
+    z = np.arange(1000 * 40, dtype=float).reshape(1000, 40)
+    z[3, 4] = np.nan
+    return HeatmapPyramid(z, [f"r{i}" for i in range(1000)], [f"c{j}" for j in range(40)])
+
+
+def test_view_fits_budget_and_aggregates_nan_aware(pyramid):
+    view = pyramid.view(max_rows=100, max_cols=10)
+    source = np.arange(1000 * 40, dtype=float).reshape(1000, 40)
+    source[3, 4] = np.nan
+
+    assert view.z.shape[0] <= 100 and view.z.shape[1] <= 10
+    assert not view.full_resolution
+    step_r, step_c = view.row_step, view.col_step
+    assert view.z[0, 0] == pytest.approx(np.nanmean(source[:step_r, :step_c]))
+    assert view.row_labels[0] == f"r0 – r{step_r - 1} ({step_r})"
+    assert sum(view.row_sizes) == 1000
+
+
+def test_narrow_window_drills_to_full_resolution(pyramid):
+    view = pyramid.view(max_rows=100, max_cols=40, row_range=(500, 560))
+    assert view.full_resolution
+    assert view.row_range == (500, 560)
+    assert view.row_labels[0] == "r500"
+    assert view.z[0, 0] == 500 * 40
+
+
+def test_levels_are_built_on_first_use(pyramid):
+    assert pyramid._levels == {}
+    assert len(pyramid.levels) == 11 * 7
+
+    view = pyramid.view(max_rows=100, max_cols=10)
+    assert list(pyramid._levels) == [(4, 2)]
+    assert view.z is not None and not view.z.flags.writeable
+    pyramid.view(max_rows=100, max_cols=10, row_range=(0, 10))
+    assert sorted(pyramid._levels) == [(0, 2), (4, 2)]
+
+
+def test_pyramids_are_cached_per_source_object():
+    calendar = {"crop_calendar": synthetic_crop_calendar(50)}
+    pyramids = calendar_heatmap_pyramids(calendar)
+    assert calendar_heatmap_pyramids(calendar) is pyramids
+    assert calendar_heatmap_pyramids(dict(calendar)) is not pyramids
+
+    metadata = synthetic_timeline_metadata(300)
+    build_coverage_availability_figure(metadata, max_rows=100)
+    pyramid = coverage_pyramid(metadata)
+    build_coverage_availability_figure(metadata, row_range=(0, 200), max_rows=100)
+    assert coverage_pyramid(metadata) is pyramid
+
+
+def test_invalid_arguments_raise(pyramid):
+    with pytest.raises(ValueError):
+        pyramid.view(row_range=(10, 5))
+    with pytest.raises(ValueError):
+        pyramid.view(max_rows=0)
+    with pytest.raises(ValueError):
+        HeatmapPyramid([[1, 2]], ["a"], ["x", "y"], agg="median")
+    with pytest.raises(ValueError):
+        HeatmapPyramid([[1, 2]], ["a", "b"], ["x", "y"])
+
+
+def test_builders_cap_cells():
+    calendar = {"crop_calendar": synthetic_crop_calendar(500)}
+    fig = create_calendar_heatmap_chart(calendar, max_rows=60)
+    assert len(fig.data[0].y) <= 60
+
+    states = [f"S{i:03d}" for i in range(300)]
+    conab = {"crop_calendar": {
+        f"Crop {c}": [{"state": s} for s in states[c % 7::7]] for c in range(400)
+    }}
+    fig = plot_state_crop_distribution(conab, max_rows=50, max_cols=40)
+    z = np.asarray(fig.data[0].z)
+    assert z.shape[0] <= 50 and z.shape[1] <= 40
+
+
+def test_coverage_view_switches_to_lod_heatmap_over_budget():
+    metadata = synthetic_timeline_metadata(300)
+
+    aggregated = build_coverage_availability_figure(metadata, max_rows=100)
+    assert len(aggregated.data) == 1 and aggregated.data[0].type == "heatmap"
+    assert len(aggregated.data[0].y) <= 100
+
+    drilled = build_coverage_availability_figure(metadata, row_range=(0, 50), max_rows=100)
+    assert len(drilled.data) == 50
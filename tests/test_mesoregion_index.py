@@ -0,0 +1,143 @@
+"""Tests for the compiled mesoregion index of the JSON interpreter."""
+
+import json
+
+import pandas as pd
+
+from scripts.utilities import json_interpreter
+from scripts.utilities.json_interpreter import (
+    MesoregionIndex,
+    enrich_conab_data_with_mesoregions,
+    get_integrated_conab_analysis,
+    get_mesoregion_by_state,
+    get_mesoregion_index,
+    get_mesoregion_info,
+)
+
+MESOREGIONS = {
+    "mesoregions": {
+        "North": {
+            "name_pt": "Norte",
+            "color": "#CCEBC5",
+            "states": [{"sigla": "RO", "nome": "Rondônia"}],
+        },
+        "South": {
+            "name_pt": "Sul",
+            "color": "#FBB4AE",
+            "states": [{"sigla": "PR", "nome": "Paraná"}, {"sigla": "RS", "nome": "RS"}],
+        },
+    }
+}
+
+
+def test_lookups_match_dictionary():
+    index = MesoregionIndex(MESOREGIONS)
+
+    assert index.mesoregion_for("pr") == "South"
+    assert index.mesoregion_for("XX") is None
+    assert index.info("Sul")["name_en"] == "South"
+    assert index.color("Norte") == "#CCEBC5"
+    assert get_mesoregion_by_state("RO", MESOREGIONS) == "North"
+    assert get_mesoregion_info("Unknown", MESOREGIONS) is None
+
+
+def test_explicit_dictionaries_are_compiled_once_per_content():
+    index = get_mesoregion_index(MESOREGIONS)
+    assert get_mesoregion_index(json.loads(json.dumps(MESOREGIONS))) is index
+    assert get_mesoregion_index({"mesoregions": {}}) is not index
+
+    # English names win over Portuguese names in every lookup
+    ambiguous = {"mesoregions": {"Sul": {"name_pt": "Norte", "color": "#1"}, "Norte": {"color": "#2"}}}
+    assert get_mesoregion_index(ambiguous).color("Norte") == get_mesoregion_index(ambiguous).info("Norte")["color"] == "#2"
+
+
+def test_enrich_conab_data_uses_bulk_enrich(monkeypatch):
+    calls = []
+    original = MesoregionIndex.enrich
+    monkeypatch.setattr(MesoregionIndex, "enrich", lambda self, codes: calls.append(list(codes)) or original(self, codes))
+    enriched = enrich_conab_data_with_mesoregions(
+        {"crop_coverage": {"Soja": {"regions": ["PR"]}, "Milho": {"regions": ["RO", "XX"]}, "Trigo": {}}},
+        MESOREGIONS,
+    )
+
+    assert calls == [["PR", "RO", "XX"]]
+    milho = enriched["crop_coverage"]["Milho"]
+    assert [r["mesoregion"] for r in milho["regions_with_mesoregions"]] == ["North", None]
+    assert milho["mesoregion_groups"] == {"North": {"states": ["RO"], "color": "#CCEBC5", "name_pt": "Norte"}}
+
+
+def test_info_returns_independent_copy():
+    index = MesoregionIndex(MESOREGIONS)
+    index.info("North")["color"] = "#000000"
+    assert index.color("North") == "#CCEBC5"
+
+
+def test_bulk_enrich_keeps_index_and_handles_missing():
+    codes = pd.Series(["PR", "ro", None, "XX", "PR"], index=[10, 11, 12, 13, 14])
+    enriched = MesoregionIndex(MESOREGIONS).enrich(codes)
+
+    assert list(enriched.index) == [10, 11, 12, 13, 14]
+    assert enriched["mesoregion"].tolist() == ["South", "North", None, None, "South"]
+    assert enriched["mesoregion_pt"].tolist() == ["Sul", "Norte", None, None, "Sul"]
+
+
+def test_enrich_conab_data_groups_and_parses_regions():
+    conab = {
+        "crop_coverage": {"Soja": {"regions": ["PR", "RS", "RO"]}},
+        "regional_coverage": ["Paraná (PR)", "Brasil"],
+    }
+    enriched = enrich_conab_data_with_mesoregions(conab, MESOREGIONS)
+
+    groups = enriched["crop_coverage"]["Soja"]["mesoregion_groups"]
+    assert groups["South"]["states"] == ["PR", "RS"]
+    coverage = enriched["regional_coverage_with_mesoregions"]
+    assert coverage[0]["state_code"] == "PR" and coverage[0]["mesoregion"] == "South"
+    assert coverage[1]["mesoregion"] is None
+    assert set(enriched["mesoregions_palette"]) == {"North", "South"}
+
+
+def test_index_is_rebuilt_only_when_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "json_dictionary.json"
+    path.write_text(json.dumps(MESOREGIONS), encoding="utf-8")
+
+    loads = []
+    original = json_interpreter.load_mesoregions_dictionary
+    monkeypatch.setattr(
+        json_interpreter,
+        "load_mesoregions_dictionary",
+        lambda p=None: loads.append(p) or original(p),
+    )
+
+    first = get_mesoregion_index(dictionary_path=path)
+    assert get_mesoregion_index(dictionary_path=path) is first
+    assert len(loads) == 1
+
+    changed = {"mesoregions": {"North": MESOREGIONS["mesoregions"]["North"]}}
+    path.write_text(json.dumps(changed) + " ", encoding="utf-8")
+    rebuilt = get_mesoregion_index(dictionary_path=path)
+    assert rebuilt is not first
+    assert rebuilt.mesoregion_for("PR") is None
+
+
+def test_integrated_analysis_is_memoized_and_copied(tmp_path):
+    dictionary = tmp_path / "json_dictionary.json"
+    dictionary.write_text(json.dumps(MESOREGIONS), encoding="utf-8")
+    conab = tmp_path / "conab.jsonc"
+    conab.write_text(
+        json.dumps(
+            {
+                "CONAB Crop Monitoring Initiative": {
+                    "detailed_crop_coverage": {"Soja": {"regions": ["PR"]}}
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    first = get_integrated_conab_analysis(conab, dictionary)
+    assert first["summary"]["total_crops"] == 1
+    first["summary"]["total_crops"] = 99
+
+    second = get_integrated_conab_analysis(conab, dictionary)
+    assert second["summary"]["total_crops"] == 1
+    assert second["summary"]["crops_by_mesoregion"]["South"]["total_states"] == 1
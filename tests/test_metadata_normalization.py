@@ -0,0 +1,59 @@
+"""Tests for the shared metadata normalization kernel."""
+
+import pytest
+
+from scripts.utilities import metadata_normalization as kernel
+from scripts.utilities.json_interpreter import parse_accuracy, parse_resolution
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memos():
+    kernel.clear_normalization_memos()
+    yield
+    kernel.clear_normalization_memos()
+
+
+def test_json_interpreter_flavour():
+    assert parse_resolution("10 m") == {"value": 10.0, "min_val": 10.0, "max_val": 10.0}
+    assert parse_resolution(
+        [{"resolution": "250 m"}, {"resolution": 30, "current": True}]
+    )["value"] == 30.0
+    assert parse_accuracy({"status": "not_available", "overall": 90})["value"] == 0.0
+    assert kernel.reference_system_text("EPSG:2, EPSG:1,EPSG:2") == "EPSG:1, EPSG:2"
+    assert kernel.methodology_category(("Random Forest", None)) == "Machine Learning"
+    assert kernel.methodology_category((None, "")) == "Unknown"
+
+
+def test_engine_flavour():
+    assert kernel.resolution_value([{"resolution": "250 m"}]) == 250.0
+    assert kernel.resolution_value(None) == 30.0
+    assert kernel.accuracy_value({"status": "validated", "overall": "85%"}) == 85.0
+    assert kernel.accuracy_value("N/A") == 0.0
+    assert kernel.methodology_group("Visual interpretation, spectral rules") == "Hybrid"
+    assert kernel.method_category(None) == "Combined"
+
+
+def test_memo_distinguishes_types_and_reuses_equal_containers():
+    assert kernel.resolution_range(True) == (1.0, 1.0, 1.0)
+    assert kernel.resolution_range("1") == (1.0, 1.0, 1.0)
+    assert kernel.resolution_range.misses == 2
+
+    first = [{"resolution": 30, "current": True}]
+    second = [{"resolution": 30, "current": True}]
+    assert kernel.resolution_range.batch([first, second, first]) == [(30.0, 30.0, 30.0)] * 3
+    assert kernel.resolution_range.misses == 3
+    assert kernel.resolution_range.hits == 2
+
+
+def test_batch_normalizes_100k_records_quickly():
+    timings = kernel.benchmark_normalization(100_000)
+    # Generous bound for slow CI machines; typically well under a second
+    assert timings["total"] < 3.0
+
+
+def test_batch_matches_single_calls():
+    records = kernel.synthetic_initiative_records(50)
+    values = [record["overall_accuracy"] for record in records]
+    batched = kernel.accuracy_range.batch(values)
+    kernel.clear_normalization_memos()
+    assert batched == [kernel.accuracy_range(value) for value in values]
@@ -0,0 +1,123 @@
+"""Tests for the 12-bit month-mask engine and the charts built on it."""
+
+import numpy as np
+import pytest
+
+from scripts.data_processors.agricultural_data.month_masks import (
+    FULL_YEAR,
+    NO_SEASON,
+    calendar_masks,
+    circular_mean,
+    circular_window,
+    intersection,
+    linear_segments,
+    longest_run,
+    mask_from_months,
+    month_counts,
+    months_from_mask,
+    overlap_matrix,
+    popcount,
+    runs,
+    season_labels,
+    union,
+    window_label,
+)
+
+OCT_MAR = circular_window("October", "March")
+
+
+def test_circular_windows_runs_and_labels():
+    assert OCT_MAR == mask_from_months(["oct", "Nov", "December", 1, "Feb", "mar"])
+    assert months_from_mask(OCT_MAR)[:2] == ["January", "February"]
+    assert runs(OCT_MAR) == [(9, 6)]
+    assert linear_segments(OCT_MAR) == [(0, 3), (9, 12)]
+    assert window_label(OCT_MAR) == "Oct–Mar"
+    assert window_label(mask_from_months(["Jan", "Jun", "Jul"])) == "Jan, Jun–Jul"
+    assert window_label(FULL_YEAR) == "Year-round"
+    with pytest.raises(ValueError):
+        mask_from_months(["Smarch"])
+    with pytest.raises(ValueError):
+        popcount([1 << 12])
+
+    # Lookup-table runs agree with the scalar scan for every mask
+    masks = np.arange(FULL_YEAR + 1)
+    start, length = longest_run(masks)
+    for mask in (0, 1, OCT_MAR, 0b100000000001, 0b010101010101, FULL_YEAR, 0b111000111000):
+        best = max(runs(mask), key=lambda run: run[1], default=(-1, 0))
+        assert (start[mask], length[mask]) == best
+    assert (popcount(masks) == [bin(m).count("1") for m in masks]).all()
+
+    assert season_labels([OCT_MAR, 0, circular_window("Jun", "Aug")]).tolist() == ["Spring", NO_SEASON, "Winter"]
+    assert circular_mean([OCT_MAR])[0] == pytest.approx(11.5)
+    assert np.isnan(circular_mean([0])[0])
+
+
+def test_group_union_intersection_and_overlaps():
+    masks = np.array([OCT_MAR, circular_window("Dec", "Feb"), 0b11, 1 << 6], dtype=np.uint16)
+    groups = np.array([0, 0, 2, 2])
+    assert union(masks, groups).tolist() == [OCT_MAR, 0, 0b1000011]
+    assert intersection(masks, groups, size=4).tolist() == [circular_window("Dec", "Feb"), 0, 0, 0]
+    assert int(union(masks)) == OCT_MAR | (1 << 6)
+
+    overlaps = overlap_matrix(masks)
+    assert overlaps[0, 1] == 3 and overlaps[0, 3] == 0 and (np.diag(overlaps) == popcount(masks)).all()
+    assert month_counts(masks).tolist() == [3, 3, 1, 0, 0, 0, 1, 0, 0, 1, 1, 2]
+
+    planting, harvest = calendar_masks([
+        {"calendar": {"October": "P", "November": "PH", "March": "H", "Smarch": "P"}},
+        {"planting_months": ["Oct"], "harvesting_months": ["Mar", "Apr"]},
+        "not a record",
+    ])
+    assert planting.tolist() == [circular_window(10, 11), 1 << 9]
+    assert harvest.tolist() == [mask_from_months([11, 3]), circular_window(3, 4)]
+
+
+def test_gantt_and_periods_handle_wrap_around_windows():
+    from dashboard.components.agricultural_analysis.charts.calendar.crop_gantt_chart import build_gantt_rows
+    from dashboard.components.agricultural_analysis.charts.calendar.monthly_activity_charts import (
+        create_planting_harvesting_periods_chart,
+    )
+
+    soybean = [
+        {"state_code": "MT", "calendar": {"October": "P", "November": "P", "December": "P", "February": "H"}},
+        {"state_code": "PR", "calendar": {"January": "P", "February": "H", "March": "H"}},
+    ]
+    rows = build_gantt_rows({"Soybean": soybean})
+    planting = [row for row in rows if row["Resource"] == "Planting"]
+    # Oct–Jan is two bars on a Jan–Dec axis, not one bar across the whole year
+    assert [(row["Start"], row["Finish"]) for row in planting] == [(0, 1), (9, 12)]
+    assert {row["Period"] for row in planting} == {"Out–Jan"}
+    assert [(row["Start"], row["Finish"], row["Period"]) for row in rows if row["Resource"] == "Harvest"] == [
+        (1, 3, "Fev–Mar")
+    ]
+
+    fig = create_planting_harvesting_periods_chart({"crop_calendar": {"Soybean": soybean}})
+    heatmap = fig.data[0]
+    assert list(heatmap.y) == ["Soybean (Planting)", "Soybean (Harvesting)"]
+    assert heatmap.z[0].tolist() == [1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1]
+    assert heatmap.z[1].tolist() == [0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+    assert heatmap.customdata[0][0] == "Oct–Jan"
+
+
+def test_conab_seasons_use_majority_masks():
+    from scripts.data_processors.agricultural_data.conab_processor import create_conab_processor
+
+    calendar = {
+        "metadata": {},
+        "states": {code: {"region": "South"} for code in ("PR", "SC", "RS")},
+        "crop_calendar": {"Wheat": [
+            {"state_code": "PR", "state_name": "Paraná", "calendar": {"November": "P", "December": "P", "January": "PH"}},
+            {"state_code": "SC", "state_name": "Santa Catarina", "calendar": {"December": "P", "January": "P", "February": "P", "June": "H"}},
+            {"state_code": "RS", "state_name": "Rio Grande do Sul", "calendar": {"January": "P", "February": "P", "June": "H"}},
+        ]},
+    }
+    processor = create_conab_processor()
+    processor.process_data(calendar)
+    south = processor.get_planting_harvest_seasons()["Wheat"]["South"]
+
+    assert south["planting_months"] == ["january", "february", "december"]
+    assert south["planting_window"] == "Dec–Feb"
+    assert (south["harvest_months"], south["main_harvest_season"]) == (["june"], "Autumn")
+    assert south["main_planting_season"] == "Summer"
+    assert processor._get_season_range(["october", "november", "january"]) == "Spring"
+    assert processor._get_season_range([]) == NO_SEASON
@@ -0,0 +1,68 @@
+"""Tests for the compact Plotly payload post-processor."""
+
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from scripts.plotting.payload_encoding import compact_array, compact_figure, payload_size
+from scripts.utilities import plotly_chart_hook
+
+
+def test_compact_array_picks_smallest_dtype():
+    assert compact_array(list(range(1985, 2025))).dtype == np.int16
+    assert compact_array([0, 1, 2, 3] * 4).dtype == np.int8
+    assert compact_array([0.5, 1.25] * 8, allow_float32=False).dtype == np.float64
+    assert compact_array([0.5, 1.25] * 8, allow_float32=True).dtype == np.float32
+    assert compact_array(["2020"] * 10) is None
+    assert compact_array([1, None] * 8) is None
+    assert np.isnan(compact_array([1.5, None] * 8, allow_missing=True)[1])
+    assert compact_array([1, 2, 3]) is None  # below min_size
+
+
+def test_compact_figure_encodes_typed_arrays_without_touching_input():
+    z = [[i * j for j in range(12)] for i in range(30)]
+    fig = go.Figure(go.Heatmap(z=z, x=list(range(2000, 2012)), text=z, texttemplate="%{text}"))
+    before = fig.to_json()
+
+    compact = compact_figure(fig)
+    trace = json.loads(compact.to_json())["data"][0]
+
+    assert fig.to_json() == before
+    assert trace["z"]["dtype"] == "i2" and trace["x"]["dtype"] == "i2"
+    assert "text" not in trace and trace["texttemplate"] == "%{z}"
+    assert payload_size(compact) < payload_size(fig)
+    assert np.array_equal(compact.data[0].z, np.array(z))
+
+
+def test_hover_text_and_unlabelled_heatmaps_keep_text():
+    z = [[i * j for j in range(12)] for i in range(30)]
+    for fig in (
+        go.Figure(go.Heatmap(z=z, text=z, hovertemplate="v=%{text}")),
+        go.Figure(go.Heatmap(z=z, text=z, texttemplate="%{text}", hovertemplate="v=%{text}<extra></extra>")),
+        go.Figure(go.Heatmap(z=z, text=z, texttemplate="%{text}", hoverinfo="x+y+text")),
+    ):
+        template = fig.data[0].texttemplate
+        trace = json.loads(compact_figure(fig).to_json())["data"][0]
+        assert "text" in trace
+        assert trace.get("texttemplate") == template
+
+
+def test_hook_transformer_replaces_displayed_figure(monkeypatch):
+    shown = []
+    monkeypatch.setattr(st, "plotly_chart", lambda fig, *args, **kwargs: shown.append(fig))
+    monkeypatch.setattr(plotly_chart_hook, "_installed", False)
+    monkeypatch.setattr(plotly_chart_hook, "_transformers", [])
+    monkeypatch.setattr(plotly_chart_hook, "_observers", [])
+
+    plotly_chart_hook.add_plotly_chart_transformer(compact_figure)
+    fig = go.Figure(go.Bar(y=list(range(300))))
+    st.plotly_chart(fig)
+    small = go.Figure(go.Bar(y=list(range(20))))
+    st.plotly_chart(small)
+
+    assert shown[0] is not fig
+    assert shown[0].data[0].y.dtype == np.int16
+    # Small figures skip the to_dict round trip entirely
+    assert shown[1] is small
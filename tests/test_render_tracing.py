@@ -0,0 +1,115 @@
+"""Tests for the render tracing API."""
+
+import json
+import sys
+import threading
+import tracemalloc
+import types
+
+import pytest
+
+from scripts.utilities import render_tracing
+from scripts.utilities.render_tracing import (
+    get_tracer,
+    instrument_components,
+    set_tracing_mode,
+    trace_render,
+    trace_rerun,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_tracer():
+    mode = render_tracing.get_tracing_mode()
+    get_tracer().clear()
+    yield
+    get_tracer().clear()
+    set_tracing_mode(mode)
+
+
+def test_decorator_records_timings():
+    @trace_render("demo.render_chart")
+    def render_chart():
+        return sum(range(1000))
+
+    with trace_rerun("Demo"):
+        render_chart()
+        render_chart()
+
+    records = get_tracer().last_rerun()
+    names = [r.component for r in records]
+    assert names.count("demo.render_chart") == 2
+    assert "page:Demo" in names
+    assert all(r.page == "Demo" and r.wall_ms >= 0 for r in records)
+
+
+def test_full_mode_measures_allocations_and_errors():
+    set_tracing_mode("full")
+
+    with pytest.raises(ValueError), trace_render("demo.failing"):
+        _buffer = bytearray(256 * 1024)
+        raise ValueError("boom")
+
+    (record,) = get_tracer().records()
+    assert record.error == "ValueError"
+    assert record.process_peak_kb is not None and record.process_peak_kb >= 200
+
+
+def test_concurrent_spans_keep_peaks_and_full_mode_off_stops_tracemalloc():
+    was_tracing = tracemalloc.is_tracing()
+    set_tracing_mode("full")
+
+    with trace_render("session.a"):
+        _buffer = bytearray(256 * 1024)
+        del _buffer
+        # A span opened by another session must not reset this span's peak
+        other = threading.Thread(target=lambda: trace_render("session.b").__enter__().__exit__(None, None, None))
+        other.start()
+        other.join()
+
+    peaks = {r.component: r.process_peak_kb for r in get_tracer().records()}
+    assert peaks["session.a"] >= 200
+    assert render_tracing._open_memory_spans == 0
+
+    set_tracing_mode("basic")
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def test_off_mode_records_nothing():
+    set_tracing_mode("off")
+
+    with trace_render("demo.silent"):
+        pass
+
+    assert get_tracer().records() == []
+
+
+def test_summary_and_json_dump(tmp_path):
+    for _ in range(3):
+        with trace_render("demo.component"):
+            pass
+
+    (row,) = get_tracer().summary()
+    assert row["component"] == "demo.component" and row["calls"] == 3
+
+    dumped = json.loads(get_tracer().dump_json(tmp_path / "t.json").read_text())
+    assert len(dumped["records"]) == 3
+
+
+def test_instrument_components_rebinds_imported_references(monkeypatch):
+    component = types.ModuleType("dashboard.components.fake_component")
+    exec("def render_fake():\n    return 42\ndef helper():\n    return 1", component.__dict__)
+    component.render_fake.__module__ = component.__name__
+    page = types.ModuleType("dashboard.fake_page")
+    page.render_fake = component.render_fake
+    monkeypatch.setitem(sys.modules, component.__name__, component)
+    monkeypatch.setitem(sys.modules, page.__name__, page)
+
+    instrument_components()
+
+    assert page.render_fake is component.render_fake
+    assert page.render_fake() == 42
+    assert not getattr(component.helper, "__traced__", False)
+    assert [r.component for r in get_tracer().records()] == [
+        "fake_component.render_fake"
+    ]
@@ -0,0 +1,109 @@
+"""Tests for the multi-safra crop calendar arrays and diff engine."""
+
+import json
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from scripts.data_processors.agricultural_data import safra_calendar
+from scripts.data_processors.agricultural_data.safra_calendar import (
+    BASE_CALENDAR_PATH,
+    SafraCalendar,
+    load_safra_calendar,
+)
+
+
+def _safra(label, soybean, corn=None):
+    crops = {"Soybean": [
+        {"state_code": "MT", "state_name": "Mato Grosso", "region": "Central-West", "calendar": soybean},
+    ]}
+    if corn:
+        crops["Corn"] = [{"state_code": "PR", "state_name": "Paraná", "region": "South", "calendar": corn}]
+    return {"metadata": {"safra": label}, "states": {}, "crop_calendar": crops}
+
+
+def test_base_calendar_round_trips_through_arrays():
+    calendar = load_safra_calendar(cache_path=None)
+    rebuilt = calendar.calendar("current")
+
+    original = safra_calendar._read_jsonc(BASE_CALENDAR_PATH)
+    assert json.dumps(rebuilt["crop_calendar"]) == json.dumps(original["crop_calendar"])
+    assert calendar.calendar("current") is rebuilt
+    with pytest.raises(TypeError):
+        rebuilt["crop_calendar"]["Soybean"].append({})
+    with pytest.raises(KeyError):
+        calendar.calendar("1999/00")
+
+
+def test_additional_safras_load_incrementally(tmp_path, monkeypatch):
+    base = tmp_path / "base.jsonc"
+    base.write_text(json.dumps(_safra("2023/24", {"October": "P", "February": "H"})))
+    safras = tmp_path / "safras"
+    safras.mkdir()
+    cache = tmp_path / "cache.npz"
+    assert load_safra_calendar(base, safras, cache).safras == ("2023/24",)
+
+    (safras / "2024-25.json").write_text(json.dumps(_safra("2024/25", {"November": "P"}, {"March": "PH"})))
+    parsed = []
+    read = safra_calendar._read_jsonc
+    monkeypatch.setattr(safra_calendar, "_read_jsonc", lambda path: parsed.append(path.name) or read(path))
+
+    calendar = load_safra_calendar(base, safras, cache)
+    assert parsed == ["2024-25.json"]
+    assert calendar.safras == ("2023/24", "2024/25")
+    assert calendar.codes.shape == (2, 2, 2, 12)
+    # Crops and states first seen in a later safra are absent from earlier ones
+    assert not calendar.present[0, calendar.crops.index("Corn")].any()
+
+    assert load_safra_calendar(base, safras, cache).safras == calendar.safras
+    assert parsed == ["2024-25.json"]
+
+
+def test_diff_reports_cells_and_circular_window_shifts():
+    calendar = SafraCalendar().add_safra(
+        "a", _safra("a", {"November": "P", "December": "P", "January": "P", "April": "H"}, {"May": "P"})
+    ).add_safra(
+        "b", _safra("b", {"December": "P", "January": "P", "February": "P", "April": "H"}, {"May": "P"})
+    )
+    diff = calendar.diff("a", "b")
+
+    assert diff.cells[["crop", "month", "before", "after"]].values.tolist() == [
+        ["Soybean", "February", "", "P"],
+        ["Soybean", "November", "P", ""],
+    ]
+    assert diff.changed_entries == 1
+    # Nov–Jan → Dec–Feb moves one month later across the year boundary
+    planting = diff.shifts.set_index("window").loc["planting"]
+    assert planting["shift_months"] == pytest.approx(1.0)
+    assert (planting["added"], planting["removed"]) == ("February", "November")
+    assert "harvest" not in set(diff.shifts["window"])
+
+    assert calendar.diff("a", "b", regions=["South"]).cells.empty
+    with pytest.raises(ValueError):
+        calendar.add_safra("a", _safra("a", {}))
+    with pytest.raises(ValueError):
+        SafraCalendar().add_safra("x", _safra("x", {"May": "Q"}))
+
+
+def _calendar_page():
+    from dashboard.agricultural_analysis import render_crop_calendar_page
+
+    render_crop_calendar_page()
+
+
+def test_safra_selector_and_changes_tab(tmp_path, monkeypatch):
+    original = safra_calendar._read_jsonc(BASE_CALENDAR_PATH)
+    later = json.loads(json.dumps(original))
+    later["metadata"]["safra"] = "next"
+    later["crop_calendar"]["Soybean"][0]["calendar"]["September"] = "P"
+    (tmp_path / "next.json").write_text(json.dumps(later))
+    monkeypatch.setattr(safra_calendar, "SAFRA_DIR", tmp_path)
+    monkeypatch.setattr(safra_calendar, "CACHE_PATH", tmp_path / "cache.npz")
+
+    at = AppTest.from_function(_calendar_page, default_timeout=120).run()
+    assert not at.exception
+    assert at.selectbox(key="crop_calendar_safra").options == ["current", "next"]
+    assert at.selectbox(key="crop_calendar_safra").value == "next"
+    assert at.selectbox(key="crop_calendar_safra_baseline").value == "current"
+    metrics = {m.label: m.value for m in at.metric}
+    assert (metrics["Changed cells"], metrics["Changed crop/state pairs"]) == ("1", "1")
@@ -0,0 +1,69 @@
+"""Tests for the inverted search index over initiatives and sensors."""
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from scripts.utilities.data_plane import DataSnapshot
+from scripts.utilities.search_index import build_search_index, get_search_index, tokenize
+
+INITIATIVES = pd.DataFrame({
+    "Name": ["MapBiomas", "Soybean Maps", "Global Cropland"],
+    "Acronym": ["MB", "SOY", "GCL"],
+    "Provider": ["MapBiomas Network", "University of Maryland", "São Paulo Institute"],
+    "Methodology": ["Random Forest", "Deep Learning", "Machine Learning"],
+    "Class_Legend": ['["Soybean", "Pasture"]', '["Soybean"]', '["Cropland"]'],
+    "Primary_Sensor": ["LANDSAT_8_OLI_TIRS", "LANDSAT_8_OLI_TIRS", "SENTINEL_2_MSI"],
+})
+SENSORS = {
+    "SENTINEL_2_MSI": {"display_name": "Sentinel-2 MSI", "instrument_names": ["MultiSpectral Instrument"]},
+    "LANDSAT_8_OLI_TIRS": {"display_name": "Landsat 8", "instrument_names": ["OLI", "TIRS"]},
+}
+
+
+def _keys(hits):
+    return [hit.key for hit in hits]
+
+
+def test_tokenize_normalizes_case_accents_and_separators():
+    assert tokenize("São Paulo_Institute, Sentinel-2") == ["sao", "paulo", "institute", "sentinel", "2"]
+
+
+def test_exact_prefix_and_typo_matches_are_ranked():
+    index = build_search_index(INITIATIVES, sensors=SENSORS)
+
+    # Name matches outrank legend-only matches
+    assert _keys(index.search("soybean", kind="initiative")) == ["Soybean Maps", "MapBiomas"]
+    assert _keys(index.search("mapbio")) == ["MapBiomas"]
+    assert _keys(index.search("sentnel")) == ["SENTINEL_2_MSI", "Global Cropland"]
+    assert _keys(index.search("instrument", kind="sensor")) == ["SENTINEL_2_MSI"]
+    # Every token must match
+    assert _keys(index.search("deep soy")) == ["Soybean Maps"]
+    assert index.search("deep random") == []
+    assert index.search("  ") == []
+
+
+def test_index_is_built_once_per_version():
+    first = DataSnapshot("v-test-1", INITIATIVES, {}, SENSORS)
+    assert get_search_index(first) is get_search_index(DataSnapshot("v-test-1", INITIATIVES, {}, {}))
+    assert get_search_index(DataSnapshot("v-test-2", INITIATIVES, {}, SENSORS)) is not get_search_index(first)
+
+
+def _picker_app():
+    import streamlit as st
+
+    from dashboard import overview
+    from scripts.utilities.data_plane import session_snapshot
+
+    snapshot = session_snapshot()
+    overview.render_initiative_details(snapshot.initiatives, snapshot.metadata, snapshot.sensors)
+
+
+def test_picker_ranks_search_results():
+    at = AppTest.from_function(_picker_app, default_timeout=60).run()
+    assert not at.exception
+    total = len(at.selectbox(key="modern_overview_select").options)
+
+    at.text_input(key="modern_overview_search").input("mapbiomas").run()
+    assert not at.exception
+    options = at.selectbox(key="modern_overview_select").options
+    assert options[0].startswith("MapBiomas") and len(options) < total
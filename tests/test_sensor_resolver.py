@@ -0,0 +1,45 @@
+"""Tests for the sensor resolver used by the overview sensor details."""
+
+import pandas as pd
+
+from scripts.utilities.data_plane import DataSnapshot
+from scripts.utilities.sensor_resolver import SensorResolver, get_sensor_resolver
+
+SENSORS = {
+    "SENTINEL_2_MSI": {"display_name": "Sentinel-2 MSI", "sensor_family": "Sentinel", "platform_name": "Sentinel-2A, Sentinel-2B"},
+    "LANDSAT_8_OLI_TIRS": {"display_name": "Landsat 8 OLI/TIRS", "sensor_family": "Landsat", "platform_name": "Landsat 8"},
+    "LANDSAT_LEGACY": {"display_name": "Landsat Legacy", "sensor_family": "Landsat", "platform_name": "Landsat 5"},
+}
+INITIATIVES = pd.DataFrame({
+    "Name": ["A", "B", "C", "D"],
+    "Primary_Sensor": ["SENTINEL_2_MSI", "N/A", None, "Landsat-8, Sentinel-2"],
+    "Data_Source": ["x", "y", "Sentinal 2 MSI", "z"],
+})
+
+
+def test_resolves_aliases_spans_and_typos():
+    resolver = SensorResolver(SENSORS)
+
+    assert resolver.resolve("sentinel_2_msi") == ("SENTINEL_2_MSI", "alias")
+    assert resolver.resolve("Landsat 8 OLI/TIRS") == ("LANDSAT_8_OLI_TIRS", "alias")
+    # Family aliases resolve to the first sensor declaring them
+    assert resolver.resolve("landsat") == ("LANDSAT_8_OLI_TIRS", "alias")
+    assert resolver.resolve("Imagery from Landsat 5 and others") == ("LANDSAT_LEGACY", "span")
+    assert resolver.resolve("Sentinal-2 MSI") == ("SENTINEL_2_MSI", "fuzzy")
+    assert resolver.resolve("aerial photography") == (None, None)
+    assert resolver.resolve("") == (None, None)
+
+
+def test_initiatives_are_resolved_once_per_version():
+    snapshot = DataSnapshot("sensor-test-v1", INITIATIVES, {}, SENSORS)
+    resolver = get_sensor_resolver(snapshot)
+    assert get_sensor_resolver(snapshot) is resolver
+
+    resolutions = resolver.resolutions
+    assert resolutions["A"].sensor_key == "SENTINEL_2_MSI"
+    # The first non-empty field is the sensor text, and "N/A" means none
+    assert resolutions["B"].sensor_info is None
+    assert resolutions["C"].sensor_key == "SENTINEL_2_MSI"
+    assert resolutions["D"].sensor_key == "LANDSAT_8_OLI_TIRS"
+    # Rows outside the snapshot are resolved on the fly
+    assert resolver.for_initiative(pd.Series({"Name": "E", "Sensor": "Landsat 5"})).sensor_key == "LANDSAT_LEGACY"
@@ -0,0 +1,127 @@
+"""Tests for single-flight coalescing of concurrent loader calls."""
+
+import threading
+import time
+
+from scripts.data_processors.agricultural_data.conab_processor import CONABProcessor
+from scripts.utilities.single_flight import (
+    SingleFlightGroup,
+    argument_fingerprint,
+    get_single_flight_stats,
+    single_flight,
+)
+
+
+def _run_concurrently(target, count):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    calls = []
+
+    @single_flight(name="test.slow_load")
+    def slow_load(path):
+        calls.append(path)
+        time.sleep(0.1)
+        return {"rows": [1, 2, 3]}
+
+    results = _run_concurrently(lambda: slow_load("a.json"), 10)
+
+    assert calls == ["a.json"]
+    assert all(result == {"rows": [1, 2, 3]} for result in results)
+    # Waiters get copies, never the owner's object
+    assert len({id(result) for result in results}) == 10
+    stats = get_single_flight_stats()["test.slow_load"]
+    assert stats == {"calls": 10, "executions": 1, "coalesced": 9, "errors": 0}
+
+
+def test_sequential_calls_are_not_cached():
+    group = SingleFlightGroup()
+    counter = iter(range(10))
+    assert group.do("f", "k", lambda: next(counter)) == 0
+    assert group.do("f", "k", lambda: next(counter)) == 1
+    assert group.stats()["f"]["coalesced"] == 0
+
+
+def test_errors_reach_every_waiter():
+    group = SingleFlightGroup()
+
+    def failing():
+        time.sleep(0.05)
+        raise ValueError("bad file")
+
+    def call():
+        try:
+            group.do("f", "k", failing)
+        except ValueError as e:
+            return str(e)
+
+    assert _run_concurrently(call, 5) == ["bad file"] * 5
+    assert group.in_flight() == 0
+
+
+def test_fingerprint_matches_equal_content():
+    assert argument_fingerprint({"a": [1, 2]}) == argument_fingerprint({"a": [1, 2]})
+    assert argument_fingerprint({"a": [1, 2]}) != argument_fingerprint({"a": [2, 1]})
+
+
+def test_conab_process_data_keeps_processor_state():
+    raw = {
+        "metadata": {},
+        "crop_calendar": {
+            "Soybean": [{"state_code": "MT", "state_name": "Mato Grosso", "calendar": {"Jan": "H"}}]
+        },
+    }
+    processors = [CONABProcessor() for _ in range(4)]
+    pending = list(processors)
+    results = _run_concurrently(lambda: pending.pop().process_data(raw), 4)
+
+    assert all(result["crop_calendar"]["jan"].tolist() == ["Harvest"] for result in results)
+    for processor in processors:
+        assert processor.detected_crops == ["Soybean"]
+        assert processor.get_crop_calendar()["crop"].tolist() == ["Soybean"]
+
+
+def test_conab_files_coalesce_on_file_version(tmp_path, monkeypatch):
+    import json
+
+    from scripts.utilities import single_flight as single_flight_module
+
+    path = tmp_path / "conab.jsonc"
+    path.write_text(json.dumps({
+        "metadata": {},
+        "crop_calendar": {"Corn": [{"state_code": "PR", "state_name": "Paraná", "calendar": {"March": "P"}}]},
+    }), encoding="utf-8")
+
+    def no_fingerprint(*args, **kwargs):
+        raise AssertionError("raw data must not be fingerprinted")
+
+    monkeypatch.setattr(single_flight_module, "argument_fingerprint", no_fingerprint)
+    original = CONABProcessor._process_crop_calendar
+    monkeypatch.setattr(
+        CONABProcessor, "_process_crop_calendar", lambda self, data: time.sleep(0.2) or original(self, data)
+    )
+    before = get_single_flight_stats().get("CONABProcessor.process_data", {"executions": 0})["executions"]
+
+    def load():
+        processor = CONABProcessor()
+        processor.process_data(processor.load_raw_data(path))
+        return processor
+
+    processors = _run_concurrently(load, 4)
+
+    stats = get_single_flight_stats()["CONABProcessor.process_data"]
+    assert stats["executions"] - before == 1
+    assert all(p.get_crop_calendar()["march"].tolist() == ["Planting"] for p in processors)
@@ -0,0 +1,28 @@
+"""Tests for the cached global stylesheet bundle."""
+
+from styles.dashboard_styles import DashboardStyles
+from styles.style_bundle import get_style_bundle, minify_css
+
+
+def test_minify_css_strips_tags_comments_and_whitespace():
+    css = """
+    <style>
+    /* comment */
+    .card {
+        color: red;
+        margin: 0 auto;
+    }
+    </style>
+    """
+
+    assert minify_css(css) == ".card{color:red;margin:0 auto}"
+
+
+def test_bundle_is_built_once_and_hashed():
+    css, digest = get_style_bundle()
+
+    assert get_style_bundle()[0] is css
+    assert len(digest) == 12
+    assert "<style" not in css
+    assert ".breadcrumb{" in css and ".nav-link{" in css
+    assert minify_css(DashboardStyles.get_card_styles()) in css
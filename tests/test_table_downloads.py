@@ -0,0 +1,80 @@
+"""Tests for the lazy table download helpers."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from scripts.utilities import table_downloads
+from scripts.utilities.table_downloads import (
+    available_formats,
+    frame_fingerprint,
+    iter_csv_chunks,
+    serialize_frame,
+    write_frame,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    table_downloads.clear_download_cache()
+    yield
+    table_downloads.clear_download_cache()
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"crop": ["Soy", "Corn", "Rice"], "area": [1.5, 2.0, 3.25]})
+
+
+def test_chunked_csv_matches_pandas(df):
+    chunks = list(iter_csv_chunks(df, chunk_rows=2))
+
+    assert len(chunks) == 2
+    assert b"".join(chunks).decode("utf-8") == df.to_csv(index=False)
+
+
+def test_fingerprint_tracks_content(df):
+    changed = df.copy()
+    changed.loc[0, "area"] = 9.0
+
+    assert frame_fingerprint(df) == frame_fingerprint(df.copy())
+    assert frame_fingerprint(df) != frame_fingerprint(changed)
+
+
+def test_serialize_frame_is_cached_by_fingerprint(df, monkeypatch):
+    calls = []
+    original = table_downloads.write_frame
+
+    def counting_write(*args, **kwargs):
+        calls.append(args[2])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(table_downloads, "write_frame", counting_write)
+    first = serialize_frame(df, "csv")
+    second = serialize_frame(df.copy(), "csv")
+
+    assert first is second
+    assert calls == ["csv"]
+
+
+def test_write_frame_xlsx_round_trip(df):
+    pytest.importorskip("openpyxl")
+    buffer = io.BytesIO()
+    write_frame(df, buffer, "excel")
+
+    buffer.seek(0)
+    pd.testing.assert_frame_equal(pd.read_excel(buffer), df)
+
+
+def test_write_frame_rejects_unknown_format(df):
+    with pytest.raises(ValueError):
+        write_frame(df, io.BytesIO(), "docx")
+
+
+def test_parquet_offered_only_for_large_frames(df, monkeypatch):
+    pytest.importorskip("pyarrow")
+    assert "parquet" not in available_formats(df)
+
+    monkeypatch.setattr(table_downloads, "PARQUET_ROW_THRESHOLD", 2)
+    assert "parquet" in available_formats(df)
@@ -0,0 +1,73 @@
+"""Tests for consolidated (one trace per visual category) timeline and Gantt figures."""
+
+import pandas as pd
+
+from dashboard.components.agricultural_analysis.charts.calendar.crop_gantt_chart import (
+    build_crop_gantt_figure,
+    build_gantt_rows,
+)
+from dashboard.components.initiative_analysis.charts.temporal.timeline_component import (
+    plot_timeline_chart,
+)
+from scripts.plotting.charts.modern_timeline_chart import plot_modern_timeline_chart
+from scripts.plotting.trace_consolidation import (
+    group_segments,
+    join_segments,
+    synthetic_crop_calendar,
+    synthetic_timeline_metadata,
+)
+
+
+def _points(fig, mode):
+    points = set()
+    for trace in fig.data:
+        if trace.mode == mode:
+            points.update((x, y) for x, y in zip(trace.x, trace.y) if x is not None)
+    return points
+
+
+def test_join_and_group_segments():
+    assert join_segments([([1, 2], ["a", "a"]), ([3], ["b"])]) == ([1, 2, None, 3], ["a", "a", None, "b"])
+    grouped = group_segments(
+        [("red", 1), ("blue", 2), ("red", 3), ("red", None)],
+        style=lambda row: row[0],
+        segment=lambda row: None if row[1] is None else ([row[1]], [row[1]]),
+    )
+    assert list(grouped) == ["red", "blue"]
+    assert grouped["red"] == ([1, None, 3], [1, None, 3])
+
+
+def test_timeline_consolidated_draws_same_points():
+    metadata = synthetic_timeline_metadata(40)
+    temporal_data = pd.DataFrame({"Name": list(metadata)})
+    timeline = getattr(plot_timeline_chart, "__wrapped__", plot_timeline_chart)
+
+    per_item = timeline(metadata, temporal_data, True, False, True, consolidate_traces=False)
+    consolidated = timeline(metadata, temporal_data, True, False, True, consolidate_traces=True)
+
+    assert len(consolidated.data) < len(per_item.data) / 5
+    assert _points(consolidated, "markers") == _points(per_item, "markers")
+    assert _points(consolidated, "lines") == _points(per_item, "lines")
+
+
+def test_modern_timeline_consolidated_draws_same_points():
+    metadata = synthetic_timeline_metadata(30)
+    df = pd.DataFrame({"Name": list(metadata), "Acronym": [m["acronym"] for m in metadata.values()]})
+
+    per_item = plot_modern_timeline_chart(metadata, df, consolidate_traces=False)
+    consolidated = plot_modern_timeline_chart(metadata, df, consolidate_traces=True)
+
+    assert len(consolidated.data) == 3
+    assert _points(consolidated, "markers") == _points(per_item, "markers")
+
+
+def test_gantt_is_a_single_bar_trace_in_row_order():
+    rows = build_gantt_rows(synthetic_crop_calendar(15), max_crops=None)
+    fig = build_crop_gantt_figure(rows)
+
+    assert len(fig.data) == 1
+    bar = fig.data[0]
+    assert list(bar.y) == [row["Task"] for row in rows]
+    assert list(bar.base) == [row["Start"] for row in rows]
+    assert list(bar.marker.opacity) == [row["Opacity"] for row in rows]
+    assert len(build_crop_gantt_figure(rows, consolidate_traces=False).data) == len(rows)
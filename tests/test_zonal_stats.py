@@ -0,0 +1,84 @@
+"""Tests for the windowed zonal-statistics engine and its detailed-analysis tab."""
+
+import numpy as np
+import pytest
+from shapely import Polygon, box
+
+from scripts.utilities import zonal_stats
+from scripts.utilities.zonal_stats import ArrayRaster, ZoneSet, list_zonal_tables, zonal_statistics
+
+TRANSFORM = (0.01, 0.0, -60.0, 0.0, -0.01, -20.0)  # lon -60..-58, lat -20..-21.5
+ZONE_GEOMETRIES = {
+    "MS": box(-60.0, -21.5, -59.0, -20.0),
+    "PR": Polygon([(-59.0, -20.0), (-58.0, -20.0), (-58.0, -21.5)]),
+    "SP": Polygon([(-59.0, -20.0), (-58.0, -21.5), (-59.0, -21.5)]),
+}
+ZONES = ZoneSet.from_geometries("test", ZONE_GEOMETRIES)
+
+
+@pytest.fixture(scope="module")
+def raster(tmp_path_factory):
+    values = np.random.default_rng(7).integers(0, 5, (150, 200), dtype=np.uint8)
+    path = tmp_path_factory.mktemp("rasters") / "classes.npy"
+    np.save(path, values)
+    return ArrayRaster.from_npy(path, TRANSFORM, nodata=0, block_shape=(32, 32))
+
+
+def _brute_force(values):
+    """Per-pixel point-in-polygon reference counts (zone → class → pixels)."""
+    from shapely import Point
+
+    geometries = [ZONE_GEOMETRIES[code] for code in ZONES.codes]
+    counts = {}
+    for row in range(values.shape[0]):
+        for col in range(values.shape[1]):
+            point = Point(-60.0 + (col + 0.5) * 0.01, -20.0 - (row + 0.5) * 0.01)
+            zone = next((code for code, g in zip(ZONES.codes, geometries) if g.contains(point)), None)
+            if zone is not None and values[row, col] != 0:
+                counts[(zone, int(values[row, col]))] = counts.get((zone, int(values[row, col])), 0) + 1
+    return counts
+
+
+def test_tiled_counts_match_pixel_reference(raster, tmp_path):
+    table = zonal_statistics(raster, zones=ZONES, workers=1, cache_dir=tmp_path, tile_size=64)
+    counts = {(z, c): p for z, c, p in table[["zone", "class_value", "pixels"]].itertuples(index=False)}
+    assert counts == _brute_force(np.load(raster.array.filename))
+
+    # Degree pixels shrink with latitude: about 1.04 km² each at 20°S
+    per_pixel = table["area_km2"].sum() / table["pixels"].sum()
+    assert per_pixel == pytest.approx(1.1119 ** 2 * np.cos(np.radians(20.75)), rel=1e-3)
+    assert table.groupby("zone")["share"].sum().to_numpy() == pytest.approx(1.0)
+
+
+def test_process_pool_and_cache(raster, tmp_path, monkeypatch):
+    pooled = zonal_statistics(raster, zones=ZONES, workers=2, cache_dir=tmp_path, tile_size=64, initiative="Demo", year=2022)
+    inline = zonal_statistics(raster, zones=ZONES, workers=1, cache_dir=tmp_path / "inline", tile_size=64)
+    assert pooled.equals(inline)
+    assert len(list(tmp_path.glob("zones_*.npy"))) == 1
+
+    # A cached (raster, zone set) table is read back without touching the raster
+    monkeypatch.setattr(zonal_stats._TileJob, "count", lambda *a: pytest.fail("recomputed"))
+    assert zonal_statistics(raster, zones=ZONES, cache_dir=tmp_path).equals(pooled)
+    regions = zonal_statistics(raster, "mesoregion", zones=ZONES, cache_dir=tmp_path)
+    assert set(regions["zone"]) == {"Central-West", "South", "Southeast"}
+
+    tables = list_zonal_tables(tmp_path)
+    assert tables[["initiative", "year", "zone_set"]].values.tolist() == [["Demo", 2022, "test"]]
+
+
+def test_rejects_unsupported_rasters(tmp_path):
+    with pytest.raises(ValueError):
+        zonal_statistics(ArrayRaster(np.zeros((4, 4), np.float32), TRANSFORM), zones=ZONES, cache_dir=tmp_path)
+    with pytest.raises(ValueError):
+        zonal_statistics(ArrayRaster(np.zeros((4, 4), np.uint8), (0.01, 0.1, 0, 0, -0.01, 0)), zones=ZONES, cache_dir=tmp_path)
+    with pytest.raises(ValueError):
+        zonal_statistics(ArrayRaster(np.zeros((4, 4), np.uint8), TRANSFORM), layer="county", zones=ZONES, cache_dir=tmp_path)
+
+
+def test_zonal_area_chart_groups_small_classes(raster, tmp_path):
+    from dashboard.components.initiative_analysis.charts.detailed.zonal_stats_component import create_zonal_area_chart
+
+    table = zonal_statistics(raster, zones=ZONES, workers=1, cache_dir=tmp_path)
+    fig = create_zonal_area_chart(table, "Demo", top_classes=2)
+    assert [trace.name for trace in fig.data][-1] == "Other"
+    assert sum(sum(trace.y) for trace in fig.data) == pytest.approx(table["area_km2"].sum())